@@ -3,6 +3,8 @@ import warnings
 import regex as re
 import numpy as np
 import pandas as pd
+from bin.mdl_index import read_MDL_sheet, unchanged_rows
+from bin.prefetch import prefetch_files, read_bytes, PREFETCH_DEPTH
 
 # import sys
 # # sys.path.append('D:\\August_PySide2\\bin')
@@ -12,7 +14,7 @@ import pandas as pd
 # from save_to_excel import all_NCs_to_excel
 
 
-def read_MDLs_for_NCs(rootdir: str):
+def read_MDLs_for_NCs(rootdir: str, msn_list: list = None, mdl_index: dict = None, prefetch_depth: int = PREFETCH_DEPTH, reader=read_bytes):
     """
     Read all MDLs from 'rootdir', and create lists with Dataframes in order to create NC.
 
@@ -21,48 +23,60 @@ def read_MDLs_for_NCs(rootdir: str):
         rootdir:
             The path to the folder containing the MDLs in '.xlsx' format.
 
+        msn_list:
+            If given, read only the MDLs of these MSNs (i.e. the ones not inside the ALL_NCs store). (Default=None reads all)
+
+        mdl_index:
+            Optional MDL index (from "load_mdl_index"). MDLs that are already inside are not read from Excel.
+
+        prefetch_depth:
+            Number of MDLs read ahead in the background while one is parsed. (Default=PREFETCH_DEPTH)
+
+        reader:
+            Function that returns the bytes of an MDL (i.e. "slow_reader" to test a slow share). (Default="read_bytes")
+
     Returns:
     ----------
         mdl_msn_list:          
             List containing MSNs that where found in the MDLs.
 
         nc_dict:
-            Dict containing DataFrames for each MSN in order to create NC.
+            Dict containing DataFrames for each MSN (that was read) in order to create NC.
     
     Extra Info:
     ----------
         Symbols '-Q' and '-T' are replaced by 'R' just to be sure.
     """
-    mdl_msn_list = []
     nc_dict = {}
-    for root, _, files in os.walk(rootdir, topdown=True):
-        for file in files:
-            if not file.endswith('xlsx'): continue
-            msn = file[:4]
-            mdl_msn_list.append(msn)
-            if msn in ['0835', '2737']:
-                mdl_column = file.replace('.xlsx','').replace('349-', '')     # The MDL filename follows the format "0835_349-MDL-0835-G.xlsx"
-            else:                                                                  
-                mdl_column = file.replace('.xlsx','').replace('EFW-E-', '')     # The MDL filename follows the format "3708_EFW-E-MDL-00243-C.xlsx"
-
-            # To ignore "UserWarning: Data Validation" and "UserWarning: Conditional Formatting"
-            with warnings.catch_warnings():
-                warnings.simplefilter(action='ignore', category=UserWarning)
-
-                # Read Sheet 'Nonconformities' (only for New MSNs)
-                df = pd.read_excel(root + os.sep + file, dtype=str, sheet_name='Nonconformities')
-                df = df[['NUMBER', 'ISSUE', 'NC NUMBER', 'NC ISSUE', 'NC TITLE', 'DIFF']]           # Keep only these columns
-                for column in df.columns: df[column] = df[column].str.strip()                       # Strip leading and trailing whitespaces
-                ### df['DIFF'] = df['DIFF'].replace(' ', np.nan)                                        # Read as NaN, this is already NaN
-                df['DIFF'] = df['DIFF'].replace(['-Q', '-T', '- Q', '- T'], 'R')                    # Update 02/03/2023: Replace with 'R'
-                df = df.rename(columns={'DIFF': mdl_column})
-                nc_dict[msn] = df
+    filepaths = [root + os.sep + file for root, _, files in os.walk(rootdir, topdown=True) for file in files if file.endswith('xlsx')]
+    mdl_msn_list = [os.path.basename(filepath)[:4] for filepath in filepaths]
+    if msn_list is not None:
+        filepaths = [filepath for filepath in filepaths if os.path.basename(filepath)[:4] in msn_list]
+    for filepath, data in prefetch_files(filepaths, prefetch_depth, reader):
+        file = os.path.basename(filepath)
+        msn = file[:4]
+        if msn in ['0835', '2737']:
+            mdl_column = file.replace('.xlsx','').replace('349-', '')     # The MDL filename follows the format "0835_349-MDL-0835-G.xlsx"
+        else:                                                                  
+            mdl_column = file.replace('.xlsx','').replace('EFW-E-', '')     # The MDL filename follows the format "3708_EFW-E-MDL-00243-C.xlsx"
+
+        # To ignore "UserWarning: Data Validation" and "UserWarning: Conditional Formatting"
+        with warnings.catch_warnings():
+            warnings.simplefilter(action='ignore', category=UserWarning)
+
+            # Read Sheet 'Nonconformities' (only for New MSNs)
+            df = read_MDL_sheet(filepath, 'NC', mdl_index, data)                               # Keep only 'NUMBER', 'ISSUE', 'NC NUMBER', 'NC ISSUE', 'NC TITLE', 'DIFF'
+            for column in df.columns: df[column] = df[column].str.strip()                       # Strip leading and trailing whitespaces
+            ### df['DIFF'] = df['DIFF'].replace(' ', np.nan)                                        # Read as NaN, this is already NaN
+            df['DIFF'] = df['DIFF'].replace(['-Q', '-T', '- Q', '- T'], 'R')                    # Update 02/03/2023: Replace with 'R'
+            df = df.rename(columns={'DIFF': mdl_column})
+            nc_dict[msn] = df
 
     return mdl_msn_list, nc_dict
 
 
 
-def update_90_day_rev(nc_dict_new: dict, nc_dict_old: dict, rev_msn_list: list):
+def update_90_day_rev(nc_dict_new: dict, nc_dict_old: dict, rev_msn_list: list, mdl_index: dict = None):
     """
     Update the DataFrames of the 90-Day Revision MSNs inside 'nc_dict_new' based on 'nc_dict_old'.
 
@@ -76,6 +90,10 @@ def update_90_day_rev(nc_dict_new: dict, nc_dict_old: dict, rev_msn_list: list):
         nc_dict_old:
             Dict containing DataFrames for each MSN from Old MDLs (only for those that will be revised).
 
+        mdl_index:
+            Optional MDL index (from "load_mdl_index") with the Old and New MDLs. The rows that are the same in both
+            (see "unchanged_rows") are kept from 'nc_dict_new' and only the rest are merged. (Default=None merges all rows)
+
     Returns:
     ----------
         nc_dict_new:
@@ -96,15 +114,22 @@ def update_90_day_rev(nc_dict_new: dict, nc_dict_old: dict, rev_msn_list: list):
         # In case a 90-Day MDL has not changed revision, then skip it
         if mdl_old == mdl_new: continue
 
-        # Merge "df_old" and "df_new"
-        df_merged = pd.merge(df_old, df_new, on=title_list, how='outer')
+        # Merge "df_old" and "df_new". With the MDL index, only the rows that changed between the two MDLs are merged
+        rows = unchanged_rows(mdl_index, mdl_old, mdl_new, 'NC') if mdl_index is not None else None
+        if rows is not None and len(rows[0]) == len(df_old) and len(rows[1]) == len(df_new):
+            is_same_old, is_same_new = rows
+            df_same = df_new.loc[is_same_new].assign(**{mdl_old: df_new.loc[is_same_new, mdl_new]})
+            df_merged = pd.merge(df_old.loc[~is_same_old], df_new.loc[~is_same_new], on=title_list, how='outer')
+            df_merged = pd.concat([df_merged, df_same], ignore_index=True)
+        else:
+            df_merged = pd.merge(df_old, df_new, on=title_list, how='outer')
         df_merged = df_merged.drop_duplicates()                                                                     
         df_merged = df_merged.sort_values(by=title_list)
 
         # Find "Phantom-New" and "Phantom-Deleted" EAs and DCNs
         df_merged[mdl_new] = df_merged[mdl_new].fillna('PD')
-        df_merged[mdl_new] = df_merged.apply(lambda row: 'PN' if (row[mdl_new] == 'R' or row[mdl_new] == '-') and (row[mdl_old] == 'D') else row[mdl_new], axis=1)
-        df_merged[mdl_new] = df_merged.apply(lambda row: 'PN' if (row[mdl_new] == 'R' or row[mdl_new] == '-') and (pd.isna(row[mdl_old])) else row[mdl_new], axis=1)
+        is_phantom_new = df_merged[mdl_new].isin(['R', '-']) & (df_merged[mdl_old].eq('D') | df_merged[mdl_old].isna())
+        df_merged[mdl_new] = df_merged[mdl_new].mask(is_phantom_new, 'PN')
 
         # Replace "nc_dict_new" with the df_merged
         nc_dict_new[msn] = df_merged.drop([mdl_old], axis=1)
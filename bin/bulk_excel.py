@@ -0,0 +1,138 @@
+##########################################################################################
+# Filename:     bulk_excel.py
+# For:          Follow_Up_Creation_Tool
+# Author:       Spyros Acheimastos (acheimastos@althom.eu)
+# Date:         19/10/2026
+##########################################################################################
+
+#   Write DataFrames to xlsxwriter sheets without "DataFrame.to_excel".
+#   "to_excel" builds a cell object for every cell (NaN included), finds its type and style and then calls "worksheet.write".
+#   Our sheets are strings (dtype=str) with many empty cells, so here the non-empty cells are found once with numpy
+#   and only they are written with "worksheet.write_string". Values that are not strings (i.e. numbers and dates) go through "worksheet.write".
+#   The header is written with its final format, so no default header format of pandas is added to the workbook.
+#   Same values as "to_excel", except that strings are never converted to formulas or URLs.
+#
+#   Usage: python -m bin.bulk_excel "EFW Follow-up R11.xlsx" --sheet DSOL     (benchmark against "to_excel")
+
+import os
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+
+
+def non_empty_cells(values: np.ndarray):
+    """
+    The non-empty cells of a 2D object array, in the order of the rows.
+
+    Returns:
+    ----------
+        rows, columns:
+            Positions of the cells that are not NaN, None or ''.
+
+        cells:
+            Their values.
+    """
+    is_set = ~pd.isna(values)
+    is_set[is_set] = values[is_set] != ''
+    rows, columns = np.nonzero(is_set)
+    return rows, columns, values[rows, columns]
+
+
+def write_block(worksheet, values: np.ndarray, first_row: int = 1):
+    """
+    Write a block of rows (2D object array) starting at 'first_row' (zero indexed). Empty cells are skipped.
+    Works in 'constant_memory' mode too, because the cells are written in the order of the rows.
+    """
+    rows, columns, cells = non_empty_cells(values)
+    write_string = worksheet.write_string
+    for row, column, value in zip((rows + first_row).tolist(), columns.tolist(), cells.tolist()):
+        if isinstance(value, str):
+            write_string(row, column, value)
+        else:
+            worksheet.write(row, column, value)
+
+
+def write_header(worksheet, column_names: list, header_format=None):
+    """Write the header row. 'header_format' is a Format for all the columns, or a list with one Format (or None) for each column."""
+    if not isinstance(header_format, (list, tuple)):
+        header_format = [header_format] * len(column_names)
+    for column, (name, cell_format) in enumerate(zip(column_names, header_format)):
+        worksheet.write_string(0, column, str(name), cell_format)
+
+
+def write_frame(writer, df: pd.DataFrame, sheet_name: str, header_format=None, n_block: int = None):
+    """
+    Same as "df.to_excel(writer, index=False, sheet_name=sheet_name)" for an xlsxwriter writer, without the cell by cell work of pandas.
+
+    Args:
+    ----------
+        writer:
+            An xlsxwriter writer (pd.ExcelWriter(engine='xlsxwriter')).
+
+        df:
+            The DataFrame. The values are expected to be strings or NaN (as "pd.read_excel(dtype=str)" returns them).
+
+        sheet_name:
+            The name of the new sheet.
+
+        header_format:
+            Format of the header, or a list with one Format for each column. (Default=None)
+
+        n_block:
+            Number of rows converted to an array at a time. If None, all rows at once. (Default=None)
+
+    Returns:
+    ----------
+        worksheet:
+            The new xlsxwriter worksheet (also inside 'writer.sheets').
+    """
+    worksheet = writer.book.add_worksheet(sheet_name)
+    write_header(worksheet, list(df.columns), header_format)
+
+    n_block = n_block or max(len(df), 1)
+    for start in range(0, len(df), n_block):
+        write_block(worksheet, df.iloc[start: start + n_block].to_numpy(dtype=object), first_row=start + 1)
+
+    return worksheet
+
+
+def benchmark(df: pd.DataFrame, sheet_name: str, directory: str):
+    """
+    Time "to_excel" and "write_frame" (filling the sheet and saving), and check that both Excels have the same values.
+    Returns a list with a line of text for every result.
+    """
+    lines = []
+    filepaths = {}
+    for name in ['to_excel', 'write_frame']:
+        filepath = os.path.join(directory, f'{name}.xlsx')
+        start = time.perf_counter()
+        writer = pd.ExcelWriter(filepath, engine='xlsxwriter')
+        if name == 'to_excel':
+            df.to_excel(writer, index=False, sheet_name=sheet_name)
+        else:
+            write_frame(writer, df, sheet_name)
+        filled = time.perf_counter()
+        writer.close()
+        saved = time.perf_counter()
+        filepaths[name] = filepath
+        lines.append(f'{name:12s} fill {filled - start:6.2f} s   save {saved - filled:6.2f} s   total {saved - start:6.2f} s   {os.path.getsize(filepath) / 1024 / 1024:.2f} MB')
+
+    df_1, df_2 = (pd.read_excel(filepaths[name], dtype=str, sheet_name=sheet_name) for name in ['to_excel', 'write_frame'])
+    lines.append('Same values.' if df_1.equals(df_2) else 'DIFFERENT values!')
+    return lines
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark "write_frame" against "DataFrame.to_excel" on a sheet of a Follow-up.')
+    parser.add_argument('excelfilepath', help='i.e. "EFW Follow-up R11.xlsx"')
+    parser.add_argument('--sheet', default='DSOL')
+    args = parser.parse_args()
+
+    from bin.sidecar import load_sidecar, read_sheet
+    df = read_sheet(args.excelfilepath, args.sheet, load_sidecar(args.excelfilepath))
+    print(f'Sheet "{args.sheet}": {df.shape[0]} rows x {df.shape[1]} columns, {int(df.notna().to_numpy().sum())} non-empty cells.')
+    with tempfile.TemporaryDirectory() as directory:
+        for line in benchmark(df, args.sheet, directory):
+            print(line)
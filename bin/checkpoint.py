@@ -0,0 +1,148 @@
+##########################################################################################
+# Filename:     checkpoint.py
+# For:          Follow_Up_Creation_Tool
+# Author:       Spyros Acheimastos (acheimastos@althom.eu)
+# Date:         19/10/2026
+##########################################################################################
+
+#   Checkpoints of the run pipeline, to resume a run that crashed (i.e. the Excel was open while saving).
+#   Every Stage saves its output in a run directory together with a key. The key is a fingerprint of the
+#   inputs of the Stage: the data of DataFrames, the signature (mtime, size) of files and folders, and
+#   the keys of the Stages it depends on. So a changed input changes the keys of every Stage after it,
+#   and only these Stages run again. The functions are fingerprinted with the source code of the tool (see "code_version"),
+#   so the checkpoints of a run with an older version of the tool are never reused.
+#   The checkpoints are always saved, but reused only when the run is resumed (opt-in from the GUI).
+#   The run directory is deleted when the run finishes successfully.
+
+import os
+import glob
+import shutil
+import pickle
+import hashlib
+import functools
+import numpy as np
+import pandas as pd
+
+from bin.session_cache import SessionCache, freeze
+
+
+SCRIPT_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+CHECKPOINT_DIRECTORY = os.path.join(os.path.dirname(SCRIPT_DIRECTORY), '_Checkpoints')
+
+
+@functools.lru_cache(maxsize=None)
+def code_version():
+    """
+    SHA-1 fingerprint (hex) of the source code of the tool (all the modules of 'bin'). The result of a Stage depends
+    on every function it calls, not only on its own source, so any change of the code makes a new version.
+    """
+    sha1 = hashlib.sha1()
+    for filepath in sorted(glob.glob(os.path.join(SCRIPT_DIRECTORY, '*.py'))):
+        sha1.update(os.path.basename(filepath).encode())
+        with open(filepath, 'rb') as f:
+            sha1.update(f.read().replace(b'\r\n', b'\n'))
+    return sha1.hexdigest()
+
+
+def fingerprint(value, sha1=None):
+    """
+    SHA-1 fingerprint (hex) of any input of a Stage. DataFrames are hashed by their data, strings
+    that are paths by their signature (see "freeze"), functions by their name and the version of the code (see "code_version").
+    """
+    top = sha1 is None
+    sha1 = sha1 or hashlib.sha1()
+    if isinstance(value, pd.DataFrame):
+        sha1.update(b'DataFrame')
+        sha1.update(repr((list(value.columns), [str(x) for x in value.dtypes])).encode())
+        sha1.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        sha1.update(b'Series')
+        sha1.update(repr((value.name, str(value.dtype))).encode())
+        sha1.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        sha1.update(repr((value.dtype.str, value.shape)).encode())
+        sha1.update(np.ascontiguousarray(value).tobytes() if value.dtype != object else repr(value.tolist()).encode())
+    elif isinstance(value, SessionCache):
+        sha1.update(b'SessionCache')                # Does not change the result
+    elif callable(value):
+        sha1.update(repr((freeze(value), code_version())).encode())
+    elif isinstance(value, (list, tuple)):
+        sha1.update(f'{type(value).__name__}{len(value)}'.encode())
+        for x in value:
+            fingerprint(x, sha1)
+    elif isinstance(value, dict):
+        sha1.update(f'dict{len(value)}'.encode())
+        for k in sorted(value, key=repr):
+            sha1.update(repr(k).encode())
+            fingerprint(value[k], sha1)
+    else:
+        sha1.update(repr(freeze(value)).encode())
+
+    return sha1.hexdigest() if top else sha1
+
+
+class CheckpointStore:
+    """
+    The checkpoints of one run, one file for each Stage inside 'run_directory'.
+
+    Args:
+    ----------
+        run_directory:
+            Folder of the checkpoints (created when the first checkpoint is saved).
+
+        reuse:
+            If False, the checkpoints are only saved (for a later run to resume) and "load" never finds one. (Default=True)
+    """
+    def __init__(self, run_directory: str, reuse: bool = True):
+        self.run_directory = run_directory
+        self.reuse = reuse
+
+    def filepath(self, name: str):
+        return os.path.join(self.run_directory, ''.join(x if x.isalnum() or x in '-_' else '_' for x in name) + '.pkl')
+
+    def load(self, name: str, key: str):
+        """Returns (True, result, elapsed) if the checkpoint of 'name' exists with the same 'key', else (False, None, None)."""
+        filepath = self.filepath(name)
+        if not self.reuse or not os.path.isfile(filepath):
+            return False, None, None
+        try:
+            with open(filepath, 'rb') as f:
+                checkpoint = pickle.load(f)
+        except Exception:
+            return False, None, None
+        if checkpoint.get('key') != key:
+            return False, None, None
+        return True, checkpoint['result'], checkpoint['elapsed']
+
+    def save(self, name: str, key: str, result, elapsed: float):
+        """Save the output of a Stage. Written to a temporary file first, so a crash never leaves half a checkpoint."""
+        os.makedirs(self.run_directory, exist_ok=True)
+        filepath = self.filepath(name)
+        with open(filepath + '.tmp', 'wb') as f:
+            pickle.dump({'key': key, 'result': result, 'elapsed': elapsed}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(filepath + '.tmp', filepath)
+
+    def clear(self):
+        """Delete all the checkpoints of the run (after it finished successfully)."""
+        shutil.rmtree(self.run_directory, ignore_errors=True)
+
+
+def run_checkpoints(excelfilepath: str, reuse: bool = True):
+    """The "CheckpointStore" of a run, named after the Excel it creates (i.e. '_Checkpoints/EFW Follow-up R11')."""
+    name = os.path.splitext(os.path.basename(excelfilepath))[0]
+    return CheckpointStore(os.path.join(CHECKPOINT_DIRECTORY, name), reuse)
+
+
+def checkpoint_call(checkpoints: CheckpointStore, name: str, fn, *args, **kwargs):
+    """
+    Call "fn" or load its result from the checkpoint 'name' if the arguments did not change.
+    For steps outside the pipeline (i.e. reading the MDLs).
+    """
+    if checkpoints is None:
+        return fn(*args, **kwargs)
+    key = fingerprint((name, fn, args, kwargs))
+    found, result, _ = checkpoints.load(name, key)
+    if not found:
+        result = fn(*args, **kwargs)
+        checkpoints.save(name, key, result, 0.0)
+    return result
@@ -0,0 +1,90 @@
+##########################################################################################
+# Filename:     effectivity.py
+# For:          Follow_Up_Creation_Tool
+# Author:       Spyros Acheimastos (acheimastos@althom.eu)
+# Date:         19/10/2026
+##########################################################################################
+
+#   Compact effectivity of a wide DataFrame (one column per MDL): one bit for every (row, MSN).
+#   Built once from the string columns, so questions like "which rows apply to these MSNs" become
+#   bitwise operations instead of scanning the strings again.
+#   The bits of a row are packed with "np.packbits" (8 MSNs per byte, in the order of the columns).
+
+import numpy as np
+import pandas as pd
+
+
+def effectivity_bits(df: pd.DataFrame, columns: list, symbols: list = None):
+    """
+    Bit-packed effectivity of the given MDL columns.
+
+    Args:
+    ----------
+        df:
+            A wide DataFrame (i.e. the result of "merge_dfs").
+
+        columns:
+            The MDL columns. Bit 'j' of a row is for 'columns[j]'.
+
+        symbols:
+            A cell sets its bit if its value is one of the 'symbols' (i.e. EFFECTIVE_SYMBOLS).
+            If None, every cell that is not empty or NaN sets its bit. (Default=None)
+
+    Returns:
+    ----------
+        bits:
+            uint8 array with shape (rows, ceil(len(columns) / 8)).
+    """
+    values = df[columns]
+    if symbols is None:
+        is_set = values.notna().to_numpy(dtype=bool) & (values != '').to_numpy(dtype=bool)
+    else:
+        is_set = values.isin(symbols).to_numpy(dtype=bool)
+    return np.packbits(is_set, axis=1)
+
+
+def msn_mask(columns: list, selected_columns: list):
+    """Packed bits with the 'selected_columns' set, to be combined with "effectivity_bits" of the same 'columns'."""
+    selected_columns = set(selected_columns)
+    return np.packbits(np.array([x in selected_columns for x in columns], dtype=bool))
+
+
+def any_bits(bits: np.ndarray, mask: np.ndarray = None):
+    """Boolean array: True for every row with at least one bit set (only the bits of 'mask', if given)."""
+    if mask is not None:
+        bits = bits & mask
+    return bits.any(axis=1)
+
+
+def set_bits(bits: np.ndarray, mask: np.ndarray):
+    """Set the bits of 'mask' on every row (i.e. MSNs that are always effective)."""
+    return bits | mask
+
+
+def effectivity_strings(bits: np.ndarray, labels: list, sep: str = ', '):
+    """
+    The effectivity string of every row (i.e. '1207, 1713'). Each distinct bit pattern is joined only once.
+
+    Args:
+    ----------
+        bits:
+            The result of "effectivity_bits".
+
+        labels:
+            The label of every bit (i.e. the MSNs of the columns).
+
+        sep:
+            Separator between the labels. (Default=', ')
+
+    Returns:
+    ----------
+        strings:
+            Object array with one string for every row ('' if no bit is set).
+    """
+    if bits.shape[0] == 0 or bits.shape[1] == 0:
+        return np.full(bits.shape[0], '', dtype=object)
+
+    patterns, inverse = np.unique(bits, axis=0, return_inverse=True)
+    is_set = np.unpackbits(patterns, axis=1, count=len(labels)).astype(bool)
+    strings = np.array([sep.join(labels[j] for j in np.flatnonzero(row)) for row in is_set], dtype=object)
+    return strings[inverse.reshape(-1)]
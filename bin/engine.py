@@ -0,0 +1,327 @@
+##########################################################################################
+# Filename:     engine.py
+# For:          Follow_Up_Creation_Tool
+# Author:       Spyros Acheimastos (acheimastos@althom.eu)
+# Date:         19/10/2026
+##########################################################################################
+
+#   Compute engine for the relational work (outer/left joins and sort + dedupe).
+#   'pandas' is the default. 'polars' and 'duckdb' are optional (multi-threaded) and used only if installed.
+#   The other engines never see the strings of the DataFrames: the key and sort columns are hashed once
+#   by pandas to integer codes, the engine finds the line numbers of the result, and the result is taken
+#   from the original DataFrames. So every engine gives exactly the same values and dtypes as pandas.
+#
+#   Select the engine with "set_engine('polars')" or the environment variable FOLLOW_UP_ENGINE
+#   (the variable is also seen by the workers of the process pool).
+#   An engine that is not installed falls back to 'pandas' without a message. The GUI shows "engine_fallback_message" on start.
+#
+#   Parity and benchmark on the sample data:
+#       python -m bin.engine __Follow_Up_R11_2023.02.15/R11_MDLs __Follow_Up_R11_2023.02.15/PSDB_R10_Final.xlsx
+
+import os
+import sys
+import time
+import argparse
+import contextlib
+import numpy as np
+import pandas as pd
+from abc import ABC, abstractmethod
+from functools import reduce
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+
+ENGINE_ENV_VARIABLE = 'FOLLOW_UP_ENGINE'
+DEFAULT_ENGINE = 'pandas'
+
+
+def key_codes(list_of_series: list):
+    """
+    Integer code of every line of one or more Series. Equal values (NaN too, as in "pd.merge") get the same code.
+    Used to have the same codes for the key columns of different DataFrames.
+    """
+    codes, _ = pd.factorize(pd.concat(list_of_series, ignore_index=True), use_na_sentinel=False)
+    codes = codes.astype(np.int64)
+    splits = np.cumsum([len(x) for x in list_of_series])[:-1]
+    return np.split(codes, splits)
+
+
+def frame_key_codes(list_of_dfs: list, on: list):
+    """Same as "key_codes" for the columns 'on' of every DataFrame (one code for every combination)."""
+    lines = [np.zeros(len(df), dtype=np.int64) for df in list_of_dfs]
+    for column in on:
+        codes = key_codes([df[column] for df in list_of_dfs])
+        n_codes = max([x.max() + 1 for x in codes if len(x)], default=1)
+        lines = key_codes([pd.Series(line * n_codes + code) for line, code in zip(lines, codes)])
+    return lines
+
+
+def sort_codes(series: pd.Series, ascending: bool = True):
+    """
+    Integer codes of a column that sort in the same order as "sort_values" (NaN last).
+    """
+    codes, uniques = pd.factorize(series, sort=True)
+    codes = codes.astype(np.int32)
+    is_nan = codes == -1
+    if not ascending:
+        codes = len(uniques) - 1 - codes
+    codes[is_nan] = len(uniques)
+    return codes
+
+
+class PandasEngine:
+    """
+    The default engine. Every other engine gives the same results.
+    """
+    name = 'pandas'
+
+    def outer_merge(self, list_of_dfs: list, on: list):
+        """
+        Outer merge of all the DataFrames on the columns 'on', one after the other.
+        Apart from 'on', the columns of the DataFrames must be different (i.e. one MDL column each).
+        The lines of the same key are in the order of "pd.merge" (every line of the left with every line of the right).
+        The order of the keys is not defined, sort the result if needed.
+        """
+        return reduce(lambda left, right: pd.merge(left, right, on=on, how='outer'), list_of_dfs)
+
+    def left_merge(self, df_left: pd.DataFrame, df_right: pd.DataFrame, on: list):
+        """Same as "df_left.merge(df_right, how='left', on=on)"."""
+        return df_left.merge(df_right, how='left', on=on)
+
+    def sort_drop_duplicates(self, df: pd.DataFrame, sort_list: list, ascending, subset: list):
+        """
+        Same as "df.sort_values(by=sort_list, ascending=ascending).drop_duplicates(subset=subset)".
+        The index is kept. 'sort_list' must have more than one column (the sort of pandas is stable then).
+        """
+        return df.sort_values(by=sort_list, ascending=ascending).drop_duplicates(subset=subset)
+
+
+class CodeEngine(PandasEngine, ABC):
+    """
+    Base of the engines that work on integer codes. The subclasses implement only the "_lines" methods.
+    """
+    def outer_merge(self, list_of_dfs: list, on: list):
+        if len(list_of_dfs) == 1:
+            return list_of_dfs[0]
+        keys = frame_key_codes(list_of_dfs, on)
+        lines = self._outer_merge_lines(keys)
+
+        # Key columns from the first DataFrame that has the key, the other columns from their own DataFrame
+        n_lines = len(lines[0])
+        columns = {column: np.empty(n_lines, dtype=object) for column in on}
+        is_done = np.zeros(n_lines, dtype=bool)
+        for df, line in zip(list_of_dfs, lines):
+            is_new = (line >= 0) & ~is_done
+            for column in on:
+                columns[column][is_new] = df[column].to_numpy(dtype=object)[line[is_new]]
+            is_done |= is_new
+            df_values = df.drop(columns=on).reset_index(drop=True)
+            for column in df_values.columns:
+                columns[column] = df_values[column].reindex(line).to_numpy()
+        return pd.DataFrame(columns)
+
+    def left_merge(self, df_left: pd.DataFrame, df_right: pd.DataFrame, on: list):
+        key_left, key_right = frame_key_codes([df_left, df_right], on)
+        line_left, line_right = self._left_merge_lines(key_left, key_right)
+
+        df_left_values = df_left.reset_index(drop=True).iloc[line_left].reset_index(drop=True)
+        df_right_values = df_right.drop(columns=on).reset_index(drop=True).reindex(line_right).reset_index(drop=True)
+        common = [x for x in df_right_values.columns if x in df_left_values.columns]
+        df_left_values = df_left_values.rename(columns={x: x + '_x' for x in common})
+        df_right_values = df_right_values.rename(columns={x: x + '_y' for x in common})
+        return pd.concat([df_left_values, df_right_values], axis=1)
+
+    def sort_drop_duplicates(self, df: pd.DataFrame, sort_list: list, ascending, subset: list):
+        if isinstance(ascending, bool):
+            ascending = [ascending] * len(sort_list)
+        sort = [sort_codes(df[column], asc) for column, asc in zip(sort_list, ascending)]
+        key = frame_key_codes([df], subset)[0]
+        return df.iloc[self._sort_unique_lines(sort, key)]
+
+    @abstractmethod
+    def _outer_merge_lines(self, keys: list):
+        """Line of every DataFrame (-1 if missing) for every line of the result."""
+
+    @abstractmethod
+    def _left_merge_lines(self, key_left: np.ndarray, key_right: np.ndarray):
+        """Line of the left and of the right (-1 if missing) for every line of the result."""
+
+    @abstractmethod
+    def _sort_unique_lines(self, sort: list, key: np.ndarray):
+        """Lines in the order of 'sort', keeping the first line of every 'key'."""
+
+
+class PolarsEngine(CodeEngine):
+    name = 'polars'
+
+    def _outer_merge_lines(self, keys: list):
+        line_columns = [f'LINE_{i}' for i in range(len(keys))]
+        df_merged = reduce(
+            lambda left, right: left.join(right, on='KEY', how='full', coalesce=True),
+            [pl.DataFrame({'KEY': key, column: np.arange(len(key))}) for key, column in zip(keys, line_columns)]
+        )
+        df_merged = df_merged.sort(['KEY'] + line_columns, nulls_last=True)
+        return [df_merged[column].fill_null(-1).to_numpy() for column in line_columns]
+
+    def _left_merge_lines(self, key_left: np.ndarray, key_right: np.ndarray):
+        df_left = pl.DataFrame({'KEY': key_left, 'LINE_L': np.arange(len(key_left))})
+        df_right = pl.DataFrame({'KEY': key_right, 'LINE_R': np.arange(len(key_right))})
+        df_merged = df_left.join(df_right, on='KEY', how='left').sort(['LINE_L', 'LINE_R'], nulls_last=True)
+        return df_merged['LINE_L'].to_numpy(), df_merged['LINE_R'].fill_null(-1).to_numpy()
+
+    def _sort_unique_lines(self, sort: list, key: np.ndarray):
+        sort_columns = [f'SORT_{i}' for i in range(len(sort))]
+        df = pl.DataFrame({**dict(zip(sort_columns, sort)), 'KEY': key, 'LINE': np.arange(len(key))})
+        df = df.sort(sort_columns + ['LINE']).unique(subset=['KEY'], keep='first', maintain_order=True)
+        return df['LINE'].to_numpy()
+
+
+class DuckDBEngine(CodeEngine):
+    name = 'duckdb'
+
+    def _outer_merge_lines(self, keys: list):
+        con = duckdb.connect()
+        line_columns = [f'LINE_{i}' for i in range(len(keys))]
+        for i, key in enumerate(keys):
+            con.register(f't{i}', pd.DataFrame({'KEY': key, line_columns[i]: np.arange(len(key))}))
+        joins = ' '.join(f'FULL JOIN t{i} USING (KEY)' for i in range(1, len(keys)))
+        order = ', '.join(['KEY'] + [f'{x} NULLS LAST' for x in line_columns])
+        result = con.execute(f'SELECT {", ".join(line_columns)} FROM t0 {joins} ORDER BY {order}').fetchnumpy()
+        con.close()
+        return [np.ma.filled(np.ma.asarray(result[column]).astype(np.int64), -1) for column in line_columns]
+
+    def _left_merge_lines(self, key_left: np.ndarray, key_right: np.ndarray):
+        con = duckdb.connect()
+        con.register('l', pd.DataFrame({'KEY': key_left, 'LINE_L': np.arange(len(key_left))}))
+        con.register('r', pd.DataFrame({'KEY': key_right, 'LINE_R': np.arange(len(key_right))}))
+        result = con.execute('SELECT LINE_L, LINE_R FROM l LEFT JOIN r USING (KEY) ORDER BY LINE_L, LINE_R NULLS LAST').fetchnumpy()
+        con.close()
+        return np.asarray(result['LINE_L']), np.ma.filled(np.ma.asarray(result['LINE_R']).astype(np.int64), -1)
+
+    def _sort_unique_lines(self, sort: list, key: np.ndarray):
+        con = duckdb.connect()
+        sort_columns = [f'SORT_{i}' for i in range(len(sort))]
+        con.register('t', pd.DataFrame({**dict(zip(sort_columns, sort)), 'KEY': key, 'LINE': np.arange(len(key))}))
+        order = ', '.join(sort_columns + ['LINE'])
+        result = con.execute(
+            f'SELECT LINE FROM (SELECT *, row_number() OVER (PARTITION BY KEY ORDER BY {order}) AS N FROM t) '
+            f'WHERE N = 1 ORDER BY {order}'
+        ).fetchnumpy()
+        con.close()
+        return np.asarray(result['LINE'])
+
+
+ENGINES = {
+    'pandas': (PandasEngine, True),
+    'polars': (PolarsEngine, pl is not None),
+    'duckdb': (DuckDBEngine, duckdb is not None),
+}
+
+
+def available_engines():
+    """Names of the engines that can be used (the optional packages are installed)."""
+    return [name for name, (_, is_installed) in ENGINES.items() if is_installed]
+
+
+def set_engine(name: str):
+    """Select the engine for this process and for the processes started after this."""
+    if name not in ENGINES:
+        raise ValueError(f'Unknown engine "{name}". Options: {list(ENGINES)}')
+    if name not in available_engines():
+        raise ImportError(f'Engine "{name}" is not installed. Run "pip install {name}".')
+    os.environ[ENGINE_ENV_VARIABLE] = name
+
+
+def engine_name(name: str = None):
+    """The name of the engine to use: 'name', else the environment variable FOLLOW_UP_ENGINE, else 'pandas'."""
+    return name or os.environ.get(ENGINE_ENV_VARIABLE) or DEFAULT_ENGINE
+
+
+def engine_fallback_message(name: str = None):
+    """The line to show if the engine to use (see "engine_name") is not available, or None."""
+    name = engine_name(name)
+    if name in available_engines():
+        return None
+    return f'Engine "{name}" is not available. Using "{DEFAULT_ENGINE}". Installed: {", ".join(available_engines())}.'
+
+
+def get_engine(name: str = None):
+    """
+    The engine to use (see "engine_name"). An engine that is not installed falls back to 'pandas' (see "engine_fallback_message").
+    """
+    name = engine_name(name)
+    if name not in available_engines():
+        name = DEFAULT_ENGINE
+    return ENGINES[name][0]()
+
+
+def frames_are_equal(df_a: pd.DataFrame, df_b: pd.DataFrame):
+    """True if the two DataFrames have the same columns, dtypes and values (NaN equal to NaN)."""
+    try:
+        pd.testing.assert_frame_equal(df_a.reset_index(drop=True), df_b.reset_index(drop=True), check_index_type=False)
+        return True
+    except AssertionError as error:
+        print(error)
+        return False
+
+
+if __name__ == '__main__':
+    from bin.setup_follow_up import read_JSON, read_MDLs, merge_dfs, add_columns_to_PS
+    from bin.pseudo_db import read_pseudo_db, drop_duplicate_keys, gnrt_lines_and_split, KEEP_COLUMN_LIST
+
+    parser = argparse.ArgumentParser(description='Parity and benchmark of the compute engines on MDLs and a PseudoDataBase.')
+    parser.add_argument('mdl_folder', help='Folder with the MDLs, i.e. __Follow_Up_R11_2023.02.15/R11_MDLs')
+    parser.add_argument('pseudo_db', help='PseudoDataBase, i.e. __Follow_Up_R11_2023.02.15/PSDB_R10_Final.xlsx')
+    parser.add_argument('--json', default='_JSON/INPUT_MSNs.json', help='JSON with the MSNs. (Default=_JSON/INPUT_MSNs.json)')
+    parser.add_argument('--engines', nargs='+', default=available_engines(), choices=list(ENGINES))
+    parser.add_argument('--repeat', type=int, default=3, help='Runs of every case (the best time is reported).')
+    args = parser.parse_args()
+
+    print('Reading MDLs and PseudoDataBase...')
+    json_MSNs = read_JSON(args.json)
+    _, follow_up_list, dsol_list, ps_list, nc_list = read_MDLs(args.mdl_folder, json_MSNs['new'] + json_MSNs['rev'])
+    df_pseudo_db = read_pseudo_db(args.pseudo_db)
+    df_initial = merge_dfs(follow_up_list)
+    df_ps = merge_dfs(ps_list)
+    df_pseudo_db_twice = pd.concat([df_pseudo_db, df_pseudo_db.assign(IPC=False)], ignore_index=True)
+
+    cases = {
+        'merge_dfs (DSOL)': lambda: merge_dfs(list(dsol_list)),
+        'merge_dfs (PS)': lambda: merge_dfs(list(ps_list)),
+        'merge_dfs (NC)': lambda: merge_dfs(list(nc_list)),
+        'merge_pseudo_dbs dedupe': lambda: drop_duplicate_keys(df_pseudo_db_twice, KEEP_COLUMN_LIST + ['IPC', 'SRM A321', 'SRM A320'],
+                                                               [True] * len(KEEP_COLUMN_LIST) + [False] * 3),
+        'gnrt_lines_and_split': lambda: gnrt_lines_and_split(df_initial, df_pseudo_db.copy(), [])[0],
+        'add_columns_to_PS': lambda: add_columns_to_PS(df_ps),
+        'outer_merge (PS)': lambda: get_engine().outer_merge([df.drop_duplicates() for df in ps_list], ['PARENT NUMBER', 'LEVEL', 'CHILD NUMBER', 'CHILD TITLE']),
+    }
+
+    results = {}
+    all_equal = True
+    for name in args.engines:
+        set_engine(name)
+        for case, fun in cases.items():
+            times = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(None):
+                    df_result = fun()
+                times.append(time.perf_counter() - start)
+            if name == args.engines[0]:
+                results[case] = df_result
+                parity = 'reference'
+            else:
+                is_equal = frames_are_equal(results[case], df_result)
+                all_equal &= is_equal
+                parity = 'same' if is_equal else 'DIFFERENT'
+            print(f'{name:8} {case:28} {min(times):8.3f} s   {parity}')
+
+    sys.exit(0 if all_equal else 1)
@@ -8,12 +8,14 @@
 import os
 import regex as re
 import numpy as np
+import pandas as pd
 from PySide2.QtCore import *
 from bin.pseudo_db import (
     follow_up_to_pseudo_db,
     merge_pseudo_dbs,
     create_pseudo_db_for_CC,
     gnrt_lines_and_split,
+    title_mismatch_lines,
     read_pseudo_db
 )
 from bin.setup_follow_up import (
@@ -21,26 +23,72 @@ from bin.setup_follow_up import (
     read_JSON_authors,
     read_MDLs_current, 
     read_MDLs, 
+    list_MDLs,
     merge_dfs, 
     add_effectivity_column, 
     add_task_column, 
     add_columns_to_Follow_Up, 
     add_columns_to_PS, 
-    add_columns_to_NC
+    add_columns_to_NC,
+    prepare_follow_up,
+    prepare_dsol,
+    prepare_ps,
+    prepare_nc
+)
+from bin.mdl_index import (
+    load_mdl_index,
+    read_with_mdl_index,
+    summarize_mdl_changes
+)
+from bin.session_cache import (
+    SessionCache,
+    cached_call
+)
+from bin.preflight import (
+    preflight_MDLs,
+    preflight_pseudo_db
+)
+from bin.sidecar import save_sidecar
+from bin.reference_workbook import is_split_reference, reference_filepath
+from bin.nc_builder import (
+    build_all_NCs,
+    NC_MEMORY_BUDGET_MB
+)
+from bin.ps_graph import (
+    PSGraph,
+    save_ps_graph,
+    ps_graph_for_follow_up
+)
+from bin.pn_index import index_MDL_frames
+from bin.nc_store import (
+    load_nc_store,
+    save_nc_store,
+    stale_MSNs,
+    update_nc_store
+)
+from bin.pseudo_db_cc import pseudo_db_for_CC_to_excel
+from bin.checkpoint import (
+    run_checkpoints,
+    checkpoint_call
+)
+from bin.pipeline import (
+    Stage,
+    StageResult,
+    run_pipeline
 )
 from bin.save_to_excel import (
     pseudo_db_to_excel,
     initial_follow_up_to_excel,
-    final_follow_up_to_excel,
-    all_NCs_to_excel
+    final_follow_up_to_excel
 )
 
 from bin.partials import (
     get_follow_ups,
     get_MSNs_and_MDLs, 
-    add_PNs_to_df_old, 
-    reduce_df_new,
-    update_MDLs_in_df_old,
+    get_changed_MDLs,
+    add_unchanged_PNs_to_df_new,
+    update_follow_up,
+    patch_MDL_sheet,
     read_PS_DSOL_NC
 )
 
@@ -51,8 +99,7 @@ from bin.create_json import (
 
 from bin.all_NCs import (
     read_MDLs_for_NCs,
-    update_90_day_rev,
-    replace_letters_with_MSNs
+    update_90_day_rev
 )
 
 SCRIPT_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
@@ -73,6 +120,15 @@ def fun_generate_msns_start(console: Signal = Signal('')):
     console.emit('---> Finished.')
 
 
+def fun_load_ps_graph_start(excelfilepath: str, console: Signal = Signal('')):
+    """Load the PS index of a Follow-up for the 'Search' tab (built from the 'PS' sheet the first time)."""
+    console.emit('Loading PS index.')
+    ps_graph = ps_graph_for_follow_up(excelfilepath)
+    console.emit(f'{len(ps_graph.part_numbers)} Part Numbers, {len(ps_graph)} PS lines, {len(ps_graph.msn_list)} MSNs.')
+    console.emit('---> Finished.')
+    return {'ps_graph': ps_graph}
+
+
 def fun_run_0_start(filepath_one_follow_up: str, console: Signal = Signal('')):
     """
     Call the functions for Step-0/Create PseudoDB of 'Extra'
@@ -86,6 +142,31 @@ def fun_run_0_start(filepath_one_follow_up: str, console: Signal = Signal('')):
     console.emit('---> Finished.')
 
 
+def fun_run_11_start(folder_follow_ups: str, excelfilepath: str = 'NEW_PSEUDODATABASE.xlsx', max_workers: int = None, console: Signal = Signal('')):
+    """
+    Call the functions for "Create PseudoDB from a folder with Follow-ups" of 'Extra'
+
+    Every Follow-up inside the folder is converted on a process pool and all of them are merged at once.
+    The result is the same as running Step-0 and Step-1 for each Follow-up one by one.
+    """
+    # Follow-ups inside the folder (temporary files of open Excels are skipped)
+    filepaths = sorted(os.path.join(folder_follow_ups, x) for x in os.listdir(folder_follow_ups) if x.endswith('.xlsx') and not x.startswith('~$'))
+    if not filepaths:
+        return console.emit('No Follow-ups found inside the folder. Fix this error and run again.')
+
+    console.emit(f'Converting {len(filepaths)} Follow-ups to PseudoDataBase format.')
+    stages = [Stage(os.path.basename(filepath), follow_up_to_pseudo_db, filepath) for filepath in filepaths]
+    results, _ = run_pipeline(stages, max_workers=max_workers, console=console)
+
+    console.emit('Merging PseudoDataBases.')
+    df_pseudo_db = merge_pseudo_dbs(list(results.values()))
+
+    console.emit('Saving New PseudoDataBase.')
+    pseudo_db_to_excel(df_pseudo_db, excelfilepath)
+
+    console.emit('---> Finished.')
+
+
 def fun_run_1_start(filepath_latest_follow_up: str, filepath_pseudo_db_1: str, console: Signal = Signal('')):
     """
     Call the functions for Step-1 of 'Create Follow-up'
@@ -105,33 +186,44 @@ def fun_run_1_start(filepath_latest_follow_up: str, filepath_pseudo_db_1: str, c
     console.emit('---> Finished.')
 
 
-def fun_run_2_start(filepath_json: str, filepath_mdl: str, filepath_pseudo_db_2: str, console: Signal = Signal('')):
+def fun_run_2_start(filepath_json: str, filepath_mdl: str, filepath_pseudo_db_2: str, session_cache: SessionCache = None, console: Signal = Signal('')):
     """
     Call the functions for Step-2 of 'Create Follow-up' and Step-1 of 'Update Follow-up'
+
+    With a 'session_cache', all the sheets of the MDLs are read, so that the next step finds them in the cache.
     """
     # Read JSON
     console.emit('Reading JSON file with MSNs.')
-    json_MSNs = read_JSON(filepath_json)
+    json_MSNs = cached_call(session_cache, read_JSON, filepath_json)
     all_msn_list = json_MSNs['all']
     current_msn_list = json_MSNs['new'] + json_MSNs['rev']
     rev_msn_list = json_MSNs['rev']
     current_A320_msn_list = [x for x in current_msn_list if x in json_MSNs['all_A320']]
 
+    # Check the MDL folder and the PseudoDataBase before reading them
+    console.emit('Checking MDLs and PseudoDataBase.')
+    errors = preflight_MDLs(filepath_mdl, all_msn_list, current_msn_list) + preflight_pseudo_db(filepath_pseudo_db_2)
+    if errors:
+        for error in errors: console.emit(error)
+        return console.emit('Fix these errors and run again.')
+
     # Read Current MDLs
     console.emit('Reading current MDLs.')
-    mdl_msn_list, follow_up_list = read_MDLs_current(filepath_mdl, current_msn_list)
+    if session_cache is None:
+        mdl_msn_list, follow_up_list = read_with_mdl_index(read_MDLs_current, filepath_mdl, current_msn_list)
+    else:
+        mdl_msn_list, follow_up_list, _, _, _ = session_cache.call(read_with_mdl_index, read_MDLs, filepath_mdl, current_msn_list)
+
+    # Changes of the current MDLs since their previous revision
+    mdl_index = load_mdl_index()
+    for msn, (_, mdl_column) in list_MDLs(filepath_mdl).items():
+        if msn not in current_msn_list: continue
+        changes = summarize_mdl_changes(mdl_index, mdl_column)
+        if changes: console.emit(changes)
 
     # Read PseudoDataBase
     console.emit('Reading PseudoDataBase.')
-    df_pseudo_db_2 = read_pseudo_db(filepath_pseudo_db_2)
-
-    # Check that MDL names and MSNs inside JSON match
-    missing_mdl_list = [x for x in all_msn_list if x not in mdl_msn_list]
-    missing_json_list = [x for x in mdl_msn_list if x not in all_msn_list]
-    if missing_mdl_list:
-        return console.emit('The MDLs of the MSNs ' + ', '.join(missing_mdl_list) + ' are missing. Fix this error and run again.')
-    if missing_json_list:
-        return console.emit('The MSNs ' + ', '.join(missing_json_list) + ' are missing from the JSON file. Fix this error and run again.')
+    df_pseudo_db_2 = cached_call(session_cache, read_pseudo_db, filepath_pseudo_db_2)
 
     # Merge Follow-up DataFrames
     console.emit('Merging Initial Follow-Up.')
@@ -140,7 +232,7 @@ def fun_run_2_start(filepath_json: str, filepath_mdl: str, filepath_pseudo_db_2:
     # Create and Save new PseudoDataBase
     console.emit('Saving new PseudoDataBase.')
     df_new_pseudo_db = create_pseudo_db_for_CC(df_initial, df_pseudo_db_2)
-    pseudo_db_to_excel(df_new_pseudo_db, filepath_pseudo_db_2.replace('.xlsx', '_for_CC.xlsx'))
+    pseudo_db_for_CC_to_excel(df_new_pseudo_db, filepath_pseudo_db_2.replace('.xlsx', '_for_CC.xlsx'))
 
     # Create and Save Initial Follow-up
     console.emit('Saving Initial Follow-up.')
@@ -153,13 +245,26 @@ def fun_run_2_start(filepath_json: str, filepath_mdl: str, filepath_pseudo_db_2:
     console.emit('> Categorize new Part Numbers (TBDs) that were added to the PseudoDataBase using "Follow-up_Initial.xlsx", and then continue.')
 
 
-def fun_run_3_start(filepath_json: str, filepath_mdl: str, filepath_pseudo_db: str, excelfilepath: str, filepath_json_authors: str = None, add_QBs: bool = True, console: Signal = Signal('')):
+def fun_run_3_start(filepath_json: str, filepath_mdl: str, filepath_pseudo_db: str, excelfilepath: str, filepath_json_authors: str = None, add_QBs: bool = True, max_workers: int = None, prerender: bool = False, resume: bool = False, sidecar: bool = False, write_excel: bool = True, split_reference: bool = False, session_cache: SessionCache = None, console: Signal = Signal('')):
     """
     Call the functions for Step-3 of 'Create Follow-up' and Step-2 of 'Update Follow-up'
+
+    Independent stages run in parallel on 'max_workers' processes. Use max_workers=1 to run everything serially.
+    With 'prerender', the sheets of the final Excel are also rendered in parallel (see "final_follow_up_to_excel").
+
+    The reading and every stage save a checkpoint (see "run_checkpoints"). If the run fails (i.e. the Excel is open),
+    running it again with 'resume' and the same inputs continues from the last finished stage.
+
+    With 'sidecar', the sheets are also saved to a binary sidecar of the Excel (see "save_sidecar"), that Step-3 of
+    'Update Follow-up' loads instead of reading the Excel. Then the Excel itself is optional ('write_excel').
+
+    With 'split_reference', 'DSOL', 'PS' and 'NC' are saved to a reference Excel next to the Follow-up (see "reference_workbook").
     """
+    checkpoints = run_checkpoints(excelfilepath, reuse=resume)
+
     # Read JSON MSNs
     console.emit('Reading JSON file with MSNs.')
-    json_MSNs = read_JSON(filepath_json)
+    json_MSNs = cached_call(session_cache, read_JSON, filepath_json)
     all_msn_list = json_MSNs['all']
     current_msn_list = json_MSNs['new'] + json_MSNs['rev']
     rev_msn_list = json_MSNs['rev']
@@ -168,97 +273,99 @@ def fun_run_3_start(filepath_json: str, filepath_mdl: str, filepath_pseudo_db: s
     # Read JSON Authors
     if filepath_json_authors:
         console.emit('Reading JSON file with Authors.')
-        authors_dict = read_JSON_authors(filepath_json_authors)
+        authors_dict = cached_call(session_cache, read_JSON_authors, filepath_json_authors)
     else:
         authors_dict = None
-        
+
+    # Check the MDL folder and the PseudoDataBase before reading them
+    console.emit('Checking MDLs and PseudoDataBase.')
+    errors = preflight_MDLs(filepath_mdl, all_msn_list, current_msn_list) + preflight_pseudo_db(filepath_pseudo_db)
+    if errors:
+        for error in errors: console.emit(error)
+        return console.emit('Fix these errors and run again.')
+
     # Read MDLs
     console.emit('Reading all MDLs.')
-    mdl_msn_list, follow_up_list, dsol_list, ps_list, nc_list = read_MDLs(filepath_mdl, current_msn_list)
+    mdl_msn_list, follow_up_list, dsol_list, ps_list, nc_list = checkpoint_call(checkpoints, 'Read MDLs', cached_call, session_cache, read_with_mdl_index, read_MDLs, filepath_mdl, current_msn_list)
+    n_changed = index_MDL_frames(dsol_list, ps_list, nc_list)
+    if n_changed: console.emit(f'Part Number index updated with {n_changed} MDL sheets.')
 
     # Read PseudoDataBase
     console.emit('Reading PseudoDataBase after human Cross Check.')
     # df_pseudo_db = read_pseudo_db(filepath_pseudo_db.replace('.xlsx', '_for_CC.xlsx'))
-    df_pseudo_db = read_pseudo_db(filepath_pseudo_db)
-
-    # Check that MDL names and MSNs inside JSON match
-    missing_mdl_list = [x for x in all_msn_list if x not in mdl_msn_list]
-    missing_json_list = [x for x in mdl_msn_list if x not in all_msn_list]
-    if missing_mdl_list:
-        return console.emit('The MDLs of the MSNs ' + ', '.join(missing_mdl_list) + ' are missing. Fix this error and run again.')
-    if missing_json_list:
-        return console.emit('The MSNs ' + ', '.join(missing_json_list) + ' are missing from the JSON file. Fix this error and run again.')
-
-    # Merge DataFrames
-    console.emit('Merging Initial Follow-Up')
-    df_initial = merge_dfs(follow_up_list)  
-    console.emit('Merging DSOL')
-    df_dsol = merge_dfs(dsol_list)
-    console.emit('Merging PS')
-    df_ps = merge_dfs(ps_list)
-    console.emit('Merging NC')
-    df_nc = merge_dfs(nc_list)
-
-    # Generate new lines
-    console.emit('Generating new lines and splitting Follow-Up into IPC and SRM.')
-    df_IPC, df_SRM_A321, df_SRM_A320 = gnrt_lines_and_split(df_initial, df_pseudo_db, current_A320_msn_list)
+    df_pseudo_db = checkpoint_call(checkpoints, 'Read PseudoDataBase', cached_call, session_cache, read_pseudo_db, filepath_pseudo_db)
 
-    # Adding additional columns
+    # Build the pipeline. Merges, split and added columns of independent sheets run in parallel
+    console.emit('Merging Initial Follow-Up, DSOL, PS and NC, generating new lines and splitting Follow-Up into IPC and SRM.')
     console.emit('Adding effectivity and additional columns to "IPC", "SRM", "DSOL", "PS" and "NC"')
-
-    # Add Effectivity column
-    df_IPC = add_effectivity_column(df_IPC, 'FOLLOW_UP')
-    df_SRM_A321 = add_effectivity_column(df_SRM_A321, 'FOLLOW_UP')
-    df_dsol = add_effectivity_column(df_dsol, 'DSOL')
-    df_ps = add_effectivity_column(df_ps, 'PS')
-    df_nc = add_effectivity_column(df_nc, 'NC', rev_msn_list)
-
-    # Add TASK column
-    df_IPC = add_task_column(df_IPC, rev_msn_list)
-    df_SRM_A321 = add_task_column(df_SRM_A321, rev_msn_list)
-
-    # Add extra columns
-    df_IPC = add_columns_to_Follow_Up(df_IPC)
-    df_SRM_A321 = add_columns_to_Follow_Up(df_SRM_A321, is_SRM_A321=True)
-    df_ps = add_columns_to_PS(df_ps)
-    df_nc = add_columns_to_NC(df_nc)
+    stages = [
+        Stage('Merge Initial Follow-Up', merge_dfs, follow_up_list),
+        Stage('Merge DSOL', merge_dfs, dsol_list),
+        Stage('Merge PS', merge_dfs, ps_list),
+        Stage('Merge NC', merge_dfs, nc_list),
+        Stage('Split', gnrt_lines_and_split, StageResult('Merge Initial Follow-Up'), df_pseudo_db, current_A320_msn_list, return_mismatches=True),
+        Stage('IPC', prepare_follow_up, StageResult('Split', 0), rev_msn_list),
+        Stage('SRM_A321', prepare_follow_up, StageResult('Split', 1), rev_msn_list, is_SRM_A321=True),
+        Stage('SRM_A320', prepare_follow_up, StageResult('Split', 2), rev_msn_list, is_SRM_A320=True),
+        Stage('DSOL', prepare_dsol, StageResult('Merge DSOL')),
+        Stage('PS', prepare_ps, StageResult('Merge PS')),
+        Stage('NC', prepare_nc, StageResult('Merge NC'), rev_msn_list)
+    ]
+    results, timings = run_pipeline(stages, max_workers=max_workers, console=console, checkpoints=checkpoints)
+    console.emit('Pipeline finished in {:.1f} s of work.'.format(sum(timings.values())))
+    df_dsol, df_ps, df_nc = results['DSOL'], results['PS'], results['NC']
+
+    # Report Part Numbers with a different Title in the MDLs and in the PseudoDataBase
+    for line in title_mismatch_lines(results['Split'][3]): console.emit(line)
 
     console.emit('Saving final Follow-up.')
 
     # Dict with kwargs for 'final_follow_up_to_excel'
     dict_with_follow_ups = {
-        'IPC': df_IPC,
-        'SRM_A321': df_SRM_A321
+        'IPC': results['IPC'],
+        'SRM_A321': results['SRM_A321']
     }
 
     # If there are any A320 add sheet for 'SRM_A320'
     if current_A320_msn_list:
-        df_SRM_A320 = add_effectivity_column(df_SRM_A320, 'FOLLOW_UP')
-        df_SRM_A320 = add_task_column(df_SRM_A320, rev_msn_list)
-        df_SRM_A320 = add_columns_to_Follow_Up(df_SRM_A320, is_SRM_A320=True)
-        dict_with_follow_ups['SRM_A320'] = df_SRM_A320
+        dict_with_follow_ups['SRM_A320'] = results['SRM_A320']
 
     # Save to Excel
     # excelfilepath = f'EFW Follow-up R{revision}.xlsx'
-    final_follow_up_to_excel(df_dsol, df_ps, df_nc, excelfilepath, authors_dict=authors_dict, add_QBs=add_QBs, **dict_with_follow_ups)
+    if write_excel:
+        final_follow_up_to_excel(df_dsol, df_ps, df_nc, excelfilepath, authors_dict=authors_dict, add_QBs=add_QBs, max_workers=max_workers, prerender=prerender, split_reference=split_reference, **dict_with_follow_ups)
+        save_ps_graph(excelfilepath, PSGraph(df_ps))
+        if split_reference: console.emit(f'DSOL, PS and NC saved to "{reference_filepath(excelfilepath)}".')
+
+    # Save the same sheets for the next step, so that it does not need to read the Excel
+    if sidecar:
+        console.emit('Saving sheets for the next step.')
+        sheets = {key.replace('_', ' ') + ' Follow-up': df for key, df in dict_with_follow_ups.items()}
+        save_sidecar(excelfilepath, {**sheets, 'DSOL': df_dsol, 'PS': df_ps, 'NC': df_nc}, excel_written=write_excel)
+
+    # The run is complete, the checkpoints are not needed anymore
+    if checkpoints is not None:
+        checkpoints.clear()
 
     console.emit('---> Finished.')
     if add_QBs is True:
         console.emit('> Be carefull with cell ranges if you manually add drop down lists.')
-        console.emit('> Manually set formatting of dates to DD/MM/YYYY.')
         console.emit('> Manually add any other Sheets.')
     else:
         console.emit('> Do not change anything inside the TEMPORARY Follow-up.')
         console.emit('> Just use it for the next step.')
 
 
-def fun_run_8_start(filepath_json: str, filepath_json_authors: str, filepath_old: str, filepath_new: str, excelfilepath: str, add_QBs: bool = False, console: Signal = Signal('')):
+def fun_run_8_start(filepath_json: str, filepath_json_authors: str, filepath_old: str, filepath_new: str, excelfilepath: str, add_QBs: bool = False, split_reference: bool = None, session_cache: SessionCache = None, console: Signal = Signal('')):
     """
     Call the functions for Step-3 of 'Update Follow-up'
+
+    With 'split_reference', 'DSOL', 'PS' and 'NC' are saved to a reference Excel next to the Follow-up (see "reference_workbook").
+    If None, the layout of the Old Follow-up is kept.
     """
     # Read JSON
     console.emit('Reading JSON file with MSNs.')
-    json_MSNs = read_JSON(filepath_json)
+    json_MSNs = cached_call(session_cache, read_JSON, filepath_json)
     # all_msn_list = json_MSNs['all']
     # current_msn_list = json_MSNs['new'] + json_MSNs['rev']
     rev_msn_list = json_MSNs['rev']
@@ -266,12 +373,12 @@ def fun_run_8_start(filepath_json: str, filepath_json_authors: str, filepath_old
 
     # Read JSON Authors
     console.emit('Reading JSON file with Authors.')
-    authors_dict = read_JSON_authors(filepath_json_authors)
+    authors_dict = cached_call(session_cache, read_JSON_authors, filepath_json_authors)
 
     # Read old and new Follow-up
     console.emit('Reading Old and New Follow-up.')
-    df_dict_old = get_follow_ups(filepath_old)
-    df_dict_new = get_follow_ups(filepath_new)
+    df_dict_old = cached_call(session_cache, get_follow_ups, filepath_old)
+    df_dict_new = cached_call(session_cache, get_follow_ups, filepath_new)
 
     # Check that keys match
     if df_dict_old.keys() != df_dict_new.keys():
@@ -292,89 +399,175 @@ def fun_run_8_start(filepath_json: str, filepath_json_authors: str, filepath_old
         # Find MDLs that have changed revision
         msn_list, mdl_dict_old, mdl_dict_new = get_MSNs_and_MDLs(list(df_old), list(df_new))
 
-        # Rename the MDL columns of "df_old"
-        for msn in msn_list:
-            df_old = df_old.rename(columns={mdl_dict_old[msn]: mdl_dict_new[msn]})
-
-        # For simplicity
-        mdl_dict = mdl_dict_new
-
-        # Add New Part Numbers to the "df_old"
-        df_old = add_PNs_to_df_old(df_old, df_new, mdl_dict)
-
-        # Keep only unique Part Numbers
-        df_new = reduce_df_new(df_new, mdl_dict)
-
         # #
         # # To test Phantom Deleted 
         # df_old['PART NUMBER'] = df_old['PART NUMBER'].replace('D113R1202-004-00', 'D999R9999-999-99')       # FOR TESTING
         # #
 
-        # Update MDL columns on 'df_old' based on 'df_new'
-        df_final = update_MDLs_in_df_old(df_old, df_new, mdl_dict)
-        
-        # Add Effectivity and Task column
-        df_final = add_effectivity_column(df_final, 'FOLLOW_UP', drop_empty_effectivity=False)          # Keeping empty effectivity just in case
-        df_final = add_task_column(df_final, rev_msn_list)
+        # Update MDL columns on 'df_old' based on 'df_new' and add Effectivity and Task column
+        df_final = update_follow_up(df_old, df_new, mdl_dict_old, mdl_dict_new, rev_msn_list)
 
         # Add DataFrame to Dict
         dict_with_follow_ups[k1] = df_final
 
     # Read PS, DSOL, NC from New Follow-up
     console.emit('Reading PS, DSOL, NC from New Follow-up')
-    df_dsol, df_ps, df_nc = read_PS_DSOL_NC(filepath_new)
+    df_dsol, df_ps, df_nc = cached_call(session_cache, read_PS_DSOL_NC, filepath_new)
 
     # Save to excel
     console.emit('Saving final Follow-up.')
-    final_follow_up_to_excel(df_dsol, df_ps, df_nc, excelfilepath, authors_dict=authors_dict, add_QBs=add_QBs, **dict_with_follow_ups)
+    if split_reference is None:
+        split_reference = is_split_reference(filepath_old)
+    final_follow_up_to_excel(df_dsol, df_ps, df_nc, excelfilepath, authors_dict=authors_dict, add_QBs=add_QBs, split_reference=split_reference, **dict_with_follow_ups)
+    save_ps_graph(excelfilepath, PSGraph(df_ps))
+    if split_reference: console.emit(f'DSOL, PS and NC saved to "{reference_filepath(excelfilepath)}".')
     console.emit('---> Finished.')
     console.emit('> Be carefull with cell ranges if you manually add drop down lists.')
-    console.emit('> Manually replace " 00:00:00" to "" for Date Columns')
-    console.emit('> Manually set formatting of Date Columns to DD/MM/YYYY.')
-    console.emit('> Manually convert "Time", "CC Time" and "CSN Changes" to Numbers.')
     console.emit('> Manually add any other Sheets.')
     console.emit('> Use "MSN Change" columns at the far right to manually colour the cells.')
 
 
-def fun_run_9_start(filepath_json: str, filepath_mdl_new: str, filepath_mdl_old: str, revision: str, console: Signal = Signal('')):
+def fun_run_10_start(filepath_json: str, filepath_mdl: str, filepath_pseudo_db: str, filepath_json_authors: str, filepath_old: str, excelfilepath: str, split_reference: bool = None, session_cache: SessionCache = None, console: Signal = Signal('')):
+    """
+    Call the functions for the Incremental Update of 'Update Follow-up'.
+
+    Only the MDLs that changed revision since the OLD Follow-up are read, and only their MSN columns are updated.
+    Replaces Step-2 and Step-3 of 'Update Follow-up' when new MDLs are sent midway through the revision.
+
+    With 'split_reference', 'DSOL', 'PS' and 'NC' are saved to a reference Excel next to the Follow-up (see "reference_workbook").
+    If None, the layout of the Old Follow-up is kept.
+    """
+    # Read JSON
+    console.emit('Reading JSON file with MSNs.')
+    json_MSNs = cached_call(session_cache, read_JSON, filepath_json)
+    current_msn_list = json_MSNs['new'] + json_MSNs['rev']
+    rev_msn_list = json_MSNs['rev']
+    current_A320_msn_list = [x for x in current_msn_list if x in json_MSNs['all_A320']]
+
+    # Read JSON Authors
+    console.emit('Reading JSON file with Authors.')
+    authors_dict = cached_call(session_cache, read_JSON_authors, filepath_json_authors)
+
+    # Read old Follow-up
+    console.emit('Reading Old Follow-up.')
+    df_dict_old = cached_call(session_cache, get_follow_ups, filepath_old)
+    df_dsol, df_ps, df_nc = cached_call(session_cache, read_PS_DSOL_NC, filepath_old)
+
+    # Find MDLs that have changed revision (DSOL has the MDLs of all MSNs)
+    msn_list, mdl_dict_old, mdl_dict_new, missing_msn_list = get_changed_MDLs(list(df_dsol), list_MDLs(filepath_mdl))
+    if missing_msn_list:
+        console.emit('The MSNs ' + ', '.join(missing_msn_list) + ' are not in the OLD Follow-up.')
+        return console.emit('Create the Follow-up from the start instead of an Incremental Update.')
+    if not msn_list:
+        return console.emit('No MDL has changed revision. Nothing to update.')
+    console.emit('These MSNs will be updated:')
+    for msn in msn_list:
+        console.emit(f'MSN {msn} from {mdl_dict_old[msn]} to {mdl_dict_new[msn]}')
+
+    # Check the changed MDLs before reading them
+    errors = preflight_MDLs(filepath_mdl, current_msn_list=current_msn_list, only_msn_list=msn_list) + preflight_pseudo_db(filepath_pseudo_db)
+    if errors:
+        for error in errors: console.emit(error)
+        return console.emit('Fix these errors and run again.')
+
+    # Read only the changed MDLs
+    console.emit('Reading changed MDLs.')
+    _, follow_up_list, dsol_list, ps_list, nc_list = cached_call(session_cache, read_with_mdl_index, read_MDLs, filepath_mdl, current_msn_list, only_msn_list=msn_list)
+    n_changed = index_MDL_frames(dsol_list, ps_list, nc_list)
+    if n_changed: console.emit(f'Part Number index updated with {n_changed} MDL sheets.')
+
+    # Patch DSOL, PS, NC
+    console.emit('Updating DSOL, PS and NC.')
+    df_dsol = patch_MDL_sheet(df_dsol, merge_dfs(dsol_list), mdl_dict_old, mdl_dict_new, 'DSOL')
+    df_ps = patch_MDL_sheet(df_ps, merge_dfs(ps_list), mdl_dict_old, mdl_dict_new, 'PS')
+    df_nc = patch_MDL_sheet(df_nc, merge_dfs(nc_list) if nc_list else None, mdl_dict_old, mdl_dict_new, 'NC', rev_msn_list)
+
+    # Generate new lines only for the changed MDLs
+    df_dict_new = {}
+    if follow_up_list:
+        console.emit('Reading PseudoDataBase after human Cross Check.')
+        df_pseudo_db = cached_call(session_cache, read_pseudo_db, filepath_pseudo_db)
+        console.emit('Generating new lines and splitting Follow-Up into IPC and SRM.')
+        df_IPC, df_SRM_A321, df_SRM_A320, df_mismatch = gnrt_lines_and_split(merge_dfs(follow_up_list), df_pseudo_db, current_A320_msn_list, return_mismatches=True)
+        for line in title_mismatch_lines(df_mismatch): console.emit(line)
+        df_dict_new = {'IPC': df_IPC, 'SRM_A321': df_SRM_A321, 'SRM_A320': df_SRM_A320}
+
+    # Loop for 'IPC', 'SRM A321', 'SRM A320'
+    dict_with_follow_ups = {}
+    for key, df_old in df_dict_old.items():
+        console.emit(f'Merging {key}')
+
+        # Only the MSNs of this sheet
+        mdl_dict_old_sheet = {msn: mdl for msn, mdl in mdl_dict_old.items() if mdl in list(df_old.columns)}
+        mdl_dict_new_sheet = {msn: mdl_dict_new[msn] for msn in mdl_dict_old_sheet}
+        df_new = df_dict_new.get(key)
+        if df_new is None or not mdl_dict_old_sheet:
+            df_new = pd.DataFrame(columns=['PART NUMBER'])
+            mdl_dict_old_sheet, mdl_dict_new_sheet = {}, {}
+        else:
+            df_new = add_unchanged_PNs_to_df_new(df_new, df_old.rename(columns={mdl_dict_old_sheet[msn]: mdl_dict_new_sheet[msn] for msn in mdl_dict_old_sheet}), mdl_dict_new_sheet)
+
+        dict_with_follow_ups[key] = update_follow_up(df_old, df_new, mdl_dict_old_sheet, mdl_dict_new_sheet, rev_msn_list)
+
+    # Save to excel
+    console.emit('Saving final Follow-up.')
+    if split_reference is None:
+        split_reference = is_split_reference(filepath_old)
+    final_follow_up_to_excel(df_dsol, df_ps, df_nc, excelfilepath, authors_dict=authors_dict, add_QBs=False, split_reference=split_reference, **dict_with_follow_ups)
+    save_ps_graph(excelfilepath, PSGraph(df_ps))
+    if split_reference: console.emit(f'DSOL, PS and NC saved to "{reference_filepath(excelfilepath)}".')
+    console.emit('---> Finished.')
+    console.emit('> Be carefull with cell ranges if you manually add drop down lists.')
+    console.emit('> Manually add any other Sheets.')
+    console.emit('> Use "MSN Change" columns at the far right to manually colour the cells.')
+
+
+def fun_run_9_start(filepath_json: str, filepath_mdl_new: str, filepath_mdl_old: str, revision: str, use_store: bool = True, memory_budget_mb: float = NC_MEMORY_BUDGET_MB, session_cache: SessionCache = None, console: Signal = Signal('')):
+    """
+    Call the functions for 'All-NCs'.
+
+    Only the MDLs of the new and 90-Day Revision MSNs (and the MDLs that changed) are read. The NCs of the other
+    MSNs come from the ALL_NCs store. If 'use_store' is False, all the MDLs are read and the store is rebuilt.
+    The Excel is written in blocks of rows that fit inside 'memory_budget_mb'.
+    """
     # Read old MDLs for 90-Day Revisions
     # Check that 90-Day Revisions have both old and new MDLs
 
     # Read JSON with MSNs
     console.emit('Reading JSON file with MSNs.')
-    json_MSNs = read_JSON(filepath_json)
+    json_MSNs = cached_call(session_cache, read_JSON, filepath_json)
     new_msn_list = json_MSNs['new']
     rev_msn_list = json_MSNs['rev']
 
-    # Read Latest MDLs for all MSNs
-    console.emit('Reading the latest MDLs for all MSNs.')
-    mdl_msn_list_new, nc_dict_new = read_MDLs_for_NCs(filepath_mdl_new)
+    # Read Latest MDLs only for the MSNs that are not inside the ALL_NCs store
+    nc_store = load_nc_store() if use_store else {}
+    mdl_dict_new = list_MDLs(filepath_mdl_new)
+    read_msn_list = stale_MSNs(nc_store, mdl_dict_new, new_msn_list + rev_msn_list)
+    console.emit(f'Reading the latest MDLs for {len(read_msn_list)} of {len(mdl_dict_new)} MSNs (the rest are inside the ALL_NCs store).')
+    mdl_msn_list_new, nc_dict_new = cached_call(session_cache, read_with_mdl_index, read_MDLs_for_NCs, filepath_mdl_new, read_msn_list)
+    n_changed = index_MDL_frames(nc_list=list(nc_dict_new.values()))
+    if n_changed: console.emit(f'Part Number index updated with {n_changed} MDL sheets.')
 
     # Read OLD MDLs for 90-Day Revision MSNs
     console.emit('Reading MDLs that where incorporated last time for the 90-Day Revision MSNs.')
-    mdl_msn_list_old, nc_dict_old = read_MDLs_for_NCs(filepath_mdl_old)
+    mdl_msn_list_old, nc_dict_old = cached_call(session_cache, read_with_mdl_index, read_MDLs_for_NCs, filepath_mdl_old, rev_msn_list)
     console.emit('Finding Phantom-New (PN) and Phantom-Deleted (PD).')
-    nc_dict_new = update_90_day_rev(nc_dict_new, nc_dict_old, rev_msn_list)
+    nc_dict_new = update_90_day_rev(nc_dict_new, nc_dict_old, rev_msn_list, load_mdl_index())
+
+    # Update the ALL_NCs store and get the NCs of all MSNs from it
+    nc_dict_new = update_nc_store(nc_store, nc_dict_new, mdl_dict_new, rev_msn_list)
+    save_nc_store(nc_store)
 
     # Merge DataFrames
     console.emit('Merging NCs from all MDLs.')
     nc_list = list(nc_dict_new.values())
     df_nc = merge_dfs(nc_list)
 
-    # Get lists
-    mdl_list = [x for x in list(df_nc.columns) if re.findall(r'^\d{4}_', x)]
-    current_mdl_list = [x for x in list(df_nc.columns) if (x[:4] in new_msn_list) or (x[:4] in rev_msn_list)]
-    old_mdl_list = list(set(mdl_list) - set(current_mdl_list))
-
-    # Replace Letters with MSNs and letters. i.e. 'N' -> '1207 (N)'
-    console.emit('Replacing letters with MSNs and letters. i.e. "N" -> "1207 (N)"')
-    df_nc = replace_letters_with_MSNs(df_nc, mdl_list)
-
-    # Get only Current NCs
-    df_nc_RXX = df_nc.drop(old_mdl_list, axis=1)
-    df_nc_RXX = df_nc_RXX.replace('', np.nan).dropna(subset=current_mdl_list, how='all')
-
-    # Save to excel
-    console.emit('Saving ALL_NCs')
-    all_NCs_to_excel(df_nc, df_nc_RXX, new_msn_list, rev_msn_list, revision)
+    # Replace letters with MSNs and letters (i.e. 'N' -> '1207 (N)'), get only Current NCs and save to excel, in blocks of rows
+    console.emit(f'Saving ALL_NCs (memory budget {memory_budget_mb:g} MB).')
+    peak_mb, n_block = build_all_NCs(df_nc, new_msn_list, rev_msn_list, revision, memory_budget_mb=memory_budget_mb)
+    if peak_mb is not None:
+        console.emit(f'Memory used while saving: {peak_mb:.0f} MB of the {memory_budget_mb:g} MB budget (blocks of {n_block} rows).')
+        if peak_mb > memory_budget_mb:
+            console.emit('The memory budget was exceeded, even after making the blocks smaller.')
     console.emit('---> Finished.')
\ No newline at end of file
@@ -0,0 +1,229 @@
+##########################################################################################
+# Filename:     job_manager.py
+# For:          Follow_Up_Creation_Tool
+# Author:       Spyros Acheimastos (acheimastos@althom.eu)
+# Date:         19/10/2026
+##########################################################################################
+
+#   Queue for the runs started from the GUI.
+#   Every run becomes a Job with its own status and log. Heavy Jobs (reading MDLs, writing Follow-ups)
+#   are limited to 'max_heavy_jobs' at the same time, and a new heavy Job waits in the queue
+#   while the free memory of the PC is less than 'min_free_memory_mb'.
+
+import os
+import sys
+import time
+import ctypes
+
+from PySide2.QtCore import QObject
+from PySide2.QtCore import QTimer
+from PySide2.QtCore import Signal
+from PySide2.QtCore import QThreadPool
+
+from bin.multi import Worker
+
+
+JOB_MAX_HEAVY_JOBS = 1
+JOB_MIN_FREE_MEMORY_MB = 2048
+JOB_ADMISSION_INTERVAL_MS = 2000
+
+QUEUED = 'Queued'
+RUNNING = 'Running'
+FINISHED = 'Finished'
+FAILED = 'Failed'
+CANCELLED = 'Cancelled'
+
+
+def available_memory_mb():
+    """
+    Free (available) physical memory of the PC in MB, or None if it cannot be found.
+    Uses psutil if installed, else the Windows API or '/proc/meminfo'.
+    """
+    try:
+        import psutil
+        return psutil.virtual_memory().available / 1024 / 1024
+    except ImportError:
+        pass
+
+    if sys.platform == 'win32':
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [
+                ('dwLength', ctypes.c_ulong),
+                ('dwMemoryLoad', ctypes.c_ulong),
+                ('ullTotalPhys', ctypes.c_ulonglong),
+                ('ullAvailPhys', ctypes.c_ulonglong),
+                ('ullTotalPageFile', ctypes.c_ulonglong),
+                ('ullAvailPageFile', ctypes.c_ulonglong),
+                ('ullTotalVirtual', ctypes.c_ulonglong),
+                ('ullAvailVirtual', ctypes.c_ulonglong),
+                ('ullAvailExtendedVirtual', ctypes.c_ulonglong),
+            ]
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullAvailPhys / 1024 / 1024
+        return None
+
+    if os.path.isfile('/proc/meminfo'):
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) / 1024
+    return None
+
+
+class Job:
+    """
+    One run of the GUI.
+
+    Args:
+    ----------
+        job_id:
+            Number of the Job (1, 2, ...)
+        name:
+            Name shown in the Jobs table (i.e. 'Create Step 3')
+        worker:
+            Worker that will execute the function
+        heavy:
+            True if the Job reads MDLs or writes Follow-ups and must be limited
+    """
+    def __init__(self, job_id: int, name: str, worker: Worker, heavy: bool = True):
+        self.id = job_id
+        self.name = name
+        self.worker = worker
+        self.heavy = heavy
+        self.status = QUEUED
+        self.log = []
+        self.submit_time = time.time()
+        self.start_time = None
+        self.end_time = None
+
+    def elapsed(self):
+        """Running time in seconds (None if it has not started)."""
+        if self.start_time is None:
+            return None
+        return (self.end_time or time.time()) - self.start_time
+
+
+class JobManager(QObject):
+    """
+    Starts the Jobs of the GUI from a queue, respecting the concurrency and memory limits.
+
+    Args:
+    ----------
+        threadpool:
+            QThreadPool that executes the Workers (Default: a new QThreadPool)
+        max_heavy_jobs:
+            Maximum number of heavy Jobs running at the same time. (Default=JOB_MAX_HEAVY_JOBS)
+        min_free_memory_mb:
+            A heavy Job is started only if the free memory is at least this much.
+            Ignored when no other heavy Job is running, so the queue never blocks forever. (Default=JOB_MIN_FREE_MEMORY_MB)
+    """
+    changed = Signal()              # Status of any Job changed
+    console = Signal(int, str)      # (job_id, message)
+
+    def __init__(self, threadpool: QThreadPool = None, max_heavy_jobs: int = JOB_MAX_HEAVY_JOBS, min_free_memory_mb: int = JOB_MIN_FREE_MEMORY_MB):
+        super().__init__()
+        self.threadpool = threadpool or QThreadPool()
+        # The admission is done here, so the threadpool must not make the light Jobs wait too
+        self.threadpool.setMaxThreadCount(max(self.threadpool.maxThreadCount(), max_heavy_jobs + 2))
+        self.max_heavy_jobs = max_heavy_jobs
+        self.min_free_memory_mb = min_free_memory_mb
+        self.jobs = {}
+        self._next_id = 1
+
+        # Retry the admission of queued Jobs while they wait for memory
+        self._timer = QTimer(self)
+        self._timer.setInterval(JOB_ADMISSION_INTERVAL_MS)
+        self._timer.timeout.connect(self.start_queued_jobs)
+
+    def submit(self, name: str, fn, *args, heavy: bool = True, on_result=None, **kwargs):
+        """
+        Add a Job to the queue and start it if the limits allow. Returns the Job.
+        'args' and 'kwargs' are passed to the Worker (i.e. console=True).
+        'on_result' is called with the return value of 'fn' (i.e. "MainWindow.save_result").
+        """
+        worker = Worker(fn, *args, **kwargs)
+        job = Job(self._next_id, name, worker, heavy=heavy)
+        self._next_id += 1
+        self.jobs[job.id] = job
+
+        if on_result is not None:
+            worker.signals.result.connect(on_result)
+        worker.signals.console.connect(lambda text, job=job: self._log(job, text))
+        worker.signals.error.connect(lambda error, job=job: self._on_error(job, error))
+        worker.signals.finished.connect(lambda job=job: self._on_finished(job))
+
+        self.changed.emit()
+        self.start_queued_jobs()
+        return job
+
+    def cancel(self, job_id: int):
+        """Cancel a queued Job. Running Jobs cannot be stopped. Returns True if cancelled."""
+        job = self.jobs.get(job_id)
+        if job is None or job.status != QUEUED:
+            return False
+        job.status = CANCELLED
+        job.end_time = time.time()
+        self._log(job, 'Cancelled before starting.')
+        self.changed.emit()
+        return True
+
+    def running_jobs(self, heavy: bool = None):
+        return [job for job in self.jobs.values() if job.status == RUNNING and (heavy is None or job.heavy == heavy)]
+
+    def queued_jobs(self):
+        return [job for job in self.jobs.values() if job.status == QUEUED]
+
+    def can_start(self, job: Job):
+        """
+        Admission rule. Returns (True, '') or (False, reason).
+        """
+        if not job.heavy:
+            return True, ''
+        running_heavy = len(self.running_jobs(heavy=True))
+        if running_heavy == 0:
+            return True, ''
+        if running_heavy >= self.max_heavy_jobs:
+            return False, f'Waiting: {running_heavy} heavy Job(s) already running (max {self.max_heavy_jobs}).'
+        free_mb = available_memory_mb()
+        if free_mb is not None and free_mb < self.min_free_memory_mb:
+            return False, f'Waiting for free memory (at least {self.min_free_memory_mb} MB needed).'
+        return True, ''
+
+    def start_queued_jobs(self):
+        """Start the queued Jobs in submission order, as long as the admission rule allows."""
+        for job in self.queued_jobs():
+            ok, reason = self.can_start(job)
+            if not ok:
+                # Keep the order: a heavy Job is not overtaken by a later heavy Job
+                if reason and (not job.log or job.log[-1] != reason):
+                    self._log(job, reason)
+                if job.heavy:
+                    break
+                continue
+            job.status = RUNNING
+            job.start_time = time.time()
+            self.threadpool.start(job.worker)
+            self.changed.emit()
+
+        if self.queued_jobs():
+            self._timer.start()
+        else:
+            self._timer.stop()
+
+    def _log(self, job: Job, text: str):
+        job.log.append(text)
+        self.console.emit(job.id, text)
+
+    def _on_error(self, job: Job, error: tuple):
+        job.status = FAILED
+        self._log(job, f'ERROR: {error[1]}\n{error[2]}')
+
+    def _on_finished(self, job: Job):
+        if job.status == RUNNING:
+            job.status = FINISHED
+        job.end_time = time.time()
+        self._log(job, f'{job.status} in {job.elapsed():.0f} s.')
+        self.changed.emit()
+        self.start_queued_jobs()
@@ -0,0 +1,101 @@
+##########################################################################################
+# Filename:     long_form.py
+# For:          Follow_Up_Creation_Tool
+# Author:       Spyros Acheimastos (acheimastos@althom.eu)
+# Date:         19/10/2026
+##########################################################################################
+
+#   Sparse long-form model of the MSN x Part matrix of DSOL/PS/NC.
+#   Instead of one column per MDL (mostly empty), every non-empty cell is a line (ROW, MDL, SYMBOL)
+#   with integer/categorical codes. The titles of every ROW are stored once.
+#   Memory and merge cost scale with the non-empty cells. The wide layout is built only once, by "to_wide".
+
+import regex as re
+import numpy as np
+import pandas as pd
+
+
+def title_columns(df: pd.DataFrame):
+    """Columns of a DataFrame that are not MDL columns (i.e. 'PART NUMBER', 'PART TITLE')."""
+    return [x for x in list(df.columns) if not re.findall(r'^\d{4}_', x)]
+
+
+def to_long(list_of_dfs: list, title_list: list):
+    """
+    Convert a list of wide DataFrames (one or more MDL columns each) to the long-form model.
+
+    Args:
+    ----------
+        list_of_dfs:
+            List of DataFrames with the columns in 'title_list' and MDL columns (i.e. the DataFrames of "read_MDLs").
+
+        title_list:
+            The title columns that identify a line.
+
+    Returns:
+    ----------
+        df_titles:
+            DataFrame with the unique titles. Its position is the ROW code.
+
+        df_long:
+            DataFrame with columns 'ROW' (int), 'MDL' (categorical) and 'SYMBOL' (categorical).
+            Lines with a NaN 'SYMBOL' are kept, because the title of the line exists in that MDL.
+
+        mdl_list:
+            The MDL columns in the order they were found.
+    """
+    mdl_list = []
+    row_offsets = []
+    mdls = []
+    symbols = []
+    n_lines = 0
+    for df in list_of_dfs:
+        for mdl in [x for x in list(df.columns) if x not in title_list]:
+            if mdl not in mdl_list: mdl_list.append(mdl)
+            row_offsets.append(np.arange(n_lines, n_lines + len(df)))
+            mdls.append(np.full(len(df), mdl_list.index(mdl), dtype=np.int32))
+            symbols.append(df[mdl].to_numpy(dtype=object))
+        n_lines += len(df)
+
+    # Unique titles (NaN is a value too, as in "pd.merge"). Each column is hashed on its own and
+    # the codes are combined, so only one title column of all the MDLs is in memory at a time
+    def title_column(title):
+        return pd.concat([df[title] for df in list_of_dfs], ignore_index=True)
+
+    lines = np.zeros(n_lines, dtype=np.int64)
+    for title in title_list:
+        codes, uniques = pd.factorize(title_column(title), use_na_sentinel=False)
+        lines, _ = pd.factorize(lines * (len(uniques) + 1) + codes)
+    _, first_idx = np.unique(lines, return_index=True)
+    df_titles = pd.DataFrame({title: title_column(title).to_numpy()[first_idx] for title in title_list})
+
+    df_long = pd.DataFrame({
+        'ROW': lines[np.concatenate(row_offsets)].astype(np.int32) if row_offsets else np.array([], dtype=np.int32),
+        'MDL': pd.Categorical.from_codes(np.concatenate(mdls) if mdls else np.array([], dtype=np.int32), categories=mdl_list),
+        'SYMBOL': pd.Categorical(np.concatenate(symbols) if symbols else np.array([], dtype=object)),
+    })
+
+    return df_titles, df_long, mdl_list
+
+
+def to_wide(df_titles: pd.DataFrame, df_long: pd.DataFrame, mdl_list: list, fill_value=np.nan):
+    """
+    Build the wide layout (one column per MDL) from the long-form model. Empty cells get the 'fill_value'.
+    Every (ROW, MDL) should appear at most once in 'df_long'.
+    """
+    symbols = df_long['SYMBOL'].astype(object).to_numpy()
+    symbols[pd.isna(symbols)] = fill_value
+
+    # A single block for the titles and all MDL columns
+    n_titles = len(df_titles.columns)
+    wide = np.full((len(df_titles), n_titles + len(mdl_list)), fill_value, dtype=object)
+    wide[:, :n_titles] = df_titles.to_numpy(dtype=object)
+    wide[df_long['ROW'].to_numpy(), n_titles + df_long['MDL'].cat.codes.to_numpy()] = symbols
+
+    return pd.DataFrame(wide, columns=list(df_titles.columns) + mdl_list)
+
+
+def multi_symbol_rows(df_long: pd.DataFrame):
+    """Codes of the ROWs that have more than one line for the same MDL (i.e. 'N' and 'D' for the same title)."""
+    is_duplicate = df_long.duplicated(subset=['ROW', 'MDL'], keep=False).to_numpy()
+    return np.unique(df_long['ROW'].to_numpy()[is_duplicate])
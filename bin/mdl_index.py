@@ -0,0 +1,395 @@
+##########################################################################################
+# Filename:     mdl_index.py
+# For:          Follow_Up_Creation_Tool
+# Author:       Spyros Acheimastos (acheimastos@althom.eu)
+# Date:         19/10/2026
+##########################################################################################
+
+#   Persistent index of the MDLs that have been read by the tool.
+#   For every MDL (key=MDL column, i.e. "1293_MDL-00228-E") it keeps the rows of sheets
+#   'Applicable Part List', 'Product Structure' and 'Nonconformities' with a fingerprint for each row.
+#   An MDL is read again from Excel only when its file content changes.
+#   The index is kept in one file per MSN (i.e. "_MDL_Index/1293.pkl") with the latest MDL_INDEX_REVISIONS revisions
+#   of the MSN, so that reading an MDL loads and saves only the file of its MSN.
+#   Each file is about 1 MB (about 40 MB for all the MSNs). Lower MDL_INDEX_REVISIONS to keep less.
+#   The folder can be deleted at any time (i.e. to free disk space). The MDLs are then read again from Excel on the next run.
+#
+#   Usage from the command line:
+#       python -m bin.mdl_index <MDL folder> --msn 1293 --since E [--to H] [--sheet APL]
+
+import io
+import os
+import sys
+import pickle
+import hashlib
+import argparse
+import warnings
+import pandas as pd
+from bin.prefetch import prefetch_files
+
+
+SCRIPT_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+MDL_INDEX_DIRECTORY = os.path.join(os.path.dirname(SCRIPT_DIRECTORY), '_MDL_Index')
+MDL_INDEX_REVISIONS = 5                             # Revisions of each MSN kept inside the index
+
+# Columns kept from each sheet of the MDL. 'DIFF' is always the last one
+MDL_SHEETS = {
+    'APL': {'name': 'Applicable Part List', 'columns': ['PART NUMBER', 'PART TITLE', 'QTY', 'PART TYPE', 'PART ISSUE']},
+    'PS':  {'name': 'Product Structure', 'columns': ['PARENT NUMBER', 'LEVEL', 'CHILD NUMBER', 'CHILD TITLE']},
+    'NC':  {'name': 'Nonconformities', 'columns': ['NUMBER', 'ISSUE', 'NC NUMBER', 'NC ISSUE', 'NC TITLE']},
+}
+
+
+def split_mdl_column(mdl_column: str):
+    """
+    Split an MDL column to MSN, document number and revision. i.e. "1293_MDL-00228-E" -> ('1293', 'MDL-00228', 'E')
+    """
+    msn, mdl = mdl_column.split('_', 1)
+    document, revision = mdl.rsplit('-', 1)
+
+    return msn, document, revision
+
+
+def file_sha1(filepath: str):
+    """Fingerprint of the content of a file. Copying or touching an MDL does not change it."""
+    sha1 = hashlib.sha1()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha1.update(chunk)
+
+    return sha1.hexdigest()
+
+
+def load_mdl_index(directory: str = MDL_INDEX_DIRECTORY):
+    """
+    An empty MDL index on 'directory'. The MDLs of an MSN are loaded from disk when the MSN is first used (see "load_msn").
+    """
+    return {'_directory': directory, '_loaded': set(), '_modified': set()}
+
+
+def msn_filepath(directory: str, msn: str):
+    """Filepath of the MDL index of an MSN. i.e. "_MDL_Index/1293.pkl" """
+    return os.path.join(directory, f'{msn}.pkl')
+
+
+def load_msn(mdl_index: dict, msn: str):
+    """Load the MDLs of an MSN from disk into the MDL index, if not loaded yet. A file that cannot be read is started again."""
+    if msn in mdl_index['_loaded']:
+        return
+    mdl_index['_loaded'].add(msn)
+    filepath = msn_filepath(mdl_index['_directory'], msn)
+    if not os.path.isfile(filepath):
+        return
+    try:
+        with open(filepath, 'rb') as f:
+            mdl_index.update(pickle.load(f))
+    except Exception:
+        print(f'MDL index "{filepath}" could not be read. Starting a new one.')
+
+
+def save_mdl_index(mdl_index: dict):
+    """
+    Save the MSNs of the MDL index that were changed. Only the latest MDL_INDEX_REVISIONS revisions of each MSN are kept.
+    """
+    if not mdl_index['_modified']:
+        return
+    os.makedirs(mdl_index['_directory'], exist_ok=True)
+    for msn in sorted(mdl_index['_modified']):
+        mdl_list = mdl_revisions(mdl_index, msn)
+        for mdl_column in mdl_list[:-MDL_INDEX_REVISIONS]:
+            del mdl_index[mdl_column]
+        filepath = msn_filepath(mdl_index['_directory'], msn)
+        tmp_filepath = filepath + '.tmp'
+        with open(tmp_filepath, 'wb') as f:
+            pickle.dump({x: mdl_index[x] for x in mdl_list[-MDL_INDEX_REVISIONS:]}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_filepath, filepath)
+    mdl_index['_modified'].clear()
+
+
+def strip_columns(df: pd.DataFrame):
+    """Strip leading and trailing whitespaces of all text columns."""
+    return df.apply(lambda column: column.str.strip() if column.dtype == object else column)
+
+
+def add_fingerprints(df: pd.DataFrame):
+    """
+    Add columns 'KEY HASH' (fingerprint of the title columns) and 'ROW HASH' (title columns and 'DIFF')
+    to the rows of an MDL sheet. Leading and trailing whitespaces are ignored.
+    """
+    df_stripped = strip_columns(df)
+    df = df.copy()
+    df['KEY HASH'] = pd.util.hash_pandas_object(df_stripped.iloc[:, :-1], index=False).values
+    df['ROW HASH'] = pd.util.hash_pandas_object(df_stripped, index=False).values
+
+    return df
+
+
+def read_MDL_sheet(filepath: str, sheet: str, mdl_index: dict = None, data: bytes = None):
+    """
+    Read a sheet of an MDL, keeping only the columns of "MDL_SHEETS". Values are returned as they are in the Excel.
+
+    Args:
+    ----------
+        filepath:
+            Filepath to the MDL.
+
+        sheet:
+            'APL', 'PS' or 'NC'
+
+        mdl_index:
+            Optional MDL index (from "load_mdl_index"). If the MDL is already inside, the Excel is not read.
+            Otherwise, the sheet is added to the index.
+
+        data:
+            Optional content of the file (i.e. from "prefetch_files"). If given, the file is not opened again.
+
+    Returns:
+    ----------
+        df:
+            DataFrame with the title columns and 'DIFF'.
+    """
+    columns = MDL_SHEETS[sheet]['columns'] + ['DIFF']
+    entry = None
+    if mdl_index is not None:
+        from bin.setup_follow_up import get_mdl_column
+        mdl_column = get_mdl_column(os.path.basename(filepath))
+        msn, document, revision = split_mdl_column(mdl_column)
+        load_msn(mdl_index, msn)
+        sha1 = hashlib.sha1(data).hexdigest() if data is not None else file_sha1(filepath)
+        entry = mdl_index.get(mdl_column)
+        if entry is None or entry['sha1'] != sha1:
+            entry = {'msn': msn, 'document': document, 'revision': revision, 'sha1': sha1, 'sheets': {}}
+            mdl_index[mdl_column] = entry
+        if sheet in entry['sheets']:
+            return entry['sheets'][sheet][columns].copy()
+
+    # To ignore "UserWarning: Data Validation" and "UserWarning: Conditional Formatting"
+    with warnings.catch_warnings():
+        warnings.simplefilter(action='ignore', category=UserWarning)
+        df = pd.read_excel(io.BytesIO(data) if data is not None else filepath, dtype=str, sheet_name=MDL_SHEETS[sheet]['name'])
+    df = df[columns].reset_index(drop=True)
+
+    if entry is not None:
+        entry['sheets'][sheet] = add_fingerprints(df)
+        mdl_index['_modified'].add(entry['msn'])
+
+    return df
+
+
+def update_mdl_index(mdl_index: dict, rootdir: str, sheet_list: list = None):
+    """
+    Add all the MDLs of 'rootdir' to the MDL index. MDLs that are already inside with the same content are not read.
+
+    Args:
+    ----------
+        mdl_index:
+            The MDL index (from "load_mdl_index").
+
+        rootdir:
+            The path to the folder containing the MDLs in '.xlsx' format.
+
+        sheet_list:
+            Sheets to add. (Default=['APL', 'PS', 'NC'])
+
+    Returns:
+    ----------
+        mdl_index:
+            The updated MDL index.
+    """
+    from bin.setup_follow_up import list_MDLs
+    filepaths = [filepath for filepath, _ in list_MDLs(rootdir).values()]
+    for filepath, data in prefetch_files(filepaths):
+        for sheet in sheet_list or list(MDL_SHEETS):
+            read_MDL_sheet(filepath, sheet, mdl_index, data)
+
+    return mdl_index
+
+
+def read_with_mdl_index(reader, *args, **kwargs):
+    """
+    Call one of the MDL readers (i.e. 'read_MDLs') with the MDL index from disk, and save the index afterwards.
+    """
+    mdl_index = load_mdl_index()
+    result = reader(*args, mdl_index=mdl_index, **kwargs)
+    save_mdl_index(mdl_index)
+
+    return result
+
+
+def mdl_revisions(mdl_index: dict, msn: str):
+    """Return the MDL columns of an MSN that are inside the MDL index, sorted by revision."""
+    load_msn(mdl_index, msn)
+    mdl_list = [x for x in mdl_index if not x.startswith('_') and split_mdl_column(x)[0] == msn]
+
+    return sorted(mdl_list, key=lambda x: (len(split_mdl_column(x)[2]), split_mdl_column(x)[2]))
+
+
+def diff_mdl_sheets(df_old: pd.DataFrame, df_new: pd.DataFrame, sheet: str):
+    """
+    Find the rows of a sheet that changed between two revisions of an MDL, using the fingerprints of the MDL index.
+
+    Args:
+    ----------
+        df_old:
+            Sheet of the OLD MDL, as stored inside the MDL index.
+
+        df_new:
+            Sheet of the NEW MDL, as stored inside the MDL index.
+
+        sheet:
+            'APL', 'PS' or 'NC'
+
+    Returns:
+    ----------
+        df_diff:
+            DataFrame with the title columns, 'OLD', 'NEW' (the 'DIFF' of each revision) and 'CHANGE'.
+            'CHANGE' is 'Added' (only in NEW), 'Removed' (only in OLD) or 'Changed' (different 'DIFF').
+    """
+    title_list = MDL_SHEETS[sheet]['columns']
+
+    # Rows that are exactly the same are dropped before anything else
+    is_same_old = df_old['ROW HASH'].isin(df_new['ROW HASH'])
+    is_same_new = df_new['ROW HASH'].isin(df_old['ROW HASH'])
+    df_old = df_old.loc[~is_same_old].drop_duplicates(subset='ROW HASH')
+    df_new = df_new.loc[~is_same_new].drop_duplicates(subset='ROW HASH')
+
+    df_old = df_old[title_list + ['DIFF', 'KEY HASH']].rename(columns={'DIFF': 'OLD'})
+    df_new = df_new[title_list + ['DIFF', 'KEY HASH']].rename(columns={'DIFF': 'NEW'})
+    df_diff = pd.merge(df_old, df_new, on='KEY HASH', how='outer', suffixes=('', ' (NEW)'), indicator=True)
+
+    # Title columns of the Added rows come from 'df_new'
+    is_added = df_diff['_merge'] == 'right_only'
+    for column in title_list:
+        df_diff[column] = df_diff[column].where(~is_added, df_diff[f'{column} (NEW)'])
+
+    df_diff['CHANGE'] = df_diff['_merge'].map({'both': 'Changed', 'left_only': 'Removed', 'right_only': 'Added'}).astype(str)
+    df_diff = strip_columns(df_diff[title_list + ['OLD', 'NEW', 'CHANGE']])
+
+    return df_diff.sort_values(by=title_list).reset_index(drop=True)
+
+
+def unchanged_rows(mdl_index: dict, mdl_old: str, mdl_new: str, sheet: str):
+    """
+    Find the rows of a sheet that are the same in two revisions of an MDL, using the fingerprints of the MDL index.
+    A row is the same if all the rows with its title columns ('KEY HASH') are inside both revisions.
+
+    Args:
+    ----------
+        mdl_index:
+            The MDL index (from "load_mdl_index").
+
+        mdl_old:
+            The OLD MDL column. i.e. '1293_MDL-00228-E'
+
+        mdl_new:
+            The NEW MDL column. i.e. '1293_MDL-00228-H'
+
+        sheet:
+            'APL', 'PS' or 'NC'
+
+    Returns:
+    ----------
+        rows:
+            Tuple (is_same_old, is_same_new) of boolean arrays, in the order of the rows of each revision.
+            None if one of the revisions is not inside the MDL index.
+    """
+    for mdl in [mdl_old, mdl_new]:
+        load_msn(mdl_index, split_mdl_column(mdl)[0])
+        if mdl not in mdl_index or sheet not in mdl_index[mdl]['sheets']:
+            return None
+    df_old = mdl_index[mdl_old]['sheets'][sheet]
+    df_new = mdl_index[mdl_new]['sheets'][sheet]
+
+    changed_keys = pd.concat([
+        df_old.loc[~df_old['ROW HASH'].isin(df_new['ROW HASH']), 'KEY HASH'],
+        df_new.loc[~df_new['ROW HASH'].isin(df_old['ROW HASH']), 'KEY HASH'],
+    ])
+
+    return ~df_old['KEY HASH'].isin(changed_keys).to_numpy(), ~df_new['KEY HASH'].isin(changed_keys).to_numpy()
+
+
+def mdl_changes(mdl_index: dict, msn: str, since: str, to: str = None, sheet: str = 'APL'):
+    """
+    Answer "what changed in MSN X since revision Y", using only the MDL index.
+
+    Args:
+    ----------
+        mdl_index:
+            The MDL index (from "load_mdl_index").
+
+        msn:
+            The MSN. i.e. '1293'
+
+        since:
+            The OLD revision (i.e. 'E') or MDL column (i.e. '1293_MDL-00228-E').
+
+        to:
+            The NEW revision or MDL column. (Default=None for the latest revision inside the index)
+
+        sheet:
+            'APL', 'PS' or 'NC'
+
+    Returns:
+    ----------
+        df_diff:
+            The DataFrame from "diff_mdl_sheets".
+    """
+    mdl_list = mdl_revisions(mdl_index, msn)
+    if not mdl_list:
+        raise Exception(f'MSN {msn} is not inside the MDL index.')
+
+    def find(revision):
+        found = [x for x in mdl_list if x == revision or split_mdl_column(x)[2] == revision]
+        if not found:
+            raise Exception(f'Revision "{revision}" of MSN {msn} is not inside the MDL index. Available: ' + ', '.join(mdl_list))
+        return found[-1]
+
+    mdl_old = find(since)
+    mdl_new = find(to) if to else mdl_list[-1]
+    for mdl in [mdl_old, mdl_new]:
+        if sheet not in mdl_index[mdl]['sheets']:
+            raise Exception(f'Sheet "{MDL_SHEETS[sheet]["name"]}" of {mdl} is not inside the MDL index.')
+
+    return diff_mdl_sheets(mdl_index[mdl_old]['sheets'][sheet], mdl_index[mdl_new]['sheets'][sheet], sheet)
+
+
+def summarize_mdl_changes(mdl_index: dict, mdl_column: str, sheet: str = 'APL'):
+    """
+    Short text with the changes of an MDL since the previous revision of the same MSN inside the MDL index.
+    Returns None if there is no previous revision.
+    """
+    msn = split_mdl_column(mdl_column)[0]
+    mdl_list = mdl_revisions(mdl_index, msn)
+    if mdl_column not in mdl_list or mdl_list.index(mdl_column) == 0:
+        return None
+    mdl_old = mdl_list[mdl_list.index(mdl_column) - 1]
+    if sheet not in mdl_index[mdl_old]['sheets'] or sheet not in mdl_index[mdl_column]['sheets']:
+        return None
+
+    df_diff = diff_mdl_sheets(mdl_index[mdl_old]['sheets'][sheet], mdl_index[mdl_column]['sheets'][sheet], sheet)
+    counts = df_diff['CHANGE'].value_counts()
+    changes = ', '.join(f'{counts.get(x, 0)} {x}' for x in ['Added', 'Removed', 'Changed'])
+
+    return f'MSN {msn} from {mdl_old} to {mdl_column}: {changes}'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='What changed in the MDL of an MSN since a revision.')
+    parser.add_argument('rootdir', nargs='?', help='Folder with MDLs to add to the index first.')
+    parser.add_argument('--msn', required=True)
+    parser.add_argument('--since', required=True, help='OLD revision, i.e. E')
+    parser.add_argument('--to', help='NEW revision. (Default=latest)')
+    parser.add_argument('--sheet', default='APL', choices=list(MDL_SHEETS))
+    parser.add_argument('--index', default=MDL_INDEX_DIRECTORY, help='Folder of the MDL index.')
+    args = parser.parse_args()
+
+    mdl_index = load_mdl_index(args.index)
+    if args.rootdir:
+        update_mdl_index(mdl_index, args.rootdir)
+        save_mdl_index(mdl_index)
+
+    df_diff = mdl_changes(mdl_index, args.msn, args.since, args.to, args.sheet)
+    pd.set_option('display.width', 200)
+    pd.set_option('display.max_rows', None)
+    print(df_diff.to_string() if not df_diff.empty else 'No changes.')
+    sys.exit()
@@ -0,0 +1,292 @@
+##########################################################################################
+# Filename:     nc_builder.py
+# For:          Follow_Up_Creation_Tool
+# Author:       Spyros Acheimastos (acheimastos@althom.eu)
+# Date:         19/10/2026
+##########################################################################################
+
+#   Builder of 'ALL_NCs_RXX.xlsx' with bounded memory.
+#   "all_NCs_to_excel" keeps every cell of both sheets inside the xlsxwriter workbook until it is saved,
+#   so memory grows with rows x all the MSNs of the fleet. Here the workbook is written in 'constant_memory'
+#   mode: the rows are streamed to the writer in blocks, and only one block is converted at a time.
+#   The size of the blocks comes from the memory budget. The letters of the MSN columns (i.e. 'N' -> '1207 (N)')
+#   and the rows of 'RXX_NCs' are done block by block, so the DataFrame of "merge_dfs" is never copied.
+#   The memory of the builder (above the memory of the process when it starts) is sampled after every block, or traced
+#   exactly with "tracemalloc". When a block makes it grow above the budget, the next blocks have half the rows.
+#   The blocks are whole rows and not groups of MSN columns, because 'constant_memory' writes every row only once, in order.
+#
+#   Compare with "all_NCs_to_excel" (time, peak memory and content):
+#       python -m bin.nc_builder ALL_NCs_R11.xlsx --json _JSON/INPUT_MSNs.json --budget 16
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+import regex as re
+import numpy as np
+import pandas as pd
+
+from bin.effectivity import effectivity_bits, any_bits
+from bin.save_to_excel import add_formats_to_workbook, format_sheet_ALL_NCs
+from bin.bulk_excel import write_block
+
+
+NC_MEMORY_BUDGET_MB = 64        # Memory budget of the builder
+CELL_BYTES = 64                 # Estimated memory of one cell of a block while it is written
+MIN_BLOCK_ROWS = 100            # The blocks are not made smaller than this when the budget is exceeded
+SYMBOL_LETTERS = ['N', '-', 'R', 'D', 'PD', 'PN']
+
+
+def block_rows(n_columns: int, memory_budget_mb: float = NC_MEMORY_BUDGET_MB):
+    """Number of rows of a block, so that a block of 'n_columns' fits inside the memory budget."""
+    return max(1, int(memory_budget_mb * 1024 * 1024 // (CELL_BYTES * max(1, n_columns))))
+
+
+def process_memory():
+    """Memory of the process in bytes (resident set / working set), or None if it cannot be read."""
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in [
+                    'PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage', 'QuotaPagedPoolUsage',
+                    'QuotaPeakNonPagedPoolUsage', 'QuotaNonPagedPoolUsage', 'PagefileUsage', 'PeakPagefileUsage'
+                ]
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+            return None
+        return counters.WorkingSetSize
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class MemoryHighWater:
+    """
+    High-water mark of the memory above the memory at the moment it is created (i.e. the DataFrames that
+    already exist are not counted).
+
+    Args:
+    ----------
+        trace:
+            If True, the peak of the Python allocations after the start is traced ("tracemalloc", exact but
+            about 3 times slower). Else the memory of the whole process is sampled by "sample" (i.e. after every block).
+    """
+    def __init__(self, trace: bool = False):
+        self.trace = trace and not tracemalloc.is_tracing()
+        if self.trace:
+            tracemalloc.start()
+        self.start = process_memory()
+        self.peak = self.start
+
+    def sample(self):
+        """The memory above the start in MB, now (None if the memory cannot be read)."""
+        if self.trace:
+            return tracemalloc.get_traced_memory()[0] / 1024 / 1024
+        current = process_memory()
+        if current is None or self.start is None:
+            return None
+        self.peak = max(self.peak, current)
+        return (current - self.start) / 1024 / 1024
+
+    def stop(self):
+        """The high-water mark above the start in MB (None if the memory cannot be read)."""
+        if self.trace:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak / 1024 / 1024
+        return None if self.start is None else (self.peak - self.start) / 1024 / 1024
+
+
+def letters_with_MSN(values: np.ndarray, msn: str):
+    """Same as "replace_letters_with_MSNs" for the values of one MDL column. i.e. 'N' -> '1207 (N)'"""
+    result = values.copy()
+    for letter in SYMBOL_LETTERS:
+        result[values == letter] = f'{msn} ({letter})'
+    return result
+
+
+def write_NC_sheet(writer, formats: dict, sheet_name: str, df_nc: pd.DataFrame, columns: list, rows: np.ndarray, new_msn_list: list, rev_msn_list: list, n_block: int, memory: MemoryHighWater = None, memory_budget_mb: float = None):
+    """
+    Write a sheet of ALL_NCs row by row, one block of rows at a time.
+
+    Args:
+    ----------
+        writer:
+            An xlsxwriter writer in 'constant_memory' mode.
+
+        formats:
+            A dictionary with the created formats.
+
+        sheet_name:
+            The name of the Sheet. ('ALL_NCs' or 'RXX_NCs')
+
+        df_nc:
+            The DataFrame with ALL the NCs (from "merge_dfs", with the letters of the MDLs).
+
+        columns:
+            The columns of 'df_nc' to write.
+
+        rows:
+            The positions of the rows of 'df_nc' to write.
+
+        n_block:
+            Number of rows in every block.
+
+        memory:
+            Sampled after every block, if given.
+
+        memory_budget_mb:
+            If given (with 'memory'), a block that makes the memory grow above the budget halves the rows of the next blocks.
+
+    Returns:
+    ----------
+        n_block:
+            Number of rows in the last block (smaller than the given one, if the budget was exceeded).
+    """
+    worksheet = writer.book.add_worksheet(sheet_name)
+    format_sheet_ALL_NCs(writer, formats, sheet_name, columns, new_msn_list, rev_msn_list)     # Writes the header first
+
+    column_positions = [df_nc.columns.get_loc(x) for x in columns]
+    mdl_columns = [(idx, x[:4]) for idx, x in enumerate(columns) if re.findall(r'^\d{4}_', x)]
+    excel_row = 1
+    start = 0
+    last_mb = memory.sample() if memory is not None else None
+    while start < len(rows):
+        block = df_nc.iloc[rows[start: start + n_block], column_positions].to_numpy(dtype=object)
+        for idx, msn in mdl_columns:
+            block[:, idx] = letters_with_MSN(block[:, idx], msn)
+        current_mb = memory.sample() if memory is not None else None
+        write_block(worksheet, block, first_row=excel_row)
+        excel_row += len(block)
+        start += len(block)
+        del block
+
+        # The memory of a process seldom goes down, so only a block that made it grow above the budget counts
+        if memory_budget_mb is not None and current_mb is not None:
+            if current_mb > memory_budget_mb and current_mb > (last_mb or 0) and n_block > MIN_BLOCK_ROWS:
+                n_block = max(MIN_BLOCK_ROWS, n_block // 2)
+            last_mb = max(current_mb, last_mb or 0)
+
+    return n_block
+
+
+def build_all_NCs(df_nc: pd.DataFrame, new_msn_list: list, rev_msn_list: list, revision: str, excelfilepath: str = None, memory_budget_mb: float = NC_MEMORY_BUDGET_MB, trace_memory: bool = False):
+    """
+    Save 'ALL_NCs_RXX.xlsx' with the sheets 'ALL_NCs' and 'RXX_NCs', as "all_NCs_to_excel" but with bounded memory.
+
+    Args:
+    ----------
+        df_nc:
+            The DataFrame with ALL the NCs, as "merge_dfs" returns it (letters are replaced with MSNs here).
+
+        new_msn_list:
+            A list with the New MSNs for this revision.
+
+        rev_msn_list:
+            A list with the 90-Day Revision MSNs for this revision.
+
+        revision:
+            A string with the current revision. (i.e. 'R10')
+
+        excelfilepath:
+            The filepath of the Excel. (Default=None for 'ALL_NCs_RXX.xlsx')
+
+        memory_budget_mb:
+            Memory budget in MB. It sets the number of rows that are converted at a time. (Default=NC_MEMORY_BUDGET_MB)
+
+        trace_memory:
+            Measure the peak memory exactly with "tracemalloc" (slower). (Default=False samples it after every block)
+
+    Returns:
+    ----------
+        peak_mb:
+            The memory high-water mark of the builder in MB, above the memory of the process when it started
+            (of the Python allocations only, if 'trace_memory'). None if it cannot be measured.
+
+        n_block:
+            Number of rows in the last block. Smaller than the one from the budget if the budget was exceeded.
+    """
+    excelfilepath = excelfilepath or f'ALL_NCs_{revision}.xlsx'
+    memory = MemoryHighWater(trace_memory)
+
+    # Columns and rows of both sheets
+    columns = list(df_nc.columns)
+    mdl_list = [x for x in columns if re.findall(r'^\d{4}_', x)]
+    current_mdl_list = [x for x in columns if (x[:4] in new_msn_list) or (x[:4] in rev_msn_list)]
+    columns_RXX = [x for x in columns if x not in mdl_list or x in current_mdl_list]
+    rows = np.arange(len(df_nc))
+    rows_RXX = np.flatnonzero(any_bits(effectivity_bits(df_nc, current_mdl_list)))
+    n_block = block_rows(len(columns), memory_budget_mb)
+
+    writer = pd.ExcelWriter(excelfilepath, engine='xlsxwriter', engine_kwargs={'options': {'constant_memory': True}})
+    workbook, formats = add_formats_to_workbook(writer.book)
+    n_block = write_NC_sheet(writer, formats, 'ALL_NCs', df_nc, columns, rows, new_msn_list, rev_msn_list, n_block, memory, memory_budget_mb)
+    n_block = write_NC_sheet(writer, formats, f'{revision}_NCs', df_nc, columns_RXX, rows_RXX, new_msn_list, rev_msn_list, n_block, memory, memory_budget_mb)
+    writer.close()
+    memory.sample()
+
+    return memory.stop(), n_block
+
+
+if __name__ == '__main__':
+    import tempfile
+    from bin.setup_follow_up import read_JSON
+    from bin.all_NCs import replace_letters_with_MSNs
+    from bin.save_to_excel import all_NCs_to_excel
+
+    parser = argparse.ArgumentParser(description='Compare the ALL_NCs builder with "all_NCs_to_excel" (time, peak memory, content).')
+    parser.add_argument('all_ncs', help='An ALL_NCs Excel, i.e. ALL_NCs_R11.xlsx (its sheet "ALL_NCs" is the input)')
+    parser.add_argument('--json', default='_JSON/INPUT_MSNs.json', help='JSON with the MSNs. (Default=_JSON/INPUT_MSNs.json)')
+    parser.add_argument('--budget', type=float, default=NC_MEMORY_BUDGET_MB, help=f'Memory budget in MB. (Default={NC_MEMORY_BUDGET_MB})')
+    parser.add_argument('--revision', default='RXX')
+    args = parser.parse_args()
+
+    json_MSNs = read_JSON(args.json)
+    new_msn_list, rev_msn_list = json_MSNs['new'], json_MSNs['rev']
+    df_nc = pd.read_excel(args.all_ncs, dtype=str, sheet_name='ALL_NCs').fillna('')
+    print(f'ALL_NCs: {df_nc.shape[0]} rows x {df_nc.shape[1]} columns')
+
+    def write_old(directory: str):
+        """As "fun_run_9_start" before the builder."""
+        mdl_list = [x for x in list(df_nc.columns) if re.findall(r'^\d{4}_', x)]
+        current_mdl_list = [x for x in list(df_nc.columns) if (x[:4] in new_msn_list) or (x[:4] in rev_msn_list)]
+        df_old = replace_letters_with_MSNs(df_nc.copy(), mdl_list)
+        df_old_RXX = df_old.drop(list(set(mdl_list) - set(current_mdl_list)), axis=1)
+        df_old_RXX = df_old_RXX[any_bits(effectivity_bits(df_old_RXX, current_mdl_list))].replace('', np.nan)
+        cwd = os.getcwd()
+        os.chdir(directory)
+        try:
+            all_NCs_to_excel(df_old, df_old_RXX, new_msn_list, rev_msn_list, args.revision)
+        finally:
+            os.chdir(cwd)
+
+    with tempfile.TemporaryDirectory() as directory:
+        filepath_new = os.path.join(directory, 'new.xlsx')
+        for name, write in [
+            ('all_NCs_to_excel', lambda: write_old(directory)),
+            ('build_all_NCs   ', lambda: build_all_NCs(df_nc, new_msn_list, rev_msn_list, args.revision, filepath_new, args.budget)),
+        ]:
+            start = time.perf_counter()
+            write()
+            elapsed = time.perf_counter() - start
+            memory = MemoryHighWater(trace=True)        # Again, for the peak of the Python allocations
+            write()
+            print(f'{name}: {elapsed:.2f} s, peak {memory.stop():.1f} MB')
+        print(f'Budget {args.budget:g} MB: blocks of {block_rows(len(df_nc.columns), args.budget)} rows')
+
+        old = pd.read_excel(os.path.join(directory, f'ALL_NCs_{args.revision}.xlsx'), dtype=str, sheet_name=None)
+        new = pd.read_excel(filepath_new, dtype=str, sheet_name=None)
+        is_equal = list(old) == list(new) and all(old[x].equals(new[x]) for x in old)
+        print('Same sheets:', is_equal)
+        print(f'Size: {os.path.getsize(os.path.join(directory, f"ALL_NCs_{args.revision}.xlsx")) / 1e6:.2f} MB -> {os.path.getsize(filepath_new) / 1e6:.2f} MB')
+
+    sys.exit(0 if is_equal else 1)
@@ -0,0 +1,109 @@
+##########################################################################################
+# Filename:     nc_store.py
+# For:          Follow_Up_Creation_Tool
+# Author:       Spyros Acheimastos (acheimastos@althom.eu)
+# Date:         19/10/2026
+##########################################################################################
+
+#   Persistent store of the ALL_NCs history, one entry for every MSN.
+#   Every entry keeps the 'Nonconformities' DataFrame of the MSN (as it goes into "merge_dfs") and the
+#   signature (filename, mtime, size) of its latest MDL. "ALL_NCs_RXX.xlsx" is rendered from the store.
+#   Each revision reads only the MDLs of the new and 90-Day Revision MSNs, and the MDLs that were
+#   added or replaced in the folder. The other MDLs are never opened (only their signature is checked).
+#   The entries of the 90-Day Revision MSNs have the Phantom-New/Deleted symbols of their revision,
+#   so they are read again when the MSN is not a 90-Day Revision MSN any more.
+
+import os
+import pickle
+
+
+SCRIPT_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+NC_STORE_FILEPATH = os.path.join(os.path.dirname(SCRIPT_DIRECTORY), '_ALL_NCs', 'ALL_NCs_STORE.pkl')
+
+
+def load_nc_store(filepath: str = NC_STORE_FILEPATH):
+    """Load the ALL_NCs store from disk. Returns an empty store if it does not exist or cannot be read."""
+    if not os.path.isfile(filepath):
+        return {}
+    try:
+        with open(filepath, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        print(f'ALL_NCs store "{filepath}" could not be read. Starting a new one.')
+        return {}
+
+
+def save_nc_store(nc_store: dict, filepath: str = NC_STORE_FILEPATH):
+    """Save the ALL_NCs store to disk."""
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    tmp_filepath = filepath + '.tmp'
+    with open(tmp_filepath, 'wb') as f:
+        pickle.dump(nc_store, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_filepath, filepath)
+
+
+def mdl_signature(filepath: str):
+    """(filename, mtime, size) of an MDL, without reading it."""
+    stat = os.stat(filepath)
+    return (os.path.basename(filepath), stat.st_mtime_ns, stat.st_size)
+
+
+def stale_MSNs(nc_store: dict, mdl_dict: dict, current_msn_list: list):
+    """
+    The MSNs whose MDLs must be read, in the order of 'mdl_dict'.
+
+    Args:
+    ----------
+        nc_store:
+            The ALL_NCs store (from "load_nc_store").
+
+        mdl_dict:
+            The MDLs of the folder (from "list_MDLs").
+
+        current_msn_list:
+            The new and 90-Day Revision MSNs of this revision. They are always read.
+
+    Returns:
+    ----------
+        msn_list:
+            The current MSNs, the MSNs that are not inside the store or whose MDL changed, and the MSNs
+            that were 90-Day Revision MSNs when they were stored.
+    """
+    msn_list = []
+    for msn, (filepath, _) in mdl_dict.items():
+        entry = nc_store.get(msn)
+        if msn in current_msn_list or entry is None or entry['is_rev'] or entry['signature'] != mdl_signature(filepath):
+            msn_list.append(msn)
+
+    return msn_list
+
+
+def update_nc_store(nc_store: dict, nc_dict: dict, mdl_dict: dict, rev_msn_list: list):
+    """
+    Replace the entries of the MSNs that were read, and drop the MSNs that are not inside the folder any more.
+
+    Args:
+    ----------
+        nc_store:
+            The ALL_NCs store (from "load_nc_store"). It is updated in place.
+
+        nc_dict:
+            Dict containing DataFrames for the MSNs that were read (after "update_90_day_rev").
+
+        mdl_dict:
+            The MDLs of the folder (from "list_MDLs").
+
+        rev_msn_list:
+            The 90-Day Revision MSNs of this revision.
+
+    Returns:
+    ----------
+        nc_dict:
+            Dict containing DataFrames for all the MSNs of the folder, in the order of 'mdl_dict'.
+    """
+    for msn, df in nc_dict.items():
+        nc_store[msn] = {'signature': mdl_signature(mdl_dict[msn][0]), 'is_rev': msn in rev_msn_list, 'df': df}
+    for msn in [x for x in nc_store if x not in mdl_dict]:
+        del nc_store[msn]
+
+    return {msn: nc_store[msn]['df'] for msn in mdl_dict}
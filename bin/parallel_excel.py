@@ -0,0 +1,184 @@
+##########################################################################################
+# Filename:     parallel_excel.py
+# For:          Follow_Up_Creation_Tool
+# Author:       Spyros Acheimastos (acheimastos@althom.eu)
+# Date:         19/10/2026
+##########################################################################################
+
+#   Render the data rows of big sheets as XML in worker processes and
+#   assemble them into the single xlsxwriter workbook of "final_follow_up_to_excel".
+#   Formats, data validations and conditional formats are still added by the format_sheet_* functions.
+#   "PrerenderedWorksheet" depends on private parts of xlsxwriter. "prerendering_supported" checks the version and these
+#   parts first; if the check fails, "final_follow_up_to_excel" writes the sheets with "write_frame" instead.
+#   It is opt-in ('prerender' of "final_follow_up_to_excel"): the strings are written inline instead of through the shared
+#   strings table, so the Excel is bigger (i.e. 4.14 MB instead of 3.86 MB).
+#   Numbers are written as "write_number" writes them ('%.16G'). Infinite numbers become the #DIV/0! error, as with the
+#   'nan_inf_to_errors' option of xlsxwriter, and NaN an empty cell.
+
+import datetime
+import functools
+import xlsxwriter
+import regex as re
+import numpy as np
+import pandas as pd
+from xml.sax.saxutils import escape
+from concurrent.futures import ProcessPoolExecutor
+from xlsxwriter.format import Format
+from xlsxwriter.worksheet import Worksheet
+from xlsxwriter.utility import xl_col_to_name
+
+
+XLS_STRMAX = 32767
+EXCEL_EPOCH = pd.Timestamp('1899-12-30')     # Day 0 of Excel dates (for dates after 01/03/1900)
+CONTROL_CHARS = re.compile(r'[\x00-\x08\x0B\x0C\x0E-\x1F]')
+
+# Versions of xlsxwriter (from, up to but not including) with the private parts used here. Checked with 3.2.9 (see 'requirements.txt')
+XLSXWRITER_SUPPORTED_VERSIONS = ((3, 0), (4, 0))
+
+
+class PrerenderedWorksheet(Worksheet):
+    """
+    xlsxwriter Worksheet that writes the header row normally and then appends data rows
+    that were already rendered to XML by "render_sheet_rows".
+    """
+    def __init__(self):
+        super().__init__()
+        self.prerendered_rows = ''
+
+    def set_prerendered_rows(self, rows_xml: str, num_of_rows: int, num_of_columns: int):
+        """Store the rendered rows (Excel rows 2 to num_of_rows+1) and extend the sheet dimensions."""
+        self.prerendered_rows = rows_xml
+        if num_of_rows and num_of_columns:
+            self._check_dimensions(num_of_rows, num_of_columns - 1)
+
+    def _write_rows(self):
+        # Header row (and anything else written normally) is only in row 0
+        self.dim_rowmax, dim_rowmax = 0, self.dim_rowmax
+        super()._write_rows()
+        self.dim_rowmax = dim_rowmax
+        self.fh.write(self.prerendered_rows)
+
+
+def render_cell(ref: str, value, xf_index):
+    """Render a single <c> element. Returns '' for empty cells, like xlsxwriter does for blanks without format."""
+    style = f' s="{xf_index}"' if xf_index else ''
+
+    if value is None or value is pd.NA or value is pd.NaT:
+        return ''
+    if isinstance(value, datetime.datetime):
+        serial = (pd.Timestamp(value) - EXCEL_EPOCH) / pd.Timedelta(days=1)
+        return f'<c r="{ref}"{style}><v>{serial:.16G}</v></c>'
+    if isinstance(value, (bool, np.bool_)):
+        return f'<c r="{ref}"{style} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        if np.isnan(value): return ''
+        if np.isinf(value):
+            sign = '-' if value < 0 else ''
+            return f'<c r="{ref}"{style} t="e"><f>{sign}1/0</f><v>#DIV/0!</v></c>'
+        return f'<c r="{ref}"{style}><v>{value:.16G}</v></c>'
+
+    string = str(value)
+    if string == '':
+        return ''
+    string = string[:XLS_STRMAX]
+    string = CONTROL_CHARS.sub(lambda m: '_x{:04X}_'.format(ord(m.group())), string)
+    preserve = ' xml:space="preserve"' if string[0].isspace() or string[-1].isspace() else ''
+    return f'<c r="{ref}"{style} t="inlineStr"><is><t{preserve}>{escape(string)}</t></is></c>'
+
+
+def render_sheet_rows(values: np.ndarray, col_xf_list: list):
+    """
+    Render the data rows of a sheet as worksheet XML. Runs inside a worker process.
+
+    Args:
+    ----------
+        values:
+            2D object array with the values of the DataFrame (without header).
+
+        col_xf_list:
+            List with the xf index of the format of each column (or None).
+
+    Returns:
+    ----------
+        rows_xml:
+            The <row> elements for Excel rows 2, 3, ...
+    """
+    letters = [xl_col_to_name(idx) for idx in range(values.shape[1])]
+    rows = []
+    for row_idx, row in enumerate(values):
+        row_num = row_idx + 2
+        cells = ''.join(render_cell(f'{letter}{row_num}', value, xf_index) for letter, value, xf_index in zip(letters, row, col_xf_list))
+        if cells:
+            rows.append(f'<row r="{row_num}">{cells}</row>')
+
+    return ''.join(rows)
+
+
+@functools.lru_cache(maxsize=None)
+def prerendering_supported():
+    """
+    True if the installed xlsxwriter is one of "XLSXWRITER_SUPPORTED_VERSIONS" and has the private parts that
+    "PrerenderedWorksheet" and "render_sheets" use: 'Worksheet._write_rows', '_check_dimensions', 'fh', 'dim_rowmax',
+    'col_info' (with the Format of a column at index 1) and 'Format._get_xf_index'.
+    """
+    version = tuple(int(x) for x in re.findall(r'\d+', xlsxwriter.__version__)[:2])
+    if not XLSXWRITER_SUPPORTED_VERSIONS[0] <= version < XLSXWRITER_SUPPORTED_VERSIONS[1]:
+        print(f'xlsxwriter {xlsxwriter.__version__} is not supported for parallel rendering. The sheets are written on a single thread.')
+        return False
+
+    try:
+        worksheet = Worksheet()
+        cell_format = Format()
+        worksheet.set_column(0, 0, 10, cell_format)
+        supported = (
+            all(callable(getattr(Worksheet, x, None)) for x in ['_write_rows', '_check_dimensions'])
+            and all(hasattr(worksheet, x) for x in ['fh', 'dim_rowmax'])
+            and worksheet.col_info[0][1] is cell_format
+            and callable(getattr(Format, '_get_xf_index', None))
+        )
+    except Exception:
+        supported = False
+
+    if not supported:
+        print(f'xlsxwriter {xlsxwriter.__version__} has changed the parts used for parallel rendering. The sheets are written on a single thread.')
+    return supported
+
+
+def add_prerendered_sheet(workbook, sheetname: str):
+    """Add an empty "PrerenderedWorksheet" to an xlsxwriter workbook. Its data are added later by "render_sheets"."""
+    return workbook.add_worksheet(sheetname, worksheet_class=PrerenderedWorksheet)
+
+
+def render_sheets(workbook, dict_of_dfs: dict, max_workers: int = None):
+    """
+    Render the data rows of several sheets in parallel and add them to their "PrerenderedWorksheet".
+
+    Call it after the sheets have been formatted (so that the column formats are known) and before saving.
+
+    Args:
+    ----------
+        workbook:
+            An xlsxwriter workbook.
+
+        dict_of_dfs:
+            Dict with key=sheetname and value=DataFrame.
+
+        max_workers:
+            Number of worker processes. (Default=os.cpu_count())
+    """
+    # Column formats must get their final xf index in the main process, in a fixed order
+    jobs = []
+    for sheetname, df in dict_of_dfs.items():
+        worksheet = workbook.get_worksheet_by_name(sheetname)
+        col_xf_list = []
+        for col in range(df.shape[1]):
+            col_format = worksheet.col_info[col][1] if col in worksheet.col_info else None
+            col_xf_list.append(col_format._get_xf_index() if col_format is not None else None)
+        jobs.append((worksheet, df.to_numpy(dtype=object), col_xf_list))
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(render_sheet_rows, values, col_xf_list) for _, values, col_xf_list in jobs]
+        for (worksheet, values, _), future in zip(jobs, futures):
+            worksheet.set_prerendered_rows(future.result(), values.shape[0], values.shape[1])
+
+    return workbook
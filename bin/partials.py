@@ -8,9 +8,27 @@
 import regex as re
 import numpy as np
 import pandas as pd
+from bin.setup_follow_up import (
+    EFFECT_COLUMN,
+    EFFECTIVE_SYMBOLS,
+    add_effectivity_column,
+    add_task_column,
+    add_columns_to_PS
+)
+from bin.sidecar import load_sidecar, read_sheet
+from bin.reference_workbook import main_filepath, reference_sheets_filepath
+from bin.schema import apply_schema, without_categories
+from bin.effectivity import (
+    effectivity_bits,
+    any_bits
+)
 
 
 SHEET_NAMES = ['IPC Follow-up', 'SRM A321 Follow-up', 'SRM A320 Follow-up']
+EXTRA_COLUMNS_NC = ['Author Check', 'Initial Status', 'Author Comment']
+
+# Symbols of an MDL column that mark a change of effectivity after "compare_mdl_columns"
+CHANGE_SYMBOLS = ['PN', 'PD', 'WTF']
 
 
 def compare_mdl_values(old_value: str, df_1_x_1):
@@ -72,6 +90,45 @@ def compare_mdl_values(old_value: str, df_1_x_1):
     return 'WTF'                    # If something weird (should be marked with 'TRUE')
 
 
+def compare_mdl_columns(old_values: pd.Series, part_numbers: pd.Series, new_values: pd.Series):
+    """
+    Same as "compare_mdl_values", but for a whole MDL column at once.
+
+    Args:
+    ----------
+        old_values:
+            The old values of the MDL column: df_old[mdl]
+
+        part_numbers:
+            The Part Numbers of each line: df_old['PART NUMBER']
+
+        new_values:
+            The new values with index=Part Number (unique): df_new_unique.set_index('PART NUMBER')[mdl]
+
+    Returns:
+    ----------
+        values:
+            Series with the values of "compare_mdl_values" for each line.
+    """
+    is_found = part_numbers.isin(new_values.index)
+    new = part_numbers.map(new_values)
+    is_old_effective = old_values.isin(['N', 'R', '-', '-Q', '-T', '- Q', '- T'])  # Update 01/03/2023: added '-Q', '-T', '- Q', '- T'
+    is_old_empty = old_values.isna() | old_values.eq('D')
+    is_new_empty = new.isna()
+    is_new_deleted = new.eq('D')
+
+    # Later assignments have priority, like the order of the checks in "compare_mdl_values"
+    values = pd.Series('WTF', index=old_values.index, dtype=object)                 # If something weird (should be marked with 'TRUE')
+    values[is_old_empty] = 'PN'                                                     # Phantom New (should be marked with 'TRUE')
+    values[is_old_empty & is_new_deleted] = 'D'                                     # Became Deleted (should be marked with 'FALSE')
+    values[is_old_empty & is_new_empty] = np.nan                                    # Became NaN (should be marked with 'FALSE')
+    values[is_old_effective] = new[is_old_effective]                                # Just change symbol (should be marked with 'FALSE')
+    values[is_old_effective & (is_new_deleted | is_new_empty)] = 'PD'               # Phantom Deleted (should be marked with 'TRUE')
+    values[~is_found] = 'PD'                                                        # Phantom Deleted (should be marked with 'TRUE')
+
+    return values
+
+
 def get_MSNs_and_MDLs(columns_old: list, columns_new: list):
     """
     Find MDL that changed revision from OLD Follow-Up to NEW Follow-Up.
@@ -119,7 +176,9 @@ def get_MSNs_and_MDLs(columns_old: list, columns_new: list):
 def get_follow_ups(filepath: str):
     """
     Read sheets 'IPC Follow-up', 'SRM A321 Follow-up', 'SRM A320 Follow-up' from an Excel file
-    and save them as DataFrame in a dict.
+    and save them as DataFrame in a dict. If the Excel has a sidecar (see "save_sidecar"), they are loaded from it.
+    For a Follow-up with a reference Excel (see "reference_workbook"), either of its two Excels can be given.
+    The times, dates and other columns of the Authors get their types from "apply_schema".
 
     Args:
     ----------
@@ -135,10 +194,12 @@ def get_follow_ups(filepath: str):
             Dict containing DataFrames. Keys: 'IPC', 'SRM A321', 'SRM A320'
     """
     df_dict = {}
+    filepath = main_filepath(filepath)
+    sheets = load_sidecar(filepath)
     for sheet in SHEET_NAMES:
         try:
-            # Read Excel
-            df = pd.read_excel(filepath, dtype=str, sheet_name=sheet)
+            # Read Excel (or its sidecar) and convert the columns to their types
+            df = apply_schema(read_sheet(filepath, sheet, sheets), sheet)
 
             # Drop extra columns to avoid problems later
             df = df.loc[:, ~df.columns.str.endswith('Change')]
@@ -234,20 +295,21 @@ def update_MDLs_in_df_old(df_old: pd.DataFrame, df_new: pd.DataFrame, mdl_dict:
     """
     # Initialize 'Effectivity Change' column
     df_old['Effectivity Change'] = False
+    df_new = df_new.drop_duplicates(subset='PART NUMBER').set_index('PART NUMBER')
 
     for mdl in mdl_dict.values():
         # Compare Old with New MDLs to find Phantom-New (PN) and Phantom-Deleted(PD) etc
-        df_old[mdl] = df_old.apply(lambda row: compare_mdl_values(row[mdl], df_new.loc[df_new['PART NUMBER'] == row['PART NUMBER']][mdl]), axis=1)
-        
+        df_old[mdl] = compare_mdl_columns(df_old[mdl], df_old['PART NUMBER'], df_new[mdl])
+
         # Create column '{msn} Change' based on MDL Column of each MSN
-        effect_col_name = f'{mdl[:4]} Change'
-        df_old[effect_col_name] = df_old[mdl].apply(lambda x: True if x in ['PN', 'PD', 'WTF'] else False)
-        
-        # OR Operation on final column 'Effectivity Change'
-        df_old['Effectivity Change'] = df_old['Effectivity Change'] | df_old[effect_col_name]
-        
-        # Change ['PN', 'PD'] to ['N', 'D']
-        df_old[mdl] = df_old[mdl].replace(['PN', 'PD'], ['N', 'D'])
+        df_old[f'{mdl[:4]} Change'] = df_old[mdl].isin(CHANGE_SYMBOLS)
+
+    # OR Operation on final column 'Effectivity Change', from the bits of the changed symbols
+    mdl_list = list(mdl_dict.values())
+    df_old['Effectivity Change'] = any_bits(effectivity_bits(df_old, mdl_list, CHANGE_SYMBOLS))
+
+    # Change ['PN', 'PD'] to ['N', 'D']
+    df_old[mdl_list] = df_old[mdl_list].replace(['PN', 'PD'], ['N', 'D'])
 
     return df_old
 
@@ -255,6 +317,9 @@ def update_MDLs_in_df_old(df_old: pd.DataFrame, df_new: pd.DataFrame, mdl_dict:
 def read_PS_DSOL_NC(filepath: str):
     """
     Read sheets 'DSOL', 'PS', 'NC' from New Excel and return as DataFrames.
+    If the Excel has a sidecar (see "save_sidecar"), they are loaded from it.
+    If the Excel does not have them, they are read from its reference Excel (see "reference_workbook").
+    The MDL columns and the other columns with few values become Categorical (see "apply_schema").
 
     Args:
     ----------
@@ -272,12 +337,225 @@ def read_PS_DSOL_NC(filepath: str):
         df_nc:
             DataFrame of sheet 'NC'.
     """
-    df_dsol = pd.read_excel(filepath, dtype=str, sheet_name='DSOL')
-    df_ps = pd.read_excel(filepath, dtype=str, sheet_name='PS')
-    df_nc = pd.read_excel(filepath, dtype=str, sheet_name='NC')
+    filepath = main_filepath(filepath)
+    sheets = load_sidecar(filepath)
+    if sheets is None or 'DSOL' not in sheets:
+        filepath = reference_sheets_filepath(filepath)
+        sheets = load_sidecar(filepath)
+    df_dsol = apply_schema(read_sheet(filepath, 'DSOL', sheets), 'DSOL')
+    df_ps = apply_schema(read_sheet(filepath, 'PS', sheets), 'PS')
+    df_nc = apply_schema(read_sheet(filepath, 'NC', sheets), 'NC')
     return df_dsol, df_ps, df_nc
 
 
+def get_changed_MDLs(columns_old: list, mdl_dict_folder: dict):
+    """
+    Find the MDLs inside the MDL folder that have a different revision than the MDL columns of the OLD Follow-up.
+
+    Args:
+    ----------
+        columns_old:
+            The column names of the OLD DataFrame that has all MSNs: list(df_dsol)
+
+        mdl_dict_folder:
+            Dict with key=MSN and value=(filepath, mdl_column) created by "list_MDLs".
+
+    Returns:
+    ----------
+        msn_list:
+            A list of the MSNs that have a new MDL
+
+        mdl_dict_old:
+            A dict of the OLD MDLs (key=MSN: value=OLD_MDL)
+
+        mdl_dict_new:
+            A dict of the NEW MDLs (key=MSN: value=NEW_MDL)
+
+        missing_msn_list:
+            The MSNs of the MDL folder that are not in the OLD Follow-up. If not empty, the other results are empty,
+            since an Incremental Update cannot add MSNs (the Follow-up must be created from the start).
+    """
+    mdl_dict_old_all = {x[:4]: x for x in columns_old if re.findall(r'MDL', x)}
+
+    # Incremental update can only change revisions of MSNs that already exist in the OLD Follow-up
+    missing_msn_list = [msn for msn in mdl_dict_folder if msn not in mdl_dict_old_all]
+    if missing_msn_list:
+        return [], {}, {}, missing_msn_list
+
+    msn_list = sorted([msn for msn, (_, mdl) in mdl_dict_folder.items() if mdl != mdl_dict_old_all[msn]])
+    mdl_dict_old = {msn: mdl_dict_old_all[msn] for msn in msn_list}
+    mdl_dict_new = {msn: mdl_dict_folder[msn][1] for msn in msn_list}
+
+    return msn_list, mdl_dict_old, mdl_dict_new, []
+
+
+def add_unchanged_PNs_to_df_new(df_new: pd.DataFrame, df_old: pd.DataFrame, mdl_dict: dict):
+    """
+    When 'df_new' was created only from the MDLs that changed revision, add the Part Numbers that are
+    still effective on the MSNs that did not change. This way 'df_new' has the same Part Numbers
+    as a New Follow-up created from all the MDLs, and they are not marked as Phantom-Deleted.
+
+    Args:
+    ----------
+        df_new:
+            The DataFrame created only from the changed MDLs.
+
+        df_old:
+            The DataFrame from the OLD Excel, with the MDL columns already renamed.
+
+        mdl_dict:
+            Dict with MDL column names that have changed revision.
+
+    Returns:
+    ----------
+        df_new:
+            The 'df_new' with the extra Part Numbers added. Their changed MDL columns are NaN.
+    """
+    # Empty cells are NaN, as when 'df_new' is read from Excel
+    df_new = df_new.replace('', np.nan)
+
+    # Keep only lines of 'df_new' that are effective on the changed MSNs
+    changed_mdl_list = list(mdl_dict.values())
+    df_new = df_new.loc[any_bits(effectivity_bits(df_new, changed_mdl_list, EFFECTIVE_SYMBOLS))]
+
+    # Part Numbers effective on MSNs that did not change
+    unchanged_mdl_list = [x for x in list(df_old.columns) if re.findall(r'MDL', x) and x not in changed_mdl_list]
+    df_unchanged = df_old.loc[any_bits(effectivity_bits(df_old, unchanged_mdl_list, EFFECTIVE_SYMBOLS))]
+    df_unchanged = df_unchanged.loc[~df_unchanged['PART NUMBER'].isin(df_new['PART NUMBER']), ['PART NUMBER']].drop_duplicates()
+    for mdl in changed_mdl_list:
+        df_unchanged[mdl] = np.nan
+
+    return pd.concat([df_new, df_unchanged], ignore_index=True)
+
+
+def update_follow_up(df_old: pd.DataFrame, df_new: pd.DataFrame, mdl_dict_old: dict, mdl_dict_new: dict, rev_msn_list: list):
+    """
+    Merge the OLD Follow-up DataFrame with the NEW one for the MDLs that changed revision.
+
+    The columns filled by the Authors in 'df_old' are kept as they are.
+
+    Args:
+    ----------
+        df_old:
+            The DataFrame from the OLD Excel (from "get_follow_ups").
+
+        df_new:
+            The DataFrame from the NEW Excel (from "get_follow_ups") or created only from the changed MDLs.
+
+        mdl_dict_old:
+            A dict of the OLD MDLs (key=MSN: value=OLD_MDL)
+
+        mdl_dict_new:
+            A dict of the NEW MDLs (key=MSN: value=NEW_MDL)
+
+        rev_msn_list:
+            A list of the 90-Day Revivion MSNs.
+
+    Returns:
+    ----------
+        df_final:
+            The updated Follow-up DataFrame with Effectivity, 'TASK' and Change columns.
+    """
+    # Rename the MDL columns of "df_old"
+    for msn in mdl_dict_old:
+        df_old = df_old.rename(columns={mdl_dict_old[msn]: mdl_dict_new[msn]})
+
+    # For simplicity
+    mdl_dict = mdl_dict_new
+
+    # Add New Part Numbers to the "df_old"
+    df_old = add_PNs_to_df_old(df_old, df_new, mdl_dict)
+
+    # Keep only unique Part Numbers
+    df_new = reduce_df_new(df_new, mdl_dict)
+
+    # Update MDL columns on 'df_old' based on 'df_new'
+    df_final = update_MDLs_in_df_old(df_old, df_new, mdl_dict)
+
+    # Add Effectivity and Task column
+    df_final = add_effectivity_column(df_final, 'FOLLOW_UP', drop_empty_effectivity=False)          # Keeping empty effectivity just in case
+    df_final = add_task_column(df_final, rev_msn_list)
+
+    # The new lines may have changed the types of the columns of the Authors (all Follow-up sheets have the same schema).
+    # Columns kept as text were already reported when the sheet was read
+    df_final = apply_schema(df_final, SHEET_NAMES[0], errors=[])
+
+    return df_final
+
+
+def patch_MDL_sheet(df_sheet: pd.DataFrame, df_changed: pd.DataFrame, mdl_dict_old: dict, mdl_dict_new: dict, sheet: str, rev_msn_list: list = None):
+    """
+    Replace the MDL columns of the MSNs that changed revision inside a 'DSOL', 'PS' or 'NC' DataFrame
+    of the OLD Follow-up, without rebuilding it from all the MDLs.
+
+    Args:
+    ----------
+        df_sheet:
+            The DataFrame of sheet 'DSOL', 'PS' or 'NC' from the OLD Excel (from "read_PS_DSOL_NC").
+
+        df_changed:
+            The DataFrame created by "merge_dfs" only from the changed MDLs. Can be None if there are no changed MDLs for this sheet.
+
+        mdl_dict_old:
+            A dict of the OLD MDLs (key=MSN: value=OLD_MDL)
+
+        mdl_dict_new:
+            A dict of the NEW MDLs (key=MSN: value=NEW_MDL)
+
+        sheet:
+            'DSOL', 'PS' or 'NC'
+
+        rev_msn_list:
+            A list of the 90-Day Revivion MSNs. Needed only for 'NC'.
+
+    Returns:
+    ----------
+        df_sheet:
+            The updated DataFrame with the new Effectivity column.
+    """
+    effect_column = EFFECT_COLUMN[sheet]['name']
+    extra_column_list = EXTRA_COLUMNS_NC if sheet == 'NC' else []
+
+    # Drop Effectivity and the old MDL columns. Categorical columns are merged and filled as strings
+    df_sheet = without_categories(df_sheet).drop([effect_column], axis=1)
+    mdl_list = [x for x in list(df_sheet.columns) if re.findall(r'MDL', x)]
+    title_list = [x for x in list(df_sheet.columns) if x not in mdl_list and x not in extra_column_list]
+
+    # Final order of MDL columns. New MDLs take the place of the old ones
+    rename_dict = {mdl_dict_old[msn]: mdl_dict_new[msn] for msn in mdl_dict_old}
+    final_mdl_list = [rename_dict.get(x, x) for x in mdl_list]
+
+    if df_changed is not None:
+        changed_mdl_list = [x for x in list(df_changed.columns) if re.findall(r'MDL', x)]
+        final_mdl_list = final_mdl_list + [x for x in changed_mdl_list if x not in final_mdl_list]
+        df_sheet = df_sheet.drop([x for x in mdl_list if x in rename_dict], axis=1)
+        df_sheet = pd.merge(df_sheet, df_changed.replace('', np.nan), on=title_list, how='outer', indicator=True)
+
+        # Drop lines that came only from the old MDLs (not in the changed MDLs and empty for all other MSNs)
+        unchanged_mdl_list = [x for x in final_mdl_list if x not in changed_mdl_list]
+        only_old = (df_sheet['_merge'] == 'left_only') & df_sheet[unchanged_mdl_list].isna().all(axis=1)
+        df_sheet = df_sheet.loc[~only_old].drop(['_merge'], axis=1)
+    else:
+        df_sheet = df_sheet.rename(columns=rename_dict)
+
+    df_sheet = df_sheet[title_list + extra_column_list + final_mdl_list]
+    df_sheet = df_sheet.drop_duplicates().sort_values(by=title_list).fillna('').reset_index(drop=True)
+
+    # Add Effectivity column. Columns of the Authors in 'NC' stay before it
+    df_extra = df_sheet[extra_column_list]
+    df_sheet = df_sheet.drop(extra_column_list, axis=1)
+    if sheet == 'NC':
+        df_sheet = add_effectivity_column(df_sheet, 'NC', rev_msn_list)
+    else:
+        df_sheet = add_effectivity_column(df_sheet, sheet)
+    for col in reversed(extra_column_list):
+        df_sheet.insert(loc=5, column=col, value=df_extra.loc[df_sheet.index, col])
+
+    if sheet == 'PS':
+        df_sheet = add_columns_to_PS(df_sheet)
+
+    return apply_schema(df_sheet.reset_index(drop=True), sheet)
+
 
 if __name__ == '__main__':
     pass
\ No newline at end of file
@@ -0,0 +1,210 @@
+##########################################################################################
+# Filename:     pipeline.py
+# For:          Follow_Up_Creation_Tool
+# Author:       Spyros Acheimastos (acheimastos@althom.eu)
+# Date:         19/10/2026
+##########################################################################################
+
+#   Small DAG executor for the run pipeline.
+#   Independent stages (i.e. the DSOL/PS/NC/Initial merges) are scheduled on a process pool
+#   and joined before the Excel export.
+#   With a "CheckpointStore", every Stage saves its output, and a rerun with the same inputs
+#   loads it instead of running the Stage again.
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+
+class StageResult:
+    """
+    Placeholder for the output of another Stage. Resolved by "run_pipeline" before the Stage is started.
+
+    Args:
+    ----------
+        name:
+            The name of the Stage whose output is needed.
+
+        idx:
+            Optional index, for Stages that return a tuple (i.e. 'gnrt_lines_and_split').
+    """
+    def __init__(self, name: str, idx: int = None):
+        self.name = name
+        self.idx = idx
+
+
+class Stage:
+    """
+    A single step of the pipeline.
+
+    Args:
+    ----------
+        name:
+            Unique name of the Stage.
+
+        fn:
+            The function to run. It must be defined at module level so it can be sent to a worker process.
+
+        *args, **kwargs:
+            Arguments passed to "fn". Any "StageResult" is replaced with the output of that Stage.
+    """
+    def __init__(self, name: str, fn, *args, **kwargs):
+        self.name = name
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+    @property
+    def depends(self):
+        """Names of the Stages that must finish before this one."""
+        values = list(self.args) + list(self.kwargs.values())
+        return [x.name for x in values if isinstance(x, StageResult)]
+
+
+def resolve(value, results: dict):
+    """Replace a "StageResult" with the actual output of the Stage."""
+    if not isinstance(value, StageResult):
+        return value
+    if value.idx is None:
+        return results[value.name]
+    return results[value.name][value.idx]
+
+
+def stage_keys(stages: list):
+    """
+    Checkpoint key of every Stage: fingerprint of its function, its arguments and the keys of the Stages it depends on.
+    Stages in a circular dependency get no key.
+    """
+    from bin.checkpoint import fingerprint
+
+    def key_value(value):
+        return ('StageResult', keys[value.name], value.idx) if isinstance(value, StageResult) else value
+
+    keys = {}
+    pending = list(stages)
+    while pending:
+        ready = [stage for stage in pending if all(x in keys for x in stage.depends)]
+        if not ready:
+            break
+        for stage in ready:
+            pending.remove(stage)
+            args = tuple(key_value(x) for x in stage.args)
+            kwargs = {k: key_value(v) for k, v in stage.kwargs.items()}
+            keys[stage.name] = fingerprint((stage.name, stage.fn, args, kwargs))
+
+    return keys
+
+
+def timed_call(fn, args: tuple, kwargs: dict):
+    """Run "fn" and return its result together with the elapsed time in seconds (runs inside the worker)."""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def run_pipeline(stages: list, max_workers: int = None, console=None, checkpoints=None):
+    """
+    Run a list of Stages respecting their dependencies. Independent Stages run in parallel on a process pool.
+
+    Args:
+    ----------
+        stages:
+            List of "Stage". The order of the list is the order of the returned dicts.
+
+        max_workers:
+            Number of worker processes. Use 1 to run everything in the current process. (Default=os.cpu_count())
+
+        console:
+            Optional Signal to emit the timing of each Stage when it finishes.
+
+        checkpoints:
+            Optional "CheckpointStore". Stages with a checkpoint of the same inputs are loaded instead of run,
+            and the other Stages save a checkpoint when they finish. (Default=None)
+
+    Returns:
+    ----------
+        results:
+            Dict with key=Stage name and value=output of the Stage.
+
+        timings:
+            Dict with key=Stage name and value=elapsed time in seconds.
+
+    Extra Info:
+    ----------
+        The output does not depend on the scheduling, because every Stage only sees the outputs of its dependencies.
+    """
+    # Catch Errors
+    names = [stage.name for stage in stages]
+    if len(names) != len(set(names)):
+        raise Exception('Stage names inside the pipeline should be unique')
+    for stage in stages:
+        missing = [x for x in stage.depends if x not in names]
+        if missing:
+            raise Exception(f'Stage "{stage.name}" depends on unknown Stages: ' + ', '.join(missing))
+
+    results = {}
+    timings = {}
+    pending = list(stages)
+
+    def ready_stages():
+        return [stage for stage in pending if all(x in results for x in stage.depends)]
+
+    def finish(stage, result, elapsed):
+        results[stage.name] = result
+        timings[stage.name] = elapsed
+        if checkpoints is not None:
+            checkpoints.save(stage.name, keys[stage.name], result, elapsed)
+        if console is not None:
+            console.emit(f'    {stage.name} finished in {elapsed:.1f} s')
+
+    # Load the Stages that have a checkpoint of the same inputs
+    keys = stage_keys(stages) if checkpoints is not None else {}
+    for stage in stages:
+        if stage.name not in keys: continue
+        found, result, elapsed = checkpoints.load(stage.name, keys[stage.name])
+        if found:
+            pending.remove(stage)
+            results[stage.name] = result
+            timings[stage.name] = elapsed
+            if console is not None:
+                console.emit(f'    {stage.name} loaded from checkpoint')
+
+    # Run in the current process
+    if max_workers == 1:
+        while pending:
+            ready = ready_stages()
+            if not ready:
+                raise Exception('Circular dependency between Stages: ' + ', '.join(x.name for x in pending))
+            for stage in ready:
+                pending.remove(stage)
+                args = tuple(resolve(x, results) for x in stage.args)
+                kwargs = {k: resolve(v, results) for k, v in stage.kwargs.items()}
+                result, elapsed = timed_call(stage.fn, args, kwargs)
+                finish(stage, result, elapsed)
+
+    # Run on a process pool
+    else:
+        max_workers = max_workers or os.cpu_count()
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            running = {}
+            while pending or running:
+                for stage in ready_stages():
+                    pending.remove(stage)
+                    args = tuple(resolve(x, results) for x in stage.args)
+                    kwargs = {k: resolve(v, results) for k, v in stage.kwargs.items()}
+                    running[executor.submit(timed_call, stage.fn, args, kwargs)] = stage
+
+                if not running:
+                    raise Exception('Circular dependency between Stages: ' + ', '.join(x.name for x in pending))
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    result, elapsed = future.result()
+                    finish(stage, result, elapsed)
+
+    # Keep the order of the given Stages
+    results = {name: results[name] for name in names}
+    timings = {name: timings[name] for name in names}
+
+    return results, timings
@@ -0,0 +1,254 @@
+##########################################################################################
+# Filename:     pn_index.py
+# For:          Follow_Up_Creation_Tool
+# Author:       Spyros Acheimastos (acheimastos@althom.eu)
+# Date:         19/10/2026
+##########################################################################################
+
+#   Inverted index from PART NUMBER and NC NUMBER to (MSN, MDL revision, sheet, symbol, title), for questions like
+#   "which MSNs contain D113R1202-004-00, with which DIFF symbol, and which NCs reference it" without opening workbooks.
+#   It is updated from the DataFrames of every MDL that "read_MDLs" and "read_MDLs_for_NCs" return, so the MDLs are never read for it.
+#   Only the latest MDL of every MSN is kept (per sheet). MDLs that did not change since the last update are skipped.
+#   Two files inside '_PN_Index':
+#       'PN_INDEX_ENTRIES.pkl'  The rows of every (MSN, sheet), used to update the index.
+#       'PN_INDEX.pkl'          The compiled index: the sorted keys and their rows as integer codes, used by the queries.
+#   Both files together are about 50 MB for all the MSNs. The size does not grow with new revisions, since only the latest MDL is kept.
+#   The folder can be deleted at any time. It is built again from the MDLs of the next run.
+#
+#   Usage: python -m bin.pn_index --lookup D113R1202-004-00
+#          python -m bin.pn_index --prefix EA-349-53
+#          python -m bin.pn_index <MDL folder>     (add all the MDLs of a folder first)
+
+import os
+import time
+import pickle
+import argparse
+import numpy as np
+import pandas as pd
+
+from bin.mdl_index import split_mdl_column
+
+
+SCRIPT_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+PN_INDEX_DIRECTORY = os.path.join(os.path.dirname(SCRIPT_DIRECTORY), '_PN_Index')
+PN_INDEX_FILEPATH = os.path.join(PN_INDEX_DIRECTORY, 'PN_INDEX.pkl')
+PN_INDEX_ENTRIES_FILEPATH = os.path.join(PN_INDEX_DIRECTORY, 'PN_INDEX_ENTRIES.pkl')
+
+# Columns of every sheet that become keys: (key column, title column, detail column).
+# The detail is the other side of the row: the parent of a PS child, the NC of a Part Number and the Part Number of an NC.
+PN_INDEX_SHEETS = {
+    'APL': [('PART NUMBER', 'PART TITLE', None)],
+    'PS':  [('CHILD NUMBER', 'CHILD TITLE', 'PARENT NUMBER')],
+    'NC':  [('NC NUMBER', 'NC TITLE', 'NUMBER'), ('NUMBER', 'NC TITLE', 'NC NUMBER')],
+}
+PN_INDEX_COLUMNS = ['KEY', 'MSN', 'MDL REVISION', 'SHEET', 'SYMBOL', 'TITLE', 'DETAIL']
+
+
+def load_pickle(filepath: str, default):
+    """Load a pickle of the index, or 'default' if it does not exist or cannot be read."""
+    if not os.path.isfile(filepath):
+        return default
+    try:
+        with open(filepath, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        print(f'Part Number index "{filepath}" could not be read. Starting a new one.')
+        return default
+
+
+def save_pickle(obj, filepath: str):
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    with open(filepath + '.tmp', 'wb') as f:
+        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(filepath + '.tmp', filepath)
+
+
+def load_pn_index(filepath: str = PN_INDEX_FILEPATH):
+    """Load the compiled Part Number index for the queries. Returns None if it does not exist."""
+    return load_pickle(filepath, None)
+
+
+def revision_key(mdl_column: str):
+    """Sort key of the revision of an MDL column (i.e. 'H' < 'K' < 'AA')."""
+    revision = split_mdl_column(mdl_column)[2]
+    return (len(revision), revision)
+
+
+def mdl_column_of(df: pd.DataFrame):
+    """The MDL column (the 'DIFF' of the MDL) of a DataFrame of "read_MDLs" or "read_MDLs_for_NCs"."""
+    return [x for x in df.columns if 'MDL' in x][-1]
+
+
+def sheet_rows(df: pd.DataFrame, sheet: str):
+    """The rows of the index for the DataFrame of one MDL sheet: 'KEY', 'SYMBOL', 'TITLE', 'DETAIL'."""
+    symbol = df[mdl_column_of(df)].fillna('')
+    df_rows = []
+    for key_column, title_column, detail_column in PN_INDEX_SHEETS[sheet]:
+        df_rows.append(pd.DataFrame({
+            'KEY': df[key_column],
+            'SYMBOL': symbol,
+            'TITLE': df[title_column].fillna(''),
+            'DETAIL': df[detail_column].fillna('') if detail_column else '',
+        }))
+    df_rows = pd.concat(df_rows, ignore_index=True)
+    return df_rows.loc[df_rows['KEY'].notna() & (df_rows['KEY'] != '')].drop_duplicates().reset_index(drop=True)
+
+
+def update_pn_index(entries: dict, sheet: str, list_of_dfs: list):
+    """
+    Replace the entries of the MSNs of 'list_of_dfs' for one sheet. An entry is replaced only by the same
+    or a later revision of the MDL (i.e. the old MDLs of the 90-Day Revision MSNs do not replace the new ones).
+
+    Args:
+    ----------
+        entries:
+            The entries of the index (key=(MSN, sheet)). Updated in place.
+
+        sheet:
+            'APL', 'PS' or 'NC'
+
+        list_of_dfs:
+            DataFrames of one MDL each (i.e. 'dsol_list' of "read_MDLs" for 'APL').
+
+    Returns:
+    ----------
+        n_changed:
+            Number of entries that were added or changed.
+    """
+    n_changed = 0
+    for df in list_of_dfs:
+        mdl_column = mdl_column_of(df)
+        msn = mdl_column[:4]
+        entry = entries.get((msn, sheet))
+        if entry is not None and revision_key(entry['mdl_column']) > revision_key(mdl_column):
+            continue
+        fingerprint = (mdl_column, int(pd.util.hash_pandas_object(df, index=False).sum()))
+        if entry is not None and entry['fingerprint'] == fingerprint:
+            continue
+        entries[(msn, sheet)] = {'mdl_column': mdl_column, 'fingerprint': fingerprint, 'rows': sheet_rows(df, sheet)}
+        n_changed += 1
+
+    return n_changed
+
+
+def compile_pn_index(entries: dict):
+    """
+    The compiled index of the entries. The rows are sorted by key and every text column is an integer code,
+    so a key is one "np.searchsorted" and its rows are one slice.
+    """
+    frames = []
+    for (msn, sheet), entry in entries.items():
+        df = entry['rows'].copy()
+        df['MDL'] = entry['mdl_column']
+        df['SHEET'] = sheet
+        frames.append(df)
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['KEY', 'SYMBOL', 'TITLE', 'DETAIL', 'MDL', 'SHEET'])
+    df = df.sort_values(by=['KEY', 'MDL', 'SHEET'], kind='stable', ignore_index=True)
+
+    keys, key_codes = np.unique(df['KEY'].to_numpy(dtype=str), return_inverse=True)
+    pn_index = {
+        'keys': keys.astype(object),
+        'offsets': np.searchsorted(key_codes, np.arange(len(keys) + 1)),
+    }
+    for column in ['MDL', 'SHEET', 'SYMBOL', 'TITLE', 'DETAIL']:
+        codes, uniques = pd.factorize(df[column])
+        pn_index[column] = (codes.astype(np.int32), uniques.to_numpy(dtype=object))
+
+    return pn_index
+
+
+def index_MDL_frames(dsol_list: list = (), ps_list: list = (), nc_list: list = (), entries_filepath: str = PN_INDEX_ENTRIES_FILEPATH, filepath: str = PN_INDEX_FILEPATH):
+    """
+    Add the DataFrames of "read_MDLs" ('dsol_list', 'ps_list', 'nc_list') or "read_MDLs_for_NCs" (the values of 'nc_dict')
+    to the index on disk. The index is compiled and saved only if something changed.
+
+    Returns:
+    ----------
+        n_changed:
+            Number of (MSN, sheet) entries that were added or changed.
+    """
+    entries = load_pickle(entries_filepath, {})
+    n_changed = update_pn_index(entries, 'APL', dsol_list) + update_pn_index(entries, 'PS', ps_list) + update_pn_index(entries, 'NC', nc_list)
+    if n_changed or not os.path.isfile(filepath):
+        save_pickle(entries, entries_filepath)
+        save_pickle(compile_pn_index(entries), filepath)
+
+    return n_changed
+
+
+def key_range(pn_index: dict, key: str):
+    """(start, stop) of the rows of a key."""
+    idx = np.searchsorted(pn_index['keys'], key)
+    if idx < len(pn_index['keys']) and pn_index['keys'][idx] == key:
+        return pn_index['offsets'][idx], pn_index['offsets'][idx + 1]
+    return 0, 0
+
+
+def lookup(pn_index: dict, key: str):
+    """
+    The rows of a PART NUMBER or NC NUMBER: a list of tuples in the order of "PN_INDEX_COLUMNS"
+    (KEY, MSN, MDL REVISION, SHEET, SYMBOL, TITLE, DETAIL). Empty list if the key is not inside the index.
+    """
+    start, stop = key_range(pn_index, key)
+    columns = {}
+    for column in ['MDL', 'SHEET', 'SYMBOL', 'TITLE', 'DETAIL']:
+        codes, uniques = pn_index[column]
+        columns[column] = uniques[codes[start:stop]]
+    return [
+        (key, mdl[:4], split_mdl_column(mdl)[2], sheet, symbol, title, detail)
+        for mdl, sheet, symbol, title, detail in zip(*columns.values())
+    ]
+
+
+def prefix_search(pn_index: dict, prefix: str, limit: int = 50):
+    """The keys that start with 'prefix' (at most 'limit'), as tuples (key, title of its first row, number of rows)."""
+    start = np.searchsorted(pn_index['keys'], prefix)
+    stop = min(np.searchsorted(pn_index['keys'], prefix + '\uffff'), start + limit)
+    offsets = pn_index['offsets'][start:stop + 1]
+    codes, uniques = pn_index['TITLE']
+    titles = uniques[codes[offsets[:-1]]] if stop > start else []
+    return list(zip(pn_index['keys'][start:stop].tolist(), list(titles), np.diff(offsets).tolist()))
+
+
+def lookup_frame(pn_index: dict, key: str):
+    """Same as "lookup", as a DataFrame."""
+    return pd.DataFrame(lookup(pn_index, key), columns=PN_INDEX_COLUMNS)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Which MSNs/MDLs contain a Part Number or an NC, with which symbol.')
+    parser.add_argument('rootdir', nargs='?', help='Folder with MDLs to add to the index first.')
+    query = parser.add_mutually_exclusive_group()
+    query.add_argument('--lookup', metavar='KEY', help='A PART NUMBER or NC NUMBER.')
+    query.add_argument('--prefix', metavar='PREFIX', help='The keys that start with PREFIX.')
+    args = parser.parse_args()
+
+    if args.rootdir:
+        from bin.setup_follow_up import read_MDLs, list_MDLs
+        from bin.mdl_index import read_with_mdl_index
+        msn_list = list(list_MDLs(args.rootdir))
+        _, _, dsol_list, ps_list, nc_list = read_with_mdl_index(read_MDLs, args.rootdir, msn_list)
+        n_changed = index_MDL_frames(dsol_list, ps_list, nc_list)
+        print(f'{n_changed} MDL sheets added to the Part Number index.')
+
+    start = time.perf_counter()
+    pn_index = load_pn_index()
+    if pn_index is None:
+        raise SystemExit('There is no Part Number index yet. Give a folder with MDLs.')
+    print(f'Part Number index with {len(pn_index["keys"])} keys loaded in {time.perf_counter() - start:.2f} s.')
+
+    start = time.perf_counter()
+    if args.lookup is not None:
+        df = lookup_frame(pn_index, args.lookup)
+        elapsed = time.perf_counter() - start
+        pd.set_option('display.width', 250)
+        pd.set_option('display.max_rows', None)
+        pd.set_option('display.max_colwidth', 60)
+        print(df.to_string(index=False) if not df.empty else f'{args.lookup} is not inside the index.')
+        print(f'{len(df)} rows in {elapsed * 1000:.2f} ms.')
+    elif args.prefix is not None:
+        found = prefix_search(pn_index, args.prefix)
+        elapsed = time.perf_counter() - start
+        for key, title, count in found:
+            print(f'{key}  {title}  ({count} rows)')
+        print(f'{len(found)} keys in {elapsed * 1000:.2f} ms.')
@@ -0,0 +1,116 @@
+##########################################################################################
+# Filename:     prefetch.py
+# For:          Follow_Up_Creation_Tool
+# Author:       Spyros Acheimastos (acheimastos@althom.eu)
+# Date:         19/10/2026
+##########################################################################################
+
+#   Read-ahead of the MDL files. The MDL folders are usually on a network share, where opening and
+#   reading a file waits mostly on the network. A few threads read the bytes of the next files
+#   while the current one is parsed, and the parser works from the bytes in memory.
+#   Every file is read from the share only once (before, every sheet and the fingerprint opened it again).
+#
+#   Throughput on a simulated slow share (no network needed):
+#       python -m bin.prefetch __Follow_Up_R11_2023.02.15/R11_MDLs --latency 0.2 --mb-per-second 20
+
+import os
+import sys
+import time
+import argparse
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+PREFETCH_DEPTH = 4          # Files read ahead of the one being parsed (also the number of reading threads)
+
+
+def read_bytes(filepath: str):
+    """Read the whole content of a file."""
+    with open(filepath, 'rb') as f:
+        return f.read()
+
+
+def slow_reader(latency: float = 0.1, mb_per_second: float = 20.0):
+    """
+    A reader like "read_bytes" that behaves like a slow network share, to test the prefetch locally.
+
+    Args:
+    ----------
+        latency:
+            Seconds of waiting before every file. Different files wait at the same time.
+
+        mb_per_second:
+            Bandwidth of the share. It is shared, so only one file is transferred at a time.
+    """
+    lock = threading.Lock()
+
+    def reader(filepath: str):
+        time.sleep(latency)
+        data = read_bytes(filepath)
+        with lock:
+            time.sleep(len(data) / (mb_per_second * 1024 * 1024))
+        return data
+
+    return reader
+
+
+def prefetch_files(filepaths: list, depth: int = PREFETCH_DEPTH, reader=read_bytes):
+    """
+    Generator of (filepath, bytes) in the order of 'filepaths'. While the caller works on a file,
+    the next 'depth' files are read in background threads. At most 'depth' + 1 files are in memory.
+
+    Args:
+    ----------
+        filepaths:
+            The files to read.
+
+        depth:
+            Number of files to read ahead. 0 reads every file only when it is needed. (Default=PREFETCH_DEPTH)
+
+        reader:
+            Function that returns the bytes of a filepath. (Default="read_bytes")
+    """
+    filepaths = list(filepaths)
+    if depth <= 0:
+        for filepath in filepaths:
+            yield filepath, reader(filepath)
+        return
+
+    with ThreadPoolExecutor(max_workers=depth, thread_name_prefix='prefetch') as executor:
+        futures = deque(executor.submit(reader, filepath) for filepath in filepaths[:depth])
+        for idx, filepath in enumerate(filepaths):
+            data = futures.popleft().result()
+            if idx + depth < len(filepaths):
+                futures.append(executor.submit(reader, filepaths[idx + depth]))
+            yield filepath, data
+
+
+if __name__ == '__main__':
+    import pandas as pd
+    from bin.setup_follow_up import read_JSON, read_MDLs
+
+    parser = argparse.ArgumentParser(description='Time "read_MDLs" on a simulated slow share, with and without read-ahead.')
+    parser.add_argument('rootdir', help='Folder with MDLs, i.e. __Follow_Up_R11_2023.02.15/R11_MDLs')
+    parser.add_argument('--json', default='_JSON/INPUT_MSNs.json', help='JSON with the MSNs. (Default=_JSON/INPUT_MSNs.json)')
+    parser.add_argument('--latency', type=float, default=0.1, help='Seconds before every file. (Default=0.1)')
+    parser.add_argument('--mb-per-second', type=float, default=20.0, help='Bandwidth of the share. (Default=20)')
+    parser.add_argument('--depth', type=int, default=PREFETCH_DEPTH)
+    args = parser.parse_args()
+
+    json_MSNs = read_JSON(args.json)
+    current_msn_list = json_MSNs['new'] + json_MSNs['rev']
+    n_files = sum(1 for _, _, files in os.walk(args.rootdir) for file in files if file.endswith('xlsx'))
+    print(f'{n_files} MDLs, latency {args.latency} s, {args.mb_per_second} MB/s')
+
+    results = {}
+    for depth in [0, args.depth]:
+        start = time.perf_counter()
+        results[depth] = read_MDLs(args.rootdir, current_msn_list, prefetch_depth=depth, reader=slow_reader(args.latency, args.mb_per_second))
+        print(f'Read-ahead {depth}: {time.perf_counter() - start:.2f} s')
+
+    is_equal = all(
+        a.equals(b) for list_a, list_b in zip(results[0][1:], results[args.depth][1:]) for a, b in zip(list_a, list_b)
+    ) and results[0][0] == results[args.depth][0]
+    print('Same DataFrames:', is_equal)
+    sys.exit(0 if is_equal else 1)
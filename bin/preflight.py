@@ -0,0 +1,238 @@
+##########################################################################################
+# Filename:     preflight.py
+# For:          Follow_Up_Creation_Tool
+# Author:       Spyros Acheimastos (acheimastos@althom.eu)
+# Date:         19/10/2026
+##########################################################################################
+
+#   Checks that run before the MDLs and the PseudoDataBase are read, so that a wrong folder or file
+#   fails in milliseconds instead of after minutes of reading.
+#   Only the filenames, the list of sheets ('xl/workbook.xml' inside the .xlsx) and the first row of
+#   the needed sheets are read. The cells of the sheets are never parsed, except for a PseudoDataBase for CC with a
+#   stored copy, whose cells are compared with it (see "cc_edit_errors").
+#
+#   Usage from the command line:
+#       python -m bin.preflight <MDL folder> [--json _JSON/INPUT_MSNs.json] [--pseudo-db <PseudoDataBase>]
+
+import os
+import sys
+import html
+import zipfile
+import argparse
+import posixpath
+import regex as re
+
+from bin.mdl_index import MDL_SHEETS
+
+
+MDL_SHEETS_FOR_ALL = ['PS', 'APL']      # Read by "read_MDLs" for every MSN
+MDL_SHEETS_FOR_CURRENT = ['NC']         # Read by "read_MDLs" only for the current MSNs
+PSEUDO_DB_SHEET = 'Pseudo_Data_Base'
+
+_SHEET_PATTERN = re.compile(r'<sheet\b[^>]*?\bname="([^"]*)"[^>]*?\br:id="([^"]*)"')
+_RELATIONSHIP_PATTERN = re.compile(r'<Relationship\b[^>]*?\bId="([^"]*)"[^>]*?\bTarget="([^"]*)"')
+_RELATIONSHIP_PATTERN_2 = re.compile(r'<Relationship\b[^>]*?\bTarget="([^"]*)"[^>]*?\bId="([^"]*)"')
+_CELL_PATTERN = re.compile(r'<c\b([^>]*?)(?:/>|>(.*?)</c>)', re.DOTALL)
+_TEXT_PATTERN = re.compile(r'<t\b[^>]*?(?:/>|>(.*?)</t>)', re.DOTALL)
+_VALUE_PATTERN = re.compile(r'<v>(.*?)</v>', re.DOTALL)
+
+
+def workbook_sheets(zf: zipfile.ZipFile):
+    """Dict with key=sheet name and value=path of the sheet inside the .xlsx, from 'xl/workbook.xml'."""
+    workbook = zf.read('xl/workbook.xml').decode('utf-8')
+    relationships = zf.read('xl/_rels/workbook.xml.rels').decode('utf-8')
+    targets = dict(_RELATIONSHIP_PATTERN.findall(relationships))
+    targets.update({rid: target for target, rid in _RELATIONSHIP_PATTERN_2.findall(relationships)})
+
+    sheets = {}
+    for name, rid in _SHEET_PATTERN.findall(workbook):
+        target = targets.get(rid, '')
+        path = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+        sheets[html.unescape(name)] = path
+
+    return sheets
+
+
+def first_row(zf: zipfile.ZipFile, path: str, chunk_size: int = 1 << 16):
+    """The XML of the first row of a sheet. Only the start of the sheet is decompressed."""
+    data = b''
+    with zf.open(path) as f:
+        while True:
+            chunk = f.read(chunk_size)
+            data += chunk
+            end = data.find(b'</row>')
+            if end >= 0:
+                break
+            if not chunk or data.find(b'</sheetData>') >= 0 or data.find(b'<sheetData/>') >= 0:
+                return ''
+    start = data.find(b'<row')
+    return data[start: end].decode('utf-8')
+
+
+def shared_strings(zf: zipfile.ZipFile, indexes: set):
+    """Dict with the shared strings of 'indexes' (key=index). Only the strings up to the largest index are decoded."""
+    if not indexes or 'xl/sharedStrings.xml' not in zf.namelist():
+        return {}
+    items = zf.read('xl/sharedStrings.xml').split(b'<si>', max(indexes) + 1)[1:]
+    strings = {}
+    for idx in indexes:
+        if idx < len(items):
+            item = items[idx].split(b'</si>', 1)[0].decode('utf-8')
+            strings[idx] = html.unescape(''.join(x or '' for x in _TEXT_PATTERN.findall(item)))
+
+    return strings
+
+
+def sheet_headers(filepath: str, sheet_names: list):
+    """
+    Read the header (first row) of some sheets of an .xlsx without reading the sheets.
+
+    Args:
+    ----------
+        filepath:
+            Filepath of the .xlsx.
+
+        sheet_names:
+            The names of the sheets.
+
+    Returns:
+    ----------
+        headers:
+            Dict with key=sheet name and value=list with the header of the sheet (None if the sheet does not exist).
+
+    Raises zipfile.BadZipFile or KeyError if the file is not an .xlsx.
+    """
+    with zipfile.ZipFile(filepath) as zf:
+        sheets = workbook_sheets(zf)
+        cells = {}
+        for name in sheet_names:
+            if name not in sheets:
+                continue
+            cells[name] = []
+            for attributes, content in _CELL_PATTERN.findall(first_row(zf, sheets[name])):
+                content = content or ''
+                cell_type = re.search(r'\bt="([^"]*)"', attributes)
+                cell_type = cell_type.group(1) if cell_type else 'n'
+                if cell_type == 'inlineStr':
+                    cells[name].append(('str', ''.join(x or '' for x in _TEXT_PATTERN.findall(content))))
+                else:
+                    value = _VALUE_PATTERN.search(content)
+                    cells[name].append((cell_type, value.group(1) if value else ''))
+
+        indexes = {int(value) for row in cells.values() for cell_type, value in row if cell_type == 's' and value}
+        strings = shared_strings(zf, indexes)
+
+    headers = {name: None for name in sheet_names}
+    for name, row in cells.items():
+        headers[name] = [strings.get(int(value), '') if cell_type == 's' and value else html.unescape(value) for cell_type, value in row]
+
+    return headers
+
+
+def check_headers(filepath: str, required: dict):
+    """
+    Check that an .xlsx has the sheets of 'required' (key=sheet name, value=list of columns) with these columns in the header.
+    Returns a list with the errors.
+    """
+    filename = os.path.basename(filepath)
+    try:
+        headers = sheet_headers(filepath, list(required))
+    except (zipfile.BadZipFile, KeyError):
+        return [f'"{filename}" is not a valid Excel (.xlsx) file.']
+
+    errors = []
+    for sheet, columns in required.items():
+        if headers[sheet] is None:
+            errors.append(f'"{filename}" has no sheet "{sheet}".')
+            continue
+        missing_columns = [x for x in columns if x not in headers[sheet]]
+        if missing_columns:
+            errors.append(f'Sheet "{sheet}" of "{filename}" has no columns: ' + ', '.join(missing_columns) + '.')
+
+    return errors
+
+
+def preflight_MDLs(rootdir: str, all_msn_list: list = None, current_msn_list: list = (), only_msn_list: list = None):
+    """
+    Check the MDL folder before "read_MDLs": MSNs of the JSON against the MDL filenames, and the sheets and
+    header columns that will be read from every MDL.
+
+    Args:
+    ----------
+        rootdir:
+            The path to the folder containing the MDLs in '.xlsx' format.
+
+        all_msn_list:
+            All the MSNs of the JSON. If None, the MSNs are not checked.
+
+        current_msn_list:
+            The MSNs for the current IPC/SRM revision (their 'Nonconformities' sheet is needed too).
+
+        only_msn_list:
+            If given, check the sheets only of the MDLs of these MSNs. (Default=None checks all MDLs)
+
+    Returns:
+    ----------
+        errors:
+            List with the errors (empty if everything is fine).
+    """
+    from bin.setup_follow_up import mdl_files
+
+    if not os.path.isdir(rootdir):
+        return [f'The MDL folder "{rootdir}" does not exist.']
+
+    errors = []
+    filepaths = mdl_files(rootdir)
+    mdl_msn_list = [os.path.basename(filepath)[:4] for filepath in filepaths]
+
+    # Check that MDL names and MSNs inside JSON match
+    if all_msn_list is not None:
+        missing_mdl_list = [x for x in all_msn_list if x not in mdl_msn_list]
+        missing_json_list = [x for x in mdl_msn_list if x not in all_msn_list]
+        if missing_mdl_list:
+            errors.append('The MDLs of the MSNs ' + ', '.join(missing_mdl_list) + ' are missing.')
+        if missing_json_list:
+            errors.append('The MSNs ' + ', '.join(missing_json_list) + ' are missing from the JSON file.')
+
+    # Check the sheets and headers
+    for filepath, msn in zip(filepaths, mdl_msn_list):
+        if only_msn_list is not None and msn not in only_msn_list: continue
+        sheets = MDL_SHEETS_FOR_ALL + (MDL_SHEETS_FOR_CURRENT if msn in current_msn_list else [])
+        required = {MDL_SHEETS[sheet]['name']: MDL_SHEETS[sheet]['columns'] + ['DIFF'] for sheet in sheets}
+        errors += check_headers(filepath, required)
+
+    return errors
+
+
+def preflight_pseudo_db(filepath: str):
+    """
+    Check the PseudoDataBase before "read_pseudo_db". Returns a list with the errors.
+    A PseudoDataBase for CC is also checked for changes outside its editable columns.
+    """
+    from bin.pseudo_db import PSEUDO_DB_COLUMNS
+    from bin.pseudo_db_cc import cc_edit_errors
+
+    if not os.path.isfile(filepath):
+        return [f'The PseudoDataBase "{filepath}" does not exist.']
+    errors = check_headers(filepath, {PSEUDO_DB_SHEET: PSEUDO_DB_COLUMNS})
+    return errors or cc_edit_errors(filepath)
+
+
+if __name__ == '__main__':
+    import time
+    from bin.setup_follow_up import read_JSON
+
+    parser = argparse.ArgumentParser(description='Check an MDL folder (and a PseudoDataBase) without reading them.')
+    parser.add_argument('rootdir', help='Folder with MDLs')
+    parser.add_argument('--json', default='_JSON/INPUT_MSNs.json', help='JSON with the MSNs. (Default=_JSON/INPUT_MSNs.json)')
+    parser.add_argument('--pseudo-db', help='PseudoDataBase to check too.')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    json_MSNs = read_JSON(args.json)
+    errors = preflight_MDLs(args.rootdir, json_MSNs['all'], json_MSNs['new'] + json_MSNs['rev'])
+    if args.pseudo_db:
+        errors += preflight_pseudo_db(args.pseudo_db)
+    print('\n'.join(errors) if errors else 'No errors.')
+    print(f'Checked in {time.perf_counter() - start:.3f} s.')
+    sys.exit(1 if errors else 0)
@@ -0,0 +1,313 @@
+##########################################################################################
+# Filename:     ps_graph.py
+# For:          Follow_Up_Creation_Tool
+# Author:       Spyros Acheimastos (acheimastos@althom.eu)
+# Date:         19/10/2026
+##########################################################################################
+
+#   Adjacency index of the Product Structure (the 'PS' sheet), for "where is this child used" and
+#   "explode this parent for MSN X" questions without filtering the sheet inside Excel.
+#   Every Part Number gets a code (its position in the sorted Part Numbers), and the edges
+#   (PARENT NUMBER -> CHILD NUMBER) are kept twice in CSR form: grouped by parent and grouped by child.
+#   The children or the parents of a Part Number are one slice, so a query only touches the edges it returns.
+#   The effectivity of every edge is kept as bits (see "effectivity_bits"), so filtering by MSN is one bit test.
+#   The index is saved when the Follow-up is saved, inside '_PS_Graph' (i.e. '_PS_Graph/EFW Follow-up R11.1a2b3c4d.pkl',
+#   where '1a2b3c4d' comes from the full path of the Follow-up), so nothing is added to the folders of the Follow-ups.
+#   Only the PS_GRAPH_FILES most recently saved indexes are kept (a few MB each). The folder can be deleted at any time,
+#   the index of a Follow-up is built again from its 'PS' sheet when it is needed.
+#
+#   Usage: python -m bin.ps_graph "EFW Follow-up R11.xlsx" --where-used D113R1202-000-00 --msn 1250
+
+import os
+import time
+import pickle
+import hashlib
+import argparse
+import regex as re
+import numpy as np
+import pandas as pd
+
+from bin.effectivity import (
+    effectivity_bits,
+    effectivity_strings
+)
+from bin.setup_follow_up import EFFECTIVE_SYMBOLS
+from bin.sidecar import (
+    excel_signature,
+    load_sidecar,
+    read_sheet
+)
+from bin.pseudo_db_cc import read_sheet_values
+from bin.reference_workbook import main_filepath, reference_sheets_filepath
+
+
+SCRIPT_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+PS_GRAPH_DIRECTORY = os.path.join(os.path.dirname(SCRIPT_DIRECTORY), '_PS_Graph')
+PS_GRAPH_FILES = 10                                 # Indexes kept inside PS_GRAPH_DIRECTORY
+PS_GRAPH_COLUMNS = ['DEPTH', 'PART NUMBER', 'TITLE', 'LEVEL', 'EFFECTIVITY']
+
+
+def csr(keys: np.ndarray, n_nodes: int):
+    """Order of the edges grouped by 'keys', and the offsets of every node inside this order."""
+    order = np.argsort(keys, kind='stable')
+    offsets = np.searchsorted(keys[order], np.arange(n_nodes + 1))
+    return order, offsets
+
+
+class PSGraph:
+    """
+    Adjacency index of a PS DataFrame.
+
+    Args:
+    ----------
+        df_ps:
+            The merged PS (the result of "merge_dfs" or "prepare_ps", or the 'PS' sheet of a Follow-up),
+            with 'PARENT NUMBER', 'LEVEL', 'CHILD NUMBER', 'CHILD TITLE' and one column per MDL.
+    """
+    def __init__(self, df_ps: pd.DataFrame):
+        mdl_list = [x for x in list(df_ps.columns) if re.findall(r'MDL', x)]
+        self.msn_list = [x[:4] for x in mdl_list]
+
+        parents = df_ps['PARENT NUMBER'].fillna('').astype(str).to_numpy(dtype=object)
+        children = df_ps['CHILD NUMBER'].fillna('').astype(str).to_numpy(dtype=object)
+        self.part_numbers = np.unique(np.concatenate([parents, children]).astype(str)).astype(object)
+        n_nodes = len(self.part_numbers)
+
+        # Edges
+        self.parent = np.searchsorted(self.part_numbers, parents).astype(np.int64)
+        self.child = np.searchsorted(self.part_numbers, children).astype(np.int64)
+        self.level = df_ps['LEVEL'].astype(object).fillna('').astype(str).to_numpy(dtype=object)
+        self.bits = effectivity_bits(df_ps, mdl_list, EFFECTIVE_SYMBOLS)
+
+        # Title of every Part Number (from the edges where it is a child)
+        self.titles = np.full(n_nodes, '', dtype=object)
+        child_titles = df_ps['CHILD TITLE'].fillna('').astype(str).to_numpy(dtype=object)
+        self.titles[self.child[::-1]] = child_titles[::-1]
+
+        # CSR: the edges of a parent (down) and the edges of a child (up)
+        self.down_order, self.down_offsets = csr(self.parent, n_nodes)
+        self.up_order, self.up_offsets = csr(self.child, n_nodes)
+
+    def __len__(self):
+        return len(self.parent)
+
+    def code(self, part_number: str):
+        """The code of a Part Number, or None if it is not inside the PS."""
+        idx = np.searchsorted(self.part_numbers, part_number)
+        if idx < len(self.part_numbers) and self.part_numbers[idx] == part_number:
+            return int(idx)
+        return None
+
+    def search(self, prefix: str, limit: int = 50):
+        """The Part Numbers that start with 'prefix' (at most 'limit')."""
+        start = np.searchsorted(self.part_numbers, prefix)
+        stop = np.searchsorted(self.part_numbers, prefix + '\uffff')
+        return self.part_numbers[start:min(stop, start + limit)].tolist()
+
+    def msn_bit(self, msn: str):
+        """(byte, mask) of the effectivity bit of an MSN. Raises KeyError if there is no MDL for the MSN."""
+        if msn not in self.msn_list:
+            raise KeyError(f'There is no MDL for MSN {msn} inside the PS.')
+        j = self.msn_list.index(msn)
+        return j // 8, np.uint8(1 << (7 - j % 8))
+
+    def walk(self, part_number: str, direction: str, msn: str = None, max_depth: int = None):
+        """
+        Depth-first walk from a Part Number, through the edges that are effective on 'msn'.
+        A Part Number that was already expanded is listed again but not expanded again (also protects from cycles).
+
+        Args:
+        ----------
+            part_number:
+                The Part Number to start from.
+
+            direction:
+                'up' for the parents (where-used) or 'down' for the children (explode).
+
+            msn:
+                Keep only the edges that are effective on this MSN. If None, all the edges. (Default=None)
+
+            max_depth:
+                Stop at this depth. If None, until the top assemblies or the last children. (Default=None)
+
+        Returns:
+        ----------
+            df:
+                One row for every Part Number reached, in the order of the tree: 'DEPTH', 'PART NUMBER',
+                'TITLE', and 'LEVEL' and 'EFFECTIVITY' of the edge from the previous Part Number.
+                Raises KeyError if the Part Number is not inside the PS.
+        """
+        start = self.code(part_number)
+        if start is None:
+            raise KeyError(f'{part_number} is not inside the PS.')
+        if direction == 'up':
+            order, offsets, other_end = self.up_order, self.up_offsets, self.parent
+        else:
+            order, offsets, other_end = self.down_order, self.down_offsets, self.child
+        msn_byte, msn_mask = self.msn_bit(msn) if msn is not None else (None, None)
+
+        # Pre-order of the tree: a row is added when it is popped, then its own edges are pushed
+        depths, nodes, edges = [], [], []
+        expanded = set()
+        stack = [(start, 0, None)]
+        while stack:
+            node, depth, edge = stack.pop()
+            if edge is not None:
+                depths.append(depth)
+                nodes.append(node)
+                edges.append(edge)
+            if node in expanded or (max_depth is not None and depth >= max_depth):
+                continue
+            expanded.add(node)
+            node_edges = order[offsets[node]:offsets[node + 1]]
+            if msn_byte is not None:
+                node_edges = node_edges[(self.bits[node_edges, msn_byte] & msn_mask) != 0]
+            # Reversed, so that they are popped in the order of the PS
+            stack.extend((other_end[x], depth + 1, x) for x in node_edges[::-1])
+
+        return self.tree_frame(depths, nodes, edges)
+
+    def tree_frame(self, depths: list, nodes: list, edges: list):
+        """The rows of "walk" as a DataFrame."""
+        edges = np.array(edges, dtype=np.int64)
+        nodes = np.array(nodes, dtype=np.int64)
+        return pd.DataFrame({
+            'DEPTH': np.array(depths, dtype=np.int64),
+            'PART NUMBER': self.part_numbers[nodes],
+            'TITLE': self.titles[nodes],
+            'LEVEL': self.level[edges],
+            'EFFECTIVITY': effectivity_strings(self.bits[edges], self.msn_list),
+        }, columns=PS_GRAPH_COLUMNS)
+
+    def where_used(self, part_number: str, msn: str = None, max_depth: int = None):
+        """The parents of a Part Number up to the top assemblies (see "walk")."""
+        return self.walk(part_number, 'up', msn=msn, max_depth=max_depth)
+
+    def explode(self, part_number: str, msn: str = None, max_depth: int = None):
+        """The children of a Part Number down to the last children (see "walk")."""
+        return self.walk(part_number, 'down', msn=msn, max_depth=max_depth)
+
+
+def ps_graph_filepath(excelfilepath: str, directory: str = PS_GRAPH_DIRECTORY):
+    """Filepath of the PS index of a Follow-up. i.e. "_PS_Graph/EFW Follow-up R11.1a2b3c4d.pkl" """
+    name = os.path.splitext(os.path.basename(excelfilepath))[0]
+    path_hash = hashlib.sha1(os.path.normcase(os.path.abspath(excelfilepath)).encode()).hexdigest()[:8]
+    return os.path.join(directory, f'{name}.{path_hash}.pkl')
+
+
+def prune_ps_graphs(directory: str = PS_GRAPH_DIRECTORY, keep: int = PS_GRAPH_FILES):
+    """Delete the oldest PS indexes of 'directory', keeping the 'keep' most recently saved."""
+    filepaths = [os.path.join(directory, x) for x in os.listdir(directory) if x.endswith('.pkl')]
+    for filepath in sorted(filepaths, key=os.path.getmtime)[:-keep or None]:
+        os.remove(filepath)
+
+
+def save_ps_graph(excelfilepath: str, ps_graph: PSGraph, directory: str = PS_GRAPH_DIRECTORY):
+    """Save the PS index of the Follow-up inside 'directory'. Call it after the Excel is saved."""
+    os.makedirs(directory, exist_ok=True)
+    filepath = ps_graph_filepath(excelfilepath, directory)
+    with open(filepath + '.tmp', 'wb') as f:
+        pickle.dump({'excel_signature': excel_signature(excelfilepath), 'ps_graph': ps_graph}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(filepath + '.tmp', filepath)
+    prune_ps_graphs(directory, PS_GRAPH_FILES)
+
+
+def load_ps_graph(excelfilepath: str, directory: str = PS_GRAPH_DIRECTORY):
+    """The PS index of a Follow-up, or None if there is no index or the Excel has changed since it was saved."""
+    filepath = ps_graph_filepath(excelfilepath, directory)
+    if not os.path.isfile(filepath):
+        return None
+    try:
+        with open(filepath, 'rb') as f:
+            saved = pickle.load(f)
+    except Exception:
+        return None
+
+    if saved['excel_signature'] != excel_signature(excelfilepath):
+        return None
+    return saved['ps_graph']
+
+
+def ps_graph_for_follow_up(excelfilepath: str):
+    """
+    The PS index of a Follow-up. If it was not saved with the Follow-up (or the Excel has changed),
+    it is built from the 'PS' sheet (from the sidecar if there is one) and saved for the next time.
+    The index is kept for the main Excel, also when 'PS' is inside the reference Excel (see "reference_workbook").
+    """
+    excelfilepath = main_filepath(excelfilepath)
+    ps_graph = load_ps_graph(excelfilepath)
+    if ps_graph is not None:
+        return ps_graph
+
+    filepath_ps = reference_sheets_filepath(excelfilepath)
+    df_ps = read_sheet_values(filepath_ps, 'PS', number_columns=['LEVEL'])
+    if df_ps is None:
+        df_ps = read_sheet(filepath_ps, 'PS', load_sidecar(filepath_ps))
+    ps_graph = PSGraph(df_ps)
+    save_ps_graph(excelfilepath, ps_graph)
+    return ps_graph
+
+
+def tree_lines(df: pd.DataFrame, indent: str = '    '):
+    """The rows of "walk" as indented text lines (one for every Part Number)."""
+    return [
+        '{}{}  {}  [LEVEL {}]  ({})'.format(indent * (depth - 1), pn, title, level, effectivity)
+        for depth, pn, title, level, effectivity in df[PS_GRAPH_COLUMNS].itertuples(index=False)
+    ]
+
+
+def check_ps_graph(ps_graph: PSGraph, df_ps: pd.DataFrame, n_sample: int = 500):
+    """
+    Compare the first level of "where_used" and "explode" with the same filtering on the PS DataFrame.
+    Returns the list of Part Numbers with a different answer.
+    """
+    mdl_list = [x for x in list(df_ps.columns) if re.findall(r'MDL', x)]
+    rng = np.random.default_rng(0)
+    part_numbers = rng.choice(ps_graph.part_numbers, size=min(n_sample, len(ps_graph.part_numbers)), replace=False)
+    msn_list = rng.choice(ps_graph.msn_list, size=len(part_numbers))
+
+    errors = []
+    for pn, msn in zip(part_numbers, msn_list):
+        mdl = mdl_list[ps_graph.msn_list.index(msn)]
+        is_effective = df_ps[mdl].isin(EFFECTIVE_SYMBOLS)
+        expected_up = sorted(df_ps.loc[(df_ps['CHILD NUMBER'] == pn) & is_effective, 'PARENT NUMBER'])
+        expected_down = sorted(df_ps.loc[(df_ps['PARENT NUMBER'] == pn) & is_effective, 'CHILD NUMBER'])
+        up = sorted(ps_graph.where_used(pn, msn=msn, max_depth=1)['PART NUMBER'])
+        down = sorted(ps_graph.explode(pn, msn=msn, max_depth=1)['PART NUMBER'])
+        if up != expected_up or down != expected_down:
+            errors.append(pn)
+    return errors
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Where-used and explode queries on the PS of a Follow-up.')
+    parser.add_argument('follow_up', help='Filepath of the Follow-up (its PS index is built the first time).')
+    query = parser.add_mutually_exclusive_group(required=True)
+    query.add_argument('--where-used', metavar='PN', help='The parents of PN up to the top assemblies.')
+    query.add_argument('--explode', metavar='PN', help='The children of PN down to the last children.')
+    query.add_argument('--search', metavar='PREFIX', help='The Part Numbers that start with PREFIX.')
+    query.add_argument('--check', action='store_true', help='Compare the index with filtering the PS sheet with pandas.')
+    parser.add_argument('--msn', help='Only the edges that are effective on this MSN.')
+    parser.add_argument('--depth', type=int, help='Maximum depth of the tree.')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    ps_graph = ps_graph_for_follow_up(args.follow_up)
+    print(f'PS index with {len(ps_graph.part_numbers)} Part Numbers and {len(ps_graph)} edges loaded in {time.perf_counter() - start:.2f} s.')
+
+    if args.check:
+        df_ps = read_sheet(args.follow_up, 'PS', load_sidecar(args.follow_up))
+        errors = check_ps_graph(ps_graph, df_ps)
+        print('Same answers as the PS sheet.' if not errors else f'Different answers for: {", ".join(errors)}')
+    elif args.search is not None:
+        for pn in ps_graph.search(args.search):
+            print(pn)
+    else:
+        start = time.perf_counter()
+        if args.where_used is not None:
+            df = ps_graph.where_used(args.where_used, msn=args.msn, max_depth=args.depth)
+        else:
+            df = ps_graph.explode(args.explode, msn=args.msn, max_depth=args.depth)
+        elapsed = time.perf_counter() - start
+        print('\n'.join(tree_lines(df)))
+        print(f'{len(df)} rows in {elapsed * 1000:.1f} ms.')
@@ -11,7 +11,8 @@ import warnings
 import regex as re
 import numpy as np
 import pandas as pd
-from functools import reduce
+from bin.engine import get_engine, sort_codes
+from bin.pseudo_db_cc import read_pseudo_db_for_CC, CC_ROW_ID_COLUMN
 
 COLOR_HEADER_YELLOW = '#FFD966'
 COLOR_HEADER_BLUE = '#9BC2E6'
@@ -26,6 +27,49 @@ BOOK_COLUMN_LIST = ['IPC', 'SRM A321', 'SRM A320']
 POSSIBLE_SHEET_NAMES = ['IPC Follow-up', 'SRM A321 Follow-up', 'SRM Follow-up', 'SRM A320 Follow-up']
 PSEUDO_DB_COLUMNS = ['PART NUMBER', 'CSN', 'Fig', 'Type', 'BOM Parts', 'PART TITLE', 'IPC', 'SRM A321', 'SRM A320']
 
+def drop_duplicate_keys(df: pd.DataFrame, sort_list: list, ascending=True):
+    """
+    Keep one line for each 'PART NUMBER'/'CSN'/'Fig'/'Type' and return the result sorted by 'sort_list'.
+    Same result as "df.sort_values(by=sort_list, ascending=ascending).drop_duplicates(subset=KEEP_COLUMN_LIST[:-2])",
+    but the strings are hashed once to integer codes, only the codes are sorted and the dedupe needs no extra hashing.
+
+    Args:
+    ----------
+        df:
+            The PseudoDataBase DataFrame with duplicate keys.
+
+        sort_list:
+            The columns to sort by, starting with the key columns. The first line of every key in this order is kept (i.e. TRUE before FALSE).
+
+        ascending:
+            Same as in "sort_values". (Default=True)
+
+    Returns:
+    ----------
+        df_unique:
+            The sorted DataFrame with one line for each key.
+    """
+    engine = get_engine()
+    if engine.name != 'pandas':
+        return engine.sort_drop_duplicates(df, sort_list, ascending, KEEP_COLUMN_LIST[:-2]).reset_index(drop=True)
+
+    if isinstance(ascending, bool):
+        ascending = [ascending] * len(sort_list)
+    codes = [sort_codes(df[column], asc) for column, asc in zip(sort_list, ascending)]
+
+    # Stable sort on the codes (the last key of "np.lexsort" is the primary one)
+    order = np.lexsort(codes[::-1])
+
+    # The key is the start of 'sort_list', so the lines of every key are next to each other. Keep the first of each
+    is_first = np.zeros(len(order), dtype=bool)
+    is_first[:1] = True
+    for key_codes in codes[:len(KEEP_COLUMN_LIST[:-2])]:
+        key_codes = key_codes[order]
+        is_first[1:] |= key_codes[1:] != key_codes[:-1]
+    order = order[is_first]
+
+    return df.iloc[order].reset_index(drop=True)
+
 def follow_up_to_pseudo_db(filepath: str):
     """
     Read a Follow-up Excel and combine Sheets 'IPC Follow-up', 'SRM A321 Follow-up', 'SRM A320 Follow-up' 
@@ -95,7 +139,7 @@ def follow_up_to_pseudo_db(filepath: str):
 
 
         # Combine IPC, SRM A321, SRM A320
-        df_merged = reduce(lambda left, right: pd.merge(left, right, on=KEEP_COLUMN_LIST, how='outer'), df_list)
+        df_merged = get_engine().outer_merge(df_list, KEEP_COLUMN_LIST)
         
         # Add column in case one of the books is missing in this Follow-Up version (i.e. Follow-up R07 doesn't have SRM A320)
         missing_BOOK_COLUMN_LIST = [x for x in BOOK_COLUMN_LIST if x not in list(df_merged.columns)]
@@ -127,7 +171,7 @@ def follow_up_to_pseudo_db(filepath: str):
             df_merged['Fig'] = df_merged.apply(lambda row: row['Fig'][:-1] if row['Type'] == 'AIB' and re.findall(r'^\d+[A-R]$', row['Fig']) else row['Fig'], axis=1)
 
             # Sort and drop duplicates
-            df_merged = df_merged.sort_values(by=KEEP_COLUMN_LIST).drop_duplicates(subset=KEEP_COLUMN_LIST[:-2]).reset_index(drop=True)
+            df_merged = drop_duplicate_keys(df_merged, KEEP_COLUMN_LIST)
 
         else:
             # Removing letter from AIB figures
@@ -137,7 +181,7 @@ def follow_up_to_pseudo_db(filepath: str):
             df_merged.loc[~df_merged['Type'].isin(['EFW', 'AIB', 'TBD']), 'Type'] = 'TBD'
 
             # Sort and drop duplicates     
-            df_merged = df_merged.sort_values(by=KEEP_COLUMN_LIST).drop_duplicates(subset=KEEP_COLUMN_LIST[:-2]).reset_index(drop=True)
+            df_merged = drop_duplicate_keys(df_merged, KEEP_COLUMN_LIST)
 
 
         # Vasilis reportred losing things from SRM A320/A321
@@ -151,6 +195,7 @@ def follow_up_to_pseudo_db(filepath: str):
 def merge_pseudo_dbs(list_of_dfs: list):
     """
     Take a list of PseudoDataBases and combine them.
+    The result does not depend on the order of the list, so any number of PseudoDataBases can be merged at once.
 
     Args:
     ----------
@@ -172,8 +217,9 @@ def merge_pseudo_dbs(list_of_dfs: list):
     # for x in list_of_dfs:
     #     print('The types of columns is:')
     #     print(x.dtypes)
-    df_merged = reduce(lambda left, right: pd.merge(left, right, how='outer'), list_of_dfs)
-    df_merged = df_merged.sort_values(by=final_sort_list, ascending=final_sort_ascending_list).drop_duplicates(subset=KEEP_COLUMN_LIST[:-2]).reset_index(drop=True)
+    # One n-way concat instead of pairwise outer merges. Same rows, because duplicates are dropped right after
+    df_merged = pd.concat(list_of_dfs, ignore_index=True)
+    df_merged = drop_duplicate_keys(df_merged, final_sort_list, ascending=final_sort_ascending_list)
     # df_merged = df_merged.drop_duplicates(subset=KEEP_COLUMN_LIST[:-2]).reset_index(drop=True)
 
 
@@ -248,7 +294,11 @@ def read_pseudo_db(filepath: str):
             The PseudoDataBase DataFrame.
     """
 
-    df_pseudo_db = pd.read_excel(filepath, dtype=str, sheet_name='Pseudo_Data_Base')
+    # The PseudoDataBase for CC is read using its stored copy (if it exists)
+    df_pseudo_db = read_pseudo_db_for_CC(filepath)
+    if df_pseudo_db is None:
+        df_pseudo_db = pd.read_excel(filepath, dtype=str, sheet_name='Pseudo_Data_Base')
+        df_pseudo_db = df_pseudo_db.drop(columns=[CC_ROW_ID_COLUMN], errors='ignore')
 
     # Check column names
     if set(df_pseudo_db.columns) != set(PSEUDO_DB_COLUMNS):
@@ -275,7 +325,33 @@ def read_pseudo_db(filepath: str):
 
 
 
-def gnrt_lines_and_split(df_initial: pd.DataFrame, df_pseudo_db: pd.DataFrame, A320_msn_list: list):
+def get_title_mismatches(df_gnrt: pd.DataFrame):
+    """
+    Find the lines where the Title in the MDLs ('PART TITLE_x') is different from the Title in the PseudoDataBase ('PART TITLE_y').
+
+    Returns:
+    ----------
+        df_mismatch:
+            DataFrame with columns 'PART NUMBER', 'MDL TITLE', 'PDB TITLE' (one line for each unique mismatch).
+    """
+    is_different = (df_gnrt['PART TITLE_x'] != df_gnrt['PART TITLE_y']).to_numpy()
+    df_mismatch = df_gnrt.loc[is_different, ['PART NUMBER', 'PART TITLE_x', 'PART TITLE_y']]
+    df_mismatch = df_mismatch.rename(columns={'PART TITLE_x': 'MDL TITLE', 'PART TITLE_y': 'PDB TITLE'})
+
+    return df_mismatch.drop_duplicates().reset_index(drop=True)
+
+
+def title_mismatch_lines(df_mismatch: pd.DataFrame):
+    """The lines that report the DataFrame from "get_title_mismatches" (none if it is empty)."""
+    if df_mismatch.empty:
+        return []
+    lines = [f'{len(df_mismatch)} Part Numbers have a different Title in the MDLs and in the PseudoDataBase (the Title of the MDL is kept):']
+    for _, row in df_mismatch.iterrows():
+        lines.append('    PN: {} \t MDL: "{}" \t PDB: "{}"'.format(row['PART NUMBER'], row['MDL TITLE'], row['PDB TITLE']))
+    return lines
+
+
+def gnrt_lines_and_split(df_initial: pd.DataFrame, df_pseudo_db: pd.DataFrame, A320_msn_list: list, return_mismatches: bool = False):
     """
      Generate new lines for the Follow-up using the PseudoDataBase, and then split them into 'IPC', 'SRM A321', 'SRM A320'.
 
@@ -290,6 +366,10 @@ def gnrt_lines_and_split(df_initial: pd.DataFrame, df_pseudo_db: pd.DataFrame, A
         A320_msn_list:
             A list with A320 MSNs.
 
+        return_mismatches:
+            Also return the DataFrame from "get_title_mismatches". (Default=False)
+            Then the mismatches are not printed; the caller reports them.
+
     Returns:
     ----------
         df_IPC:                  
@@ -301,6 +381,9 @@ def gnrt_lines_and_split(df_initial: pd.DataFrame, df_pseudo_db: pd.DataFrame, A
         df_SRM_A320:                  
             The DataFrame for the SRM A320 with the generated lines
 
+        df_mismatch:
+            Only if 'return_mismatches'. The Part Numbers with a different Title in the MDLs and in the PseudoDataBase.
+
     Columns of Returned:
     ----------
         - 'PART NUMBER'
@@ -319,43 +402,37 @@ def gnrt_lines_and_split(df_initial: pd.DataFrame, df_pseudo_db: pd.DataFrame, A
 
     # Convert to boolean and convert TBDs to 'True'
     # Spyros 25/10/22: I added '.fillna(True)' just to be sure
-    df_pseudo_db['IPC'] = df_pseudo_db['IPC'].fillna(True).replace({'True': True, 'False': False, 'TBD': True})
-    df_pseudo_db['SRM A321'] = df_pseudo_db['SRM A321'].fillna(True).replace({'True': True, 'False': False, 'TBD': True})
-    df_pseudo_db['SRM A320'] = df_pseudo_db['SRM A320'].fillna(True).replace({'True': True, 'False': False, 'TBD': True})
+    df_pseudo_db[BOOK_COLUMN_LIST] = df_pseudo_db[BOOK_COLUMN_LIST].fillna(True).replace({'True': True, 'False': False, 'TBD': True})
 
     # Update 05/12/22: Removed 'TBD' to 'EFW'
     # Maybe convert TBDs 'Type' to 'EFW' to not lose any info ?????????????
     # df_pseudo_db['Type'] = df_pseudo_db['Type'].replace({'TBD': 'EFW'})
 
     # Generate new lines
-    df_gnrt = df_initial.merge(df_pseudo_db, how='left', on=['PART NUMBER'])
+    df_gnrt = get_engine().left_merge(df_initial, df_pseudo_db, ['PART NUMBER'])
 
     # Check for different titles
-    try:
-        df_gnrt['Different Title'] = df_gnrt.apply(lambda row: True if row['PART TITLE_x'] != row['PART TITLE_y'] else False, axis=1)
-
-        print('Some Part Numbers have a different Title in the MDLs and in the PseudoDataBase:')
-        for idx, row in df_gnrt.loc[df_gnrt['Different Title'] == True].iterrows():
-            print('PN: {} \t MDL: "{}" \t PDB: "{}"'.format(row['PART NUMBER'], row['PART TITLE_x'], row['PART TITLE_y']))
+    if 'PART TITLE_y' in df_gnrt.columns:
+        df_mismatch = get_title_mismatches(df_gnrt)
+        if not df_mismatch.empty and not return_mismatches:
+            print('Some Part Numbers have a different Title in the MDLs and in the PseudoDataBase:')
+            print(df_mismatch.to_string(index=False))
 
         # Rename and Drop x/y. Keep the title from the MDL
         df_gnrt = df_gnrt.rename({'PART TITLE_x': 'PART TITLE'}, axis=1)
-        df_gnrt = df_gnrt.drop(columns=['Different Title', 'PART TITLE_y'])
-
-    except KeyError:
-        print('Part Numbers have the same Title in the MDLs and in the PseudoDataBase:')
-        pass
-
-    # Split gnrted lines into the correct manual
-    df_IPC =  df_gnrt.loc[df_gnrt['IPC'] == True]
-    df_SRM_A321 =  df_gnrt.loc[df_gnrt['SRM A321'] == True]
-    df_SRM_A320 =  df_gnrt.loc[df_gnrt['SRM A320'] == True]
-
-    # Sort and Keep only certain columns
+        df_gnrt = df_gnrt.drop(columns=['PART TITLE_y'])
+    else:
+        if not return_mismatches:
+            print('Part Numbers have the same Title in the MDLs and in the PseudoDataBase:')
+        df_mismatch = pd.DataFrame(columns=['PART NUMBER', 'MDL TITLE', 'PDB TITLE'])
+
+    # Sort once and split gnrted lines into the correct manual with one mask for each manual
+    # (sorting on many columns is stable, so it is the same as sorting each manual separately)
     keep_only_list = ['PART NUMBER', 'CSN', 'Fig', 'Type', 'PART TITLE'] + mns_column_list
-    df_IPC = df_IPC[keep_only_list].sort_values(by=['PART NUMBER', 'CSN', 'Fig', 'Type', 'PART TITLE']).reset_index(drop=True)
-    df_SRM_A321 = df_SRM_A321[keep_only_list].sort_values(by=['PART NUMBER', 'CSN', 'Fig', 'Type', 'PART TITLE']).reset_index(drop=True)
-    df_SRM_A320 = df_SRM_A320[keep_only_list].sort_values(by=['PART NUMBER', 'CSN', 'Fig', 'Type', 'PART TITLE']).reset_index(drop=True)
+    df_gnrt = df_gnrt[keep_only_list + BOOK_COLUMN_LIST].sort_values(by=['PART NUMBER', 'CSN', 'Fig', 'Type', 'PART TITLE'])
+    book_mask = df_gnrt[BOOK_COLUMN_LIST].eq(True).to_numpy()
+    df_gnrt = df_gnrt[keep_only_list]
+    df_IPC, df_SRM_A321, df_SRM_A320 = [df_gnrt.loc[book_mask[:, idx]].reset_index(drop=True) for idx in range(len(BOOK_COLUMN_LIST))]
 
     # Subtract MSN columns from 'df_SRM_A321' and 'df_SRM_A320' based on A320_msn_list
     all_msn_column_names = [x for x in list(df_IPC.columns) if re.findall(r'^\d{4}', x)]
@@ -365,6 +442,8 @@ def gnrt_lines_and_split(df_initial: pd.DataFrame, df_pseudo_db: pd.DataFrame, A
     df_SRM_A320 = df_SRM_A320.drop(columns=[x for x in all_msn_column_names if x[:4] not in A320_msn_list], axis=1)
     if not A320_msn_list: df_SRM_A320 = None
 
+    if return_mismatches:
+        return df_IPC, df_SRM_A321, df_SRM_A320, df_mismatch
     return df_IPC, df_SRM_A321, df_SRM_A320
 
 
@@ -0,0 +1,320 @@
+##########################################################################################
+# Filename:     pseudo_db_cc.py
+# For:          Follow_Up_Creation_Tool
+# Author:       Spyros Acheimastos (acheimastos@althom.eu)
+# Date:         19/10/2026
+##########################################################################################
+
+#   The PseudoDataBase for CC (Step-2 of 'Create Follow-up'), re-imported by Step-3.
+#   Between the two steps a user only changes the columns 'Type', 'IPC', 'SRM A321' and 'SRM A320'.
+#   The export has a hidden 'ROW ID' column (it follows the rows when the user sorts or filters), and a
+#   stored copy is saved next to it (i.e. 'PSDB_R11_for_CC.cc.pkl') with the exported rows and the
+#   fingerprint of every row without the editable columns.
+#   On re-import the cells of the sheet are read straight from the XML of the .xlsx (much faster than
+#   "pd.read_excel"), the editable columns are taken from the Excel and the rest from the stored copy.
+#   Cells of the other columns that were edited by accident are found with the fingerprints and reported as errors
+#   before the run (see "cc_edit_errors"), so that the user decides: nothing is restored behind their back.
+#   Without the stored copy (or when it belongs to another export, or was edited) the Excel is read as before.
+
+import os
+import html
+import pickle
+import hashlib
+import zipfile
+import numpy as np
+import pandas as pd
+import regex as re
+from pandas._libs.parsers import STR_NA_VALUES
+
+from bin.preflight import workbook_sheets, PSEUDO_DB_SHEET
+from bin.sidecar import frame_as_read
+
+
+CC_ROW_ID_COLUMN = 'ROW ID'
+CC_EDITABLE_COLUMNS = ['Type', 'IPC', 'SRM A321', 'SRM A320']
+CC_STORE_EXTENSION = '.cc.pkl'
+CC_FINGERPRINT_PROPERTY = 'PseudoDataBase Fingerprint'
+
+_CELL_PATTERN = re.compile(
+    rb'<c r="([A-Z]+)(\d+)"[^>]*?(?: t="(\w+)")?[^>t]*(?:/>|>(?:<f\b[^>]*?(?:/>|>.*?</f>))?(?:<v>(.*?)</v>|<is>(.*?)</is>)?</c>)',
+    re.DOTALL
+)
+_SHARED_STRING_PATTERN = re.compile(rb'<si>(.*?)</si>|<si/>', re.DOTALL)
+_PHONETIC_PATTERN = re.compile(rb'<rPh\b.*?</rPh>', re.DOTALL)
+_TEXT_PATTERN = re.compile(rb'<t\b[^>]*?(?:/>|>(.*?)</t>)', re.DOTALL)
+_PROPERTY_PATTERN = r'<property\b[^>]*?\bname="{}"[^>]*>\s*<vt:lpwstr>(.*?)</vt:lpwstr>'
+
+
+def cc_store_filepath(excelfilepath: str):
+    """Filepath of the stored copy of a PseudoDataBase for CC."""
+    return os.path.splitext(excelfilepath)[0] + CC_STORE_EXTENSION
+
+
+def frozen_columns(columns: list):
+    """The columns that the user should not change."""
+    return [x for x in columns if x not in CC_EDITABLE_COLUMNS and x != CC_ROW_ID_COLUMN]
+
+
+def row_fingerprints(df: pd.DataFrame, columns: list):
+    """Array with a 64-bit hash for every row of 'df', from 'columns' only."""
+    return pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+
+
+def pseudo_db_for_CC_to_excel(df: pd.DataFrame, excelfilepath: str):
+    """
+    Save the PseudoDataBase for CC with its row identity, and its stored copy next to it.
+
+    Args:
+    ----------
+        df:
+            The PseudoDataBase DataFrame (from "create_pseudo_db_for_CC").
+
+        excelfilepath:
+            The filepath of the Excel that will be created.
+    """
+    from bin.save_to_excel import pseudo_db_to_excel
+
+    df_as_read = frame_as_read(df)
+    columns = list(df_as_read.columns)
+    rows = row_fingerprints(df_as_read, frozen_columns(columns))
+    fingerprint = hashlib.sha1(repr(columns).encode() + rows.tobytes()).hexdigest()
+
+    df_cc = df.reset_index(drop=True)
+    df_cc[CC_ROW_ID_COLUMN] = np.arange(1, len(df_cc) + 1)
+    pseudo_db_to_excel(df_cc, excelfilepath, custom_properties={CC_FINGERPRINT_PROPERTY: fingerprint})
+
+    store = {'fingerprint': fingerprint, 'df': df_as_read, 'row_fingerprints': rows}
+    filepath = cc_store_filepath(excelfilepath)
+    with open(filepath + '.tmp', 'wb') as f:
+        pickle.dump(store, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(filepath + '.tmp', filepath)
+
+
+def column_index(letters: bytes):
+    """Zero-based index of a column from its letters (b'A' -> 0)."""
+    idx = 0
+    for x in letters:
+        idx = idx * 26 + x - 64
+    return idx - 1
+
+
+def decode_text(text: bytes):
+    """The string of the text of a cell, as openpyxl reads it, or None if it has escaped characters (i.e. '_x000D_')."""
+    if b'_x' in text:
+        return None
+    return html.unescape(text.replace(b'\r\n', b'\n').replace(b'\r', b'\n').decode('utf-8'))
+
+
+def read_shared_strings(zf: zipfile.ZipFile):
+    """Array with all the shared strings of an .xlsx (the NA strings are NaN), or None if a string cannot be read."""
+    strings = []
+    if 'xl/sharedStrings.xml' in zf.namelist():
+        for item in _SHARED_STRING_PATTERN.finditer(zf.read('xl/sharedStrings.xml')):
+            item = _PHONETIC_PATTERN.sub(b'', item.group(1) or b'')
+            strings.append(decode_text(b''.join(x or b'' for x in _TEXT_PATTERN.findall(item))))
+    if None in strings:
+        return None
+
+    return np.array([np.nan if x in STR_NA_VALUES else x for x in strings] + [np.nan], dtype=object)
+
+
+def cell_strings(cell_type: bytes, texts: np.ndarray, inline_texts: np.ndarray, strings: np.ndarray):
+    """Array with the strings of the cells of a string type ('s', 'str' or 'inlineStr'), or None if a string cannot be read."""
+    if cell_type == b's':
+        return strings[texts.astype(bytes).astype(np.int64)]
+    if cell_type == b'inlineStr':
+        values = [decode_text(b''.join(x or b'' for x in _TEXT_PATTERN.findall(_PHONETIC_PATTERN.sub(b'', text)))) for text in inline_texts]
+    else:
+        values = [decode_text(text) for text in texts]
+    if None in values:
+        return None
+
+    return np.array([np.nan if x in STR_NA_VALUES else x for x in values], dtype=object)
+
+
+def read_sheet_values(filepath: str, sheet: str, number_columns: list = ()):
+    """
+    Read a sheet straight from the XML of an .xlsx, with the values "pd.read_excel(dtype=str)" returns.
+    Only strings and booleans are supported (numbers only in the columns 'number_columns').
+
+    Args:
+    ----------
+        filepath:
+            Filepath of the .xlsx.
+
+        sheet:
+            The name of the sheet.
+
+        number_columns:
+            The columns (header names) that may have numbers. Their numbers are returned as int.
+
+    Returns:
+    ----------
+        df:
+            The DataFrame of the sheet, or None if the sheet does not exist or has cells that are not supported
+            (numbers, dates, escaped characters, not a simple table starting at 'A1').
+    """
+    with zipfile.ZipFile(filepath) as zf:
+        sheets = workbook_sheets(zf)
+        if sheet not in sheets:
+            return None
+        data = zf.read(sheets[sheet])
+        strings = read_shared_strings(zf)
+
+    # All the cells with one search, then everything by type with numpy
+    cells = _CELL_PATTERN.findall(data)
+    if strings is None or not cells or len(cells) != data.count(b'<c ') + data.count(b'<c>'):
+        return None         # Escaped characters, no cells or cells without a reference
+    letters, rows, types, texts, inline_texts = (np.array(x, dtype=object) for x in zip(*cells))
+    types[types == b''] = b'n'
+    is_empty = (texts == b'') & (inline_texts == b'') & (types != b'inlineStr') & (types != b'str')
+    letters, rows, types, texts, inline_texts = (x[~is_empty] for x in (letters, rows, types, texts, inline_texts))
+    column_idx = {x: column_index(x) for x in set(letters)}
+    columns_ = np.array([column_idx[x] for x in letters], dtype=np.int64)
+    rows = rows.astype(bytes).astype(np.int64) - 1
+
+    # Header: strings from 'A1' without gaps
+    is_header = rows == 0
+    if rows.min() != 0 or not np.isin(types[is_header], [b's', b'str', b'inlineStr']).all():
+        return None
+    header_idx = np.argsort(columns_[is_header])
+    if not np.array_equal(columns_[is_header][header_idx], np.arange(is_header.sum())):
+        return None
+    columns = np.empty(is_header.sum(), dtype=object)
+    for cell_type in set(types[is_header]):
+        is_type = types[is_header] == cell_type
+        columns[columns_[is_header][is_type]] = cell_strings(cell_type, texts[is_header][is_type], inline_texts[is_header][is_type], strings)
+    columns = columns.tolist()
+    if any(not isinstance(x, str) for x in columns) or (columns_ >= len(columns)).any():
+        return None
+    number_idx = [columns.index(x) for x in number_columns if x in columns]
+
+    # Values
+    values = np.full((rows.max(), len(columns)), np.nan, dtype=object)
+    for cell_type in set(types):
+        is_type = (types == cell_type) & ~is_header
+        if not is_type.any() or cell_type == b'e':
+            continue
+        if cell_type in (b's', b'str', b'inlineStr'):
+            value = cell_strings(cell_type, texts[is_type], inline_texts[is_type], strings)
+            if value is None:
+                return None
+        elif cell_type == b'b':
+            value = np.where(texts[is_type] == b'1', 'True', 'False').astype(object)
+        elif cell_type == b'n' and np.isin(columns_[is_type], number_idx).all():
+            value = np.array([int(float(x)) if b'.' in x or b'E' in x else int(x) for x in texts[is_type]], dtype=object)
+        else:
+            return None     # Numbers (or dates) outside 'number_columns'
+        values[rows[is_type] - 1, columns_[is_type]] = value
+
+    return pd.DataFrame(values, columns=columns)
+
+
+def workbook_property(filepath: str, name: str):
+    """Value of a custom property of an .xlsx (i.e. 'PseudoDataBase Fingerprint'), or None."""
+    with zipfile.ZipFile(filepath) as zf:
+        if 'docProps/custom.xml' not in zf.namelist():
+            return None
+        custom = zf.read('docProps/custom.xml').decode('utf-8')
+    value = re.search(_PROPERTY_PATTERN.format(re.escape(html.escape(name))), custom, re.DOTALL)
+    return html.unescape(value.group(1)) if value else None
+
+
+def compare_with_stored_copy(filepath: str):
+    """
+    Read a PseudoDataBase for CC and compare it with its stored copy.
+
+    Args:
+    ----------
+        filepath:
+            The filepath of the PseudoDataBase Excel.
+
+    Returns:
+    ----------
+        comparison:
+            None if there is no stored copy for this Excel or the Excel cannot be read this way. Else a dict with:
+            'df' the sheet (without 'ROW ID'), 'df_stored' the exported rows, 'stored_position' the exported row of every
+            line (-1 for added lines) and 'is_edited' the lines with other columns than the editable ones changed.
+    """
+    store_filepath = cc_store_filepath(filepath)
+    if not os.path.isfile(store_filepath):
+        return None
+    try:
+        with open(store_filepath, 'rb') as f:
+            store = pickle.load(f)
+        if workbook_property(filepath, CC_FINGERPRINT_PROPERTY) != store['fingerprint']:
+            return None
+        df = read_sheet_values(filepath, PSEUDO_DB_SHEET, number_columns=[CC_ROW_ID_COLUMN])
+    except (OSError, zipfile.BadZipFile, KeyError, pickle.UnpicklingError):
+        return None
+
+    df_stored = store['df']
+    columns = list(df_stored.columns)
+    if df is None or sorted(df.columns) != sorted(columns + [CC_ROW_ID_COLUMN]):
+        return None
+
+    # Rows of the Excel that are rows of the export (a copied row keeps the ID only in its first copy)
+    row_ids = pd.to_numeric(df[CC_ROW_ID_COLUMN], errors='coerce')
+    is_known = (row_ids.between(1, len(df_stored)) & ~row_ids.duplicated()).to_numpy()
+    stored_position = np.full(len(df), -1)
+    stored_position[is_known] = row_ids[is_known].astype(int).to_numpy() - 1
+
+    # Validate the other columns by their fingerprint
+    df = df.drop(columns=[CC_ROW_ID_COLUMN]).reset_index(drop=True)
+    is_edited = np.zeros(len(df), dtype=bool)
+    is_edited[is_known] = row_fingerprints(df[is_known], frozen_columns(columns)) != store['row_fingerprints'][stored_position[is_known]]
+
+    return {'df': df, 'df_stored': df_stored, 'stored_position': stored_position, 'is_edited': is_edited}
+
+
+def cc_edit_errors(filepath: str, max_cells: int = 20):
+    """
+    Check that only the editable columns of a PseudoDataBase for CC were changed. Returns a list with the errors:
+    one line for every changed cell (at most 'max_cells'), and what to do. Empty if there is no stored copy.
+    """
+    comparison = compare_with_stored_copy(filepath)
+    if comparison is None or not comparison['is_edited'].any():
+        return []
+
+    df, df_stored = comparison['df'], comparison['df_stored']
+    errors = []
+    for idx in np.flatnonzero(comparison['is_edited']):
+        row_stored = df_stored.iloc[comparison['stored_position'][idx]]
+        for column in frozen_columns(list(df.columns)):
+            value, value_stored = df.at[idx, column], row_stored[column]
+            if value == value_stored or (pd.isna(value) and pd.isna(value_stored)):
+                continue
+            errors.append(f'PseudoDataBase for CC, line {idx + 2} (PN: {row_stored["PART NUMBER"]}): "{column}" was changed from "{value_stored}" to "{value}".')
+    n_cells = len(errors)
+    errors = errors[:max_cells] + ([f'... and {n_cells - max_cells} more cells.'] if n_cells > max_cells else [])
+    errors.append('Only the columns "' + '"/"'.join(CC_EDITABLE_COLUMNS) + f'" can be changed inside: {filepath}. '
+                  f'Undo these changes, or delete "{cc_store_filepath(filepath)}" to use the Excel as it is.')
+
+    return errors
+
+
+def read_pseudo_db_for_CC(filepath: str):
+    """
+    Read a PseudoDataBase for CC using its stored copy: only the editable columns are taken from the Excel.
+
+    Args:
+    ----------
+        filepath:
+            The filepath of the PseudoDataBase Excel.
+
+    Returns:
+    ----------
+        df_pseudo_db:
+            The PseudoDataBase DataFrame as "pd.read_excel(dtype=str)" returns it (without 'ROW ID'), or None if
+            there is no stored copy for this Excel, the Excel cannot be read this way, or other columns than the
+            editable ones were changed (see "cc_edit_errors").
+    """
+    comparison = compare_with_stored_copy(filepath)
+    if comparison is None or comparison['is_edited'].any():
+        return None
+
+    n_added = (comparison['stored_position'] < 0).sum()
+    if n_added:
+        print(f'{n_added} lines without "{CC_ROW_ID_COLUMN}" were added inside: {filepath}.')
+
+    return comparison['df']
@@ -0,0 +1,85 @@
+##########################################################################################
+# Filename:     reference_workbook.py
+# For:          Follow_Up_Creation_Tool
+# Author:       Spyros Acheimastos (acheimastos@althom.eu)
+# Date:         19/10/2026
+##########################################################################################
+
+#   Layout of a Follow-up with its reference sheets in a companion Excel.
+#   Most of the size of a Follow-up is the 'DSOL', 'PS' and 'NC' sheets, that nobody edits. With "split_reference"
+#   (see "final_follow_up_to_excel") the Follow-up and Quality Board sheets are saved to the main Excel
+#   (i.e. 'EFW Follow-up R11.xlsx') and 'DSOL', 'PS', 'NC' to the reference Excel next to it ('EFW Follow-up R11 Reference.xlsx').
+#   The readers of the Follow-up accept both layouts, and either of the two files of a split Follow-up.
+#
+#   Usage: python -m bin.reference_workbook "EFW Follow-up R11.xlsx"     (show the layout of a Follow-up)
+
+import os
+import zipfile
+import argparse
+
+from bin.preflight import workbook_sheets
+
+
+REFERENCE_SHEETS = ['DSOL', 'PS', 'NC']
+REFERENCE_SUFFIX = ' Reference'
+REFERENCE_PROPERTY = 'Reference Workbook'
+
+
+def reference_filepath(excelfilepath: str):
+    """Filepath of the reference Excel of a Follow-up (i.e. 'EFW Follow-up R11 Reference.xlsx')."""
+    root, extension = os.path.splitext(main_filepath(excelfilepath))
+    return root + REFERENCE_SUFFIX + extension
+
+
+def main_filepath(excelfilepath: str):
+    """Filepath of the main Excel of a Follow-up, from the main or the reference Excel."""
+    root, extension = os.path.splitext(excelfilepath)
+    if root.endswith(REFERENCE_SUFFIX):
+        root = root[:-len(REFERENCE_SUFFIX)]
+    return root + extension
+
+
+def excel_sheet_names(excelfilepath: str):
+    """The sheet names of an .xlsx (without reading the sheets), or None if it does not exist or cannot be read."""
+    if not os.path.isfile(excelfilepath):
+        return None
+    try:
+        with zipfile.ZipFile(excelfilepath) as zf:
+            return list(workbook_sheets(zf))
+    except (zipfile.BadZipFile, KeyError):
+        return None
+
+
+def reference_sheets_filepath(excelfilepath: str):
+    """
+    The Excel that has the 'DSOL', 'PS' and 'NC' sheets of a Follow-up: the main Excel if it has them,
+    otherwise the reference Excel if it exists. If neither, the main Excel (so the error is about the file that was given).
+    """
+    filepath = main_filepath(excelfilepath)
+    sheet_names = excel_sheet_names(filepath)
+    if sheet_names is not None and REFERENCE_SHEETS[0] in sheet_names:
+        return filepath
+
+    filepath_reference = reference_filepath(filepath)
+    if os.path.isfile(filepath_reference):
+        return filepath_reference
+    return filepath
+
+
+def is_split_reference(excelfilepath: str):
+    """True if the Follow-up has its 'DSOL', 'PS' and 'NC' sheets in a reference Excel."""
+    return reference_sheets_filepath(excelfilepath) != main_filepath(excelfilepath)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Show which Excel has the sheets of a Follow-up.')
+    parser.add_argument('excelfilepath', help='i.e. "EFW Follow-up R11.xlsx"')
+    args = parser.parse_args()
+
+    for filepath in [main_filepath(args.excelfilepath), reference_filepath(args.excelfilepath)]:
+        sheet_names = excel_sheet_names(filepath)
+        if sheet_names is None:
+            print(f'"{filepath}": not found')
+        else:
+            print(f'"{filepath}": {os.path.getsize(filepath) / 1024 / 1024:.2f} MB, sheets: {", ".join(sheet_names)}')
+    print('Layout: {}'.format('split (reference sheets in a separate Excel)' if is_split_reference(args.excelfilepath) else 'single Excel'))
@@ -5,10 +5,15 @@
 # Date:         21/12/2022
 ##########################################################################################
 
+import os
 import string
 import regex as re
 import numpy as np
 import pandas as pd
+from bin.parallel_excel import add_prerendered_sheet, render_sheets, prerendering_supported
+from bin.bulk_excel import write_frame
+from bin.reference_workbook import REFERENCE_PROPERTY, reference_filepath
+from bin.schema import DATE_NUM_FORMAT
 
 
 COLOR_HEADER_YELLOW = '#FFD966'
@@ -67,6 +72,7 @@ def add_formats_to_workbook(workbook):
         - cell_left
         - cell_left_wrap
         - cell_center
+        - cell_center_date
         - header_blue
         - header_orange
         - header_green
@@ -143,6 +149,7 @@ def add_formats_to_workbook(workbook):
     cell_left = workbook.add_format(cell_left_format_dict)
     cell_left_wrap = workbook.add_format(cell_left_wrap_format_dict)
     cell_center = workbook.add_format(cell_center_format_dict)
+    cell_center_date = workbook.add_format({**cell_center_format_dict, 'num_format': DATE_NUM_FORMAT})
     header_blue = workbook.add_format(header_blue_dict)
     header_orange = workbook.add_format(header_orange_dict)
     header_green = workbook.add_format(header_green_dict)
@@ -164,6 +171,7 @@ def add_formats_to_workbook(workbook):
         "cell_left":         cell_left,
         "cell_left_wrap":    cell_left_wrap,
         "cell_center":       cell_center,
+        "cell_center_date":  cell_center_date,
         "header_blue":       header_blue,
         "header_orange":     header_orange,
         "header_green":      header_green,
@@ -225,7 +233,7 @@ def format_sheet_Follow_Up(writer, formats: dict, prop_dict: dict, column_names:
     worksheet.set_column('F:F', 0.86*max_length, formats['cell_left'])
     worksheet.set_column('G:G', 14.5, formats['cell_center'])
     worksheet.set_column('H:H', 13.2, formats['cell_center'])
-    worksheet.set_column('I:I', 11, formats['cell_center'])
+    worksheet.set_column('I:I', 11, formats['cell_center_date'])
     worksheet.set_column('J:J', 17.3, formats['cell_center'])
     worksheet.set_column('K:K', 9.3, formats['cell_center'])
     worksheet.set_column('L:L', 13.2, formats['cell_center'])
@@ -461,9 +469,9 @@ def add_sheet_QB(workbook, formats: dict, prop_dict: dict):
         worksheet.write_blank(f'B{i}', None, formats['cell_center'])
         worksheet.write_blank(f'C{i}', None, formats['cell_center'])
         worksheet.write_blank(f'D{i}', None, formats['cell_center'])
-        worksheet.write_blank(f'E{i}', None, formats['cell_center'])
+        worksheet.write_blank(f'E{i}', None, formats['cell_center_date'])
         worksheet.write_blank(f'F{i}', None, formats['cell_center'])
-        worksheet.write_blank(f'G{i}', None, formats['cell_center'])
+        worksheet.write_blank(f'G{i}', None, formats['cell_center_date'])
         worksheet.write_blank(f'H{i}', None, formats['cell_center'])
         worksheet.write_blank(f'I{i}', None, formats['cell_center'])
         worksheet.write_blank(f'J{i}', None, formats['cell_center'])
@@ -555,14 +563,14 @@ def add_sheet_QB_illu(workbook, formats: dict, prop_dict: dict):
         worksheet.write_blank(f'D{i}', None, formats['cell_center'])
         worksheet.write_blank(f'E{i}', None, formats['cell_center'])
         worksheet.write_blank(f'F{i}', None, formats['cell_center'])
-        worksheet.write_blank(f'G{i}', None, formats['cell_center'])
+        worksheet.write_blank(f'G{i}', None, formats['cell_center_date'])
         worksheet.write_blank(f'H{i}', None, formats['cell_center'])
         worksheet.write_blank(f'I{i}', None, formats['cell_center'])
         worksheet.write_blank(f'J{i}', None, formats['cell_center'])
-        worksheet.write_blank(f'K{i}', None, formats['cell_center'])
+        worksheet.write_blank(f'K{i}', None, formats['cell_center_date'])
         worksheet.write_blank(f'L{i}', None, formats['cell_center'])
         worksheet.write_blank(f'M{i}', None, formats['cell_center'])
-        worksheet.write_blank(f'N{i}', None, formats['cell_center'])
+        worksheet.write_blank(f'N{i}', None, formats['cell_center_date'])
         worksheet.write_blank(f'O{i}', None, formats['cell_center'])
         worksheet.write_blank(f'P{i}', None, formats['cell_center'])
         worksheet.write_blank(f'Q{i}', None, formats['cell_center'])
@@ -633,6 +641,7 @@ def format_sheet_ALL_NCs(writer, formats: dict, sheet_name: str, column_names: l
     worksheet.set_column('D:D', 6, formats['cell_center'])
     worksheet.set_column('E:E', 73, formats['cell_left_wrap'])
     # for idx in range(5, len(column_names)):
+    d_columns, n_columns = [], []
     for idx, col in enumerate(column_names):
         # Format not-MDL columns
         # if not re.findall(r'^\d{4}', col):
@@ -647,7 +656,7 @@ def format_sheet_ALL_NCs(writer, formats: dict, sheet_name: str, column_names: l
         worksheet.set_column(get_column_range(idx+1, mode=0), 8.7, formats['cell_center'])
 
         # Colour all "D" or "PD" cells 
-        worksheet.conditional_format(get_column_range(idx+1, mode=2), {'type': 'formula', 'criteria': f'=ISNUMBER(SEARCH("D", ${get_column_range(idx+1, mode=3)}))', 'format': formats['EA_D']})
+        d_columns.append(idx+1)
 
         if msn in new_msn_list:
             # Set format for New MSN headers
@@ -656,14 +665,32 @@ def format_sheet_ALL_NCs(writer, formats: dict, sheet_name: str, column_names: l
             # Set format for Rev MSN headers
             worksheet.write(get_column_range(idx+1, mode=1), col, formats['header_yellow'])
             # Colour "N" or "PN" cells of Rev MSN
-            worksheet.conditional_format(get_column_range(idx+1, mode=2), {'type': 'formula', 'criteria': f'=ISNUMBER(SEARCH("N", ${get_column_range(idx+1, mode=3)}))', 'format': formats['EA_N']})
+            n_columns.append(idx+1)
         else:
             # Set format for Old MSN headers
             worksheet.write(get_column_range(idx+1, mode=1), col, formats['header_gray'])
 
+    # One conditional format for every block of adjacent columns (instead of one for every column).
+    # The formula is relative to the first cell, so each cell checks itself
+    for symbol, columns, cell_format in [('D', d_columns, formats['EA_D']), ('N', n_columns, formats['EA_N'])]:
+        for first, last in column_blocks(columns):
+            first_letter, last_letter = get_column_range(first, mode=4), get_column_range(last, mode=4)
+            worksheet.conditional_format(f'{first_letter}2:{last_letter}1048576', {'type': 'formula', 'criteria': f'=ISNUMBER(SEARCH("{symbol}", {first_letter}2))', 'format': cell_format})
+
     worksheet.set_row(0, 60)
 
 
+def column_blocks(columns: list):
+    """Blocks (first, last) of adjacent column indexes. i.e. [6, 7, 8, 10] -> [(6, 8), (10, 10)]"""
+    blocks = []
+    for idx in columns:
+        if blocks and blocks[-1][1] == idx - 1:
+            blocks[-1] = (blocks[-1][0], idx)
+        else:
+            blocks.append((idx, idx))
+    return blocks
+
+
 def divmod_excel(n):
     a, b = divmod(n, 26)
     if b == 0:
@@ -710,7 +737,7 @@ def get_column_range(num: str, mode: int = 0):
         return x + ':' + x
 
 
-def pseudo_db_to_excel(df: pd.DataFrame, excelfilepath: str):
+def pseudo_db_to_excel(df: pd.DataFrame, excelfilepath: str, custom_properties: dict = None):
     """
     Save PseudoDataBase to Excel with custom formatting.
     
@@ -721,16 +748,20 @@ def pseudo_db_to_excel(df: pd.DataFrame, excelfilepath: str):
         
         excelfilepath:
             The filepath of the Excel that will be created.
+
+        custom_properties:
+            Custom document properties of the Excel (key=name, value=string). (Default=None)
     """
-    # Creater Writer and write DataFrame to Excel
+    # Creater Writer and add formats to workbook
     writer = pd.ExcelWriter(excelfilepath, engine='xlsxwriter')
-    df.to_excel(writer, index=False, sheet_name='Pseudo_Data_Base')
-
-    # Get the xlsxwriter workbook and worksheet objects, and add formats to workbook
-    workbook  = writer.book
-    worksheet = writer.sheets['Pseudo_Data_Base']
+    workbook = writer.book
     workbook, formats = add_formats_to_workbook(workbook)
 
+    # Write DataFrame to Excel, with the formats of the headers
+    header_formats = [formats['header_yellow']] * 6 + [formats['header_blue'], formats['header_orange'], formats['header_green']]
+    header_formats += [formats['header_yellow']] * (len(df.columns) - len(header_formats))
+    worksheet = write_frame(writer, df, 'Pseudo_Data_Base', header_format=header_formats)
+
     # For Columns
     worksheet.set_column('A:A', 17, formats['cell_left'])
     worksheet.set_column('B:B', 11.5, formats['cell_center'])
@@ -741,19 +772,13 @@ def pseudo_db_to_excel(df: pd.DataFrame, excelfilepath: str):
     worksheet.set_column('G:G', 10, formats['cell_center'])
     worksheet.set_column('H:H', 10, formats['cell_center'])
     worksheet.set_column('I:I', 10, formats['cell_center'])
+    if len(df.columns) > 9:
+        worksheet.set_column(9, len(df.columns) - 1, None, None, {'hidden': True})     # i.e. 'ROW ID' of the PseudoDataBase for CC
+    for name, value in (custom_properties or {}).items():
+        workbook.set_custom_property(name, value)
 
     # For Headers
-    column_names = list(df)
     worksheet.freeze_panes(1, 0)
-    worksheet.write('A1', column_names[0], formats['header_yellow'])
-    worksheet.write('B1', column_names[1], formats['header_yellow'])
-    worksheet.write('C1', column_names[2], formats['header_yellow'])
-    worksheet.write('D1', column_names[3], formats['header_yellow'])
-    worksheet.write('E1', column_names[4], formats['header_yellow'])
-    worksheet.write('F1', column_names[5], formats['header_yellow'])
-    worksheet.write('G1', column_names[6], formats['header_blue'])
-    worksheet.write('H1', column_names[7], formats['header_orange'])
-    worksheet.write('I1', column_names[8], formats['header_green'])
     worksheet.set_row(0, 20)
 
     # Conditional formatting for highlighting True/False
@@ -772,7 +797,6 @@ def initial_follow_up_to_excel(df_initial: pd.DataFrame, excelfilepath: str):
     # excelfilepath = 'Follow_Up_test_From_OLD_DSOL.xlsx'
     # excelfilepath = 'Follow_Up_test_From_FINAL_DSOL_2.xlsx'
     writer = pd.ExcelWriter(excelfilepath, engine='xlsxwriter')
-    df_initial.to_excel(writer, index=False, sheet_name='Follow-up Initial')
 
     # Get the xlsxwriter workbook and add formats
     workbook = writer.book
@@ -780,13 +804,14 @@ def initial_follow_up_to_excel(df_initial: pd.DataFrame, excelfilepath: str):
 
     # Change 'Follow-up' to 'Follow-up Initial' !!!
     prop_dict_Initial = {'sheetname': 'Follow-up Initial', 'color': COLOR_HEADER_PINK, 'header_format': formats['header_pink']}
+    write_frame(writer, df_initial, prop_dict_Initial['sheetname'], header_format=prop_dict_Initial['header_format'])
     writer = format_sheet_Follow_Up(writer, formats, prop_dict_Initial, list(df_initial), max_length=df_initial[EFFECT_COLUMN_FOLLOW_UP].str.len().max(), num_of_rows=df_initial.shape[0])
 
     # Save and close
     writer.save()
     # writer.close()
 
-def final_follow_up_to_excel(df_dsol: pd.DataFrame, df_ps: pd.DataFrame, df_nc: pd.DataFrame, excelfilepath: str, authors_dict: dict = None, add_QBs = True, **dict_with_follow_ups):
+def final_follow_up_to_excel(df_dsol: pd.DataFrame, df_ps: pd.DataFrame, df_nc: pd.DataFrame, excelfilepath: str, authors_dict: dict = None, add_QBs = True, max_workers: int = 1, prerender: bool = False, split_reference: bool = False, **dict_with_follow_ups):
     """
     Create the final Follow-Up Excel.
 
@@ -810,6 +835,19 @@ def final_follow_up_to_excel(df_dsol: pd.DataFrame, df_ps: pd.DataFrame, df_nc:
         add_QBs:
             Boolean to add empty Quality Boards. (Default=True)
 
+        max_workers:
+            Number of processes used to render the data of the Follow-up, DSOL, PS and NC sheets, with 'prerender'.
+            Use 1 to write everything through "write_frame" on a single thread, None for os.cpu_count(). (Default=1)
+
+        prerender:
+            Boolean to render the data of the sheets in parallel (see "parallel_excel"). The Excel is bigger, because
+            the strings are not shared. If the installed xlsxwriter is not supported for parallel rendering
+            (see "prerendering_supported"), "write_frame" is used. (Default=False)
+
+        split_reference:
+            Boolean to save 'DSOL', 'PS' and 'NC' to a separate reference Excel (see "reference_filepath")
+            and only the Follow-up and Quality Board sheets to 'excelfilepath'. (Default=False)
+
         **dict_with_follow_ups:
             kwargs with possible keys: 'IPC', 'SRM_A321', 'SRM_A320' and DataFrames as values.
             This is to handle the case of Follow-up without 'SRM_A320'.
@@ -826,21 +864,30 @@ def final_follow_up_to_excel(df_dsol: pd.DataFrame, df_ps: pd.DataFrame, df_nc:
         list_of_illustrators = None
         list_of_authors_ALL = None
 
-    # Get xlsx writer
-    writer = pd.ExcelWriter(excelfilepath, engine='xlsxwriter')
+    # Get xlsx writer. Infinite numbers become #DIV/0! (as in "render_cell") instead of stopping the save
+    engine_kwargs = {'options': {'nan_inf_to_errors': True}}
+    writer = pd.ExcelWriter(excelfilepath, engine='xlsxwriter', engine_kwargs=engine_kwargs)
 
     # Get the xlsxwriter workbook and worksheet objects.
     workbook = writer.book
     workbook, formats = add_formats_to_workbook(workbook)
 
+    # Writer for DSOL / PS / NC. The same one, or the one of the reference Excel (formats belong to their own workbook)
+    if split_reference:
+        writer_reference = pd.ExcelWriter(reference_filepath(excelfilepath), engine='xlsxwriter', engine_kwargs=engine_kwargs)
+        _, formats_reference = add_formats_to_workbook(writer_reference.book)
+        workbook.set_custom_property(REFERENCE_PROPERTY, os.path.basename(reference_filepath(excelfilepath)))
+    else:
+        writer_reference, formats_reference = writer, formats
+
     # Properties For 
     prop_dict = {
         'IPC': {'sheetname': 'IPC Follow-up', 'color': COLOR_HEADER_BLUE, 'header_format': formats['header_blue'], 'authors': list_of_authors_IPC},
         'SRM_A321': {'sheetname': 'SRM A321 Follow-up', 'color': COLOR_HEADER_ORANGE, 'header_format': formats['header_orange'], 'authors': list_of_authors_SRM},
         'SRM_A320': {'sheetname': 'SRM A320 Follow-up', 'color': COLOR_HEADER_GREEN, 'header_format': formats['header_green'], 'authors': list_of_authors_SRM},
-        'DSOL': {'sheetname': 'DSOL', 'color': COLOR_HEADER_YELLOW, 'header_format': formats['header_yellow']},
-        'PS': {'sheetname': 'PS', 'color': COLOR_HEADER_YELLOW, 'header_format': formats['header_yellow']},
-        'NC': {'sheetname': 'NC', 'color': COLOR_HEADER_YELLOW, 'header_format': formats['header_yellow']}
+        'DSOL': {'sheetname': 'DSOL', 'color': COLOR_HEADER_YELLOW, 'header_format': formats_reference['header_yellow']},
+        'PS': {'sheetname': 'PS', 'color': COLOR_HEADER_YELLOW, 'header_format': formats_reference['header_yellow']},
+        'NC': {'sheetname': 'NC', 'color': COLOR_HEADER_YELLOW, 'header_format': formats_reference['header_yellow']}
     }
 
     prop_QB_dict = {
@@ -850,9 +897,18 @@ def final_follow_up_to_excel(df_dsol: pd.DataFrame, df_ps: pd.DataFrame, df_nc:
         'ILLU': {'sheetname': 'ILLU - QB', 'color': COLOR_HEADER_PINK, 'header_format': formats['header_pink'], 'authors': list_of_authors_ALL, 'illustrators': list_of_illustrators}
     }
 
+    # Write a sheet directly or leave its data to be rendered in parallel
+    dfs_to_render = {writer: {}, writer_reference: {}}
+    def add_data_sheet(writer, df, prop):
+        if not prerender or max_workers == 1 or not prerendering_supported():
+            write_frame(writer, df, prop['sheetname'], header_format=prop['header_format'])
+        else:
+            add_prerendered_sheet(writer.book, prop['sheetname'])
+            dfs_to_render[writer][prop['sheetname']] = df
+
     # Add and format Follow-Up and Quality Board Sheets
     for key, df in dict_with_follow_ups.items():
-        df.to_excel(writer, index=False, sheet_name=prop_dict[key]['sheetname'])
+        add_data_sheet(writer, df, prop_dict[key])
         writer = format_sheet_Follow_Up(writer, formats, prop_dict[key], list(df.columns), max_length=df[EFFECT_COLUMN_FOLLOW_UP].str.len().max(), num_of_rows=df.shape[0])
         if add_QBs is True:
             workbook = add_sheet_QB(workbook, formats, prop_QB_dict[key])
@@ -862,15 +918,22 @@ def final_follow_up_to_excel(df_dsol: pd.DataFrame, df_ps: pd.DataFrame, df_nc:
         workbook = add_sheet_QB_illu(workbook, formats, prop_QB_dict['ILLU'])
 
     # Write and formats sheets: DSOL / PS / NC 
-    df_dsol.to_excel(writer, index=False, sheet_name='DSOL')
-    df_ps.to_excel(writer, index=False, sheet_name='PS')
-    df_nc.to_excel(writer, index=False, sheet_name='NC')
-    writer = format_sheet_DSOL(writer, formats, prop_dict['DSOL'], list(df_dsol.columns), max_length=df_dsol[EFFECT_COLUMN_DSOL].str.len().max())
-    writer = format_sheet_PS(writer, formats, prop_dict['PS'], list(df_ps.columns))
-    writer = format_sheet_NC(writer, formats, prop_dict['NC'], list(df_nc.columns))
+    add_data_sheet(writer_reference, df_dsol, prop_dict['DSOL'])
+    add_data_sheet(writer_reference, df_ps, prop_dict['PS'])
+    add_data_sheet(writer_reference, df_nc, prop_dict['NC'])
+    writer_reference = format_sheet_DSOL(writer_reference, formats_reference, prop_dict['DSOL'], list(df_dsol.columns), max_length=df_dsol[EFFECT_COLUMN_DSOL].str.len().max())
+    writer_reference = format_sheet_PS(writer_reference, formats_reference, prop_dict['PS'], list(df_ps.columns))
+    writer_reference = format_sheet_NC(writer_reference, formats_reference, prop_dict['NC'], list(df_nc.columns))
+
+    # Render the data of all sheets in parallel
+    for writer_to_render, dfs in dfs_to_render.items():
+        if dfs:
+            render_sheets(writer_to_render.book, dfs, max_workers=max_workers)
 
     # Save and close
     writer.save()
+    if split_reference:
+        writer_reference.save()
     # writer.close()
 
 def all_NCs_to_excel(df_nc: pd.DataFrame, df_nc_RXX: pd.DataFrame, new_msn_list: list, rev_msn_list: list, revision: str):
@@ -902,12 +965,12 @@ def all_NCs_to_excel(df_nc: pd.DataFrame, df_nc_RXX: pd.DataFrame, new_msn_list:
 
     # Save DataFrame with 'ALL_NCs'
     sheet_name = 'ALL_NCs'
-    df_nc.to_excel(writer, index=False, sheet_name=sheet_name)
+    write_frame(writer, df_nc, sheet_name)
     format_sheet_ALL_NCs(writer, formats, sheet_name, list(df_nc.columns), new_msn_list, rev_msn_list)
 
     # Save DataFrame with 'RXX_NCs'
     sheet_name = f'{revision}_NCs'
-    df_nc_RXX.to_excel(writer, index=False, sheet_name=sheet_name)
+    write_frame(writer, df_nc_RXX, sheet_name)
     format_sheet_ALL_NCs(writer, formats, sheet_name, list(df_nc_RXX.columns), new_msn_list, rev_msn_list)
 
     # Save
@@ -0,0 +1,248 @@
+##########################################################################################
+# Filename:     schema.py
+# For:          Follow_Up_Creation_Tool
+# Author:       Spyros Acheimastos (acheimastos@althom.eu)
+# Date:         19/10/2026
+##########################################################################################
+
+#   Declared types of the columns of every sheet of a Follow-up.
+#   The sheets are read with "dtype=str", so the times and dates that the Authors fill in came back as strings
+#   (i.e. '45' and '2023-02-15 00:00:00') and were written back as text. "apply_schema" turns these columns into:
+#       NUMBER      float64 (NaN for empty cells), written as Excel numbers
+#       DATE        datetime64 (NaT for empty cells), written as Excel dates (formatted DD/MM/YYYY)
+#       CATEGORY    pandas Categorical, for the columns with few distinct values (i.e. the symbols of the MDL columns)
+#   A NUMBER or DATE column is converted only if all its non-empty cells can be converted. Otherwise it stays text
+#   (nothing is lost) and it is reported, so that the Author can correct the cells.
+#   "apply_schema" is idempotent: typed columns are left as they are.
+#
+#   The types are applied after reading, not by "pd.read_excel(dtype=..., converters=...)": the sheets are read the same way
+#   from the Excel and from its sidecar (see "sidecar"), the MDL columns are only known after reading the header, and a
+#   column that cannot be converted must stay text as it is in the Excel. The cost is that a sheet is held twice while it is
+#   converted: the text columns (i.e. PS 53 MB, DSOL 36 MB) until the typed columns (7 MB, 4 MB) replace them.
+#   Only the converted columns are copied (a shallow copy of the DataFrame), so the peak is the text sheet plus its typed columns.
+#
+#   Usage: python -m bin.schema "EFW Follow-up R11.xlsx"     (types and memory of every sheet)
+
+import argparse
+import warnings
+import regex as re
+import numpy as np
+import pandas as pd
+
+
+NUMBER = 'number'
+DATE = 'date'
+CATEGORY = 'category'
+
+DATE_NUM_FORMAT = 'dd/mm/yyyy'
+DATE_FORMAT_EXCEL = '%Y-%m-%d %H:%M:%S'     # As "pd.read_excel(dtype=str)" returns a date cell
+
+FOLLOW_UP_SCHEMA = {
+    'Author': CATEGORY,
+    'Start Date': DATE,
+    'Status': CATEGORY,
+    'Time (minutes)': NUMBER,
+    'Author CC': CATEGORY,
+    'CC Time (minutes)': NUMBER,
+}
+
+QB_SCHEMA = {
+    'Author (SC)': CATEGORY,
+    'SC Date': DATE,
+    'Cross Checker (CC)': CATEGORY,
+    'CC Date': DATE,
+    'RFT/WFT': CATEGORY,
+    'OTD': CATEGORY,
+    'NC Quantity': NUMBER,
+    'Weight': CATEGORY,
+}
+
+ILLU_QB_SCHEMA = {
+    'Manual': CATEGORY,
+    'Author': CATEGORY,
+    'MCK Date': DATE,
+    'Type of Illu': CATEGORY,
+    'Illustrator': CATEGORY,
+    'Time (minutes)': NUMBER,
+    'SC Date': DATE,
+    'Illustrator CC': CATEGORY,
+    'CC Time (minutes)': NUMBER,
+    'CC Date': DATE,
+    'RFT/WFT': CATEGORY,
+    'OTD': CATEGORY,
+    'NC Quantity': NUMBER,
+    'Weight': CATEGORY,
+    'IO Deleted': CATEGORY,
+    'Incorporated': CATEGORY,
+}
+
+SHEET_SCHEMAS = {
+    'IPC Follow-up': FOLLOW_UP_SCHEMA,
+    'SRM A321 Follow-up': FOLLOW_UP_SCHEMA,
+    'SRM A320 Follow-up': FOLLOW_UP_SCHEMA,
+    'IPC - QB': QB_SCHEMA,
+    'SRM A321 - QB': QB_SCHEMA,
+    'SRM A320 - QB': QB_SCHEMA,
+    'ILLU - QB': ILLU_QB_SCHEMA,
+    'DSOL': {'QTY': CATEGORY, 'PART TYPE': CATEGORY, 'PART ISSUE': CATEGORY, 'Effectivity': CATEGORY},
+    'PS': {'LEVEL': CATEGORY, 'Effectivity of the CHILD': CATEGORY},
+    'NC': {'ISSUE': CATEGORY, 'NC ISSUE': CATEGORY, 'Author Check': CATEGORY, 'Initial Status': CATEGORY, 'Effectivity': CATEGORY},
+}
+
+# Sheets with their MDL columns as CATEGORY. The MDL columns of the Follow-up sheets are compared
+# and replaced by "update_follow_up", so they stay strings.
+MDL_CATEGORY_SHEETS = ['DSOL', 'PS', 'NC']
+
+
+def column_schema(sheet: str, columns: list):
+    """The types of the given columns of a sheet (key=column, value=NUMBER/DATE/CATEGORY). Columns without a type are left out."""
+    schema = SHEET_SCHEMAS.get(sheet, {})
+    types = {x: schema[x] for x in columns if x in schema}
+    if sheet in MDL_CATEGORY_SHEETS:
+        types.update({x: CATEGORY for x in columns if re.findall(r'MDL', x)})
+    return types
+
+
+def is_empty(series: pd.Series):
+    """Boolean array: True for NaN, None and ''."""
+    values = series.to_numpy(dtype=object)
+    empty = pd.isna(values)
+    empty[~empty] = values[~empty] == ''
+    return empty
+
+
+def to_numbers(series: pd.Series):
+    """
+    The column as float64, or None if a non-empty cell is not a number.
+
+    Returns:
+    ----------
+        converted:
+            The float64 Series, or None.
+
+        bad_values:
+            The values that are not numbers (at most 5).
+    """
+    empty = is_empty(series)
+    converted = pd.to_numeric(series.where(~empty, np.nan), errors='coerce').astype('float64')
+    bad = ~empty & converted.isna().to_numpy()
+    if bad.any():
+        return None, series[bad].unique()[:5].tolist()
+    return converted, []
+
+
+def to_dates(series: pd.Series):
+    """
+    The column as datetime64, or None if a non-empty cell is not a date.
+    Date cells of Excel ('2023-02-15 00:00:00') and dates typed as text (day first, i.e. '15/02/2023') are accepted.
+
+    Returns:
+    ----------
+        converted:
+            The datetime64 Series, or None.
+
+        bad_values:
+            The values that are not dates (at most 5).
+    """
+    empty = is_empty(series)
+    text = series.where(~empty, np.nan)
+    converted = pd.to_datetime(text, format=DATE_FORMAT_EXCEL, errors='coerce')
+    other = ~empty & converted.isna().to_numpy()
+    if other.any():
+        # Numbers of days are not dates. Only text with a separator is parsed, one value at a time (the formats may be mixed)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            converted[other] = [
+                pd.to_datetime(x, dayfirst=True, errors='coerce') if isinstance(x, str) and re.search(r'[-/.]', x) else pd.NaT
+                for x in text[other]
+            ]
+    bad = ~empty & converted.isna().to_numpy()
+    if bad.any():
+        return None, series[bad].unique()[:5].tolist()
+    return converted, []
+
+
+def to_category(series: pd.Series):
+    """The column as Categorical. Empty strings become NaN, as inside a sheet that was read."""
+    return series.where(~is_empty(series), np.nan).astype('category')
+
+
+def apply_schema(df: pd.DataFrame, sheet: str, errors: list = None):
+    """
+    Convert the columns of a sheet to their declared types (see "SHEET_SCHEMAS").
+
+    Args:
+    ----------
+        df:
+            The DataFrame of the sheet (i.e. from "read_sheet"). Not changed.
+
+        sheet:
+            Name of the sheet (i.e. 'IPC Follow-up', 'DSOL').
+
+        errors:
+            A list. For every NUMBER or DATE column that stays text, a line with the column and its bad values is appended.
+            If None, the lines are printed. (Default=None)
+
+    Returns:
+    ----------
+        df:
+            A copy of the DataFrame with typed columns.
+    """
+    # Shallow copy: replacing a column does not change 'df', and the columns that are not converted are not copied
+    df = df.copy(deep=False)
+    for column, column_type in column_schema(sheet, list(df.columns)).items():
+        series = df[column]
+        if column_type == NUMBER:
+            if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                continue
+            converted, bad_values = to_numbers(series)
+        elif column_type == DATE:
+            if pd.api.types.is_datetime64_any_dtype(series):
+                continue
+            converted, bad_values = to_dates(series)
+        else:
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                continue
+            converted, bad_values = to_category(series), []
+
+        if converted is None:
+            line = f'Sheet "{sheet}": column "{column}" kept as text, because of the values {bad_values}.'
+            if errors is not None:
+                errors.append(line)
+            else:
+                print(line)
+        else:
+            df[column] = converted
+
+    return df
+
+
+def without_categories(df: pd.DataFrame):
+    """A copy of the DataFrame with the CATEGORY columns as plain object columns, for code that fills in new values."""
+    columns = [x for x in df.columns if isinstance(df[x].dtype, pd.CategoricalDtype)]
+    return df.astype({x: object for x in columns}) if columns else df.copy()
+
+
+def schema_report(df_text: pd.DataFrame, df_typed: pd.DataFrame):
+    """A line with the number of typed columns and the memory of the sheet as text and typed."""
+    n_typed = sum(1 for x in df_typed.columns if df_typed[x].dtype != object)
+    mb_text = df_text.memory_usage(deep=True).sum() / 1024 / 1024
+    mb_typed = df_typed.memory_usage(deep=True).sum() / 1024 / 1024
+    return f'{n_typed} typed columns, {mb_text:.1f} MB as text -> {mb_typed:.1f} MB typed'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Read the sheets of a Follow-up with their declared types.')
+    parser.add_argument('excelfilepath', help='i.e. "EFW Follow-up R11.xlsx"')
+    args = parser.parse_args()
+
+    from bin.reference_workbook import main_filepath, reference_sheets_filepath
+    for filepath in dict.fromkeys([main_filepath(args.excelfilepath), reference_sheets_filepath(args.excelfilepath)]):
+        for sheet, df in pd.read_excel(filepath, dtype=str, sheet_name=None).items():
+            if sheet not in SHEET_SCHEMAS:
+                continue
+            errors = []
+            df_typed = apply_schema(df, sheet, errors)
+            print(f'{sheet}: {schema_report(df, df_typed)}')
+            for line in errors:
+                print(f'    {line}')
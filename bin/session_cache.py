@@ -0,0 +1,136 @@
+##########################################################################################
+# Filename:     session_cache.py
+# For:          Follow_Up_Creation_Tool
+# Author:       Spyros Acheimastos (acheimastos@althom.eu)
+# Date:         19/10/2026
+##########################################################################################
+
+#   In-memory cache that lives as long as the GUI is open.
+#   Consecutive steps that read the same MDLs, PseudoDataBase or JSON files reuse the parsed result.
+#   Files and folders are part of the key together with their modification time and size,
+#   so a changed input is always read again.
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+import pandas as pd
+
+
+SESSION_CACHE_MAX_MB = 1024
+
+
+def path_signature(path: str):
+    """
+    Signature of a file or folder: (mtime, size) of the file or of every '.xlsx'/'.json' file inside the folder.
+    Returns None if 'path' is not an existing file or folder.
+    """
+    if os.path.isfile(path):
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+    if os.path.isdir(path):
+        signature = []
+        for root, _, files in os.walk(path, topdown=True):
+            for file in sorted(files):
+                if not file.endswith(('xlsx', 'json')): continue
+                stat = os.stat(root + os.sep + file)
+                signature.append((file, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+    return None
+
+
+def freeze(value):
+    """Convert an argument to something hashable for the key. Paths also get their "path_signature"."""
+    if isinstance(value, str):
+        signature = path_signature(value) if value else None
+        return (value, signature) if signature is not None else value
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(x) for x in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if callable(value):
+        return f'{value.__module__}.{value.__qualname__}'
+    return value
+
+
+def estimate_size(value):
+    """Approximate memory size of a result in bytes."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(x) for x in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(x) for x in value.values())
+    return sys.getsizeof(value)
+
+
+def copy_value(value):
+    """Copy DataFrames (also inside lists, tuples and dicts) so that callers can change them freely."""
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    if isinstance(value, list):
+        return [copy_value(x) for x in value]
+    if isinstance(value, tuple):
+        return tuple(copy_value(x) for x in value)
+    if isinstance(value, dict):
+        return {k: copy_value(v) for k, v in value.items()}
+    return value
+
+
+class SessionCache:
+    """
+    LRU cache for the results of the reading functions (i.e. 'read_MDLs', 'read_pseudo_db', 'read_JSON').
+
+    Args:
+    ----------
+        max_mb:
+            Memory limit in MB. The least recently used results are dropped first. (Default=SESSION_CACHE_MAX_MB)
+    """
+    def __init__(self, max_mb: int = SESSION_CACHE_MAX_MB):
+        self.max_bytes = max_mb * 1024 * 1024
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()     # key: (value, size)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.total_bytes = 0
+
+    def call(self, fn, *args, **kwargs):
+        """Return the result of fn(*args, **kwargs), from the cache if the same call with the same inputs was done before."""
+        key = (freeze(fn), freeze(args), freeze(kwargs))
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return copy_value(self._items[key][0])
+            self.misses += 1
+
+        # Read outside the lock, so that other steps are not blocked
+        value = fn(*args, **kwargs)
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return value
+
+        with self._lock:
+            if key not in self._items:
+                self._items[key] = (copy_value(value), size)
+                self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, (_, old_size) = self._items.popitem(last=False)
+                self.total_bytes -= old_size
+
+        return value
+
+
+def cached_call(session_cache: SessionCache, fn, *args, **kwargs):
+    """Call 'fn' through the 'session_cache', or directly if there is no cache."""
+    if session_cache is None:
+        return fn(*args, **kwargs)
+    return session_cache.call(fn, *args, **kwargs)
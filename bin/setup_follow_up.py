@@ -11,7 +11,22 @@ import warnings
 import numpy as np
 import regex as re
 import pandas as pd
-from functools import reduce
+from bin.mdl_index import read_MDL_sheet
+from bin.prefetch import prefetch_files, read_bytes, PREFETCH_DEPTH
+from bin.engine import get_engine
+from bin.long_form import (
+    title_columns,
+    to_long,
+    to_wide,
+    multi_symbol_rows
+)
+from bin.effectivity import (
+    effectivity_bits,
+    effectivity_strings,
+    msn_mask,
+    set_bits,
+    any_bits
+)
 
 
 EFFECT_COLUMN = {
@@ -22,6 +37,9 @@ EFFECT_COLUMN = {
     'NC': {'name': 'Effectivity', 'idx': 5}
 }
 
+# Symbols that make an MSN part of the effectivity (Update 01/03/2023: added '-Q', '-T', '- Q', '- T')
+EFFECTIVE_SYMBOLS = ['N', 'R', '-', 'WTF', '-Q', '-T', '- Q', '- T']
+
 
 def read_JSON(filepath: str):
     """
@@ -69,7 +87,42 @@ def read_JSON_authors(filepath: str):
 
     return json_authors
 
-def read_MDLs_current(rootdir: str, current_msn_list: list):
+def get_mdl_column(file: str):
+    """
+    Get the name of the MDL column from the filename of an MDL. i.e. "3708_EFW-E-MDL-00243-C.xlsx" -> "3708_MDL-00243-C"
+    """
+    msn = file[:4]
+    if msn in ['0835', '2737']:
+        return file.replace('.xlsx','').replace('349-', '')         # The MDL filename follows the format "0835_349-MDL-0835-G.xlsx"
+    return file.replace('.xlsx','').replace('EFW-E-', '')           # The MDL filename follows the format "3708_EFW-E-MDL-00243-C.xlsx"
+
+def list_MDLs(rootdir: str):
+    """
+    Find the MDLs inside 'rootdir' without reading them.
+
+    Args:
+    ----------
+        rootdir:
+            The path to the folder containing the MDLs in '.xlsx' format.
+
+    Returns:
+    ----------
+        mdl_dict:
+            Dict with key=MSN and value=(filepath, mdl_column).
+    """
+    mdl_dict = {}
+    for root, _, files in os.walk(rootdir, topdown=True):
+        for file in files:
+            if not file.endswith('xlsx'): continue
+            mdl_dict[file[:4]] = (root + os.sep + file, get_mdl_column(file))
+
+    return mdl_dict
+
+def mdl_files(rootdir: str):
+    """Filepaths of the MDLs ('.xlsx') inside 'rootdir', in the order of "os.walk"."""
+    return [root + os.sep + file for root, _, files in os.walk(rootdir, topdown=True) for file in files if file.endswith('xlsx')]
+
+def read_MDLs_current(rootdir: str, current_msn_list: list, mdl_index: dict = None, prefetch_depth: int = PREFETCH_DEPTH, reader=read_bytes):
     """
     Read only the current MDLs from 'rootdir', and create lists with Dataframes in order to create Follow-Up, DSOL and PS.
 
@@ -81,6 +134,15 @@ def read_MDLs_current(rootdir: str, current_msn_list: list):
         current_msn_list:
             List of the MSNs for the current IPC/SRM revision.
 
+        mdl_index:
+            Optional MDL index (from "load_mdl_index"). MDLs that are already inside are not read from Excel.
+
+        prefetch_depth:
+            Number of MDLs read ahead in the background while one is parsed. (Default=PREFETCH_DEPTH)
+
+        reader:
+            Function that returns the bytes of an MDL (i.e. "slow_reader" to test a slow share). (Default="read_bytes")
+
     Returns:
     ----------
         mdl_msn_list:          
@@ -93,36 +155,29 @@ def read_MDLs_current(rootdir: str, current_msn_list: list):
     ----------
         Symbols '-Q' and '-T' are replaced by 'R' just to be sure.
     """
-    mdl_msn_list = []
+    filepaths = mdl_files(rootdir)
+    mdl_msn_list = [os.path.basename(filepath)[:4] for filepath in filepaths]
     follow_up_list = []
-    for root, _, files in os.walk(rootdir, topdown=True):
-        for file in files:
-            if not file.endswith('xlsx'): continue
-            msn = file[:4]
-            mdl_msn_list.append(msn)
-            if msn in ['0835', '2737']:
-                mdl_column = file.replace('.xlsx','').replace('349-', '')     # The MDL filename follows the format "0835_349-MDL-0835-G.xlsx"
-            else:                                                                  
-                mdl_column = file.replace('.xlsx','').replace('EFW-E-', '')     # The MDL filename follows the format "3708_EFW-E-MDL-00243-C.xlsx"
-
-            # To ignore "UserWarning: Data Validation" and "UserWarning: Conditional Formatting"
-            with warnings.catch_warnings():
-                warnings.simplefilter(action='ignore', category=UserWarning)
-                if msn in current_msn_list:
-                    # Read Sheet 'Applicable Part List' to create Follow-Up DataFrame (for New MSNs)
-                    df = pd.read_excel(root + os.sep + file, dtype=str, sheet_name='Applicable Part List')
-                    df = df[['PART NUMBER', 'PART TITLE', 'QTY', 'PART TYPE', 'PART ISSUE', 'DIFF']]    # Keep only these columns
-                    df['DIFF'] = df['DIFF'].replace(['-Q', '-T', '- Q', '- T'], 'R')                    # Update 02/03/2023: Replace with 'R'
-                    df = df.rename(columns={'DIFF': mdl_column})
-                    for column in df.columns: df[column] = df[column].str.strip()                       # Strip leading and trailing whitespaces
-                    df = df.loc[ df['PART TYPE'] == 'DSOL']
-                    df = df.loc[ df['PART NUMBER'].map(lambda x: True if re.findall(r'R0|R1|R3', x) else False) ]       # Keep only "R0", "R1" and "R3"
-                    df = df.drop(['QTY', 'PART TYPE', 'PART ISSUE'], axis=1)
-                    follow_up_list.append(df)
+    filepaths = [filepath for filepath, msn in zip(filepaths, mdl_msn_list) if msn in current_msn_list]
+    for filepath, data in prefetch_files(filepaths, prefetch_depth, reader):
+        mdl_column = get_mdl_column(os.path.basename(filepath))
+
+        # To ignore "UserWarning: Data Validation" and "UserWarning: Conditional Formatting"
+        with warnings.catch_warnings():
+            warnings.simplefilter(action='ignore', category=UserWarning)
+            # Read Sheet 'Applicable Part List' to create Follow-Up DataFrame (for New MSNs)
+            df = read_MDL_sheet(filepath, 'APL', mdl_index, data)                                  # Keep only 'PART NUMBER', 'PART TITLE', 'QTY', 'PART TYPE', 'PART ISSUE', 'DIFF'
+            df['DIFF'] = df['DIFF'].replace(['-Q', '-T', '- Q', '- T'], 'R')                    # Update 02/03/2023: Replace with 'R'
+            df = df.rename(columns={'DIFF': mdl_column})
+            for column in df.columns: df[column] = df[column].str.strip()                       # Strip leading and trailing whitespaces
+            df = df.loc[ df['PART TYPE'] == 'DSOL']
+            df = df.loc[ df['PART NUMBER'].map(lambda x: True if re.findall(r'R0|R1|R3', x) else False) ]       # Keep only "R0", "R1" and "R3"
+            df = df.drop(['QTY', 'PART TYPE', 'PART ISSUE'], axis=1)
+            follow_up_list.append(df)
 
     return mdl_msn_list, follow_up_list
 
-def read_MDLs(rootdir: str, current_msn_list: list):
+def read_MDLs(rootdir: str, current_msn_list: list, only_msn_list: list = None, mdl_index: dict = None, prefetch_depth: int = PREFETCH_DEPTH, reader=read_bytes):
     """
     Read all MDLs from 'rootdir', and create lists with Dataframes in order to create Follow-Up, DSOL and PS.
 
@@ -134,6 +189,18 @@ def read_MDLs(rootdir: str, current_msn_list: list):
         current_msn_list:
             List of the MSNs for the current IPC/SRM revision.
 
+        only_msn_list:
+            If given, read only the MDLs of these MSNs. (Default=None reads all MDLs)
+
+        mdl_index:
+            Optional MDL index (from "load_mdl_index"). MDLs that are already inside are not read from Excel.
+
+        prefetch_depth:
+            Number of MDLs read ahead in the background while one is parsed. (Default=PREFETCH_DEPTH)
+
+        reader:
+            Function that returns the bytes of an MDL (i.e. "slow_reader" to test a slow share). (Default="read_bytes")
+
     Returns:
     ----------
         mdl_msn_list:          
@@ -155,56 +222,50 @@ def read_MDLs(rootdir: str, current_msn_list: list):
     ----------
         Symbols '-Q' and '-T' are replaced by 'R' just to be sure.
     """
-    mdl_msn_list = []
     dsol_list = []
     ps_list = []
     follow_up_list = []
     nc_list = []
-    for root, _, files in os.walk(rootdir, topdown=True):
-        for file in files:
-            if not file.endswith('xlsx'): continue
-            msn = file[:4]
-            mdl_msn_list.append(msn)
-            if msn in ['0835', '2737']:
-                mdl_column = file.replace('.xlsx','').replace('349-', '')     # The MDL filename follows the format "0835_349-MDL-0835-G.xlsx"
-            else:                                                                  
-                mdl_column = file.replace('.xlsx','').replace('EFW-E-', '')     # The MDL filename follows the format "3708_EFW-E-MDL-00243-C.xlsx"
-
-            # To ignore "UserWarning: Data Validation" and "UserWarning: Conditional Formatting"
-            with warnings.catch_warnings():
-                warnings.simplefilter(action='ignore', category=UserWarning)
-                # Read Sheet 'Product Structure' (for All MSNs)
-                df = pd.read_excel(root + os.sep + file, dtype=str, sheet_name='Product Structure')
-                df = df[['PARENT NUMBER', 'LEVEL', 'CHILD NUMBER', 'CHILD TITLE', 'DIFF']]                          # Keep only these columns
-                df['DIFF'] = df['DIFF'].replace(['-Q', '-T', '- Q', '- T'], 'R')                                    # Update 02/03/2023: Replace with 'R'
-                df = df.rename(columns={'DIFF': mdl_column})
-                for column in df.columns: df[column] = df[column].str.strip()                                       # Strip leading and trailing whitespaces
-                df = df.loc[ df['CHILD TITLE'].map(lambda x: False if re.findall(r'DELET|SALV', x) else True) ]     # Drop "Deleted" and "Salvage"
-                df = df.loc[ df['CHILD NUMBER'].map(lambda x: False if re.findall(r'R6|R7', x) else True) ]         # Drop "R6" and "R7"
-                ps_list.append(df)
-
-                # Read Sheet 'Applicable Part List' to create DSOL (for All MSNs)
-                df = pd.read_excel(root + os.sep + file, dtype=str, sheet_name='Applicable Part List')
-                df = df[['PART NUMBER', 'PART TITLE', 'QTY', 'PART TYPE', 'PART ISSUE', 'DIFF']]    # Keep only these columns
+    filepaths = mdl_files(rootdir)
+    mdl_msn_list = [os.path.basename(filepath)[:4] for filepath in filepaths]
+    if only_msn_list is not None:
+        filepaths = [filepath for filepath, msn in zip(filepaths, mdl_msn_list) if msn in only_msn_list]
+    for filepath, data in prefetch_files(filepaths, prefetch_depth, reader):
+        msn = os.path.basename(filepath)[:4]
+        mdl_column = get_mdl_column(os.path.basename(filepath))
+
+        # To ignore "UserWarning: Data Validation" and "UserWarning: Conditional Formatting"
+        with warnings.catch_warnings():
+            warnings.simplefilter(action='ignore', category=UserWarning)
+            # Read Sheet 'Product Structure' (for All MSNs)
+            df = read_MDL_sheet(filepath, 'PS', mdl_index, data)                                                 # Keep only 'PARENT NUMBER', 'LEVEL', 'CHILD NUMBER', 'CHILD TITLE', 'DIFF'
+            df['DIFF'] = df['DIFF'].replace(['-Q', '-T', '- Q', '- T'], 'R')                                    # Update 02/03/2023: Replace with 'R'
+            df = df.rename(columns={'DIFF': mdl_column})
+            for column in df.columns: df[column] = df[column].str.strip()                                       # Strip leading and trailing whitespaces
+            df = df.loc[ df['CHILD TITLE'].map(lambda x: False if re.findall(r'DELET|SALV', x) else True) ]     # Drop "Deleted" and "Salvage"
+            df = df.loc[ df['CHILD NUMBER'].map(lambda x: False if re.findall(r'R6|R7', x) else True) ]         # Drop "R6" and "R7"
+            ps_list.append(df)
+
+            # Read Sheet 'Applicable Part List' to create DSOL (for All MSNs)
+            df = read_MDL_sheet(filepath, 'APL', mdl_index, data)                              # Keep only 'PART NUMBER', 'PART TITLE', 'QTY', 'PART TYPE', 'PART ISSUE', 'DIFF'
+            df['DIFF'] = df['DIFF'].replace(['-Q', '-T', '- Q', '- T'], 'R')                    # Update 02/03/2023: Replace with 'R'
+            df = df.rename(columns={'DIFF': mdl_column})
+            for column in df.columns: df[column] = df[column].str.strip()                       # Strip leading and trailing whitespaces
+            dsol_list.append(df)
+
+            if msn in current_msn_list:
+                # Create Follow-Up DataFrame from 'Applicable Part List' (only for New MSNs)
+                df = df.loc[ df['PART TYPE'] == 'DSOL']
+                df = df.loc[ df['PART NUMBER'].map(lambda x: True if re.findall(r'R0|R1|R3', x) else False) ]       # Keep only "R0", "R1" and "R3"
+                df = df.drop(['QTY', 'PART TYPE', 'PART ISSUE'], axis=1)
+                follow_up_list.append(df)
+
+                # Read Sheet 'Nonconformities' (only for New MSNs)
+                df = read_MDL_sheet(filepath, 'NC', mdl_index, data)                               # Keep only 'NUMBER', 'ISSUE', 'NC NUMBER', 'NC ISSUE', 'NC TITLE', 'DIFF'
                 df['DIFF'] = df['DIFF'].replace(['-Q', '-T', '- Q', '- T'], 'R')                    # Update 02/03/2023: Replace with 'R'
                 df = df.rename(columns={'DIFF': mdl_column})
                 for column in df.columns: df[column] = df[column].str.strip()                       # Strip leading and trailing whitespaces
-                dsol_list.append(df)
-
-                if msn in current_msn_list:
-                    # Create Follow-Up DataFrame from 'Applicable Part List' (only for New MSNs)
-                    df = df.loc[ df['PART TYPE'] == 'DSOL']
-                    df = df.loc[ df['PART NUMBER'].map(lambda x: True if re.findall(r'R0|R1|R3', x) else False) ]       # Keep only "R0", "R1" and "R3"
-                    df = df.drop(['QTY', 'PART TYPE', 'PART ISSUE'], axis=1)
-                    follow_up_list.append(df)
-
-                    # Read Sheet 'Nonconformities' (only for New MSNs)
-                    df = pd.read_excel(root + os.sep + file, dtype=str, sheet_name='Nonconformities')
-                    df = df[['NUMBER', 'ISSUE', 'NC NUMBER', 'NC ISSUE', 'NC TITLE', 'DIFF']]           # Keep only these columns
-                    df['DIFF'] = df['DIFF'].replace(['-Q', '-T', '- Q', '- T'], 'R')                    # Update 02/03/2023: Replace with 'R'
-                    df = df.rename(columns={'DIFF': mdl_column})
-                    for column in df.columns: df[column] = df[column].str.strip()                       # Strip leading and trailing whitespaces
-                    nc_list.append(df)
+                nc_list.append(df)
 
     return mdl_msn_list, follow_up_list, dsol_list, ps_list, nc_list
 
@@ -223,16 +284,43 @@ def merge_dfs(list_of_dfs: list):
             The merged DataFrame.
     """
     # Get "title_list"
-    title_list = [x for x in list(list_of_dfs[0]) if not re.findall(r'^\d{4}_', x)]
+    title_list = title_columns(list_of_dfs[0])
 
     # Drop Duplicates here before df_merged becomes huge
     for i, _ in enumerate(list_of_dfs):
         list_of_dfs[i] = list_of_dfs[i].drop_duplicates() 
-                            
-    # Merge all Data frames from list (drop duplicates again just to be sure)
-    df_merged = reduce(lambda left, right: pd.merge(left, right, on=title_list, how='outer'), list_of_dfs)
-    df_merged = df_merged.drop_duplicates()                                                                     
-    df_merged = df_merged.sort_values(by=title_list).fillna('')
+
+    # Sparse long-form model: one line for every cell of every MDL
+    df_titles, df_long, mdl_list = to_long(list_of_dfs, title_list)
+
+    # Titles with more than one symbol in the same MDL. The outer merge gives every combination of their symbols,
+    # so only these lines are still merged one MDL after the other (usually a few lines of PS)
+    multi_rows = multi_symbol_rows(df_long)
+    is_multi_long = np.isin(df_long['ROW'].to_numpy(), multi_rows)
+    is_multi_title = np.isin(np.arange(len(df_titles)), multi_rows)
+    df_merged = to_wide(df_titles, df_long[~is_multi_long], mdl_list, fill_value='')[~is_multi_title]
+
+    if len(multi_rows):
+        # MDLs without any of these titles would only add an empty column
+        list_of_multi_dfs = []
+        offset = 0
+        for df in list_of_dfs:
+            is_multi = is_multi_long[offset: offset + len(df)]
+            if is_multi.any(): list_of_multi_dfs.append(df[is_multi])
+            offset += len(df) * (len(df.columns) - len(title_list))
+        df_multi = get_engine().outer_merge(list_of_multi_dfs, title_list)
+
+        # Drop duplicates again just to be sure (the other lines are unique already).
+        # Kept as a single block like 'df_merged', so that sorting does not copy column by column
+        values = df_multi.drop_duplicates().reindex(columns=df_merged.columns).to_numpy(dtype=object)
+        mdl_values = values[:, len(title_list):]
+        mdl_values[pd.isna(mdl_values)] = ''
+        df_merged = pd.concat([df_merged, pd.DataFrame(values, columns=df_merged.columns)])
+
+    # Empty titles are sorted last and filled after sorting. The MDL columns are filled already
+    df_merged = df_merged.sort_values(by=title_list).reset_index(drop=True)
+    for title in title_list:
+        df_merged[title] = df_merged[title].fillna('')
 
     return df_merged
 
@@ -264,26 +352,16 @@ def add_effectivity_column(df_merged: pd.DataFrame, sheet: str, rev_msn_list: li
     if sheet not in ['FOLLOW_UP', 'FOLLOW_UP_INITIAL', 'DSOL', 'PS', 'NC']: sheet = 'DSOL'
     effect_column = EFFECT_COLUMN[sheet]
 
-    # Get "title_list" and "msn_list"
-    title_list = [x for x in list(df_merged.columns) if not re.findall(r'MDL', x)]
-    msn_list = [x[:4] for x in list(df_merged.columns) if re.findall(r'MDL', x)]        
-
-    # Replace '' with np.nan
-    # Because it doesnt work correctly below?????????
-
-    # Create Effectivity Column
-    df_effect = df_merged.drop(title_list, axis=1)
-    df_effect.columns = msn_list
-    for msn in msn_list:
-        if rev_msn_list and msn in rev_msn_list:
-            # df_effect[msn] = df_effect[msn].apply(lambda x: msn if x != '' else np.nan)                                       # Original
-            # df_effect[msn] = df_effect[msn].apply(lambda x: msn if ((x != '') or (pd.notna(x))) else np.nan)                  # One way to also work with NaN
-            df_effect[msn] = df_effect[msn].apply(lambda x: msn if ['N', 'R', '-', 'D', 'WTF', '-Q', '-T', '- Q', '- T'] else np.nan)  # Update 01/03/2023: added '-Q', '-T', '- Q', '- T'
-        else:
-            # df_effect[msn] = df_effect[msn].apply(lambda x: msn if x != '' and x != 'D' else np.nan)                          # Original
-            # df_effect[msn] = df_effect[msn].apply(lambda x: msn if ((x != '') and (pd.notna(x))) and x != 'D' else np.nan)    # One way to also work with NaN
-            df_effect[msn] = df_effect[msn].apply(lambda x: msn if x in ['N', 'R', '-', 'WTF', '-Q', '-T', '- Q', '- T'] else np.nan)   # Update 01/03/2023: added '-Q', '-T', '- Q', '- T'
-    df_effect = df_effect.apply(lambda x: ', '.join(x[x.notnull()]), axis = 1)
+    # Get "mdl_list" and "msn_list"
+    mdl_list = [x for x in list(df_merged.columns) if re.findall(r'MDL', x)]
+    msn_list = [x[:4] for x in mdl_list]
+
+    # Create Effectivity Column from the bits of the effective symbols.
+    # The 90-Day Revision MSNs of 'NC' are effective on every line, to keep the effectivity of the 'D' items
+    bits = effectivity_bits(df_merged, mdl_list, EFFECTIVE_SYMBOLS)
+    if rev_msn_list:
+        bits = set_bits(bits, msn_mask(msn_list, rev_msn_list))
+    df_effect = effectivity_strings(bits, msn_list)
 
     # Insert Effectivity Column
     df_merged.insert(loc=effect_column['idx'], column=effect_column['name'], value=df_effect)
@@ -313,9 +391,10 @@ def add_task_column(df: pd.DataFrame, rev_msn_list: list):
         df:
             The original DataFrame with the 'TASK' column added.
     """
-    all_msn_column_names = [x for x in list(df.columns) if re.findall(r'^\d{4}', x)]
+    # Only the MDL columns. An Update also has the boolean '{msn} Change' columns, that start with the MSN too
+    all_msn_column_names = [x for x in list(df.columns) if re.findall(r'^\d{4}', x) and re.findall(r'MDL', x)]
     new_msn_column_names = [x for x in all_msn_column_names if x[:4] not in rev_msn_list]
-    task_column = df[new_msn_column_names].replace('', np.nan).any(axis=1)
+    task_column = any_bits(effectivity_bits(df, new_msn_column_names))
     task_column = np.where(task_column, 'NEW MSNs', 'REV OLD MSNs')
     idx = 6 if 'CSN' in list(df.columns) else 3
     df.insert(loc=idx, column='TASK', value=task_column)
@@ -346,8 +425,7 @@ def add_columns_to_PS(df_ps: pd.DataFrame):
     
     final_sort_list = ['CHILD NUMBER', 'PARENT NUMBER'] + list(df_ps)[5:]
     final_sort_ascending_list = [True, True] + [False for x in list(df_ps)[5:]]
-    df_ps = df_ps.sort_values(by=final_sort_list, ascending=final_sort_ascending_list)
-    df_ps = df_ps.drop_duplicates(subset=['PARENT NUMBER', 'LEVEL', 'CHILD NUMBER', 'CHILD TITLE'])
+    df_ps = get_engine().sort_drop_duplicates(df_ps, final_sort_list, final_sort_ascending_list, ['PARENT NUMBER', 'LEVEL', 'CHILD NUMBER', 'CHILD TITLE'])
     df_ps = df_ps.reset_index(drop=True)
 
     return df_ps
@@ -359,3 +437,30 @@ def add_columns_to_NC(df_nc: pd.DataFrame):
         df_nc.insert(loc=5, column=col, value=empty_column_nc)
 
     return df_nc
+
+def prepare_follow_up(df_follow_up: pd.DataFrame, rev_msn_list: list, is_SRM_A321: bool = False, is_SRM_A320: bool = False):
+    """
+    Add effectivity, 'TASK' and extra columns to one of the Follow-up DataFrames: df_IPC, df_SRM_A321, df_SRM_A320.
+    
+    Used as a single Stage of the pipeline. Returns None if 'df_follow_up' is None (i.e. no A320 MSNs).
+    """
+    if df_follow_up is None:
+        return None
+    df_follow_up = add_effectivity_column(df_follow_up, 'FOLLOW_UP')
+    df_follow_up = add_task_column(df_follow_up, rev_msn_list)
+    df_follow_up = add_columns_to_Follow_Up(df_follow_up, is_SRM_A321=is_SRM_A321, is_SRM_A320=is_SRM_A320)
+    return df_follow_up
+
+def prepare_dsol(df_dsol: pd.DataFrame):
+    """Add effectivity column to DSOL. Used as a single Stage of the pipeline."""
+    return add_effectivity_column(df_dsol, 'DSOL')
+
+def prepare_ps(df_ps: pd.DataFrame):
+    """Add effectivity column to PS and sort it. Used as a single Stage of the pipeline."""
+    df_ps = add_effectivity_column(df_ps, 'PS')
+    return add_columns_to_PS(df_ps)
+
+def prepare_nc(df_nc: pd.DataFrame, rev_msn_list: list):
+    """Add effectivity and extra columns to NC. Used as a single Stage of the pipeline."""
+    df_nc = add_effectivity_column(df_nc, 'NC', rev_msn_list)
+    return add_columns_to_NC(df_nc)
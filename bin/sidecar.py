@@ -0,0 +1,107 @@
+##########################################################################################
+# Filename:     sidecar.py
+# For:          Follow_Up_Creation_Tool
+# Author:       Spyros Acheimastos (acheimastos@althom.eu)
+# Date:         19/10/2026
+##########################################################################################
+
+#   Binary copy of the sheets of a Follow-up, saved next to the Excel (i.e. 'EFW Follow-up New-Temporary.frames.pkl').
+#   Step-2 of 'Update Follow-up' saves it and Step-3 loads the sheets from it instead of parsing the Excel.
+#   The DataFrames are stored as "pd.read_excel(dtype=str)" would return them from the Excel, so both ways give the same result.
+#   If the Excel was changed after the sidecar was saved, the sidecar is ignored and the Excel is read.
+#   A sidecar saved without an Excel (Step-2 with 'write_excel=False') records "NO_EXCEL" instead of the signature of the Excel,
+#   so an old Excel at the same path is never taken as its Excel. Then the sidecar is used unless an Excel is saved after it.
+
+import os
+import time
+import pickle
+import numpy as np
+import pandas as pd
+
+
+SIDECAR_EXTENSION = '.frames.pkl'
+NO_EXCEL = 'NO_EXCEL'
+
+
+def sidecar_filepath(excelfilepath: str):
+    """Filepath of the sidecar of an Excel."""
+    return os.path.splitext(excelfilepath)[0] + SIDECAR_EXTENSION
+
+
+def excel_signature(excelfilepath: str):
+    """(mtime, size) of the Excel, or None if it does not exist."""
+    if not os.path.isfile(excelfilepath):
+        return None
+    stat = os.stat(excelfilepath)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def frame_as_read(df: pd.DataFrame):
+    """
+    The DataFrame as "pd.read_excel(dtype=str)" returns it after "to_excel": empty strings become NaN,
+    other values become strings (whole floats without '.0') and the index is reset.
+    """
+    values = df.to_numpy(dtype=object).copy()
+    is_str = np.array([isinstance(x, str) for x in values.ravel()], dtype=bool).reshape(values.shape)
+    is_empty = pd.isna(values) | (is_str & (values == ''))
+    is_other = ~is_str & ~is_empty
+    values[is_empty] = np.nan
+    if is_other.any():
+        values[is_other] = [str(int(x)) if isinstance(x, float) and x.is_integer() else str(x) for x in values[is_other]]
+
+    return pd.DataFrame(values, columns=[str(x) for x in df.columns])
+
+
+def save_sidecar(excelfilepath: str, sheets: dict, excel_written: bool = True):
+    """
+    Save the sheets that were written to 'excelfilepath' (key=sheet name, value=DataFrame).
+    Call it after the Excel is saved. With excel_written=False (the Excel is not needed), any Excel
+    already at 'excelfilepath' is not from this run and its signature is not recorded.
+    """
+    sidecar = {
+        'excel_signature': excel_signature(excelfilepath) if excel_written else NO_EXCEL,
+        'saved_ns': time.time_ns(),
+        'sheets': {sheet: frame_as_read(df) for sheet, df in sheets.items()},
+    }
+    filepath = sidecar_filepath(excelfilepath)
+    with open(filepath + '.tmp', 'wb') as f:
+        pickle.dump(sidecar, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(filepath + '.tmp', filepath)
+
+
+def load_sidecar(excelfilepath: str):
+    """
+    The sheets of the sidecar of 'excelfilepath' (key=sheet name, value=DataFrame), or None if there is
+    no sidecar or the Excel has changed since the sidecar was saved (for a sidecar saved without an Excel: an Excel was saved after it).
+    """
+    filepath = sidecar_filepath(excelfilepath)
+    if not os.path.isfile(filepath):
+        return None
+    try:
+        with open(filepath, 'rb') as f:
+            sidecar = pickle.load(f)
+    except Exception:
+        return None
+
+    signature = excel_signature(excelfilepath)
+    if sidecar['excel_signature'] == NO_EXCEL:
+        # Saved without an Excel. An Excel saved after the sidecar replaces it, an older one is ignored
+        if signature is not None and signature[0] > sidecar.get('saved_ns', 0):
+            print(f'"{excelfilepath}" was saved after "{filepath}". Reading the Excel.')
+            return None
+    elif signature is not None and signature != sidecar['excel_signature']:
+        print(f'"{excelfilepath}" has changed after "{filepath}" was saved. Reading the Excel.')
+        return None
+    return sidecar['sheets']
+
+
+def read_sheet(excelfilepath: str, sheet: str, sheets: dict = None):
+    """
+    Same as "pd.read_excel(excelfilepath, dtype=str, sheet_name=sheet)", from the sidecar 'sheets' (of "load_sidecar") if given.
+    Raises ValueError if the sheet does not exist, as "pd.read_excel".
+    """
+    if sheets is None:
+        return pd.read_excel(excelfilepath, dtype=str, sheet_name=sheet)
+    if sheet not in sheets:
+        raise ValueError(f"Worksheet named '{sheet}' not found")
+    return sheets[sheet].copy()
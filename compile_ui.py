@@ -0,0 +1,90 @@
+##########################################################################################
+# Filename:     compile_ui.py
+# For:          Follow_Up_Creation_Tool
+# Author:       Spyros Acheimastos (acheimastos@althom.eu)
+# Date:         19/10/2026
+##########################################################################################
+
+#   Compile "ui/UI.ui" to the Python module "ui/compiled_ui.py" (same as pyside2-uic).
+#   Run it every time "ui/UI.ui" is changed in Qt Designer, and before building the executable.
+#   "main.py" uses the compiled module, so the .ui file is not parsed at every launch.
+#   The compiled module keeps a hash of the .ui file it was compiled from ('UI_HASH'). "main.py" compares it with the hash
+#   of the current .ui file (not the modification times, that a clone or an unzip does not keep in order).
+#
+#   Usage:
+#       python compile_ui.py                  # Compile
+#       python compile_ui.py --benchmark 20   # Compare startup time of compiled module and .ui file
+
+import os
+import sys
+import time
+import hashlib
+import argparse
+
+
+SCRIPT_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+UI_FILEPATH = os.path.join(SCRIPT_DIRECTORY, 'ui', 'UI.ui')
+COMPILED_UI_FILEPATH = os.path.join(SCRIPT_DIRECTORY, 'ui', 'compiled_ui.py')
+
+
+def ui_hash(ui_filepath: str = UI_FILEPATH):
+    """SHA-256 of a .ui file. Line endings are normalized, so a checkout with CRLF gives the same hash."""
+    with open(ui_filepath, 'rb') as f:
+        return hashlib.sha256(f.read().replace(b'\r\n', b'\n')).hexdigest()
+
+
+def compile_ui(ui_filepath: str = UI_FILEPATH, compiled_ui_filepath: str = COMPILED_UI_FILEPATH):
+    """
+    Compile a .ui file to a Python module with the compiler of pyside2-uic.
+    """
+    # pyside2-uic of PySide2 5.13 uses 'Element.getiterator' that was removed in Python 3.9.
+    # The Python version of ElementTree can be patched (the C version cannot)
+    if 'xml.etree.ElementTree' not in sys.modules:
+        sys.modules['_elementtree'] = None
+    import xml.etree.ElementTree as ElementTree
+    if not hasattr(ElementTree.Element, 'getiterator'):
+        ElementTree.Element.getiterator = ElementTree.Element.iter
+    from pyside2uic import compileUi
+
+    # Relative path, so that the header of the compiled module does not depend on the PC
+    with open(compiled_ui_filepath, 'w', encoding='utf-8') as f:
+        compileUi(os.path.relpath(ui_filepath), f, False, 4, False)
+        f.write(f'\n# Hash of the .ui file this module was compiled from (see "compile_ui.py")\nUI_HASH = {ui_hash(ui_filepath)!r}\n')
+    print(f'Compiled "{ui_filepath}" to "{compiled_ui_filepath}"')
+
+
+def benchmark_startup(repeat: int = 10):
+    """
+    Time the creation of the MainWindow with the compiled module and with QUiLoader (.ui file).
+    """
+    from PySide2.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv)
+    import main
+
+    timings = {}
+    for label, ui_class in [('Compiled module', main.Ui_MainWindow), ('QUiLoader (.ui)', None)]:
+        if label == 'Compiled module' and ui_class is None:
+            print('Compiled module not found. Run "python compile_ui.py" first.')
+            continue
+        main.Ui_MainWindow = ui_class
+        elapsed = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            window = main.MainWindow()
+            elapsed.append(time.perf_counter() - start)
+            window.deleteLater()
+        timings[label] = elapsed
+        print(f'{label:<18} best: {min(elapsed) * 1000:7.1f} ms    mean: {sum(elapsed) / len(elapsed) * 1000:7.1f} ms    ({repeat} runs)')
+
+    return timings
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compile "ui/UI.ui" to "ui/compiled_ui.py".')
+    parser.add_argument('--benchmark', type=int, metavar='N', help='Only compare the startup time (N runs each).')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark_startup(args.benchmark)
+    else:
+        compile_ui()
@@ -8,13 +8,15 @@
 #   Useful for multithreading: https://www.pythonguis.com/tutorials/multithreading-pyqt-applications-qthreadpool/
 
 import os, sys
+import multiprocessing
 from PySide2.QtCore import *
 from PySide2.QtGui import *
 from PySide2.QtWidgets import *
 from PySide2.QtUiTools import QUiLoader
 
 # For Multithreading
-from bin.multi import Worker
+from bin.job_manager import JobManager
+from bin.session_cache import SessionCache
 from PySide2.QtCore import QThreadPool
 
 # Main Running Functions
@@ -25,12 +27,37 @@ from bin.fun_run_start import (
     fun_run_3_start, 
     fun_run_8_start,
     fun_run_9_start,
+    fun_run_10_start,
+    fun_run_11_start,
     fun_generate_authors_start,
-    fun_generate_msns_start
+    fun_generate_msns_start,
+    fun_load_ps_graph_start
+)
+from bin.engine import engine_fallback_message
+from bin.ps_graph import PS_GRAPH_COLUMNS
+from bin.pn_index import (
+    PN_INDEX_FILEPATH,
+    load_pn_index,
+    lookup,
+    prefix_search
 )
 
 
 SCRIPT_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+UI_FILEPATH = os.path.join(SCRIPT_DIRECTORY, 'ui/UI.ui')
+COMPILED_UI_FILEPATH = os.path.join(SCRIPT_DIRECTORY, 'ui/compiled_ui.py')
+
+# UI compiled by "compile_ui.py". If it is missing or was compiled from another "ui/UI.ui" (by hash), the .ui file is loaded at runtime.
+# A compiled UI that is out of date is reported in the console when the window opens ('UI_MESSAGE')
+UI_MESSAGE = None
+try:
+    from ui.compiled_ui import Ui_MainWindow, UI_HASH
+    from compile_ui import ui_hash
+    if os.path.isfile(UI_FILEPATH) and ui_hash(UI_FILEPATH) != UI_HASH:
+        UI_MESSAGE = '"ui/UI.ui" has changed since "ui/compiled_ui.py" was compiled, so it was loaded instead. Run "python compile_ui.py" to update it.'
+        Ui_MainWindow = None
+except ImportError:
+    Ui_MainWindow = None
 
 
 class UiLoader(QUiLoader):
@@ -89,75 +116,136 @@ class MainWindow(QMainWindow):
 
         self.setWindowIcon(QIcon('ui/althom.png'))
 
-        # For Multithreading
+        # For Multithreading. Runs are queued as Jobs and started when the limits allow
         self.threadpool = QThreadPool()
-
-        # Load UI
-        load_ui(os.path.join(SCRIPT_DIRECTORY, 'ui/UI.ui'), self)
+        self.job_manager = JobManager(self.threadpool)
+        self.console_job_id = None
+
+        # Parsed MDLs, PseudoDataBases and JSONs are kept in memory while the GUI is open
+        self.session_cache = SessionCache()
+
+        # Load UI. Widgets become attributes of the MainWindow in both cases
+        if Ui_MainWindow is not None:
+            ui = Ui_MainWindow()
+            ui.setupUi(self)
+            for name, widget in vars(ui).items():
+                setattr(self, name, widget)
+        else:
+            load_ui(UI_FILEPATH, self)
+            if UI_MESSAGE is not None:
+                self.my_console_update(text=UI_MESSAGE)
 
         # Add colour to all "Run" buttons
-        for btn in ['btn_run_0', 'btn_run_1', 'btn_run_2', 'btn_run_3', 'btn_run_6', 'btn_run_7', 'btn_run_8', 'btn_run_9', 'btn_generate_msns', 'btn_generate_authors']:
-            self.findChild(QPushButton, btn).setStyleSheet("background-color: #FFD966")
+        for btn in [self.btn_run_0, self.btn_run_1, self.btn_run_2, self.btn_run_3, self.btn_run_6, self.btn_run_7, self.btn_run_8, self.btn_run_9, self.btn_run_10, self.btn_run_11, self.btn_generate_msns, self.btn_generate_authors, self.btn_where_used, self.btn_explode]:
+            btn.setStyleSheet("background-color: #FFD966")
 
 
         ############ CREATE FOLLOW_UP ############
         # Step 1
-        self.findChild(QPushButton, 'btn_latest_follow_up').clicked.connect(lambda: self.fun_latest_follow_up())
-        self.findChild(QPushButton, 'btn_pseudo_db_1').clicked.connect(lambda: self.fun_pseudo_db_1())
-        self.findChild(QPushButton, 'btn_run_1').clicked.connect(lambda: self.fun_run_1())
+        self.btn_latest_follow_up.clicked.connect(self.fun_latest_follow_up)
+        self.btn_pseudo_db_1.clicked.connect(self.fun_pseudo_db_1)
+        self.btn_run_1.clicked.connect(self.fun_run_1)
 
         # Step 2
-        self.findChild(QPushButton, 'btn_json').clicked.connect(lambda: self.fun_json())
-        self.findChild(QPushButton, 'btn_mdl').clicked.connect(lambda: self.fun_mdl())
-        self.findChild(QPushButton, 'btn_pseudo_db_2').clicked.connect(lambda: self.fun_pseudo_db_2())
-        self.findChild(QPushButton, 'btn_run_2').clicked.connect(lambda: self.fun_run_2())
+        self.btn_json.clicked.connect(self.fun_json)
+        self.btn_mdl.clicked.connect(self.fun_mdl)
+        self.btn_pseudo_db_2.clicked.connect(self.fun_pseudo_db_2)
+        self.btn_run_2.clicked.connect(self.fun_run_2)
         
         # Step 3
-        self.findChild(QPushButton, 'btn_json_2').clicked.connect(lambda: self.fun_json())
-        self.findChild(QPushButton, 'btn_mdl_2').clicked.connect(lambda: self.fun_mdl())
-        self.findChild(QPushButton, 'btn_pseudo_db_3').clicked.connect(lambda: self.fun_pseudo_db_2())
-        self.findChild(QPushButton, 'btn_json_authors').clicked.connect(lambda: self.fun_json_authors())
-        self.findChild(QPushButton, 'btn_run_3').clicked.connect(lambda: self.fun_run_3())
+        self.btn_json_2.clicked.connect(self.fun_json)
+        self.btn_mdl_2.clicked.connect(self.fun_mdl)
+        self.btn_pseudo_db_3.clicked.connect(self.fun_pseudo_db_2)
+        self.btn_json_authors.clicked.connect(self.fun_json_authors)
+        self.btn_run_3.clicked.connect(self.fun_run_3)
 
         ############ UPDATE FOLLOW_UP ############
         # Step 1
-        self.findChild(QPushButton, 'btn_json_3').clicked.connect(lambda: self.fun_json())
-        self.findChild(QPushButton, 'btn_mdl_3').clicked.connect(lambda: self.fun_mdl())
-        self.findChild(QPushButton, 'btn_pseudo_db_5').clicked.connect(lambda: self.fun_pseudo_db_2())
-        self.findChild(QPushButton, 'btn_run_6').clicked.connect(lambda: self.fun_run_2())
+        self.btn_json_3.clicked.connect(self.fun_json)
+        self.btn_mdl_3.clicked.connect(self.fun_mdl)
+        self.btn_pseudo_db_5.clicked.connect(self.fun_pseudo_db_2)
+        self.btn_run_6.clicked.connect(self.fun_run_2)
 
         # Step 2
-        self.findChild(QPushButton, 'btn_json_4').clicked.connect(lambda: self.fun_json())
-        self.findChild(QPushButton, 'btn_mdl_4').clicked.connect(lambda: self.fun_mdl())
-        self.findChild(QPushButton, 'btn_pseudo_db_6').clicked.connect(lambda: self.fun_pseudo_db_2())
-        self.findChild(QPushButton, 'btn_run_7').clicked.connect(lambda: self.fun_run_7())
+        self.btn_json_4.clicked.connect(self.fun_json)
+        self.btn_mdl_4.clicked.connect(self.fun_mdl)
+        self.btn_pseudo_db_6.clicked.connect(self.fun_pseudo_db_2)
+        self.btn_run_7.clicked.connect(self.fun_run_7)
 
         # Step 3
-        self.findChild(QPushButton, 'btn_json_5').clicked.connect(lambda: self.fun_json())
-        self.findChild(QPushButton, 'btn_json_authors_2').clicked.connect(lambda: self.fun_json_authors())
-        self.findChild(QPushButton, 'btn_old_follow_up').clicked.connect(lambda: self.fun_old_follow_up())
-        self.findChild(QPushButton, 'btn_new_follow_up').clicked.connect(lambda: self.fun_new_follow_up())
-        self.findChild(QPushButton, 'btn_run_8').clicked.connect(lambda: self.fun_run_8())
+        self.btn_json_5.clicked.connect(self.fun_json)
+        self.btn_json_authors_2.clicked.connect(self.fun_json_authors)
+        self.btn_old_follow_up.clicked.connect(self.fun_old_follow_up)
+        self.btn_new_follow_up.clicked.connect(self.fun_new_follow_up)
+        self.btn_run_8.clicked.connect(self.fun_run_8)
+
+        # Incremental Update (only changed MDLs)
+        self.btn_json_7.clicked.connect(self.fun_json)
+        self.btn_json_authors_3.clicked.connect(self.fun_json_authors)
+        self.btn_mdl_5.clicked.connect(self.fun_mdl)
+        self.btn_pseudo_db_7.clicked.connect(self.fun_pseudo_db_2)
+        self.btn_old_follow_up_2.clicked.connect(self.fun_old_follow_up)
+        self.btn_run_10.clicked.connect(self.fun_run_10)
 
         ############ EXTRA ############
         # Generate JSON files
-        self.findChild(QPushButton, 'btn_generate_authors').clicked.connect(lambda: self.fun_generate_authors())
-        self.findChild(QPushButton, 'btn_generate_msns').clicked.connect(lambda: self.fun_generate_msns())
+        self.btn_generate_authors.clicked.connect(self.fun_generate_authors)
+        self.btn_generate_msns.clicked.connect(self.fun_generate_msns)
 
         # (Step 0) Generate a New PseudoDB
-        self.findChild(QPushButton, 'btn_one_follow_up').clicked.connect(lambda: self.fun_one_follow_up())
-        self.findChild(QPushButton, 'btn_run_0').clicked.connect(lambda: self.fun_run_0())
+        self.btn_one_follow_up.clicked.connect(self.fun_one_follow_up)
+        self.btn_run_0.clicked.connect(self.fun_run_0)
+
+        # Generate a New PseudoDB from a folder with Follow-ups
+        self.btn_folder_follow_ups.clicked.connect(self.fun_folder_follow_ups)
+        self.btn_run_11.clicked.connect(self.fun_run_11)
 
         # Create ALL-NCs
-        self.findChild(QPushButton, 'btn_json_6').clicked.connect(lambda: self.fun_json())
-        self.findChild(QPushButton, 'btn_mdl_all_MSNs').clicked.connect(lambda: self.fun_all_mdl())
-        self.findChild(QPushButton, 'btn_mdl_rev_MSNs').clicked.connect(lambda: self.fun_rev_mdl())
-        self.findChild(QPushButton, 'btn_run_9').clicked.connect(lambda: self.fun_run_9())
+        self.btn_json_6.clicked.connect(self.fun_json)
+        self.btn_mdl_all_MSNs.clicked.connect(self.fun_all_mdl)
+        self.btn_mdl_rev_MSNs.clicked.connect(self.fun_rev_mdl)
+        self.btn_run_9.clicked.connect(self.fun_run_9)
+
+        ############ SEARCH ############
+        self.ps_graph = None
+        self.pn_index, self.pn_index_mtime = None, None
+        self.btn_search_follow_up.clicked.connect(self.fun_search_follow_up)
+        self.btn_where_used.clicked.connect(self.fun_where_used)
+        self.btn_explode.clicked.connect(self.fun_explode)
+        self.btn_search_pn.clicked.connect(self.fun_search_pn)
+        self.btn_pn_lookup.clicked.connect(self.fun_pn_lookup)
+        self.input_search_pn.returnPressed.connect(self.fun_where_used)
+        self.tree_search.itemClicked.connect(self.fun_select_search_pn)
+        self.tree_search.setColumnWidth(0, 150)
+        self.tree_search.setColumnWidth(1, 130)
+        self.tree_search.setColumnWidth(2, 40)
+
+        ############ JOBS ############
+        self.table_jobs.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.table_jobs.setColumnWidth(0, 30)
+        self.table_jobs.itemSelectionChanged.connect(self.fun_select_job)
+        self.btn_cancel_job.clicked.connect(self.fun_cancel_job)
+        self.job_manager.changed.connect(self.update_jobs_table)
+        self.job_manager.console.connect(self.job_console_update)
+
+        # Refresh the running time of the Jobs
+        self.jobs_timer = QTimer(self)
+        self.jobs_timer.setInterval(1000)
+        self.jobs_timer.timeout.connect(self.update_running_jobs)
+        self.jobs_timer.start()
+
+        # The compute engine of FOLLOW_UP_ENGINE falls back to 'pandas' if it is not installed
+        message = engine_fallback_message()
+        if message is not None:
+            self.my_console_update(text=message)
 
 
     def fun_one_follow_up(self):
         self.filepath_one_follow_up = QFileDialog.getOpenFileName(self, 'Select a Follow-up', SCRIPT_DIRECTORY, 'Excel File (*.xlsx)')[0]
 
+    def fun_folder_follow_ups(self):
+        self.filepath_folder_follow_ups = QFileDialog.getExistingDirectory(self, 'Select folder with Follow-ups', SCRIPT_DIRECTORY)
+
     def fun_latest_follow_up(self):
         self.filepath_latest_follow_up = QFileDialog.getOpenFileName(self, 'Select latest Follow-up', SCRIPT_DIRECTORY, 'Excel File (*.xlsx)')[0]
 
@@ -203,6 +291,75 @@ class MainWindow(QMainWindow):
         self.my_textBrowser.setText(msg)
 
 
+    def job_console_update(self, job_id: int, text: str):
+        """
+        Print the message of a Job, if the console shows this Job.
+        """
+        if job_id == self.console_job_id:
+            self.my_console_update(text=text)
+
+
+    def show_job_log(self, job_id: int):
+        """
+        Show the log of a Job in the console.
+        """
+        self.console_job_id = job_id
+        job = self.job_manager.jobs[job_id]
+        self.my_textBrowser.setText('\n'.join([f'[Job {job.id}: {job.name}]'] + job.log))
+
+
+    def submit_job(self, name: str, fn, *args, **kwargs):
+        """
+        Add a run to the queue of Jobs and show its log in the console.
+        """
+        job = self.job_manager.submit(name, fn, *args, **kwargs)
+        self.show_job_log(job.id)
+        return job
+
+
+    def update_jobs_table(self):
+        """
+        Fill the Jobs table (newest Job first).
+        """
+        jobs = sorted(self.job_manager.jobs.values(), key=lambda job: job.id, reverse=True)
+
+        selected_id = self.selected_job_id()
+        self.table_jobs.blockSignals(True)
+        self.table_jobs.setRowCount(len(jobs))
+        for row, job in enumerate(jobs):
+            elapsed = job.elapsed()
+            values = [str(job.id), job.name, job.status, '' if elapsed is None else f'{elapsed:.0f} s']
+            for column, value in enumerate(values):
+                self.table_jobs.setItem(row, column, QTableWidgetItem(value))
+            if job.id == selected_id:
+                self.table_jobs.selectRow(row)
+        self.table_jobs.blockSignals(False)
+
+
+    def update_running_jobs(self):
+        if self.job_manager.running_jobs():
+            self.update_jobs_table()
+
+
+    def selected_job_id(self):
+        rows = self.table_jobs.selectionModel().selectedRows()
+        if not rows:
+            return None
+        return int(self.table_jobs.item(rows[0].row(), 0).text())
+
+
+    def fun_select_job(self):
+        job_id = self.selected_job_id()
+        if job_id is not None:
+            self.show_job_log(job_id)
+
+
+    def fun_cancel_job(self):
+        job_id = self.selected_job_id()
+        if job_id is None or not self.job_manager.cancel(job_id):
+            self.my_console_update(text='Select a Queued Job first. Running Jobs cannot be cancelled.')
+
+
     def save_result(self, ressult_dict):
         """
         """
@@ -215,36 +372,22 @@ class MainWindow(QMainWindow):
     #############################################
     #############################################
     def fun_generate_authors(self):
-        # Clear before starting
-        self.my_console_update(clear=True)
-
-        # Pass the function to execute
-        self.worker = Worker(
+        # Add to the queue of Jobs (started when the limits allow)
+        self.submit_job(
+            'Generate JSON with Authors',
             fun_generate_authors_start,
+            heavy=False,
             console=True
-        )  # Any other args, kwargs are passed to the run function
-
-        # Make Connections
-        self.worker.signals.console.connect(self.my_console_update)
-
-        # Execute
-        self.threadpool.start(self.worker)
+        )
 
     def fun_generate_msns(self):
-        # Clear before starting
-        self.my_console_update(clear=True)
-
-        # Pass the function to execute
-        self.worker = Worker(
+        # Add to the queue of Jobs (started when the limits allow)
+        self.submit_job(
+            'Generate JSON with MSNs',
             fun_generate_msns_start,
+            heavy=False,
             console=True
-        )  # Any other args, kwargs are passed to the run function
-
-        # Make Connections
-        self.worker.signals.console.connect(self.my_console_update)
-
-        # Execute
-        self.threadpool.start(self.worker)
+        )
 
 
     def fun_run_0(self):
@@ -252,22 +395,32 @@ class MainWindow(QMainWindow):
         if not hasattr(self, 'filepath_one_follow_up') or self.filepath_one_follow_up == '':
             return self.my_console_update(text='Give a Follow-up file first.', clear=True)
 
-        # Clear before starting
-        self.my_console_update(clear=True)
-
-        # Pass the function to execute
-        self.worker = Worker(
+        # Add to the queue of Jobs (started when the limits allow)
+        self.submit_job(
+            'Generate New PseudoDataBase',
             fun_run_0_start,
             self.filepath_one_follow_up,
+            heavy=True,
             console=True
-        )  # Any other args, kwargs are passed to the run function
+        )
 
-        # Make Connections
-        # self.worker.signals.result.connect(self.save_result)
-        self.worker.signals.console.connect(self.my_console_update)
 
-        # Execute
-        self.threadpool.start(self.worker)
+    def fun_run_11(self):
+        """
+        For a New PseudoDB from a folder with Follow-ups
+        """
+        # Initial Checks
+        if not hasattr(self, 'filepath_folder_follow_ups') or self.filepath_folder_follow_ups == '':
+            return self.my_console_update(text='Give a folder with Follow-ups first.', clear=True)
+
+        # Add to the queue of Jobs (started when the limits allow)
+        self.submit_job(
+            'Generate PseudoDataBase from folder',
+            fun_run_11_start,
+            self.filepath_folder_follow_ups,
+            heavy=True,
+            console=True
+        )
 
 
     def fun_run_1(self):
@@ -277,23 +430,15 @@ class MainWindow(QMainWindow):
         if not hasattr(self, 'filepath_pseudo_db_1') or self.filepath_pseudo_db_1 == '':
             return self.my_console_update(text='Give the Latest PseudoDataBase first.', clear=True)
 
-        # Clear before starting
-        self.my_console_update(clear=True)
-
-        # Pass the function to execute
-        self.worker = Worker(
+        # Add to the queue of Jobs (started when the limits allow)
+        self.submit_job(
+            'Create Step 1',
             fun_run_1_start,
             self.filepath_latest_follow_up,
             self.filepath_pseudo_db_1,
+            heavy=True,
             console=True
-        )  # Any other args, kwargs are passed to the run function
-
-        # Make Connections
-        # self.worker.signals.result.connect(self.save_result)
-        self.worker.signals.console.connect(self.my_console_update)
-
-        # Execute
-        self.threadpool.start(self.worker)
+        )
 
 
     def fun_run_2(self):
@@ -305,29 +450,22 @@ class MainWindow(QMainWindow):
         if not hasattr(self, 'filepath_pseudo_db_2') or self.filepath_pseudo_db_2 == '':
             return self.my_console_update(text='Give the Latest PseudoDataBase first.', clear=True)
 
-        # Clear before starting
-        self.my_console_update(clear=True)
-        
-        # Pass the function to execute
-        self.worker = Worker(
+        # Add to the queue of Jobs (started when the limits allow)
+        self.submit_job(
+            'Create Step 2 / Update Step 1',
             fun_run_2_start,
             self.filepath_json,
             self.filepath_mdl,
             self.filepath_pseudo_db_2,
+            session_cache=self.session_cache,
+            heavy=True,
             console=True
-        )  # Any other args, kwargs are passed to the run function
-
-        # Make Connections
-        # self.worker.signals.result.connect(self.save_result)
-        self.worker.signals.console.connect(self.my_console_update)
-
-        # Execute
-        self.threadpool.start(self.worker)
+        )
 
 
     def fun_run_3(self):
         # Get Revision and excelfilepath
-        revision = self.findChild(QLineEdit, 'input_revision').text()
+        revision = self.input_revision.text()
         if revision == '': revision = 'RXX'
         excelfilepath = f'EFW Follow-up {revision}.xlsx'
 
@@ -341,26 +479,21 @@ class MainWindow(QMainWindow):
         if not hasattr(self, 'filepath_pseudo_db_2') or self.filepath_pseudo_db_2 == '':
             return self.my_console_update(text='Give the Latest PseudoDataBase first.', clear=True)
 
-        # Clear before starting
-        self.my_console_update(clear=True)
-        
-        # Pass the function to execute
-        self.worker = Worker(
+        # Add to the queue of Jobs (started when the limits allow)
+        self.submit_job(
+            'Create Step 3',
             fun_run_3_start,
             self.filepath_json,
             self.filepath_mdl,
             self.filepath_pseudo_db_2,
             excelfilepath,
             self.filepath_json_authors,
+            split_reference=self.check_split_reference.isChecked(),
+            resume=self.check_resume.isChecked(),
+            session_cache=self.session_cache,
+            heavy=True,
             console=True
-        )  # Any other args, kwargs are passed to the run function
-
-        # Make Connections
-        # self.worker.signals.result.connect(self.save_result)
-        self.worker.signals.console.connect(self.my_console_update)
-
-        # Execute
-        self.threadpool.start(self.worker)
+        )
 
     
     def fun_run_7(self):
@@ -375,14 +508,12 @@ class MainWindow(QMainWindow):
         if not hasattr(self, 'filepath_pseudo_db_2') or self.filepath_pseudo_db_2 == '':
             return self.my_console_update(text='Give the Latest PseudoDataBase first.', clear=True)
     
-        # Clear before starting
-        self.my_console_update(clear=True)
-        
         # Dont add authors
         self.filepath_json_authors = None
 
-        # Pass the function to execute
-        self.worker = Worker(
+        # Add to the queue of Jobs (started when the limits allow)
+        self.submit_job(
+            'Update Step 2',
             fun_run_3_start,
             self.filepath_json,
             self.filepath_mdl,
@@ -390,15 +521,11 @@ class MainWindow(QMainWindow):
             excelfilepath,
             self.filepath_json_authors,
             add_QBs=False,
+            sidecar=True,
+            session_cache=self.session_cache,
+            heavy=True,
             console=True
-        )  # Any other args, kwargs are passed to the run function
-
-        # Make Connections
-        # self.worker.signals.result.connect(self.save_result)
-        self.worker.signals.console.connect(self.my_console_update)
-
-        # Execute
-        self.threadpool.start(self.worker)
+        )
 
 
     def fun_run_8(self):
@@ -412,29 +539,22 @@ class MainWindow(QMainWindow):
         if not hasattr(self, 'filepath_new_follow_up') or self.filepath_new_follow_up == '':
             return self.my_console_update(text='Give the New Follow-up first.', clear=True)
 
-        # Clear before starting
-        self.my_console_update(clear=True)
-
         # Set filename of Excel
         excelfilepath = self.filepath_old_follow_up.replace('.xlsx', '_FINAL.xlsx')
         
-        # Pass the function to execute
-        self.worker = Worker(
+        # Add to the queue of Jobs (started when the limits allow)
+        self.submit_job(
+            'Update Step 3',
             fun_run_8_start,
             self.filepath_json,
             self.filepath_json_authors,
             self.filepath_old_follow_up,
             self.filepath_new_follow_up,
             excelfilepath,
+            session_cache=self.session_cache,
+            heavy=True,
             console=True
-        )  # Any other args, kwargs are passed to the run function
-
-        # Make Connections
-        # self.worker.signals.result.connect(self.save_result)
-        self.worker.signals.console.connect(self.my_console_update)
-
-        # Execute
-        self.threadpool.start(self.worker)
+        )
 
 
     def fun_run_9(self):
@@ -442,7 +562,7 @@ class MainWindow(QMainWindow):
         For All-NCs
         """
         # Get Revision and excelfilepath
-        revision = self.findChild(QLineEdit, 'input_revision_2').text()
+        revision = self.input_revision_2.text()
         if revision == '': revision = 'RXX'
         # excelfilepath = f'ALL_NCs_R{revision}.xlsx'
 
@@ -454,28 +574,189 @@ class MainWindow(QMainWindow):
         if not hasattr(self, 'filepath_rev_mdl') or self.filepath_rev_mdl == '':
             return self.my_console_update(text='Give folder with the MDLs that where incorporated last time for Rev MSNs first.', clear=True)
 
-        # Clear before starting
-        self.my_console_update(clear=True)
-
-        # Pass the function to execute
-        self.worker = Worker(
+        # Add to the queue of Jobs (started when the limits allow)
+        self.submit_job(
+            'Create ALL-NCs',
             fun_run_9_start,
             self.filepath_json,
             self.filepath_all_mdl,
             self.filepath_rev_mdl,
             revision,
+            session_cache=self.session_cache,
+            heavy=True,
             console=True
-        )  # Any other args, kwargs are passed to the run function
+        )
 
-        # Make Connections
-        # self.worker.signals.result.connect(self.save_result)
-        self.worker.signals.console.connect(self.my_console_update)
 
-        # Execute
-        self.threadpool.start(self.worker)
+    def fun_search_follow_up(self):
+        """
+        Select a Follow-up and load its PS index for the 'Search' tab
+        """
+        excelfilepath = QFileDialog.getOpenFileName(self, 'Select a Follow-up', SCRIPT_DIRECTORY, 'Excel File (*.xlsx)')[0]
+        if excelfilepath == '':
+            return
+
+        self.ps_graph = None
+        self.submit_job(
+            'Load PS index',
+            fun_load_ps_graph_start,
+            excelfilepath,
+            heavy=False,
+            on_result=self.save_result,
+            console=True
+        )
+
+
+    def fun_where_used(self):
+        self.show_ps_tree('up')
+
+
+    def fun_explode(self):
+        self.show_ps_tree('down')
+
+
+    def show_ps_tree(self, direction: str):
+        """
+        Fill the tree of the 'Search' tab with the parents ('up') or the children ('down') of the Part Number.
+        Runs directly (not as a Job), because the PS index answers in milliseconds.
+        """
+        if self.ps_graph is None:
+            return self.my_console_update(text='Give a Follow-up first and wait for its PS index to load.', clear=True)
+        part_number = self.input_search_pn.text().strip()
+        msn = self.input_search_msn.text().strip() or None
+
+        try:
+            df = self.ps_graph.walk(part_number, direction, msn=msn)
+        except KeyError as error:
+            return self.my_console_update(text=error.args[0], clear=True)
+
+        # Rows are in the order of the tree, so the parent of a row is the last row with one less depth
+        self.clear_search_tree(['Part Number', 'Title', 'Level', 'Effectivity'])
+        root = self.search_tree_item(self.tree_search, [part_number, self.ps_graph.titles[self.ps_graph.code(part_number)], '', ''], part_number)
+        last_items = [root]
+        for depth, pn, title, level, effectivity in df[PS_GRAPH_COLUMNS].itertuples(index=False):
+            item = self.search_tree_item(last_items[depth - 1], [pn, title, level, effectivity], pn)
+            del last_items[depth:]
+            last_items.append(item)
+        self.tree_search.expandAll()
+
+        found = 'parents' if direction == 'up' else 'children'
+        self.my_console_update(text=f'{part_number}: {len(df)} {found}' + (f' effective on MSN {msn}.' if msn else '.'), clear=True)
+
+
+    def fun_search_pn(self):
+        """
+        List the Part Numbers and NCs that start with the text of the 'Part Number' box.
+        Uses the Part Number index of all MDLs, or the PS index of the Follow-up if there is no Part Number index yet.
+        """
+        prefix = self.input_search_pn.text().strip()
+        pn_index = self.current_pn_index()
+        if pn_index is not None:
+            found = prefix_search(pn_index, prefix)
+        elif self.ps_graph is not None:
+            found = [(pn, self.ps_graph.titles[self.ps_graph.code(pn)], None) for pn in self.ps_graph.search(prefix)]
+        else:
+            return self.my_console_update(text='There is no Part Number index yet (it is built by Step-3) and no Follow-up was given.', clear=True)
+
+        self.clear_search_tree(['Part Number', 'Title', '', 'MDL lines'])
+        for key, title, count in found:
+            self.search_tree_item(self.tree_search, [key, title, '', '' if count is None else str(count)], key)
+        self.my_console_update(text=f'{len(found)} found (at most 50). Select one and press "Where used", "Explode" or "MDLs and NCs".', clear=True)
+
+
+    def fun_pn_lookup(self):
+        """
+        Show the MSNs (and MDL revisions) that contain the Part Number or NC of the 'Part Number' box,
+        with the symbol of every sheet and the NCs or Parents of the lines
+        """
+        pn_index = self.current_pn_index()
+        if pn_index is None:
+            return self.my_console_update(text='There is no Part Number index yet. It is built when MDLs are read (i.e. Step-3 or ALL-NCs).', clear=True)
+        key = self.input_search_pn.text().strip()
+        rows = lookup(pn_index, key)
+
+        # One item for every MSN with its lines below. Selecting a line with a Parent or NC searches for it
+        self.clear_search_tree(['MSN / Sheet', 'Symbol', 'Title', 'Parent / NC / PN'])
+        msn_items = {}
+        for _, msn, revision, sheet, symbol, title, detail in rows:
+            if msn not in msn_items:
+                msn_items[msn] = self.search_tree_item(self.tree_search, [f'{msn} (MDL rev {revision})', '', '', ''])
+            self.search_tree_item(msn_items[msn], [sheet, symbol, title, detail], detail or None)
+
+        self.my_console_update(text=f'{key}: {len(rows)} MDL lines on {len(msn_items)} MSNs.', clear=True)
+
+
+    def current_pn_index(self):
+        """
+        The Part Number index, loaded again only if the runs have updated it since it was loaded.
+        """
+        if not os.path.isfile(PN_INDEX_FILEPATH):
+            return None
+        mtime = os.path.getmtime(PN_INDEX_FILEPATH)
+        if mtime != self.pn_index_mtime:
+            self.pn_index, self.pn_index_mtime = load_pn_index(), mtime
+        return self.pn_index
+
+
+    def clear_search_tree(self, labels: list):
+        self.tree_search.clear()
+        self.tree_search.setHeaderLabels(labels)
+
+
+    def search_tree_item(self, parent, values: list, key: str = None):
+        """
+        Add a line to the tree of the 'Search' tab. Selecting it puts 'key' inside the 'Part Number' box.
+        """
+        item = QTreeWidgetItem(parent, values)
+        if key is not None:
+            item.setData(0, Qt.UserRole, key)
+        return item
+
+
+    def fun_select_search_pn(self, item, column):
+        key = item.data(0, Qt.UserRole)
+        if key:
+            self.input_search_pn.setText(key)
+
+
+    def fun_run_10(self):
+        """
+        For Incremental Update of the Follow-up (only MDLs that changed revision)
+        """
+        # Initial Checks
+        if not hasattr(self, 'filepath_json') or self.filepath_json == '':
+            return self.my_console_update(text='Give the Latest JSON File with MSNs first.', clear=True)
+        if not hasattr(self, 'filepath_json_authors') or self.filepath_json_authors == '':
+            return self.my_console_update(text='Give the Latest JSON File with Authors first.', clear=True)
+        if not hasattr(self, 'filepath_mdl') or self.filepath_mdl == '':
+            return self.my_console_update(text='Give the Latest MDL Folder first.', clear=True)
+        if not hasattr(self, 'filepath_pseudo_db_2') or self.filepath_pseudo_db_2 == '':
+            return self.my_console_update(text='Give the Latest PseudoDataBase first.', clear=True)
+        if not hasattr(self, 'filepath_old_follow_up') or self.filepath_old_follow_up == '':
+            return self.my_console_update(text='Give the Old Follow-up first.', clear=True)
+
+        # Set filename of Excel
+        excelfilepath = self.filepath_old_follow_up.replace('.xlsx', '_FINAL.xlsx')
+
+        # Add to the queue of Jobs (started when the limits allow)
+        self.submit_job(
+            'Incremental Update',
+            fun_run_10_start,
+            self.filepath_json,
+            self.filepath_mdl,
+            self.filepath_pseudo_db_2,
+            self.filepath_json_authors,
+            self.filepath_old_follow_up,
+            excelfilepath,
+            session_cache=self.session_cache,
+            heavy=True,
+            console=True
+        )
 
 
 if __name__ == '__main__':
+    # Needed for the process pool of the run pipeline when frozen into an executable
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
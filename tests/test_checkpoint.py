@@ -0,0 +1,50 @@
+import pandas as pd
+
+import bin.checkpoint as checkpoint
+from bin.checkpoint import CheckpointStore, checkpoint_call, fingerprint
+
+
+def add_one(x):
+    return x + 1
+
+
+def test_fingerprint_of_dataframes():
+    df = pd.DataFrame({'PART NUMBER': ['A', 'B'], 'QTY': ['1', '2']})
+    assert fingerprint(df) == fingerprint(df.copy())
+    assert fingerprint(df) != fingerprint(df.assign(QTY=['1', '3']))
+    assert fingerprint(df) != fingerprint(df[['QTY', 'PART NUMBER']])
+    assert fingerprint({'a': 1, 'b': [df]}) == fingerprint({'b': [df.copy()], 'a': 1})
+
+
+def test_fingerprint_of_functions_changes_with_the_code(monkeypatch):
+    key = fingerprint(('Stage', add_one, (1,), {}))
+    assert key == fingerprint(('Stage', add_one, (1,), {}))
+
+    monkeypatch.setattr(checkpoint, 'code_version', lambda: 'another version of the code')
+    assert fingerprint(('Stage', add_one, (1,), {})) != key
+
+
+def test_checkpoint_store(tmp_path):
+    store = CheckpointStore(str(tmp_path / 'run'))
+    assert store.load('Read MDLs', 'key') == (False, None, None)
+
+    store.save('Read MDLs', 'key', [1, 2], 1.5)
+    assert store.load('Read MDLs', 'key') == (True, [1, 2], 1.5)
+    assert store.load('Read MDLs', 'other key') == (False, None, None)
+    assert CheckpointStore(str(tmp_path / 'run'), reuse=False).load('Read MDLs', 'key') == (False, None, None)
+
+    store.clear()
+    assert not (tmp_path / 'run').exists()
+
+
+def test_checkpoint_call_reuses_only_when_resumed(tmp_path):
+    calls = []
+
+    def read(x):
+        calls.append(x)
+        return x * 2
+
+    assert checkpoint_call(CheckpointStore(str(tmp_path), reuse=False), 'Read', read, 21) == 42
+    assert checkpoint_call(CheckpointStore(str(tmp_path)), 'Read', read, 21) == 42
+    assert checkpoint_call(CheckpointStore(str(tmp_path)), 'Read', read, 22) == 44
+    assert calls == [21, 22]
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+from bin.effectivity import effectivity_bits, effectivity_strings, any_bits, msn_mask, set_bits
+from bin.setup_follow_up import add_task_column
+
+
+def test_effectivity_strings_from_bits():
+    df = pd.DataFrame({'1207_MDL-00184-E': ['N', '', 'D'], '1713_MDL-00229-D': ['R', 'N', np.nan]})
+    bits = effectivity_bits(df, list(df.columns), ['N', 'R', '-'])
+    assert list(effectivity_strings(bits, ['1207', '1713'])) == ['1207, 1713', '1713', '']
+    assert list(any_bits(bits, msn_mask(['1207', '1713'], ['1207']))) == [True, False, False]
+    assert list(effectivity_strings(set_bits(bits, msn_mask(['1207', '1713'], ['1207'])), ['1207', '1713'])) == ['1207, 1713', '1207, 1713', '1207']
+
+
+def test_add_task_column_ignores_change_columns():
+    # After "update_MDLs_in_df_old" the frame also has the boolean '{msn} Change' columns.
+    # False is not an effectivity: only the rows with a symbol in a New MSN are 'NEW MSNs'
+    df = pd.DataFrame({
+        'PART NUMBER': ['A', 'B', 'C'],
+        'PART TITLE': ['a', 'b', 'c'],
+        'Effectivity': ['1241, 3930', '1241', '1241'],
+        '1241_MDL-00254-B': ['N', 'R', '-'],
+        '3930_MDL-00300-A': ['N', '', np.nan],
+        'Effectivity Change': [True, False, False],
+        '1241 Change': [True, False, False],
+        '3930 Change': [True, False, False],
+    })
+    df = add_task_column(df, rev_msn_list=['1241'])
+    assert list(df['TASK']) == ['NEW MSNs', 'REV OLD MSNs', 'REV OLD MSNs']
+    assert list(df.columns).index('TASK') == 3
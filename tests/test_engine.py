@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bin.engine import CodeEngine, PandasEngine, available_engines, engine_fallback_message, get_engine
+
+CODE_ENGINES = [x for x in ['polars', 'duckdb'] if x in available_engines()]
+TITLE_LIST = ['PARENT NUMBER', 'LEVEL', 'CHILD NUMBER']
+
+
+def ps_frames():
+    """The PS of three MDLs: keys in more than one MDL, a key twice inside an MDL and a NaN inside a key."""
+    return [
+        pd.DataFrame({'PARENT NUMBER': ['TOP', 'TOP', 'A', 'A'], 'LEVEL': ['1', '1', '2', '2'],
+                      'CHILD NUMBER': ['A', 'B', 'C', 'C'], '1293_MDL-00228-E': ['-', 'N', 'R', '-']}),
+        pd.DataFrame({'PARENT NUMBER': ['TOP', 'A', np.nan], 'LEVEL': ['1', '2', '1'],
+                      'CHILD NUMBER': ['A', 'C', 'D'], '1294_MDL-00229-B': ['N', '-', '-']}),
+        pd.DataFrame({'PARENT NUMBER': ['TOP', 'B'], 'LEVEL': ['1', '2'],
+                      'CHILD NUMBER': ['E', 'F'], '1023_MDL-00288-B': ['-', 'N']}),
+    ]
+
+
+def sorted_frame(df: pd.DataFrame):
+    return df.sort_values(by=list(df.columns), na_position='last').reset_index(drop=True)
+
+
+@pytest.mark.parametrize('name', CODE_ENGINES)
+def test_outer_merge_is_the_same_as_pandas(name):
+    expected = PandasEngine().outer_merge(ps_frames(), TITLE_LIST)
+    result = get_engine(name).outer_merge(ps_frames(), TITLE_LIST)
+    pd.testing.assert_frame_equal(sorted_frame(result), sorted_frame(expected))
+
+
+@pytest.mark.parametrize('name', CODE_ENGINES)
+def test_left_merge_is_the_same_as_pandas(name):
+    df_left = pd.DataFrame({'PART NUMBER': ['A', 'B', 'C', np.nan], 'IPC': ['X', 'Y', 'Z', 'W']})
+    df_right = pd.DataFrame({'PART NUMBER': ['A', 'A', 'C', np.nan], 'IPC': ['1', '2', '3', '4'], 'Type': ['P', 'Q', 'R', 'S']})
+    expected = PandasEngine().left_merge(df_left, df_right, ['PART NUMBER'])
+    pd.testing.assert_frame_equal(get_engine(name).left_merge(df_left, df_right, ['PART NUMBER']), expected)
+
+
+@pytest.mark.parametrize('name', CODE_ENGINES)
+def test_sort_drop_duplicates_is_the_same_as_pandas(name):
+    df = pd.concat(ps_frames()[:2], ignore_index=True)
+    args = (['PARENT NUMBER', 'CHILD NUMBER', 'LEVEL'], [True, False, True], TITLE_LIST)
+    pd.testing.assert_frame_equal(get_engine(name).sort_drop_duplicates(df, *args), PandasEngine().sort_drop_duplicates(df, *args))
+
+
+def test_code_engines_implement_the_lines_methods():
+    class HalfEngine(CodeEngine):
+        def _outer_merge_lines(self, keys):
+            return keys
+
+    with pytest.raises(TypeError):
+        HalfEngine()
+
+
+def test_unknown_engine_falls_back_to_pandas():
+    assert engine_fallback_message('pandas') is None
+    assert engine_fallback_message('spark').startswith('Engine "spark" is not available. Using "pandas".')
+    assert isinstance(get_engine('spark'), PandasEngine) and not isinstance(get_engine('spark'), CodeEngine)
@@ -0,0 +1,32 @@
+import pandas as pd
+
+from bin.mdl_index import load_mdl_index, mdl_revisions, save_mdl_index, split_mdl_column
+
+
+def add_mdl(mdl_index, mdl_column):
+    msn, document, revision = split_mdl_column(mdl_column)
+    mdl_index[mdl_column] = {'msn': msn, 'document': document, 'revision': revision, 'sha1': mdl_column, 'sheets': {}}
+    mdl_index['_modified'].add(msn)
+
+
+def test_mdl_revisions_of_msns_with_any_length(tmp_path):
+    mdl_index = load_mdl_index(str(tmp_path))
+    for mdl_column in ['1293_MDL-00228-E', '1293_MDL-00228-AA', '1293_MDL-00228-H', '12930_MDL-00229-A', '129_MDL-00230-B']:
+        add_mdl(mdl_index, mdl_column)
+
+    assert mdl_revisions(mdl_index, '1293') == ['1293_MDL-00228-E', '1293_MDL-00228-H', '1293_MDL-00228-AA']
+    assert mdl_revisions(mdl_index, '12930') == ['12930_MDL-00229-A']
+    assert mdl_revisions(mdl_index, '129') == ['129_MDL-00230-B']
+
+
+def test_saved_index_keeps_the_latest_revisions(tmp_path, monkeypatch):
+    monkeypatch.setattr('bin.mdl_index.MDL_INDEX_REVISIONS', 2)
+    mdl_index = load_mdl_index(str(tmp_path))
+    for revision in ['A', 'B', 'C']:
+        add_mdl(mdl_index, f'1293_MDL-00228-{revision}')
+    mdl_index['1293_MDL-00228-C']['sheets']['APL'] = pd.DataFrame({'PART NUMBER': ['D113R1202-004-00']})
+    save_mdl_index(mdl_index)
+
+    mdl_index = load_mdl_index(str(tmp_path))
+    assert mdl_revisions(mdl_index, '1293') == ['1293_MDL-00228-B', '1293_MDL-00228-C']
+    assert mdl_index['1293_MDL-00228-C']['sheets']['APL']['PART NUMBER'].tolist() == ['D113R1202-004-00']
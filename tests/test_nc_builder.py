@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from bin.nc_builder import MemoryHighWater, MIN_BLOCK_ROWS, build_all_NCs, block_rows, write_NC_sheet
+from bin.save_to_excel import add_formats_to_workbook
+
+
+def nc_frame(n_rows: int):
+    return pd.DataFrame({
+        'NUMBER': [f'EA-{i:05d}' for i in range(n_rows)],
+        'ISSUE': ['A'] * n_rows,
+        'NC NUMBER': [f'NC-{i:05d}' for i in range(n_rows)],
+        'NC ISSUE': ['1'] * n_rows,
+        'NC TITLE': ['TITLE'] * n_rows,
+        '1207_MDL-00184-E': ['N', ''] * (n_rows // 2),
+        '1713_MDL-00229-D': ['', 'R'] * (n_rows // 2),
+    })
+
+
+def test_build_all_NCs_writes_every_row(tmp_path):
+    df_nc = nc_frame(1000)
+    excelfilepath = tmp_path / 'ALL_NCs_RXX.xlsx'
+    peak_mb, n_block = build_all_NCs(df_nc, ['1207'], [], 'RXX', str(excelfilepath), memory_budget_mb=0.05)
+    assert MIN_BLOCK_ROWS <= n_block <= block_rows(len(df_nc.columns), 0.05) < len(df_nc)
+
+    sheets = pd.read_excel(excelfilepath, sheet_name=None, dtype=str)
+    assert list(sheets) == ['ALL_NCs', 'RXX_NCs']
+    assert len(sheets['ALL_NCs']) == 1000
+    assert sheets['ALL_NCs']['1207_MDL-00184-E'].fillna('').tolist() == ['1207 (N)', ''] * 500
+    assert len(sheets['RXX_NCs']) == 500
+    assert '1713_MDL-00229-D' not in sheets['RXX_NCs']
+
+
+def test_blocks_shrink_when_the_budget_is_exceeded(tmp_path, monkeypatch):
+    readings = iter(range(0, 10000, 10))       # Every block makes the memory grow by 10 MB
+    monkeypatch.setattr(MemoryHighWater, 'sample', lambda self: next(readings))
+    df_nc = nc_frame(5000)
+
+    writer = pd.ExcelWriter(tmp_path / 'ALL_NCs_RXX.xlsx', engine='xlsxwriter', engine_kwargs={'options': {'constant_memory': True}})
+    _, formats = add_formats_to_workbook(writer.book)
+    n_block = write_NC_sheet(writer, formats, 'ALL_NCs', df_nc, list(df_nc.columns), np.arange(len(df_nc)), ['1207'], [], 800, MemoryHighWater(), memory_budget_mb=15)
+    writer.close()
+
+    assert n_block == MIN_BLOCK_ROWS
+    assert len(pd.read_excel(tmp_path / 'ALL_NCs_RXX.xlsx', dtype=str)) == 5000
+
+
+def test_memory_is_measured_above_the_start():
+    memory = MemoryHighWater()
+    data = np.ones(16 * 1024 * 1024 // 8)         # 16 MB
+    memory.sample()
+    del data
+    peak_mb = memory.stop()
+    assert peak_mb is None or 8 < peak_mb < 200
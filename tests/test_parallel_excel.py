@@ -0,0 +1,43 @@
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+import xlsxwriter
+
+from bin.parallel_excel import add_prerendered_sheet, prerendering_supported, render_cell, render_sheets
+
+
+def sheet_xml(filepath):
+    xml = zipfile.ZipFile(filepath).read('xl/worksheets/sheet1.xml').decode()
+    return xml[xml.index('<sheetData>'):xml.index('</sheetData>')]
+
+
+def test_render_cell_of_numbers():
+    assert render_cell('A2', 45.0, None) == '<c r="A2"><v>45</v></c>'
+    assert render_cell('A2', np.nan, 3) == ''
+    assert render_cell('A2', np.inf, 3) == '<c r="A2" s="3" t="e"><f>1/0</f><v>#DIV/0!</v></c>'
+    assert render_cell('A2', -np.inf, None) == '<c r="A2" t="e"><f>-1/0</f><v>#DIV/0!</v></c>'
+
+
+@pytest.mark.skipif(not prerendering_supported(), reason='xlsxwriter not supported for parallel rendering')
+def test_numbers_are_the_same_as_write_number(tmp_path):
+    values = [45.0, 0.1 + 0.2, np.inf, np.nan, -np.inf]
+
+    workbook = xlsxwriter.Workbook(str(tmp_path / 'write_number.xlsx'), {'nan_inf_to_errors': True})
+    worksheet = workbook.add_worksheet()
+    worksheet.write_string(0, 0, 'Time (minutes)')
+    for row, value in enumerate(values, start=1):
+        if not np.isnan(value):
+            worksheet.write_number(row, 0, value)
+    workbook.close()
+
+    workbook = xlsxwriter.Workbook(str(tmp_path / 'prerendered.xlsx'))
+    worksheet = add_prerendered_sheet(workbook, 'Sheet1')
+    worksheet.write_string(0, 0, 'Time (minutes)')
+    render_sheets(workbook, {'Sheet1': pd.DataFrame({'Time (minutes)': values})}, max_workers=1)
+    workbook.close()
+
+    cells = sheet_xml(tmp_path / 'prerendered.xlsx')
+    assert cells.count('#DIV/0!') == 2
+    assert cells.replace(' spans="1:1"', '') == sheet_xml(tmp_path / 'write_number.xlsx').replace(' spans="1:1"', '')
@@ -0,0 +1,52 @@
+import os
+
+import pandas as pd
+
+from bin.ps_graph import PSGraph, load_ps_graph, ps_graph_filepath, save_ps_graph
+
+
+def ps_frame():
+    return pd.DataFrame({
+        'PARENT NUMBER': ['TOP', 'TOP', 'A'],
+        'LEVEL': ['1', '1', '2'],
+        'CHILD NUMBER': ['A', 'B', 'C'],
+        'CHILD TITLE': ['PANEL', 'BRACKET', 'RIVET'],
+        '1293_MDL-00228-E': ['-', '-', '-'],
+        '1294_MDL-00229-B': ['-', None, 'N'],
+    })
+
+
+def test_walk():
+    ps_graph = PSGraph(ps_frame())
+    assert ps_graph.where_used('C')['PART NUMBER'].tolist() == ['A', 'TOP']
+    assert ps_graph.explode('TOP', msn='1294')['PART NUMBER'].tolist() == ['A', 'C']
+    assert ps_graph.explode('TOP')['PART NUMBER'].tolist() == ['A', 'C', 'B']
+
+
+def test_saved_outside_the_folder_of_the_follow_up(tmp_path):
+    excelfilepath = tmp_path / 'follow_up' / 'EFW Follow-up R11.xlsx'
+    excelfilepath.parent.mkdir()
+    excelfilepath.write_bytes(b'xlsx')
+    directory = str(tmp_path / '_PS_Graph')
+
+    save_ps_graph(str(excelfilepath), PSGraph(ps_frame()), directory)
+    assert os.listdir(excelfilepath.parent) == ['EFW Follow-up R11.xlsx']
+    assert os.path.dirname(ps_graph_filepath(str(excelfilepath), directory)) == directory
+    assert len(load_ps_graph(str(excelfilepath), directory)) == 3
+
+    # A changed Excel is not taken as the same Follow-up
+    excelfilepath.write_bytes(b'another xlsx')
+    assert load_ps_graph(str(excelfilepath), directory) is None
+
+
+def test_only_the_latest_indexes_are_kept(tmp_path, monkeypatch):
+    monkeypatch.setattr('bin.ps_graph.PS_GRAPH_FILES', 2)
+    directory = str(tmp_path / '_PS_Graph')
+    ps_graph = PSGraph(ps_frame())
+    for i in range(4):
+        excelfilepath = tmp_path / f'EFW Follow-up R{i}.xlsx'
+        excelfilepath.write_bytes(b'xlsx')
+        save_ps_graph(str(excelfilepath), ps_graph, directory)
+        os.utime(ps_graph_filepath(str(excelfilepath), directory), (i, i))
+
+    assert sorted(os.listdir(directory)) == sorted(os.path.basename(ps_graph_filepath(str(tmp_path / f'EFW Follow-up R{i}.xlsx'), directory)) for i in [2, 3])
@@ -0,0 +1,56 @@
+import openpyxl
+import pandas as pd
+
+from bin.preflight import preflight_pseudo_db
+from bin.pseudo_db import read_pseudo_db
+from bin.pseudo_db_cc import cc_edit_errors, cc_store_filepath, pseudo_db_for_CC_to_excel, read_pseudo_db_for_CC
+
+
+def export(tmp_path):
+    df = pd.DataFrame({
+        'PART NUMBER': ['PN-1', 'PN-2', 'PN-3'],
+        'CSN': ['', '', ''],
+        'Fig': ['', '', ''],
+        'Type': ['EFW', 'TBD', 'AIB'],
+        'BOM Parts': ['', '', ''],
+        'PART TITLE': ['BRACKET', 'HARNESS', 'PANEL'],
+        'IPC': [True, True, False],
+        'SRM A321': [True, False, False],
+        'SRM A320': [False, False, True],
+    })
+    excelfilepath = str(tmp_path / 'PSDB_for_CC.xlsx')
+    pseudo_db_for_CC_to_excel(df, excelfilepath)
+    return excelfilepath
+
+
+def edit(excelfilepath: str, cells: dict):
+    """Change cells of the sheet as a user does in Excel. i.e. {'D3': 'EFW'}"""
+    workbook = openpyxl.load_workbook(excelfilepath)
+    for cell, value in cells.items():
+        workbook['Pseudo_Data_Base'][cell] = value
+    workbook.save(excelfilepath)
+
+
+def test_editable_columns_are_taken_from_the_excel(tmp_path):
+    excelfilepath = export(tmp_path)
+    edit(excelfilepath, {'D3': 'EFW', 'G3': False})
+    assert cc_edit_errors(excelfilepath) == []
+    assert preflight_pseudo_db(excelfilepath) == []
+
+    df = read_pseudo_db_for_CC(excelfilepath)
+    assert df['Type'].tolist() == ['EFW', 'EFW', 'AIB']
+    assert df['IPC'].tolist() == ['True', 'False', 'False']
+
+
+def test_other_columns_are_reported_and_not_restored(tmp_path):
+    excelfilepath = export(tmp_path)
+    edit(excelfilepath, {'F2': 'BRACKET ASSY'})
+
+    errors = cc_edit_errors(excelfilepath)
+    assert errors[0] == 'PseudoDataBase for CC, line 2 (PN: PN-1): "PART TITLE" was changed from "BRACKET" to "BRACKET ASSY".'
+    assert cc_store_filepath(excelfilepath) in errors[-1]
+    assert preflight_pseudo_db(excelfilepath) == errors
+
+    # The Excel is read as it is, with the change of the user
+    assert read_pseudo_db_for_CC(excelfilepath) is None
+    assert read_pseudo_db(excelfilepath)['PART TITLE'].tolist() == ['BRACKET ASSY', 'HARNESS', 'PANEL']
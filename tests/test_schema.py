@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from bin.schema import apply_schema, column_schema, without_categories
+
+
+def follow_up_frame():
+    return pd.DataFrame({
+        'PART NUMBER': ['D113R1202-004-00', 'D113R1202-005-00', 'D113R1202-006-00'],
+        'Author': ['SA', np.nan, 'SA'],
+        'Start Date': ['2023-02-15 00:00:00', '16/02/2023', np.nan],
+        'Time (minutes)': ['45', '', '7.5'],
+        '1293_MDL-00228-E': ['N', '-', 'R'],
+    })
+
+
+def test_columns_get_their_types():
+    df = follow_up_frame()
+    df_typed = apply_schema(df, 'IPC Follow-up', errors=[])
+
+    assert df_typed['Time (minutes)'].tolist()[::2] == [45.0, 7.5] and np.isnan(df_typed['Time (minutes)'][1])
+    assert df_typed['Start Date'].tolist()[:2] == [pd.Timestamp('2023-02-15'), pd.Timestamp('2023-02-16')]
+    assert isinstance(df_typed['Author'].dtype, pd.CategoricalDtype)
+    # MDL columns of the Follow-up sheets stay strings
+    assert df_typed['1293_MDL-00228-E'].dtype == object
+    # The DataFrame that was given is not changed, and typed columns are left as they are
+    assert df.equals(follow_up_frame())
+    assert apply_schema(df_typed, 'IPC Follow-up').equals(df_typed)
+
+
+def test_bad_values_keep_the_column_as_text():
+    df = follow_up_frame().assign(**{'Time (minutes)': ['45', 'about 1 hour', '']})
+    errors = []
+    df_typed = apply_schema(df, 'IPC Follow-up', errors)
+
+    assert df_typed['Time (minutes)'].tolist() == ['45', 'about 1 hour', '']
+    assert errors == ['Sheet "IPC Follow-up": column "Time (minutes)" kept as text, because of the values [\'about 1 hour\'].']
+
+
+def test_mdl_columns_of_the_reference_sheets_are_categories():
+    columns = ['PARENT NUMBER', 'LEVEL', '1293_MDL-00228-E']
+    assert column_schema('PS', columns) == {'LEVEL': 'category', '1293_MDL-00228-E': 'category'}
+
+    df_typed = apply_schema(pd.DataFrame({x: ['A', 'B'] for x in columns}), 'PS')
+    assert [str(x) for x in df_typed.dtypes] == ['object', 'category', 'category']
+    assert list(without_categories(df_typed).dtypes) == [object, object, object]
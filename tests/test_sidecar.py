@@ -0,0 +1,52 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bin.sidecar import load_sidecar, read_sheet, save_sidecar, sidecar_filepath
+
+
+def follow_up_frame():
+    return pd.DataFrame({
+        'PART NUMBER': ['D113R1202-004-00', 'D113R1202-005-00', 'D113R1202-006-00'],
+        'QTY': [2.0, 1.5, np.nan],
+        'Author': ['SA', '', None],
+    })
+
+
+def test_sheets_are_the_same_as_read_from_the_excel(tmp_path):
+    excelfilepath = str(tmp_path / 'EFW Follow-up New-Temporary.xlsx')
+    follow_up_frame().to_excel(excelfilepath, sheet_name='IPC Follow-up', index=False)
+    save_sidecar(excelfilepath, {'IPC Follow-up': follow_up_frame()})
+
+    sheets = load_sidecar(excelfilepath)
+    pd.testing.assert_frame_equal(read_sheet(excelfilepath, 'IPC Follow-up', sheets), read_sheet(excelfilepath, 'IPC Follow-up'))
+    with pytest.raises(ValueError):
+        read_sheet(excelfilepath, 'SRM A320 Follow-up', sheets)
+
+
+def test_changed_excel_is_read_instead(tmp_path):
+    excelfilepath = str(tmp_path / 'EFW Follow-up New-Temporary.xlsx')
+    follow_up_frame().to_excel(excelfilepath, sheet_name='IPC Follow-up', index=False)
+    save_sidecar(excelfilepath, {'IPC Follow-up': follow_up_frame()})
+    assert load_sidecar(excelfilepath) is not None
+
+    follow_up_frame().iloc[:1].to_excel(excelfilepath, sheet_name='IPC Follow-up', index=False)
+    assert load_sidecar(excelfilepath) is None
+
+
+def test_sidecar_without_excel(tmp_path):
+    excelfilepath = str(tmp_path / 'EFW Follow-up New-Temporary.xlsx')
+
+    # An older Excel at the same path is not from this run
+    follow_up_frame().iloc[:1].to_excel(excelfilepath, sheet_name='IPC Follow-up', index=False)
+    os.utime(excelfilepath, ns=(time.time_ns() - 10**10,) * 2)
+    save_sidecar(excelfilepath, {'IPC Follow-up': follow_up_frame()}, excel_written=False)
+    assert len(load_sidecar(excelfilepath)['IPC Follow-up']) == 3
+
+    # An Excel saved after the sidecar replaces it
+    os.utime(excelfilepath, ns=(time.time_ns() + 10**10,) * 2)
+    assert load_sidecar(excelfilepath) is None
+    assert os.path.isfile(sidecar_filepath(excelfilepath))
@@ -0,0 +1,701 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'ui/UI.ui',
+# licensing of 'ui/UI.ui' applies.
+#
+# Created: Mon Oct 19 15:39:50 2026
+#      by: pyside2-uic  running on PySide2 5.13.2
+#
+# WARNING! All changes made in this file will be lost!
+
+from PySide2 import QtCore, QtGui, QtWidgets
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(450, 600)
+        MainWindow.setMinimumSize(QtCore.QSize(430, 500))
+        MainWindow.setMaximumSize(QtCore.QSize(450, 600))
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.verticalLayout_6 = QtWidgets.QVBoxLayout(self.centralwidget)
+        self.verticalLayout_6.setObjectName("verticalLayout_6")
+        self.tabWidget = QtWidgets.QTabWidget(self.centralwidget)
+        self.tabWidget.setObjectName("tabWidget")
+        self.tab_5 = QtWidgets.QWidget()
+        self.tab_5.setObjectName("tab_5")
+        self.toolBox = QtWidgets.QToolBox(self.tab_5)
+        self.toolBox.setGeometry(QtCore.QRect(10, 10, 401, 281))
+        font = QtGui.QFont()
+        font.setFamily("Microsoft Sans Serif")
+        font.setPointSize(9)
+        self.toolBox.setFont(font)
+        self.toolBox.setCursor(QtCore.Qt.ArrowCursor)
+        self.toolBox.setObjectName("toolBox")
+        self.page_2 = QtWidgets.QWidget()
+        self.page_2.setGeometry(QtCore.QRect(0, 0, 401, 194))
+        self.page_2.setObjectName("page_2")
+        self.verticalLayout_4 = QtWidgets.QVBoxLayout(self.page_2)
+        self.verticalLayout_4.setObjectName("verticalLayout_4")
+        self.horizontalLayout_3 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_3.setObjectName("horizontalLayout_3")
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_3.addItem(spacerItem)
+        self.verticalLayout = QtWidgets.QVBoxLayout()
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.btn_latest_follow_up = QtWidgets.QPushButton(self.page_2)
+        self.btn_latest_follow_up.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_latest_follow_up.setObjectName("btn_latest_follow_up")
+        self.verticalLayout.addWidget(self.btn_latest_follow_up)
+        self.btn_pseudo_db_1 = QtWidgets.QPushButton(self.page_2)
+        self.btn_pseudo_db_1.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_pseudo_db_1.setObjectName("btn_pseudo_db_1")
+        self.verticalLayout.addWidget(self.btn_pseudo_db_1)
+        self.horizontalLayout_3.addLayout(self.verticalLayout)
+        spacerItem1 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_3.addItem(spacerItem1)
+        self.btn_run_1 = QtWidgets.QPushButton(self.page_2)
+        self.btn_run_1.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_run_1.setStyleSheet("")
+        self.btn_run_1.setObjectName("btn_run_1")
+        self.horizontalLayout_3.addWidget(self.btn_run_1)
+        spacerItem2 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_3.addItem(spacerItem2)
+        self.verticalLayout_4.addLayout(self.horizontalLayout_3)
+        self.toolBox.addItem(self.page_2, "")
+        self.page_3 = QtWidgets.QWidget()
+        self.page_3.setGeometry(QtCore.QRect(0, 0, 401, 194))
+        self.page_3.setObjectName("page_3")
+        self.verticalLayout_5 = QtWidgets.QVBoxLayout(self.page_3)
+        self.verticalLayout_5.setObjectName("verticalLayout_5")
+        self.horizontalLayout_4 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_4.setObjectName("horizontalLayout_4")
+        spacerItem3 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_4.addItem(spacerItem3)
+        self.verticalLayout_2 = QtWidgets.QVBoxLayout()
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.btn_mdl = QtWidgets.QPushButton(self.page_3)
+        self.btn_mdl.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_mdl.setObjectName("btn_mdl")
+        self.verticalLayout_2.addWidget(self.btn_mdl)
+        self.btn_json = QtWidgets.QPushButton(self.page_3)
+        self.btn_json.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_json.setObjectName("btn_json")
+        self.verticalLayout_2.addWidget(self.btn_json)
+        self.btn_pseudo_db_2 = QtWidgets.QPushButton(self.page_3)
+        self.btn_pseudo_db_2.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_pseudo_db_2.setObjectName("btn_pseudo_db_2")
+        self.verticalLayout_2.addWidget(self.btn_pseudo_db_2)
+        self.horizontalLayout_4.addLayout(self.verticalLayout_2)
+        spacerItem4 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_4.addItem(spacerItem4)
+        self.btn_run_2 = QtWidgets.QPushButton(self.page_3)
+        self.btn_run_2.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_run_2.setObjectName("btn_run_2")
+        self.horizontalLayout_4.addWidget(self.btn_run_2)
+        spacerItem5 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_4.addItem(spacerItem5)
+        self.verticalLayout_5.addLayout(self.horizontalLayout_4)
+        self.toolBox.addItem(self.page_3, "")
+        self.page_4 = QtWidgets.QWidget()
+        self.page_4.setGeometry(QtCore.QRect(0, 0, 401, 194))
+        self.page_4.setObjectName("page_4")
+        self.verticalLayoutWidget = QtWidgets.QWidget(self.page_4)
+        self.verticalLayoutWidget.setGeometry(QtCore.QRect(10, 0, 391, 185))
+        self.verticalLayoutWidget.setObjectName("verticalLayoutWidget")
+        self.verticalLayout_9 = QtWidgets.QVBoxLayout(self.verticalLayoutWidget)
+        self.verticalLayout_9.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_9.setObjectName("verticalLayout_9")
+        self.horizontalLayout = QtWidgets.QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.verticalLayout_7 = QtWidgets.QVBoxLayout()
+        self.verticalLayout_7.setObjectName("verticalLayout_7")
+        self.btn_mdl_2 = QtWidgets.QPushButton(self.verticalLayoutWidget)
+        self.btn_mdl_2.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_mdl_2.setObjectName("btn_mdl_2")
+        self.verticalLayout_7.addWidget(self.btn_mdl_2)
+        self.btn_json_2 = QtWidgets.QPushButton(self.verticalLayoutWidget)
+        self.btn_json_2.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_json_2.setObjectName("btn_json_2")
+        self.verticalLayout_7.addWidget(self.btn_json_2)
+        self.btn_json_authors = QtWidgets.QPushButton(self.verticalLayoutWidget)
+        self.btn_json_authors.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_json_authors.setObjectName("btn_json_authors")
+        self.verticalLayout_7.addWidget(self.btn_json_authors)
+        self.btn_pseudo_db_3 = QtWidgets.QPushButton(self.verticalLayoutWidget)
+        self.btn_pseudo_db_3.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_pseudo_db_3.setObjectName("btn_pseudo_db_3")
+        self.verticalLayout_7.addWidget(self.btn_pseudo_db_3)
+        self.horizontalLayout.addLayout(self.verticalLayout_7)
+        spacerItem6 = QtWidgets.QSpacerItem(300, 20, QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout.addItem(spacerItem6)
+        self.verticalLayout_revision = QtWidgets.QVBoxLayout()
+        self.verticalLayout_revision.setObjectName("verticalLayout_revision")
+        self.horizontalLayout_revision = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_revision.setObjectName("horizontalLayout_revision")
+        self.label = QtWidgets.QLabel(self.verticalLayoutWidget)
+        self.label.setObjectName("label")
+        self.horizontalLayout_revision.addWidget(self.label)
+        self.input_revision = QtWidgets.QLineEdit(self.verticalLayoutWidget)
+        self.input_revision.setObjectName("input_revision")
+        self.horizontalLayout_revision.addWidget(self.input_revision)
+        self.verticalLayout_revision.addLayout(self.horizontalLayout_revision)
+        self.check_resume = QtWidgets.QCheckBox(self.verticalLayoutWidget)
+        self.check_resume.setObjectName("check_resume")
+        self.verticalLayout_revision.addWidget(self.check_resume)
+        self.horizontalLayout.addLayout(self.verticalLayout_revision)
+        spacerItem7 = QtWidgets.QSpacerItem(300, 20, QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout.addItem(spacerItem7)
+        self.verticalLayout_9.addLayout(self.horizontalLayout)
+        self.check_split_reference = QtWidgets.QCheckBox(self.verticalLayoutWidget)
+        self.check_split_reference.setObjectName("check_split_reference")
+        self.verticalLayout_9.addWidget(self.check_split_reference)
+        self.btn_run_3 = QtWidgets.QPushButton(self.verticalLayoutWidget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.btn_run_3.sizePolicy().hasHeightForWidth())
+        self.btn_run_3.setSizePolicy(sizePolicy)
+        self.btn_run_3.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_run_3.setObjectName("btn_run_3")
+        self.verticalLayout_9.addWidget(self.btn_run_3)
+        self.toolBox.addItem(self.page_4, "")
+        self.tabWidget.addTab(self.tab_5, "")
+        self.tab_6 = QtWidgets.QWidget()
+        self.tab_6.setObjectName("tab_6")
+        self.toolBox_2 = QtWidgets.QToolBox(self.tab_6)
+        self.toolBox_2.setGeometry(QtCore.QRect(10, 10, 411, 281))
+        font = QtGui.QFont()
+        font.setFamily("Microsoft Sans Serif")
+        font.setPointSize(9)
+        self.toolBox_2.setFont(font)
+        self.toolBox_2.setCursor(QtCore.Qt.ArrowCursor)
+        self.toolBox_2.setObjectName("toolBox_2")
+        self.page_5 = QtWidgets.QWidget()
+        self.page_5.setGeometry(QtCore.QRect(0, 0, 411, 194))
+        self.page_5.setObjectName("page_5")
+        self.verticalLayout_8 = QtWidgets.QVBoxLayout(self.page_5)
+        self.verticalLayout_8.setObjectName("verticalLayout_8")
+        self.horizontalLayout_7 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_7.setObjectName("horizontalLayout_7")
+        spacerItem8 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_7.addItem(spacerItem8)
+        self.verticalLayout_13 = QtWidgets.QVBoxLayout()
+        self.verticalLayout_13.setObjectName("verticalLayout_13")
+        self.btn_mdl_3 = QtWidgets.QPushButton(self.page_5)
+        self.btn_mdl_3.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_mdl_3.setObjectName("btn_mdl_3")
+        self.verticalLayout_13.addWidget(self.btn_mdl_3)
+        self.btn_json_3 = QtWidgets.QPushButton(self.page_5)
+        self.btn_json_3.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_json_3.setObjectName("btn_json_3")
+        self.verticalLayout_13.addWidget(self.btn_json_3)
+        self.btn_pseudo_db_5 = QtWidgets.QPushButton(self.page_5)
+        self.btn_pseudo_db_5.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_pseudo_db_5.setObjectName("btn_pseudo_db_5")
+        self.verticalLayout_13.addWidget(self.btn_pseudo_db_5)
+        self.horizontalLayout_7.addLayout(self.verticalLayout_13)
+        spacerItem9 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_7.addItem(spacerItem9)
+        self.btn_run_6 = QtWidgets.QPushButton(self.page_5)
+        self.btn_run_6.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_run_6.setObjectName("btn_run_6")
+        self.horizontalLayout_7.addWidget(self.btn_run_6)
+        spacerItem10 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_7.addItem(spacerItem10)
+        self.verticalLayout_8.addLayout(self.horizontalLayout_7)
+        self.toolBox_2.addItem(self.page_5, "")
+        self.page_6 = QtWidgets.QWidget()
+        self.page_6.setGeometry(QtCore.QRect(0, 0, 211, 150))
+        self.page_6.setObjectName("page_6")
+        self.verticalLayout_10 = QtWidgets.QVBoxLayout(self.page_6)
+        self.verticalLayout_10.setObjectName("verticalLayout_10")
+        self.verticalLayout_14 = QtWidgets.QVBoxLayout()
+        self.verticalLayout_14.setObjectName("verticalLayout_14")
+        self.horizontalLayout_8 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_8.setObjectName("horizontalLayout_8")
+        spacerItem11 = QtWidgets.QSpacerItem(300, 20, QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_8.addItem(spacerItem11)
+        self.verticalLayout_15 = QtWidgets.QVBoxLayout()
+        self.verticalLayout_15.setObjectName("verticalLayout_15")
+        self.btn_mdl_4 = QtWidgets.QPushButton(self.page_6)
+        self.btn_mdl_4.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_mdl_4.setObjectName("btn_mdl_4")
+        self.verticalLayout_15.addWidget(self.btn_mdl_4)
+        self.btn_json_4 = QtWidgets.QPushButton(self.page_6)
+        self.btn_json_4.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_json_4.setObjectName("btn_json_4")
+        self.verticalLayout_15.addWidget(self.btn_json_4)
+        self.btn_pseudo_db_6 = QtWidgets.QPushButton(self.page_6)
+        self.btn_pseudo_db_6.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_pseudo_db_6.setObjectName("btn_pseudo_db_6")
+        self.verticalLayout_15.addWidget(self.btn_pseudo_db_6)
+        self.horizontalLayout_8.addLayout(self.verticalLayout_15)
+        spacerItem12 = QtWidgets.QSpacerItem(300, 20, QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_8.addItem(spacerItem12)
+        self.verticalLayout_14.addLayout(self.horizontalLayout_8)
+        spacerItem13 = QtWidgets.QSpacerItem(20, 10, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed)
+        self.verticalLayout_14.addItem(spacerItem13)
+        self.btn_run_7 = QtWidgets.QPushButton(self.page_6)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.btn_run_7.sizePolicy().hasHeightForWidth())
+        self.btn_run_7.setSizePolicy(sizePolicy)
+        self.btn_run_7.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_run_7.setObjectName("btn_run_7")
+        self.verticalLayout_14.addWidget(self.btn_run_7)
+        self.verticalLayout_10.addLayout(self.verticalLayout_14)
+        self.toolBox_2.addItem(self.page_6, "")
+        self.page_8 = QtWidgets.QWidget()
+        self.page_8.setGeometry(QtCore.QRect(0, 0, 98, 28))
+        self.page_8.setObjectName("page_8")
+        self.verticalLayoutWidget_3 = QtWidgets.QWidget(self.page_8)
+        self.verticalLayoutWidget_3.setGeometry(QtCore.QRect(10, 10, 393, 176))
+        self.verticalLayoutWidget_3.setObjectName("verticalLayoutWidget_3")
+        self.verticalLayout_16 = QtWidgets.QVBoxLayout(self.verticalLayoutWidget_3)
+        self.verticalLayout_16.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_16.setObjectName("verticalLayout_16")
+        self.horizontalLayout_9 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_9.setObjectName("horizontalLayout_9")
+        spacerItem14 = QtWidgets.QSpacerItem(300, 20, QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_9.addItem(spacerItem14)
+        self.verticalLayout_17 = QtWidgets.QVBoxLayout()
+        self.verticalLayout_17.setObjectName("verticalLayout_17")
+        self.btn_json_5 = QtWidgets.QPushButton(self.verticalLayoutWidget_3)
+        self.btn_json_5.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_json_5.setObjectName("btn_json_5")
+        self.verticalLayout_17.addWidget(self.btn_json_5)
+        self.btn_json_authors_2 = QtWidgets.QPushButton(self.verticalLayoutWidget_3)
+        self.btn_json_authors_2.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_json_authors_2.setObjectName("btn_json_authors_2")
+        self.verticalLayout_17.addWidget(self.btn_json_authors_2)
+        self.btn_old_follow_up = QtWidgets.QPushButton(self.verticalLayoutWidget_3)
+        self.btn_old_follow_up.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_old_follow_up.setObjectName("btn_old_follow_up")
+        self.verticalLayout_17.addWidget(self.btn_old_follow_up)
+        self.btn_new_follow_up = QtWidgets.QPushButton(self.verticalLayoutWidget_3)
+        self.btn_new_follow_up.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_new_follow_up.setObjectName("btn_new_follow_up")
+        self.verticalLayout_17.addWidget(self.btn_new_follow_up)
+        self.horizontalLayout_9.addLayout(self.verticalLayout_17)
+        spacerItem15 = QtWidgets.QSpacerItem(300, 20, QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_9.addItem(spacerItem15)
+        self.verticalLayout_16.addLayout(self.horizontalLayout_9)
+        spacerItem16 = QtWidgets.QSpacerItem(20, 10, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed)
+        self.verticalLayout_16.addItem(spacerItem16)
+        self.btn_run_8 = QtWidgets.QPushButton(self.verticalLayoutWidget_3)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.btn_run_8.sizePolicy().hasHeightForWidth())
+        self.btn_run_8.setSizePolicy(sizePolicy)
+        self.btn_run_8.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_run_8.setObjectName("btn_run_8")
+        self.verticalLayout_16.addWidget(self.btn_run_8)
+        self.toolBox_2.addItem(self.page_8, "")
+        self.page_10 = QtWidgets.QWidget()
+        self.page_10.setGeometry(QtCore.QRect(0, 0, 98, 28))
+        self.page_10.setObjectName("page_10")
+        self.verticalLayoutWidget_4 = QtWidgets.QWidget(self.page_10)
+        self.verticalLayoutWidget_4.setGeometry(QtCore.QRect(10, 10, 393, 131))
+        self.verticalLayoutWidget_4.setObjectName("verticalLayoutWidget_4")
+        self.verticalLayout_18 = QtWidgets.QVBoxLayout(self.verticalLayoutWidget_4)
+        self.verticalLayout_18.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_18.setObjectName("verticalLayout_18")
+        self.horizontalLayout_14 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_14.setObjectName("horizontalLayout_14")
+        spacerItem17 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_14.addItem(spacerItem17)
+        self.gridLayout_2 = QtWidgets.QGridLayout()
+        self.gridLayout_2.setObjectName("gridLayout_2")
+        self.btn_json_7 = QtWidgets.QPushButton(self.verticalLayoutWidget_4)
+        self.btn_json_7.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_json_7.setObjectName("btn_json_7")
+        self.gridLayout_2.addWidget(self.btn_json_7, 0, 0, 1, 1)
+        self.btn_json_authors_3 = QtWidgets.QPushButton(self.verticalLayoutWidget_4)
+        self.btn_json_authors_3.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_json_authors_3.setObjectName("btn_json_authors_3")
+        self.gridLayout_2.addWidget(self.btn_json_authors_3, 0, 1, 1, 1)
+        self.btn_mdl_5 = QtWidgets.QPushButton(self.verticalLayoutWidget_4)
+        self.btn_mdl_5.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_mdl_5.setObjectName("btn_mdl_5")
+        self.gridLayout_2.addWidget(self.btn_mdl_5, 1, 0, 1, 1)
+        self.btn_pseudo_db_7 = QtWidgets.QPushButton(self.verticalLayoutWidget_4)
+        self.btn_pseudo_db_7.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_pseudo_db_7.setObjectName("btn_pseudo_db_7")
+        self.gridLayout_2.addWidget(self.btn_pseudo_db_7, 1, 1, 1, 1)
+        self.btn_old_follow_up_2 = QtWidgets.QPushButton(self.verticalLayoutWidget_4)
+        self.btn_old_follow_up_2.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_old_follow_up_2.setObjectName("btn_old_follow_up_2")
+        self.gridLayout_2.addWidget(self.btn_old_follow_up_2, 2, 0, 1, 1)
+        self.horizontalLayout_14.addLayout(self.gridLayout_2)
+        spacerItem18 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_14.addItem(spacerItem18)
+        self.verticalLayout_18.addLayout(self.horizontalLayout_14)
+        spacerItem19 = QtWidgets.QSpacerItem(20, 10, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed)
+        self.verticalLayout_18.addItem(spacerItem19)
+        self.btn_run_10 = QtWidgets.QPushButton(self.verticalLayoutWidget_4)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.btn_run_10.sizePolicy().hasHeightForWidth())
+        self.btn_run_10.setSizePolicy(sizePolicy)
+        self.btn_run_10.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_run_10.setObjectName("btn_run_10")
+        self.verticalLayout_18.addWidget(self.btn_run_10)
+        self.toolBox_2.addItem(self.page_10, "")
+        self.tabWidget.addTab(self.tab_6, "")
+        self.tab = QtWidgets.QWidget()
+        self.tab.setObjectName("tab")
+        self.toolBox_3 = QtWidgets.QToolBox(self.tab)
+        self.toolBox_3.setGeometry(QtCore.QRect(10, 10, 411, 281))
+        font = QtGui.QFont()
+        font.setPointSize(9)
+        self.toolBox_3.setFont(font)
+        self.toolBox_3.setObjectName("toolBox_3")
+        self.page_9 = QtWidgets.QWidget()
+        self.page_9.setGeometry(QtCore.QRect(0, 0, 98, 28))
+        self.page_9.setObjectName("page_9")
+        self.layoutWidget = QtWidgets.QWidget(self.page_9)
+        self.layoutWidget.setGeometry(QtCore.QRect(0, 0, 411, 141))
+        self.layoutWidget.setObjectName("layoutWidget")
+        self.horizontalLayout_5 = QtWidgets.QHBoxLayout(self.layoutWidget)
+        self.horizontalLayout_5.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout_5.setObjectName("horizontalLayout_5")
+        spacerItem20 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_5.addItem(spacerItem20)
+        self.btn_generate_authors = QtWidgets.QPushButton(self.layoutWidget)
+        self.btn_generate_authors.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_generate_authors.setStyleSheet("")
+        self.btn_generate_authors.setObjectName("btn_generate_authors")
+        self.horizontalLayout_5.addWidget(self.btn_generate_authors)
+        spacerItem21 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_5.addItem(spacerItem21)
+        self.btn_generate_msns = QtWidgets.QPushButton(self.layoutWidget)
+        self.btn_generate_msns.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_generate_msns.setStyleSheet("")
+        self.btn_generate_msns.setObjectName("btn_generate_msns")
+        self.horizontalLayout_5.addWidget(self.btn_generate_msns)
+        spacerItem22 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_5.addItem(spacerItem22)
+        self.textBrowser_2 = QtWidgets.QTextBrowser(self.page_9)
+        self.textBrowser_2.setGeometry(QtCore.QRect(0, 150, 411, 41))
+        self.textBrowser_2.setObjectName("textBrowser_2")
+        self.toolBox_3.addItem(self.page_9, "")
+        self.page_7 = QtWidgets.QWidget()
+        self.page_7.setGeometry(QtCore.QRect(0, 0, 98, 28))
+        self.page_7.setObjectName("page_7")
+        self.layoutWidget1 = QtWidgets.QWidget(self.page_7)
+        self.layoutWidget1.setGeometry(QtCore.QRect(2, 0, 401, 141))
+        self.layoutWidget1.setObjectName("layoutWidget1")
+        self.horizontalLayout_2 = QtWidgets.QHBoxLayout(self.layoutWidget1)
+        self.horizontalLayout_2.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout_2.setObjectName("horizontalLayout_2")
+        spacerItem23 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_2.addItem(spacerItem23)
+        self.btn_one_follow_up = QtWidgets.QPushButton(self.layoutWidget1)
+        self.btn_one_follow_up.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_one_follow_up.setStyleSheet("")
+        self.btn_one_follow_up.setObjectName("btn_one_follow_up")
+        self.horizontalLayout_2.addWidget(self.btn_one_follow_up)
+        spacerItem24 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_2.addItem(spacerItem24)
+        self.btn_run_0 = QtWidgets.QPushButton(self.layoutWidget1)
+        self.btn_run_0.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_run_0.setStyleSheet("")
+        self.btn_run_0.setObjectName("btn_run_0")
+        self.horizontalLayout_2.addWidget(self.btn_run_0)
+        spacerItem25 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_2.addItem(spacerItem25)
+        self.textBrowser = QtWidgets.QTextBrowser(self.page_7)
+        self.textBrowser.setGeometry(QtCore.QRect(0, 150, 411, 41))
+        self.textBrowser.setObjectName("textBrowser")
+        self.toolBox_3.addItem(self.page_7, "")
+        self.page_11 = QtWidgets.QWidget()
+        self.page_11.setGeometry(QtCore.QRect(0, 0, 98, 28))
+        self.page_11.setObjectName("page_11")
+        self.layoutWidget_11 = QtWidgets.QWidget(self.page_11)
+        self.layoutWidget_11.setGeometry(QtCore.QRect(2, 0, 401, 141))
+        self.layoutWidget_11.setObjectName("layoutWidget_11")
+        self.horizontalLayout_15 = QtWidgets.QHBoxLayout(self.layoutWidget_11)
+        self.horizontalLayout_15.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout_15.setObjectName("horizontalLayout_15")
+        spacerItem26 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_15.addItem(spacerItem26)
+        self.btn_folder_follow_ups = QtWidgets.QPushButton(self.layoutWidget_11)
+        self.btn_folder_follow_ups.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_folder_follow_ups.setStyleSheet("")
+        self.btn_folder_follow_ups.setObjectName("btn_folder_follow_ups")
+        self.horizontalLayout_15.addWidget(self.btn_folder_follow_ups)
+        spacerItem27 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_15.addItem(spacerItem27)
+        self.btn_run_11 = QtWidgets.QPushButton(self.layoutWidget_11)
+        self.btn_run_11.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_run_11.setStyleSheet("")
+        self.btn_run_11.setObjectName("btn_run_11")
+        self.horizontalLayout_15.addWidget(self.btn_run_11)
+        spacerItem28 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_15.addItem(spacerItem28)
+        self.textBrowser_11 = QtWidgets.QTextBrowser(self.page_11)
+        self.textBrowser_11.setGeometry(QtCore.QRect(0, 150, 411, 41))
+        self.textBrowser_11.setObjectName("textBrowser_11")
+        self.toolBox_3.addItem(self.page_11, "")
+        self.page = QtWidgets.QWidget()
+        self.page.setGeometry(QtCore.QRect(0, 0, 411, 197))
+        self.page.setObjectName("page")
+        self.verticalLayoutWidget_2 = QtWidgets.QWidget(self.page)
+        self.verticalLayoutWidget_2.setGeometry(QtCore.QRect(10, 10, 391, 181))
+        self.verticalLayoutWidget_2.setObjectName("verticalLayoutWidget_2")
+        self.verticalLayout_3 = QtWidgets.QVBoxLayout(self.verticalLayoutWidget_2)
+        self.verticalLayout_3.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_3.setObjectName("verticalLayout_3")
+        self.gridLayout = QtWidgets.QGridLayout()
+        self.gridLayout.setHorizontalSpacing(8)
+        self.gridLayout.setVerticalSpacing(15)
+        self.gridLayout.setObjectName("gridLayout")
+        self.btn_json_6 = QtWidgets.QPushButton(self.verticalLayoutWidget_2)
+        self.btn_json_6.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_json_6.setObjectName("btn_json_6")
+        self.gridLayout.addWidget(self.btn_json_6, 0, 1, 1, 1)
+        self.btn_mdl_rev_MSNs = QtWidgets.QPushButton(self.verticalLayoutWidget_2)
+        self.btn_mdl_rev_MSNs.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_mdl_rev_MSNs.setObjectName("btn_mdl_rev_MSNs")
+        self.gridLayout.addWidget(self.btn_mdl_rev_MSNs, 2, 1, 1, 1)
+        self.label_3 = QtWidgets.QLabel(self.verticalLayoutWidget_2)
+        self.label_3.setLayoutDirection(QtCore.Qt.LeftToRight)
+        self.label_3.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.label_3.setObjectName("label_3")
+        self.gridLayout.addWidget(self.label_3, 1, 0, 1, 1)
+        self.btn_mdl_all_MSNs = QtWidgets.QPushButton(self.verticalLayoutWidget_2)
+        self.btn_mdl_all_MSNs.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_mdl_all_MSNs.setObjectName("btn_mdl_all_MSNs")
+        self.gridLayout.addWidget(self.btn_mdl_all_MSNs, 1, 1, 1, 1)
+        self.label_2 = QtWidgets.QLabel(self.verticalLayoutWidget_2)
+        self.label_2.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.label_2.setObjectName("label_2")
+        self.gridLayout.addWidget(self.label_2, 3, 0, 1, 1)
+        self.label_4 = QtWidgets.QLabel(self.verticalLayoutWidget_2)
+        self.label_4.setLayoutDirection(QtCore.Qt.LeftToRight)
+        self.label_4.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.label_4.setWordWrap(True)
+        self.label_4.setObjectName("label_4")
+        self.gridLayout.addWidget(self.label_4, 2, 0, 1, 1)
+        self.input_revision_2 = QtWidgets.QLineEdit(self.verticalLayoutWidget_2)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.input_revision_2.sizePolicy().hasHeightForWidth())
+        self.input_revision_2.setSizePolicy(sizePolicy)
+        self.input_revision_2.setMaximumSize(QtCore.QSize(120, 16777215))
+        self.input_revision_2.setAlignment(QtCore.Qt.AlignCenter)
+        self.input_revision_2.setObjectName("input_revision_2")
+        self.gridLayout.addWidget(self.input_revision_2, 3, 1, 1, 1)
+        self.verticalLayout_3.addLayout(self.gridLayout)
+        spacerItem29 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.verticalLayout_3.addItem(spacerItem29)
+        self.horizontalLayout_13 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_13.setObjectName("horizontalLayout_13")
+        spacerItem30 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_13.addItem(spacerItem30)
+        self.btn_run_9 = QtWidgets.QPushButton(self.verticalLayoutWidget_2)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.btn_run_9.sizePolicy().hasHeightForWidth())
+        self.btn_run_9.setSizePolicy(sizePolicy)
+        self.btn_run_9.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_run_9.setObjectName("btn_run_9")
+        self.horizontalLayout_13.addWidget(self.btn_run_9)
+        spacerItem31 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_13.addItem(spacerItem31)
+        self.verticalLayout_3.addLayout(self.horizontalLayout_13)
+        self.toolBox_3.addItem(self.page, "")
+        self.tabWidget.addTab(self.tab, "")
+        self.tab_search = QtWidgets.QWidget()
+        self.tab_search.setObjectName("tab_search")
+        self.btn_search_follow_up = QtWidgets.QPushButton(self.tab_search)
+        self.btn_search_follow_up.setGeometry(QtCore.QRect(10, 10, 91, 25))
+        self.btn_search_follow_up.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_search_follow_up.setObjectName("btn_search_follow_up")
+        self.input_search_pn = QtWidgets.QLineEdit(self.tab_search)
+        self.input_search_pn.setGeometry(QtCore.QRect(110, 10, 201, 25))
+        self.input_search_pn.setObjectName("input_search_pn")
+        self.input_search_msn = QtWidgets.QLineEdit(self.tab_search)
+        self.input_search_msn.setGeometry(QtCore.QRect(320, 10, 91, 25))
+        self.input_search_msn.setObjectName("input_search_msn")
+        self.btn_where_used = QtWidgets.QPushButton(self.tab_search)
+        self.btn_where_used.setGeometry(QtCore.QRect(10, 45, 96, 25))
+        self.btn_where_used.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_where_used.setObjectName("btn_where_used")
+        self.btn_explode = QtWidgets.QPushButton(self.tab_search)
+        self.btn_explode.setGeometry(QtCore.QRect(115, 45, 96, 25))
+        self.btn_explode.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_explode.setObjectName("btn_explode")
+        self.btn_search_pn = QtWidgets.QPushButton(self.tab_search)
+        self.btn_search_pn.setGeometry(QtCore.QRect(220, 45, 96, 25))
+        self.btn_search_pn.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_search_pn.setObjectName("btn_search_pn")
+        self.btn_pn_lookup = QtWidgets.QPushButton(self.tab_search)
+        self.btn_pn_lookup.setGeometry(QtCore.QRect(325, 45, 96, 25))
+        self.btn_pn_lookup.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_pn_lookup.setObjectName("btn_pn_lookup")
+        self.tree_search = QtWidgets.QTreeWidget(self.tab_search)
+        self.tree_search.setGeometry(QtCore.QRect(10, 80, 411, 205))
+        font = QtGui.QFont()
+        font.setPointSize(9)
+        self.tree_search.setFont(font)
+        self.tree_search.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.tree_search.setObjectName("tree_search")
+        self.tabWidget.addTab(self.tab_search, "")
+        self.tab_jobs = QtWidgets.QWidget()
+        self.tab_jobs.setObjectName("tab_jobs")
+        self.table_jobs = QtWidgets.QTableWidget(self.tab_jobs)
+        self.table_jobs.setGeometry(QtCore.QRect(10, 10, 411, 241))
+        font = QtGui.QFont()
+        font.setPointSize(9)
+        self.table_jobs.setFont(font)
+        self.table_jobs.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table_jobs.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.table_jobs.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.table_jobs.setObjectName("table_jobs")
+        self.table_jobs.setColumnCount(4)
+        self.table_jobs.setRowCount(0)
+        item = QtWidgets.QTableWidgetItem()
+        self.table_jobs.setHorizontalHeaderItem(0, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.table_jobs.setHorizontalHeaderItem(1, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.table_jobs.setHorizontalHeaderItem(2, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.table_jobs.setHorizontalHeaderItem(3, item)
+        self.table_jobs.horizontalHeader().setStretchLastSection(True)
+        self.table_jobs.verticalHeader().setVisible(False)
+        self.btn_cancel_job = QtWidgets.QPushButton(self.tab_jobs)
+        self.btn_cancel_job.setGeometry(QtCore.QRect(10, 260, 201, 25))
+        self.btn_cancel_job.setCursor(QtCore.Qt.PointingHandCursor)
+        self.btn_cancel_job.setObjectName("btn_cancel_job")
+        self.tabWidget.addTab(self.tab_jobs, "")
+        self.verticalLayout_6.addWidget(self.tabWidget)
+        self.my_textBrowser = QtWidgets.QTextBrowser(self.centralwidget)
+        self.my_textBrowser.setMaximumSize(QtCore.QSize(16777215, 250))
+        font = QtGui.QFont()
+        font.setFamily("Calibri")
+        font.setPointSize(10)
+        self.my_textBrowser.setFont(font)
+        self.my_textBrowser.setProperty("cursor", QtCore.Qt.ArrowCursor)
+        self.my_textBrowser.setObjectName("my_textBrowser")
+        self.verticalLayout_6.addWidget(self.my_textBrowser)
+        MainWindow.setCentralWidget(self.centralwidget)
+
+        self.retranslateUi(MainWindow)
+        self.tabWidget.setCurrentIndex(0)
+        self.toolBox.setCurrentIndex(0)
+        self.toolBox_2.setCurrentIndex(0)
+        self.toolBox_3.setCurrentIndex(2)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        MainWindow.setWindowTitle(QtWidgets.QApplication.translate("MainWindow", "Follow-Up Creation Tool", None, -1))
+        self.btn_latest_follow_up.setText(QtWidgets.QApplication.translate("MainWindow", "Latest Follow-up", None, -1))
+        self.btn_pseudo_db_1.setText(QtWidgets.QApplication.translate("MainWindow", "Old PseudoDB", None, -1))
+        self.btn_run_1.setText(QtWidgets.QApplication.translate("MainWindow", "Merge", None, -1))
+        self.toolBox.setItemText(self.toolBox.indexOf(self.page_2), QtWidgets.QApplication.translate("MainWindow", "1. Merge Latest Follow-up with existing PseudoDB", None, -1))
+        self.btn_mdl.setText(QtWidgets.QApplication.translate("MainWindow", "MDL Folder", None, -1))
+        self.btn_json.setText(QtWidgets.QApplication.translate("MainWindow", "JSON with MSNs", None, -1))
+        self.btn_pseudo_db_2.setText(QtWidgets.QApplication.translate("MainWindow", "Merged PseudoDB", None, -1))
+        self.btn_run_2.setText(QtWidgets.QApplication.translate("MainWindow", "PseudoDB for CC", None, -1))
+        self.toolBox.setItemText(self.toolBox.indexOf(self.page_3), QtWidgets.QApplication.translate("MainWindow", "2. Update the PseudoDB using the latest MDLs", None, -1))
+        self.btn_mdl_2.setText(QtWidgets.QApplication.translate("MainWindow", "MDL Folder", None, -1))
+        self.btn_json_2.setText(QtWidgets.QApplication.translate("MainWindow", "JSON with MSNs", None, -1))
+        self.btn_json_authors.setText(QtWidgets.QApplication.translate("MainWindow", "JSON with Authors", None, -1))
+        self.btn_pseudo_db_3.setText(QtWidgets.QApplication.translate("MainWindow", "PseudoDΒ after CC", None, -1))
+        self.label.setText(QtWidgets.QApplication.translate("MainWindow", "Follow-up Revision:", None, -1))
+        self.input_revision.setPlaceholderText(QtWidgets.QApplication.translate("MainWindow", "i.e. R10", None, -1))
+        self.check_resume.setToolTip(QtWidgets.QApplication.translate("MainWindow", "Reuse the stages that a failed run of the same Follow-up saved in \"_Checkpoints\"", None, -1))
+        self.check_resume.setText(QtWidgets.QApplication.translate("MainWindow", "Resume the last run if it failed", None, -1))
+        self.check_split_reference.setToolTip(QtWidgets.QApplication.translate("MainWindow", "Save DSOL, PS and NC to \"EFW Follow-up RXX Reference.xlsx\" next to the Follow-up", None, -1))
+        self.check_split_reference.setText(QtWidgets.QApplication.translate("MainWindow", "DSOL, PS and NC in a separate Reference Excel", None, -1))
+        self.btn_run_3.setText(QtWidgets.QApplication.translate("MainWindow", "Create Final Follow-up", None, -1))
+        self.toolBox.setItemText(self.toolBox.indexOf(self.page_4), QtWidgets.QApplication.translate("MainWindow", "3. Create the Final Follow-up", None, -1))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_5), QtWidgets.QApplication.translate("MainWindow", "Create Follow-up", None, -1))
+        self.btn_mdl_3.setText(QtWidgets.QApplication.translate("MainWindow", "MDL Folder", None, -1))
+        self.btn_json_3.setText(QtWidgets.QApplication.translate("MainWindow", "JSON with MSNs", None, -1))
+        self.btn_pseudo_db_5.setText(QtWidgets.QApplication.translate("MainWindow", "PseudoDB", None, -1))
+        self.btn_run_6.setText(QtWidgets.QApplication.translate("MainWindow", "PseudoDB for CC", None, -1))
+        self.toolBox_2.setItemText(self.toolBox_2.indexOf(self.page_5), QtWidgets.QApplication.translate("MainWindow", "1. Update the PseudoDB using the latest MDLs", None, -1))
+        self.btn_mdl_4.setText(QtWidgets.QApplication.translate("MainWindow", "MDL Folder", None, -1))
+        self.btn_json_4.setText(QtWidgets.QApplication.translate("MainWindow", "JSON with MSNs", None, -1))
+        self.btn_pseudo_db_6.setText(QtWidgets.QApplication.translate("MainWindow", "PseudoDΒ after CC", None, -1))
+        self.btn_run_7.setText(QtWidgets.QApplication.translate("MainWindow", "Create Temporary New Follow-up", None, -1))
+        self.toolBox_2.setItemText(self.toolBox_2.indexOf(self.page_6), QtWidgets.QApplication.translate("MainWindow", "2. Create a Temporary New Follow-up", None, -1))
+        self.btn_json_5.setText(QtWidgets.QApplication.translate("MainWindow", "JSON with MSNs", None, -1))
+        self.btn_json_authors_2.setText(QtWidgets.QApplication.translate("MainWindow", "JSON with Authors", None, -1))
+        self.btn_old_follow_up.setText(QtWidgets.QApplication.translate("MainWindow", "Old Follow-up", None, -1))
+        self.btn_new_follow_up.setText(QtWidgets.QApplication.translate("MainWindow", "New Follow-up", None, -1))
+        self.btn_run_8.setText(QtWidgets.QApplication.translate("MainWindow", "Create Final Follow-up", None, -1))
+        self.toolBox_2.setItemText(self.toolBox_2.indexOf(self.page_8), QtWidgets.QApplication.translate("MainWindow", "3. Create the Final Follow-up", None, -1))
+        self.btn_json_7.setText(QtWidgets.QApplication.translate("MainWindow", "JSON with MSNs", None, -1))
+        self.btn_json_authors_3.setText(QtWidgets.QApplication.translate("MainWindow", "JSON with Authors", None, -1))
+        self.btn_mdl_5.setText(QtWidgets.QApplication.translate("MainWindow", "MDLs", None, -1))
+        self.btn_pseudo_db_7.setText(QtWidgets.QApplication.translate("MainWindow", "PseudoDataBase (after CC)", None, -1))
+        self.btn_old_follow_up_2.setText(QtWidgets.QApplication.translate("MainWindow", "Old Follow-up", None, -1))
+        self.btn_run_10.setText(QtWidgets.QApplication.translate("MainWindow", "Update Final Follow-up with changed MDLs", None, -1))
+        self.toolBox_2.setItemText(self.toolBox_2.indexOf(self.page_10), QtWidgets.QApplication.translate("MainWindow", "4. Incremental Update (only changed MDLs)", None, -1))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_6), QtWidgets.QApplication.translate("MainWindow", "Update Follow-up", None, -1))
+        self.btn_generate_authors.setText(QtWidgets.QApplication.translate("MainWindow", "Generate Authors", None, -1))
+        self.btn_generate_msns.setText(QtWidgets.QApplication.translate("MainWindow", "Generate MSNs", None, -1))
+        self.textBrowser_2.setHtml(QtWidgets.QApplication.translate("MainWindow", "<!DOCTYPE HTML PUBLIC \"-//W3C//DTD HTML 4.0//EN\" \"http://www.w3.org/TR/REC-html40/strict.dtd\">\n"
+"<html><head><meta name=\"qrichtext\" content=\"1\" /><style type=\"text/css\">\n"
+"p, li { white-space: pre-wrap; }\n"
+"</style></head><body style=\" font-family:\'MS Shell Dlg 2\'; font-size:9pt; font-weight:400; font-style:normal;\">\n"
+"<p align=\"center\" style=\" margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px; -qt-block-indent:0; text-indent:0px;\">Generate the required JSON files if you have lost them. They must be modified manually as they use information for the creation of R10.</p></body></html>", None, -1))
+        self.toolBox_3.setItemText(self.toolBox_3.indexOf(self.page_9), QtWidgets.QApplication.translate("MainWindow", "Generate JSON files", None, -1))
+        self.btn_one_follow_up.setText(QtWidgets.QApplication.translate("MainWindow", "Follow-up", None, -1))
+        self.btn_run_0.setText(QtWidgets.QApplication.translate("MainWindow", "Convert", None, -1))
+        self.textBrowser.setHtml(QtWidgets.QApplication.translate("MainWindow", "<!DOCTYPE HTML PUBLIC \"-//W3C//DTD HTML 4.0//EN\" \"http://www.w3.org/TR/REC-html40/strict.dtd\">\n"
+"<html><head><meta name=\"qrichtext\" content=\"1\" /><style type=\"text/css\">\n"
+"p, li { white-space: pre-wrap; }\n"
+"</style></head><body style=\" font-family:\'MS Shell Dlg 2\'; font-size:9pt; font-weight:400; font-style:normal;\">\n"
+"<p align=\"center\" style=\" margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px; -qt-block-indent:0; text-indent:0px;\">Use this only if you have lost the PseudoDataBase and you want to start merging everyhting from R07 until now.</p></body></html>", None, -1))
+        self.toolBox_3.setItemText(self.toolBox_3.indexOf(self.page_7), QtWidgets.QApplication.translate("MainWindow", "Create PseudoDB from a Follow-up (If you don\'t have a PseudoDB)", None, -1))
+        self.btn_folder_follow_ups.setText(QtWidgets.QApplication.translate("MainWindow", "Folder with Follow-ups", None, -1))
+        self.btn_run_11.setText(QtWidgets.QApplication.translate("MainWindow", "Convert and Merge", None, -1))
+        self.textBrowser_11.setHtml(QtWidgets.QApplication.translate("MainWindow", "<!DOCTYPE HTML PUBLIC \"-//W3C//DTD HTML 4.0//EN\" \"http://www.w3.org/TR/REC-html40/strict.dtd\">\n"
+"<html><head><meta name=\"qrichtext\" content=\"1\" /><style type=\"text/css\">\n"
+"p, li { white-space: pre-wrap; }\n"
+"</style></head><body style=\" font-family:\'MS Shell Dlg 2\'; font-size:9pt; font-weight:400; font-style:normal;\">\n"
+"<p align=\"center\" style=\" margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px; -qt-block-indent:0; text-indent:0px;\">All Follow-ups inside the folder are converted in parallel and merged into a single PseudoDataBase. Same result as Step 0 and Step 1 one by one.</p></body></html>", None, -1))
+        self.toolBox_3.setItemText(self.toolBox_3.indexOf(self.page_11), QtWidgets.QApplication.translate("MainWindow", "Create PseudoDB from a folder with Follow-ups (R07 until now at once)", None, -1))
+        self.btn_json_6.setText(QtWidgets.QApplication.translate("MainWindow", "JSON with MSNs", None, -1))
+        self.btn_mdl_rev_MSNs.setText(QtWidgets.QApplication.translate("MainWindow", "MDLs for Rev MSNs", None, -1))
+        self.label_3.setText(QtWidgets.QApplication.translate("MainWindow", "Folder with the Latest MDLs for All MSNs:", None, -1))
+        self.btn_mdl_all_MSNs.setText(QtWidgets.QApplication.translate("MainWindow", "MDLs for All MSNs", None, -1))
+        self.label_2.setText(QtWidgets.QApplication.translate("MainWindow", "Revision:", None, -1))
+        self.label_4.setText(QtWidgets.QApplication.translate("MainWindow", "Folder with MDLs that where incorporated last time for Rev MSNs:", None, -1))
+        self.input_revision_2.setPlaceholderText(QtWidgets.QApplication.translate("MainWindow", "i.e. R10", None, -1))
+        self.btn_run_9.setText(QtWidgets.QApplication.translate("MainWindow", "Create ALL_NCs", None, -1))
+        self.toolBox_3.setItemText(self.toolBox_3.indexOf(self.page), QtWidgets.QApplication.translate("MainWindow", "Create ALL_NCs", None, -1))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab), QtWidgets.QApplication.translate("MainWindow", "Extra", None, -1))
+        self.btn_search_follow_up.setText(QtWidgets.QApplication.translate("MainWindow", "Follow-up", None, -1))
+        self.input_search_pn.setPlaceholderText(QtWidgets.QApplication.translate("MainWindow", "Part Number", None, -1))
+        self.input_search_msn.setPlaceholderText(QtWidgets.QApplication.translate("MainWindow", "MSN (optional)", None, -1))
+        self.btn_where_used.setText(QtWidgets.QApplication.translate("MainWindow", "Where used", None, -1))
+        self.btn_explode.setText(QtWidgets.QApplication.translate("MainWindow", "Explode", None, -1))
+        self.btn_search_pn.setText(QtWidgets.QApplication.translate("MainWindow", "Find", None, -1))
+        self.btn_pn_lookup.setText(QtWidgets.QApplication.translate("MainWindow", "MDLs and NCs", None, -1))
+        self.tree_search.headerItem().setText(0, QtWidgets.QApplication.translate("MainWindow", "Part Number", None, -1))
+        self.tree_search.headerItem().setText(1, QtWidgets.QApplication.translate("MainWindow", "Title", None, -1))
+        self.tree_search.headerItem().setText(2, QtWidgets.QApplication.translate("MainWindow", "Level", None, -1))
+        self.tree_search.headerItem().setText(3, QtWidgets.QApplication.translate("MainWindow", "Effectivity", None, -1))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_search), QtWidgets.QApplication.translate("MainWindow", "Search", None, -1))
+        self.table_jobs.horizontalHeaderItem(0).setText(QtWidgets.QApplication.translate("MainWindow", "#", None, -1))
+        self.table_jobs.horizontalHeaderItem(1).setText(QtWidgets.QApplication.translate("MainWindow", "Job", None, -1))
+        self.table_jobs.horizontalHeaderItem(2).setText(QtWidgets.QApplication.translate("MainWindow", "Status", None, -1))
+        self.table_jobs.horizontalHeaderItem(3).setText(QtWidgets.QApplication.translate("MainWindow", "Time", None, -1))
+        self.btn_cancel_job.setText(QtWidgets.QApplication.translate("MainWindow", "Cancel selected Job (if Queued)", None, -1))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_jobs), QtWidgets.QApplication.translate("MainWindow", "Jobs", None, -1))
+
+
+# Hash of the .ui file this module was compiled from (see "compile_ui.py")
+UI_HASH = '4ee9bd59616af0f30542b7e95512021b0a1aff42a0280b64258123032b9c485c'